@@ -84,9 +84,29 @@ TOP_LEAGUES = {
 LOG_FILE = 'debug.log'
 LOG_LEVEL = 'INFO'
 
+# Каталог файлов состояния между перезапусками (не зависит от рабочего каталога)
+DATA_DIR = os.getenv('SPORTSTAVKA_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+BYPASS_STATS_FILE = os.path.join(DATA_DIR, 'bypass_stats.json')
+SESSION_STATE_FILE = os.path.join(DATA_DIR, 'session_state.json')
+
+# Доля циклов демона, которые профилируются выборочно (0 - выключено)
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0.01'))
+
 # Максимальное количество рекомендаций в отчете
 MAX_RECOMMENDATIONS = 5
 
+# Детальный сбор: одновременные запросы по источникам и предельное время на матч
+DETAILED_SOURCE_CONCURRENCY = {
+    'sofascore': 4,  # JSON API через общий HTTP транспорт
+    'scores24': 3,   # страницы матчей в общем пуле браузеров
+}
+# Домен страницы матча -> источник детальных данных (остальные домены - под своим именем)
+DETAILED_SOURCE_NAMES = {
+    'scores24.live': 'scores24',
+    'flashscore.com': 'flashscore',
+}
+DETAILED_MATCH_TIMEOUT = 40  # секунд
+
 # ПРОДАКШН НАСТРОЙКИ
 PRODUCTION_MODE = True
 MANUAL_FALLBACK_ENABLED = False  # Отключен в продакшене - только автоматические источники
@@ -36,7 +36,7 @@ class CaptchaConfig:
     min_delay: float = 1.0
     max_delay: float = 3.0
     
-    # Таймауты для разных методов
+    # Стартовые таймауты методов (после накопления статистики - p99 x 1.5, см. utils/latency_histogram.py)
     method_timeouts: Dict[str, int] = field(default_factory=lambda: {
         "http_simple": 10,
         "undetected_chrome": 30,
@@ -2,33 +2,37 @@
 Главный модуль автоматизированного аналитика спортивных ставок
 """
 import time
-import schedule
+import asyncio
 import threading
 import re
 from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 import pytz
 
 # Импорты модулей системы
 from utils.logger import setup_logger, log_cycle_start, log_cycle_end, log_error
-from scrapers.football_scraper import FootballScraper
-from scrapers.tennis_scraper import TennisScraper
-from scrapers.table_tennis_scraper import TableTennisScraper
-from scrapers.handball_scraper import HandballScraper
-from scrapers.sofascore_simple_quality import SofaScoreSimpleQuality
+from scrapers.source_registry import get_global_source_registry
 from scrapers.multi_source_aggregator import MultiSourceAggregator
 from scrapers.manual_live_provider import ManualLiveProvider
 from scrapers.demo_data_provider import demo_provider
+from utils.match_record import as_matches, to_dicts
+from utils.match_batch import create_match_batch
+from utils.score_parser import parse_score
 from utils.smart_scheduler import SmartScheduler
 from utils.football_league_prioritizer import FootballLeaguePrioritizer
-from ai_analyzer.claude_analyzer import ClaudeAnalyzer
-from ai_analyzer.claude_analyzer_v2 import ClaudeAnalyzerV2
+from utils.cycle_stages import mark_stage, end_cycle
+from utils.cycle_deadline import current_deadline
+from utils.rate_limiter import domain_for
+from utils.daemon_runtime import DaemonRuntime
+from utils.browser_pool import close_global_browser_pool
+from utils.captcha_bypass import close_captcha_bypass_managers
 from telegram_bot.reporter import TelegramReporter
 from telegram_bot.claude_telegram_reporter import ClaudeTelegramReporter
 
 from config import (
-    SOFASCORE_URLS, SCORES24_URLS, CYCLE_INTERVAL_MINUTES, RETRY_DELAY_SECONDS,
-    MAX_RECOMMENDATIONS
+    SOFASCORE_URLS, SCORES24_URLS,
+    MAX_RECOMMENDATIONS, DETAILED_SOURCE_CONCURRENCY, DETAILED_SOURCE_NAMES, DETAILED_MATCH_TIMEOUT
 )
 
 class SportsAnalyzer:
@@ -40,6 +44,13 @@ class SportsAnalyzer:
         self.logger = setup_logger('SportsAnalyzer')
         self.running = False
         
+        # Профилировщик циклов (run.py --profile или выборочный режим, в run.py включен по умолчанию)
+        self.cycle_profiler = None
+        
+        # Очередь публикаций в Telegram (устанавливается рантаймом демона)
+        self.telegram_outbox = None
+        self._stopped = False
+        
         # Инициализация компонентов
         # Умный планировщик по московскому времени
         self.smart_scheduler = SmartScheduler(self.logger)
@@ -47,26 +58,17 @@ class SportsAnalyzer:
         # Инициализация приоритизатора футбольных лиг
         self.football_prioritizer = FootballLeaguePrioritizer(self.logger)
         
-        # Инициализируем SofaScore скрапер для детальной статистики
-        self.sofascore_scraper = SofaScoreSimpleQuality(self.logger)
+        # Реестр источников: скраперы и анализаторы создаются при первом обращении
+        self.source_registry = get_global_source_registry(self.logger)
         
         # Инициализируем мульти-источник агрегатор
-        self.multi_source_aggregator = MultiSourceAggregator(self.logger)
+        self.multi_source_aggregator = MultiSourceAggregator(self.logger, self.source_registry)
         
         # Инициализируем ручной поставщик актуальных данных
         self.manual_provider = ManualLiveProvider(self.logger)
         
-        self.scrapers = {
-            'football': FootballScraper(self.logger),
-            'tennis': TennisScraper(self.logger),
-            'table_tennis': TableTennisScraper(self.logger),
-            'handball': HandballScraper(self.logger)
-        }
-        
-        self.claude_analyzer = ClaudeAnalyzer(self.logger)
-        
-        # Инициализируем Claude AI анализатор V2 для независимого анализа (Вариант 2)
-        self.claude_analyzer_v2 = ClaudeAnalyzerV2(self.logger)
+        # Браузерные скраперы по видам спорта (ленивые, selenium только при использовании)
+        self.scrapers = self.source_registry.view('sport')
         
         self.telegram_reporter = TelegramReporter(self.logger)
         
@@ -74,6 +76,22 @@ class SportsAnalyzer:
         self.claude_telegram_reporter = ClaudeTelegramReporter(self.logger)
         
         self.logger.info("Автоматизированный аналитик спортивных ставок инициализирован")
+        self.source_registry.log_import_report()
+    
+    @property
+    def sofascore_scraper(self):
+        """SofaScore скрапер для детальной статистики (общий с агрегатором)"""
+        return self.multi_source_aggregator.scrapers['sofascore']
+    
+    @property
+    def claude_analyzer(self):
+        """Claude AI анализатор (основной цикл)"""
+        return self.source_registry.get('claude_v1')
+    
+    @property
+    def claude_analyzer_v2(self):
+        """Claude AI анализатор V2 для независимого анализа (Вариант 2)"""
+        return self.source_registry.get('claude_v2')
     
     def _basic_filter_matches(self, matches: List[Dict[str, Any]], sport: str) -> List[Dict[str, Any]]:
         """
@@ -86,14 +104,12 @@ class SportsAnalyzer:
             if not match.get('team1') or not match.get('team2'):
                 continue
             
-            score = match.get('score', '0:0')
+            score = parse_score(match.get('score', '0:0'))
             
             # Проверяем что счет не ничейный для футбола и гандбола
             if sport in ['football', 'handball']:
-                if ':' in score:
-                    parts = score.split(':')
-                    if len(parts) == 2 and parts[0].strip() == parts[1].strip():
-                        continue  # Пропускаем ничьи
+                if score and score.is_draw:
+                    continue  # Пропускаем ничьи
             
             # Проверяем качество данных
             data_quality = match.get('data_quality', 0.0)
@@ -112,11 +128,9 @@ class SportsAnalyzer:
             
             if sport == 'football':
                 # Проверяем что счет не ничейный
-                score = match.get('score', '0:0')
-                if ':' in score:
-                    parts = score.split(':')
-                    if len(parts) == 2 and parts[0].strip() == parts[1].strip():
-                        return False  # Ничья
+                score = parse_score(match.get('score', '0:0'))
+                if score and score.is_draw:
+                    return False  # Ничья
                 
                 # Проверяем важность матча
                 importance = match.get('importance', 'LOW')
@@ -153,38 +167,67 @@ class SportsAnalyzer:
             self.logger.error("Критические ошибки подключений. Остановка.")
             return
         
-        # Настраиваем планировщик
-        schedule.every(CYCLE_INTERVAL_MINUTES).minutes.do(self.run_analysis_cycle)
-        
-        # Запускаем первый цикл сразу
-        self.run_analysis_cycle()
-        
-        # Основной цикл
+        # Рантайм демона: интервалы умного расписания, дедлайн цикла, плавная остановка
         self.running = True
-        while self.running:
-            try:
-                schedule.run_pending()
-                time.sleep(60)  # Проверяем каждую минуту
-            except KeyboardInterrupt:
-                self.logger.info("Получен сигнал остановки")
-                self.stop()
-            except Exception as e:
-                log_error(self.logger, e, "Ошибка в основном цикле")
-                time.sleep(RETRY_DELAY_SECONDS)
+        runtime = DaemonRuntime(self, self.logger, cycle_func=self.run_analysis_cycle)
+        asyncio.run(runtime.run())
     
     def stop(self):
         """
         Остановка анализатора
         """
+        if self._stopped:
+            return
+        self._stopped = True
+        
         self.logger.info("Остановка автоматизированного аналитика...")
         self.running = False
         
-        # Закрываем все драйверы
-        for scraper in self.scrapers.values():
+        # Неотправленные публикации
+        if self.telegram_outbox is not None:
+            self.telegram_outbox.close()
+        
+        # Закрываем драйверы только созданных скраперов
+        for _, scraper in self.scrapers.loaded_items():
             try:
                 scraper.close_driver()
             except:
                 pass
+        
+        # Останавливаем пул процессов парсинга
+        self.multi_source_aggregator.close()
+        
+        # Браузеры общего пула (детальный сбор Scores24)
+        close_global_browser_pool()
+        
+        # Несохраненная статистика методов обхода CAPTCHA
+        close_captcha_bypass_managers()
+        
+        if self.cycle_profiler is not None:
+            self.cycle_profiler.close()
+        
+        self.source_registry.log_import_report()
+    
+    def run_profiled_cycle(self, cycle_func=None):
+        """
+        Цикл анализа через профилировщик (если он включен)
+        """
+        cycle_func = cycle_func or self.run_analysis_cycle
+        if self.cycle_profiler is not None:
+            return self.cycle_profiler.run(cycle_func)
+        return cycle_func()
+    
+    def _publish(self, send_func, *args, **kwargs) -> bool:
+        """
+        Публикация в Telegram: через очередь в режиме демона, иначе сразу
+
+        Returns:
+            bool: в режиме демона - публикация принята в очередь (о доставке
+            сообщает очередь), иначе - сообщение отправлено
+        """
+        if self.telegram_outbox is not None:
+            return self.telegram_outbox.submit(send_func, *args, **kwargs)
+        return send_func(*args, **kwargs)
     
     def run_analysis_cycle(self):
         """
@@ -193,19 +236,31 @@ class SportsAnalyzer:
         log_cycle_start(self.logger)
         
         try:
+            # Соединения с источниками открываются до начала сбора
+            mark_stage('prewarm')
+            self.multi_source_aggregator.prewarm_connections()
+            
             # 1. Сбор данных по всем видам спорта
+            mark_stage('collect')
             all_matches = self._collect_all_matches()
             
             if not all_matches:
                 self.logger.warning("Не найдено подходящих матчей")
-                self.telegram_reporter.send_report([])
+                self._publish(self.telegram_reporter.send_report, [])
                 log_cycle_end(self.logger, success=True)
                 return
             
             # 2. Детальный сбор данных для отобранных матчей
-            detailed_matches = self._collect_detailed_data(all_matches)
+            mark_stage('detailed')
+            if current_deadline().expired():
+                # Дедлайн цикла: анализируем и публикуем то, что уже собрано
+                self.logger.warning("⏰ Дедлайн цикла: детальный сбор пропущен")
+                detailed_matches = all_matches
+            else:
+                detailed_matches = self._collect_detailed_data(all_matches)
             
             # 3. Анализ с помощью Claude AI
+            mark_stage('analysis')
             analyzed_matches = self.claude_analyzer.analyze_multiple_matches(detailed_matches)
             
             # 4. Выбор лучших рекомендаций
@@ -214,9 +269,15 @@ class SportsAnalyzer:
             )
             
             # 5. Публикация отчета в Telegram
-            success = self.telegram_reporter.send_report(best_recommendations)
+            mark_stage('report')
+            success = self._publish(self.telegram_reporter.send_report, best_recommendations)
             
-            if success:
+            if success and self.telegram_outbox is not None:
+                # Доставку подтверждает очередь, цикл отвечает только за постановку
+                self.logger.info(f"Цикл завершен успешно. Отчет ({len(best_recommendations)} рекомендаций) "
+                                 f"поставлен в очередь Telegram")
+                log_cycle_end(self.logger, success=True)
+            elif success:
                 self.logger.info(f"Цикл завершен успешно. Опубликовано {len(best_recommendations)} рекомендаций")
                 log_cycle_end(self.logger, success=True)
             else:
@@ -226,6 +287,8 @@ class SportsAnalyzer:
         except Exception as e:
             log_error(self.logger, e, "Критическая ошибка в цикле анализа")
             log_cycle_end(self.logger, success=False)
+        finally:
+            end_cycle()
     
     def _test_connections(self) -> bool:
         """
@@ -253,7 +316,12 @@ class SportsAnalyzer:
         self.logger.info(f"Доступные источники: {', '.join(healthy_sources)}")
         
         # Используем мульти-источник агрегатор как основной метод
+        deadline = current_deadline()
         for sport, scraper in self.scrapers.items():
+            if deadline.expired():
+                self.logger.warning(f"⏰ Дедлайн цикла: сбор остановлен перед {sport}")
+                break
+            
             try:
                 self.logger.info(f"Сбор {sport} матчей (мульти-источник)...")
                 
@@ -328,48 +396,169 @@ class SportsAnalyzer:
     def _collect_detailed_data(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Сбор детальных данных для отобранных матчей
+        Матчи собираются одновременно с лимитами по источникам и предельным временем
+        на матч, результат упорядочен по приоритету. Сбор останавливается, как только
+        MAX_RECOMMENDATIONS самых приоритетных матчей получили качественные данные:
+        менее приоритетные матчи в рекомендации уже не попадут и идут в анализ с
+        базовыми данными (как и матчи, не успевшие к дедлайну)
         """
-        detailed_matches = []
+        deadline = current_deadline()
+        
+        # Очередь по приоритету лиги, при равном приоритете - в порядке отбора
+        ranked = []
+        for index, match in enumerate(matches):
+            sport = match.get('sport')
+            match_url = match.get('url')
+            if not sport or not match_url or not self.scrapers.get(sport):
+                continue
+            ranked.append((match.get('priority', 999), index, match))
+        ranked.sort(key=lambda item: item[:2])
+        ranked = [match for _, _, match in ranked]
         
-        for match in matches:
-            try:
-                sport = match.get('sport')
-                match_url = match.get('url')
-                
-                if not sport or not match_url:
-                    continue
-                
-                scraper = self.scrapers.get(sport)
-                if not scraper:
-                    continue
-                
-                self.logger.info(f"Сбор детальных данных для {sport} матча: {match_url}")
-                
-                # Собираем подробные данные
-                # Используем SofaScore детальный сбор если доступен
-                if hasattr(self, 'sofascore_scraper') and match_url.startswith('/'):
-                    detailed_data = self.sofascore_scraper.get_detailed_match_data(match_url)
-                else:
-                    detailed_data = scraper.collect_match_data(match_url)
+        if not ranked:
+            return []
+        
+        # Отдельный пул потоков на источник = лимит одновременных запросов к нему
+        # (источники без настройки - по одному запросу)
+        executors: Dict[str, ThreadPoolExecutor] = {}
+        started_at: Dict[int, float] = {}
+        
+        def fetch(rank: int, source: str, match: Dict[str, Any]) -> Dict[str, Any]:
+            started_at[rank] = time.monotonic()
+            self.logger.info(f"Сбор детальных данных для {match['sport']} матча: {match['url']}")
+            return self._fetch_match_details(source, match)
+        
+        futures = {}
+        for rank, match in enumerate(ranked):
+            source = self._detail_source(match)
+            if source not in executors:
+                executors[source] = ThreadPoolExecutor(max_workers=DETAILED_SOURCE_CONCURRENCY.get(source, 1),
+                                                       thread_name_prefix=f'details-{source}')
+            futures[executors[source].submit(fetch, rank, source, match)] = rank
+        
+        results: Dict[int, Any] = {}  # rank -> детальные данные (None - только базовые)
+        failed = set()
+        pending = set(futures)
+        stop_reason = None
+        stage_started = time.monotonic()
+        
+        try:
+            while pending:
+                # Предельное время на матч отсчитывается от начала его сбора
+                now = time.monotonic()
+                for future in list(pending):
+                    rank = futures[future]
+                    if rank in started_at and now - started_at[rank] >= DETAILED_MATCH_TIMEOUT:
+                        pending.discard(future)
+                        results[rank] = None
+                        self.logger.warning(f"⏰ Детальные данные {ranked[rank]['url']}: "
+                                            f"нет ответа за {DETAILED_MATCH_TIMEOUT}с, матч идет с базовыми данными")
                 
-                # Объединяем с базовой информацией
-                detailed_data.update(match)
+                if self._enough_quality_details(results, len(ranked)):
+                    stop_reason = f"{MAX_RECOMMENDATIONS} приоритетных матчей с полными данными"
+                    break
+                if deadline.expired():
+                    stop_reason = "дедлайн цикла"
+                    break
+                if not pending:
+                    break
                 
-                detailed_matches.append(detailed_data)
+                # Ожидание до ближайшего события: завершения матча, его предельного времени или дедлайна
+                waits = [DETAILED_MATCH_TIMEOUT - (now - started_at[futures[future]])
+                         for future in pending if futures[future] in started_at]
+                timeout = min(waits, default=1.0)
+                remaining = deadline.remaining()
+                if remaining is not None:
+                    timeout = min(timeout, remaining)
                 
-            except Exception as e:
-                log_error(self.logger, e, f"Ошибка сбора детальных данных для матча")
-                continue
+                done, _ = wait(pending, timeout=max(0.05, timeout), return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    rank = futures[future]
+                    try:
+                        results[rank] = future.result()
+                    except Exception as e:
+                        log_error(self.logger, e, f"Ошибка сбора детальных данных для матча")
+                        results[rank] = None
+                        failed.add(rank)
+        finally:
+            # Несобранные матчи не запускаются; уже идущие загрузки завершатся в фоне
+            for executor in executors.values():
+                executor.shutdown(wait=False, cancel_futures=True)
         
-        self.logger.info(f"Собраны детальные данные для {len(detailed_matches)} матчей")
+        detailed_matches = []
+        for rank, match in enumerate(ranked):
+            if rank in failed:
+                continue
+            detailed_data = results.get(rank)
+            if detailed_data is None:
+                detailed_matches.append(match)
+                continue
+            # Объединяем с базовой информацией
+            detailed_data.update(match)
+            detailed_matches.append(detailed_data)
+        
+        collected = sum(1 for rank, data in results.items() if data is not None)
+        if stop_reason:
+            self.logger.info(f"⚡ Детальный сбор остановлен ({stop_reason}): собрано {collected} из {len(ranked)}, "
+                             f"остальные - с базовыми данными")
+        self.logger.info(f"Собраны детальные данные для {collected} матчей за "
+                         f"{time.monotonic() - stage_started:.1f}с")
         return detailed_matches
     
+    def _detail_source(self, match: Dict[str, Any]) -> str:
+        """
+        Источник детальных данных матча (определяет лимит одновременных запросов):
+        относительные URL - SofaScore API, остальные - по домену страницы матча
+        """
+        if match['url'].startswith('/'):
+            return 'sofascore'
+        domain = domain_for(match['url'])
+        source = DETAILED_SOURCE_NAMES.get(domain, domain or 'unknown')
+        if not hasattr(self.scrapers.get(match['sport']), 'detail_collector'):
+            # Скрапер без общего пула браузеров работает через свой self.driver по очереди:
+            # отдельная очередь, чтобы не занимать потоки пула источника ожиданием
+            return f"{source}/{match['sport']}"
+        return source
+    
+    def _fetch_match_details(self, source: str, match: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Детальные данные одного матча из источника
+        """
+        if source == 'sofascore':
+            return self.sofascore_scraper.get_detailed_match_data(match['url'])
+        # Страницы матчей: общий пул браузеров или self.driver скрапера под его driver_lock
+        return self.scrapers.get(match['sport']).collect_match_data(match['url'])
+    
+    def _is_quality_detail(self, detailed_data: Any) -> bool:
+        """
+        Детальные данные получены полностью: без ошибки и (для страниц матчей) с разделами
+        """
+        if not detailed_data or detailed_data.get('error'):
+            return False
+        return bool(detailed_data.get('detail_sections', True))
+    
+    def _enough_quality_details(self, results: Dict[int, Any], total: int) -> bool:
+        """
+        Первые по приоритету MAX_RECOMMENDATIONS качественных матчей определены:
+        все более приоритетные матчи уже завершены
+        """
+        quality = 0
+        for rank in range(total):
+            if rank not in results:
+                return False
+            if self._is_quality_detail(results[rank]):
+                quality += 1
+                if quality >= MAX_RECOMMENDATIONS:
+                    return True
+        return False
+    
     def run_single_cycle(self):
         """
         Запуск одного цикла анализа (для тестирования)
         """
         self.logger.info("Запуск тестового цикла анализа...")
-        self.run_analysis_cycle()
+        self.run_profiled_cycle()
     
     def run_smart_cycle(self):
         """
@@ -390,7 +579,12 @@ class SportsAnalyzer:
             
             self.logger.info(f"🕐 Запуск анализа в период {current_period.value} (Москва: {moscow_time.strftime('%H:%M')})")
             
+            # Соединения с источниками открываются до начала сбора
+            mark_stage('prewarm')
+            self.multi_source_aggregator.prewarm_connections()
+            
             # УПРОЩЕННЫЙ СБОР для Варианта 2 - только MarathonBet
+            mark_stage('collect')
             if self.multi_source_aggregator.variant_2_mode:
                 marathonbet_matches = self.multi_source_aggregator.get_marathonbet_matches_for_claude_variant2()
                 
@@ -406,15 +600,19 @@ class SportsAnalyzer:
                 # Полный режим со всеми источниками (если переключимся обратно)
                 marathonbet_matches = []
                 for sport in ['football', 'tennis', 'table_tennis', 'handball']:
+                    if current_deadline().expired():
+                        self.logger.warning(f"⏰ Дедлайн цикла: сбор остановлен перед {sport}")
+                        break
                     try:
                         sport_matches = self.multi_source_aggregator.scrapers['marathonbet'].get_live_matches_with_odds(sport, use_prioritization=False)
-                        marathonbet_matches.extend(sport_matches)
+                        marathonbet_matches.extend(as_matches(sport_matches))
                     except Exception as e:
                         self.logger.warning(f"Ошибка сбора {sport}: {e}")
                 
                 enriched_matches = self.multi_source_aggregator.enrich_marathonbet_matches_for_claude(marathonbet_matches)
             
             # Фильтруем и приоритизируем для телеграм канала
+            mark_stage('select')
             max_matches_for_telegram = self.smart_scheduler.get_max_matches_for_period(moscow_time)
             telegram_matches = self._select_best_matches_for_telegram(enriched_matches, max_matches_for_telegram)
             
@@ -425,20 +623,26 @@ class SportsAnalyzer:
                 self.logger.info(f"🧠 Запуск независимого анализа Claude AI для {len(telegram_matches)} матчей")
                 
                 # ВАРИАНТ 2: Claude AI независимый анализ
-                analysis_result = self.claude_analyzer_v2.analyze_matches_independently(telegram_matches)
+                # Промпт строится из обычных словарей
+                mark_stage('analysis')
+                analysis_result = self.claude_analyzer_v2.analyze_matches_independently(to_dicts(telegram_matches))
                 
                 if analysis_result:
                     self.logger.info(f"✅ Claude AI анализ получен ({len(analysis_result)} символов)")
                     
                     # Отправляем результат в телеграм канал через специальный репортер
-                    send_success = self.claude_telegram_reporter.send_claude_analysis(
+                    mark_stage('report')
+                    send_success = self._publish(
+                        self.claude_telegram_reporter.send_claude_analysis,
                         claude_analysis=analysis_result,
                         period=current_period.value,
                         matches_count=len(telegram_matches),
                         total_available=len(enriched_matches)
                     )
                     
-                    if send_success:
+                    if send_success and self.telegram_outbox is not None:
+                        self.logger.info("📨 Анализ поставлен в очередь отправки в телеграм канал")
+                    elif send_success:
                         self.logger.info("📨 Анализ успешно отправлен в телеграм канал")
                     else:
                         self.logger.warning("⚠️ Проблемы с отправкой в телеграм канал")
@@ -456,6 +660,8 @@ class SportsAnalyzer:
         except Exception as e:
             self.logger.error(f"Ошибка умного цикла: {e}")
             raise
+        finally:
+            end_cycle()
     
     def _select_best_matches_for_telegram(self, enriched_matches: List[Dict[str, Any]], max_matches: int) -> List[Dict[str, Any]]:
         """
@@ -498,6 +704,21 @@ class SportsAnalyzer:
             self.logger.info(f"🎯 После приоритизации берем все: {len(all_prioritized_matches)} матчей")
             return all_prioritized_matches
         
+        # Векторизованный путь: коэффициенты разбираются один раз, top-k через argpartition
+        batch = create_match_batch(all_prioritized_matches)
+        if batch is not None:
+            quality_mask = batch.odds_sanity_mask()
+            quality_count = int(quality_mask.sum())
+            self.logger.info(f"📊 Качественных матчей после фильтрации: {quality_count}")
+            
+            if quality_count <= max_matches:
+                self.logger.info(f"📊 Качественных матчей {quality_count} <= {max_matches} - берем все без сортировки")
+                return [m for m, ok in zip(all_prioritized_matches, quality_mask) if ok]
+            
+            top_indices = batch.top_k(batch.telegram_priority(), max_matches, mask=quality_mask)
+            self.logger.info(f"📊 Отобрано {max_matches} лучших из {quality_count} качественных матчей")
+            return batch.take(top_indices)
+        
         # Дополнительная приоритизация по качеству для телеграм
         def calculate_telegram_priority(match):
             score = 0
@@ -9,7 +9,12 @@ import argparse
 # Добавляем текущую директорию в путь Python
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from config import PROFILE_SAMPLE_RATE
 from main import SportsAnalyzer
+from utils.cycle_profiler import create_cycle_profiler
+from utils.cycle_bench import (
+    bench_failures, compare_with_baseline, create_cycle_benchmark, format_report, load_baseline, save_report
+)
 
 def main():
     parser = argparse.ArgumentParser(description='Автоматизированный аналитик спортивных ставок')
@@ -17,13 +22,55 @@ def main():
                        help='Запустить один тестовый цикл анализа')
     parser.add_argument('--daemon', action='store_true',
                        help='Запустить в режиме демона (непрерывно)')
-    
+    parser.add_argument('--profile', action='store_true',
+                       help='Профилировать циклы анализа (стеки по этапам, топ функций, память)')
+    parser.add_argument('--profile-cycles', type=int, default=1,
+                       help='Число профилируемых циклов подряд (для --profile)')
+    parser.add_argument('--profile-sample-rate', type=float, default=PROFILE_SAMPLE_RATE,
+                       help='Доля циклов демона, которые профилируются (по умолчанию 0.01, 0 - выключить)')
+    parser.add_argument('--profile-dir', default='profiles',
+                       help='Каталог для результатов профилирования')
+    parser.add_argument('--bench', action='store_true',
+                       help='Бенчмарк циклов на локальных подменах (без сети, Claude и Telegram)')
+    parser.add_argument('--bench-cycles', type=int, default=5,
+                       help='Число измеряемых циклов каждого вида (для --bench)')
+    parser.add_argument('--bench-scale', type=float, default=1.0,
+                       help='Множитель объема вечернего пика синтетических матчей')
+    parser.add_argument('--bench-seed', type=int, default=42,
+                       help='Зерно генератора синтетических матчей')
+    parser.add_argument('--bench-http-latency', type=float, default=0.05,
+                       help='Задержка ответа подмененных источников, с')
+    parser.add_argument('--bench-claude-latency', type=float, default=1.0,
+                       help='Задержка ответа фиктивного Claude, с')
+    parser.add_argument('--bench-baseline', default='bench_baseline.json',
+                       help='JSON базы для сравнения')
+    parser.add_argument('--bench-save-baseline', action='store_true',
+                       help='Сохранить результат как новую базу')
+    parser.add_argument('--bench-threshold', type=float, default=0.15,
+                       help='Допустимый рост p50/p95 относительно базы (доля)')
+
     args = parser.parse_args()
-    
+
     analyzer = SportsAnalyzer()
+    exit_code = 0
+
+    if args.profile:
+        analyzer.cycle_profiler = create_cycle_profiler(analyzer.logger, args.profile_dir)
+    elif args.profile_sample_rate > 0:
+        analyzer.cycle_profiler = create_cycle_profiler(analyzer.logger, args.profile_dir,
+                                                        sample_rate=args.profile_sample_rate)
     
     try:
-        if args.test:
+        if args.bench:
+            print(f"Бенчмарк {args.bench_cycles} циклов...")
+            exit_code = run_bench(analyzer, args)
+        elif args.profile:
+            print(f"Профилирование {args.profile_cycles} циклов...")
+            for _ in range(args.profile_cycles):
+                analyzer.run_profiled_cycle()
+            output_dir = analyzer.cycle_profiler.write_report()
+            print(f"Профиль записан в {output_dir}")
+        elif args.test:
             print("Запуск тестового цикла...")
             analyzer.run_single_cycle()
             print("Тестовый цикл завершен")
@@ -37,5 +84,31 @@ def main():
         analyzer.stop()
         print("Анализатор остановлен")
 
+    sys.exit(exit_code)
+
+def run_bench(analyzer, args) -> int:
+    """
+    Бенчмарк циклов и сравнение с базой; код возврата 1 при регрессии или ошибках циклов
+    """
+    bench = create_cycle_benchmark(analyzer, analyzer.logger, seed=args.bench_seed, scale=args.bench_scale,
+                                   http_latency=args.bench_http_latency,
+                                   claude_latency=args.bench_claude_latency)
+    report = bench.run(args.bench_cycles)
+
+    baseline = load_baseline(args.bench_baseline, analyzer.logger)
+    regressions = compare_with_baseline(report, baseline, args.bench_threshold) if baseline else None
+    failures = bench_failures(report)
+    print(format_report(report, regressions, failures))
+
+    if args.bench_save_baseline and failures:
+        print("База не сохранена: в циклах есть ошибки")
+    elif args.bench_save_baseline:
+        if save_report(report, args.bench_baseline, analyzer.logger):
+            print(f"База сохранена в {args.bench_baseline}")
+    elif baseline is None:
+        print(f"База {args.bench_baseline} не найдена (--bench-save-baseline для сохранения)")
+
+    return 1 if regressions or failures else 0
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -13,7 +13,20 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
 import logging
+import functools
+import threading
 from config import SELENIUM_OPTIONS, CHROMEDRIVER_PATH
+from utils.rate_limiter import get_global_rate_limiter
+
+def exclusive_driver(method):
+    """
+    Метод работает с self.driver: вызовы на одном экземпляре скрапера выполняются по очереди
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.driver_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class BaseScraper(ABC):
     """
@@ -24,6 +37,8 @@ class BaseScraper(ABC):
         self.logger = logger
         self.driver = None
         self.wait = None
+        # self.driver один на экземпляр: обходы страниц через него не выполняются параллельно
+        self.driver_lock = threading.Lock()
     
     def setup_driver(self) -> webdriver.Chrome:
         """
@@ -38,6 +53,13 @@ class BaseScraper(ABC):
         self.wait = WebDriverWait(self.driver, 20)  # Увеличиваем время ожидания
         return self.driver
     
+    def open_page(self, url: str):
+        """
+        Загрузка страницы в браузере с учетом общего ограничителя запросов домена
+        """
+        get_global_rate_limiter(self.logger).acquire(url)
+        self.driver.get(url)
+    
     def close_driver(self):
         """
         Закрытие WebDriver
@@ -1,7 +1,6 @@
 """
 Браузерный SofaScore скрапер для получения точно тех же данных, что видит пользователь
 """
-import time
 import re
 from typing import List, Dict, Any
 from selenium import webdriver
@@ -9,6 +8,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from utils.browser_capture import CAPTURE_PROFILES, capture_page_selenium, enable_performance_log
 
 class BrowserSofaScoreScraper:
     """
@@ -29,6 +29,8 @@ class BrowserSofaScoreScraper:
         self.chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         self.chrome_options.add_experimental_option('useAutomationExtension', False)
         self.chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        # Журнал performance для перехвата JSON ответов API страницы
+        enable_performance_log(self.chrome_options)
     
     def get_user_visible_matches(self) -> List[Dict[str, Any]]:
         """
@@ -43,12 +45,11 @@ class BrowserSofaScoreScraper:
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             # Идем на SofaScore как обычный пользователь
-            self.driver.get('https://www.sofascore.com/')
+            # Ждем live данных API (не дольше прежних 15 секунд), картинки и реклама не грузятся
+            capture_page_selenium(self.driver, 'https://www.sofascore.com/', CAPTURE_PROFILES['sofascore'],
+                                  self.logger, timeout=15)
             self.logger.info("Загружена главная SofaScore")
             
-            # Ждем полной загрузки как обычный пользователь
-            time.sleep(15)
-            
             # Получаем все текстовое содержимое страницы
             page_body = self.driver.find_element(By.TAG_NAME, 'body')
             full_text = page_body.text
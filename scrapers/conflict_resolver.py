@@ -4,10 +4,27 @@
 """
 import time
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 import logging
 
+from utils.score_parser import parse_score
+
+
+@dataclass
+class MatchState:
+    """Последнее принятое состояние матча между опросами"""
+    score: str = 'LIVE'
+    total_goals: int = 0
+    minute: int = 0
+    odds: Dict[str, Any] = field(default_factory=dict)
+    source_hashes: Dict[str, Tuple[int, ...]] = field(default_factory=dict)
+    resolved: Dict[str, Any] = field(default_factory=dict)
+    updated_at: float = field(default_factory=time.time)
+    seen_at: float = field(default_factory=time.time)
+
+
 class DataConflictResolver:
     """
     Интеллектуальная система разрешения конфликтов данных
@@ -35,6 +52,126 @@ class DataConflictResolver:
             'player_ratings': ['fotmob', 'sofascore'],
             'xg_data': ['understat']
         }
+        
+        # Таблица состояний матчей: ключ группы -> последнее принятое состояние
+        self.match_states: Dict[Any, MatchState] = {}
+        self.state_ttl = 3 * 60 * 60  # Матч без обновлений 3 часа - удаляем
+        
+        self.incremental_stats = {
+            'groups_total': 0,
+            'groups_unchanged': 0,
+            'groups_resolved': 0,
+            'score_regressions_rejected': 0,
+            'time_regressions_rejected': 0
+        }
+    
+    def _payload_hash(self, match: Dict[str, Any]) -> int:
+        """
+        Хэш значимых данных источника (без timestamp/fetch_time, которые меняются каждый опрос)
+        """
+        odds = match.get('odds') or {}
+        statistics = match.get('statistics') or {}
+        return hash((
+            match.get('score'),
+            match.get('time'),
+            tuple(sorted((k, str(v)) for k, v in odds.items())),
+            repr(sorted(statistics.items(), key=lambda item: item[0])) if statistics else None
+        ))
+    
+    def resolve_group(self, key: Any, matches: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Инкрементальное разрешение группы версий одного матча
+        
+        Если данные всех источников не изменились с прошлого опроса - возвращается
+        сохраненный результат без повторного разрешения. Новые данные проверяются
+        за O(1) по сохраненному состоянию (счет не уменьшается, время не откатывается).
+        
+        Returns:
+            Tuple[Dict, bool]: (разрешенный и валидированный матч, были ли изменения)
+        """
+        self.incremental_stats['groups_total'] += 1
+        now = time.time()
+        
+        # По источнику - отсортированные хэши его версий: порядок матчей в группе не важен
+        payloads: Dict[str, List[int]] = {}
+        for m in matches:
+            payloads.setdefault(m.get('source', 'unknown'), []).append(self._payload_hash(m))
+        source_hashes = {source: tuple(sorted(hashes)) for source, hashes in payloads.items()}
+        
+        state = self.match_states.get(key)
+        if state is not None and state.source_hashes == source_hashes:
+            state.seen_at = now
+            self.incremental_stats['groups_unchanged'] += 1
+            return state.resolved.copy(), False
+        
+        self.incremental_stats['groups_resolved'] += 1
+        
+        if len(matches) == 1:
+            resolved = matches[0].copy()
+        else:
+            resolved = self.resolve_match_conflicts(matches)
+        
+        if state is None:
+            state = MatchState()
+            self.match_states[key] = state
+        else:
+            self._apply_state_rules(state, resolved)
+        
+        resolved = self.validate_resolved_data(resolved) if len(matches) > 1 else resolved
+        
+        # Запоминаем принятое состояние
+        score = resolved.get('score', 'LIVE')
+        parsed = parse_score(score)
+        if parsed:
+            state.score = score
+            state.total_goals = parsed.total
+        time_info = resolved.get('time', '')
+        if time_info and time_info != 'LIVE':
+            state.minute = self._convert_time_to_numeric(time_info)
+        if resolved.get('odds'):
+            state.odds = resolved['odds']
+        
+        state.source_hashes = source_hashes
+        state.resolved = resolved
+        state.updated_at = now
+        state.seen_at = now
+        
+        return resolved.copy(), True
+    
+    def _apply_state_rules(self, state: MatchState, resolved: Dict[str, Any]):
+        """
+        Проверка новых данных по прошлому состоянию: счет может только увеличиваться
+        (кроме подтвержденной отмены гола), время матча не откатывается назад
+        """
+        parsed = parse_score(resolved.get('score', ''))
+        if parsed and parsed.total < state.total_goals:
+            source_priority = self.source_priorities.get(resolved.get('source', ''), 0)
+            recent = time.time() - state.updated_at < 300
+            
+            if not (recent and source_priority >= 8):
+                self.logger.debug(f"Откат счета отклонен: {state.score} → {resolved.get('score')}")
+                resolved['score'] = state.score
+                self.incremental_stats['score_regressions_rejected'] += 1
+            else:
+                self.logger.info(f"ОТМЕНА ГОЛА между опросами: {state.score} → {resolved.get('score')}")
+        
+        time_info = resolved.get('time', '')
+        if time_info and time_info != 'LIVE' and state.minute:
+            if self._convert_time_to_numeric(time_info) < state.minute - 5:
+                resolved['time'] = state.resolved.get('time', time_info)
+                self.incremental_stats['time_regressions_rejected'] += 1
+        
+        if not resolved.get('odds') and state.odds:
+            resolved['odds'] = state.odds
+    
+    def prune_states(self, max_age: Optional[float] = None) -> int:
+        """Удаление состояний матчей, которые давно не встречались"""
+        max_age = self.state_ttl if max_age is None else max_age
+        threshold = time.time() - max_age
+        stale = [key for key, state in self.match_states.items() if state.seen_at < threshold]
+        for key in stale:
+            del self.match_states[key]
+        return len(stale)
     
     def resolve_match_conflicts(self, conflicting_matches: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -201,21 +338,11 @@ class DataConflictResolver:
         НОВЫЙ: Подсчет общего количества голов в матче
         """
         try:
-            if not score or score == 'LIVE':
+            parsed = parse_score(score)
+            if not parsed:
                 return 0
             
-            # Извлекаем числа из счета
-            import re
-            numbers = re.findall(r'\d+', score)
-            
-            if len(numbers) >= 2:
-                goals1, goals2 = int(numbers[0]), int(numbers[1])
-                total = goals1 + goals2
-                
-                self.logger.debug(f"Счет {score} = {total} голов")
-                return total
-            
-            return 0
+            return parsed.total
             
         except Exception as e:
             self.logger.warning(f"Ошибка подсчета голов для счета {score}: {e}")
@@ -587,6 +714,8 @@ class DataConflictResolver:
         return {
             'source_priorities': self.source_priorities,
             'specialization': self.source_specialization,
+            'tracked_matches': len(self.match_states),
+            'incremental': self.incremental_stats,
             'resolution_strategies': [
                 'Приоритет по времени обновления',
                 'Приоритет по надежности источника',
@@ -2,7 +2,6 @@
 Точный SofaScore скрапер для извлечения актуальных live матчей
 Создан на основе анализа реальной структуры сайта
 """
-import time
 import re
 import json
 from typing import List, Dict, Any
@@ -12,6 +11,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from utils.browser_capture import CAPTURE_PROFILES, capture_page_selenium, enable_performance_log
 
 class ExactSofaScoreScraper:
     """
@@ -33,6 +33,8 @@ class ExactSofaScoreScraper:
         self.chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         self.chrome_options.add_experimental_option('useAutomationExtension', False)
         self.chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        # Журнал performance для перехвата JSON ответов API страницы
+        enable_performance_log(self.chrome_options)
     
     def get_exact_live_matches(self, sport: str = 'football') -> List[Dict[str, Any]]:
         """
@@ -47,12 +49,11 @@ class ExactSofaScoreScraper:
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             # Переходим на главную SofaScore
-            self.driver.get('https://www.sofascore.com/')
+            # Ждем live данных API вместо фиксированной паузы (таймаут - прежние 10 секунд)
+            capture_page_selenium(self.driver, 'https://www.sofascore.com/', CAPTURE_PROFILES['sofascore'],
+                                  self.logger, timeout=10)
             self.logger.info("Загружена главная страница SofaScore")
             
-            # Ждем полной загрузки с увеличенным таймаутом
-            time.sleep(10)
-            
             # Пробуем найти live матчи разными методами
             matches = []
             
@@ -92,9 +93,6 @@ class ExactSofaScoreScraper:
         try:
             self.logger.info("Поиск live матчей на главной странице")
             
-            # Ждем загрузки live контента
-            time.sleep(5)
-            
             # Современные селекторы SofaScore 2024
             current_selectors = [
                 # Основные контейнеры
@@ -154,8 +152,7 @@ class ExactSofaScoreScraper:
             live_url = f'https://www.sofascore.com/{sport}/live'
             self.logger.info(f"Переход на {live_url}")
             
-            self.driver.get(live_url)
-            time.sleep(10)  # Ждем загрузки live данных
+            capture_page_selenium(self.driver, live_url, CAPTURE_PROFILES['sofascore'], self.logger, timeout=10)
             
             # Специальные селекторы для live страницы
             live_selectors = [
@@ -223,8 +220,8 @@ class ExactSofaScoreScraper:
                         if href and ('live' in href or 'football' in href) and ('live' in text or sport in text):
                             self.logger.info(f"Найдена live ссылка: {href}")
                             
-                            self.driver.get(href)
-                            time.sleep(8)
+                            capture_page_selenium(self.driver, href, CAPTURE_PROFILES['sofascore'],
+                                                  self.logger, timeout=8)
                             
                             # Извлекаем матчи с новой страницы
                             page_matches = self._extract_from_current_page()
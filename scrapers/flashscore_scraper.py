@@ -2,7 +2,6 @@
 Скрапер для FlashScore.com - альтернативный источник данных
 Основан на анализе GitHub репозиториев FlashScore парсеров
 """
-import requests
 import json
 import re
 from typing import List, Dict, Any
@@ -13,24 +12,22 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from scrapers.base_scraper import BaseScraper
+from utils.conditional_http import create_conditional_session
 
 class FlashScoreScraper(BaseScraper):
     """
     Скрапер для FlashScore.com с методами на основе GitHub решений
     """
     
-    def __init__(self, logger):
+    def __init__(self, logger, transport=None):
         super().__init__(logger)
         self.base_url = "https://www.flashscore.com"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+        # Общий транспорт; Accept-Encoding выставляет сессия (br/zstd только при наличии декодеров)
+        self.session = create_conditional_session('flashscore', 'html_en', {'Upgrade-Insecure-Requests': '1'},
+                                                  transport=transport)
+        
+        # Сервис парсинга в пуле процессов (устанавливается агрегатором)
+        self.parse_service = None
         
         # URL паттерны для разных видов спорта
         self.sport_urls = {
@@ -80,15 +77,14 @@ class FlashScoreScraper(BaseScraper):
             if not endpoint:
                 return []
             
-            response = self.session.get(endpoint, timeout=10)
-            if response.status_code != 200:
+            # Неизменившийся фид не разбирается повторно
+            matches, response = self.session.get_parsed(
+                endpoint, lambda r: self._parse_feed_response(r, sport), timeout=10
+            )
+            if not matches:
                 return []
             
-            # FlashScore API возвращает специальный формат
-            matches = self._parse_flashscore_api_response(response.text, sport)
-            
-            if matches:
-                self.logger.info(f"FlashScore API: найдено {len(matches)} матчей {sport}")
+            self.logger.info(f"FlashScore API: найдено {len(matches)} матчей {sport}")
             
             return matches
             
@@ -96,6 +92,16 @@ class FlashScoreScraper(BaseScraper):
             self.logger.warning(f"FlashScore API ошибка: {e}")
             return []
     
+    def _parse_feed_response(self, response, sport: str) -> List[Dict[str, Any]]:
+        """
+        Разбор ответа фида (в пуле процессов, если он есть)
+        """
+        # FlashScore API возвращает специальный формат
+        if self.parse_service:
+            return self.parse_service.parse('flashscore_feed', response.content, sport,
+                                            encoding=response.encoding or 'utf-8')
+        return self._parse_flashscore_api_response(response.text, sport)
+    
     def _parse_flashscore_api_response(self, response_text: str, sport: str) -> List[Dict[str, Any]]:
         """
         Парсинг ответа FlashScore API
@@ -197,7 +203,7 @@ class FlashScoreScraper(BaseScraper):
             self.setup_driver()
             sport_url = self.sport_urls[sport]
             
-            self.driver.get(sport_url)
+            self.open_page(sport_url)
             time.sleep(2)  # Сокращено с 3 до 2 сек
             
             matches = []
@@ -373,7 +379,7 @@ class FlashScoreScraper(BaseScraper):
         """
         try:
             self.setup_driver()
-            self.driver.get(match_url)
+            self.open_page(match_url)
             time.sleep(3)
             
             details = {
@@ -5,10 +5,12 @@ from typing import List, Dict, Any
 import re
 import time
 from selenium.webdriver.common.by import By
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, exclusive_driver
+from scrapers.match_detail_collector import MatchDetailCollector
 from scrapers.improved_scraper import ImprovedScraper
 from scrapers.sofascore_simple_quality import SofaScoreSimpleQuality
 from config import FOOTBALL_FILTER, TOP_LEAGUES
+from utils.score_parser import parse_score
 
 class FootballScraper(BaseScraper):
     """
@@ -19,6 +21,8 @@ class FootballScraper(BaseScraper):
         super().__init__(logger)
         self.improved_scraper = ImprovedScraper(logger)
         self.sofascore_scraper = SofaScoreSimpleQuality(logger)
+        # Детали матча за одну загрузку страницы через общий пул браузеров
+        self.detail_collector = MatchDetailCollector(logger)
     
     def get_live_matches(self, url: str) -> List[Dict[str, Any]]:
         """
@@ -253,14 +257,9 @@ class FootballScraper(BaseScraper):
         """
         Проверка, является ли счет ничейным
         """
-        try:
-            # Парсим счет вида "1:1" или "0-0"
-            parts = re.split(r'[:-]', score)
-            if len(parts) == 2:
-                return parts[0].strip() == parts[1].strip()
-        except:
-            pass
-        return False
+        # Счет вида "1:1" или "0-0"
+        parsed = parse_score(score)
+        return bool(parsed and parsed.is_draw)
     
     def _get_league_priority(self, league: str) -> int:
         """
@@ -274,13 +273,26 @@ class FootballScraper(BaseScraper):
     def collect_match_data(self, match_url: str) -> Dict[str, Any]:
         """
         Сбор подробных данных по футбольному матчу
+        Данные вкладок берутся из API и встроенного состояния страницы за одну загрузку;
+        обход вкладок кликами остается запасным путем, если страница их не отдала
         """
         self.logger.info(f"Сбор подробных данных матча: {match_url}")
         
+        match_data = self.detail_collector.collect(match_url, 'football')
+        if match_data.get('detail_sections'):
+            return match_data
+        
+        return self._collect_match_data_by_tabs(match_url)
+    
+    @exclusive_driver
+    def _collect_match_data_by_tabs(self, match_url: str) -> Dict[str, Any]:
+        """
+        Сбор подробных данных кликами по вкладкам (запасной путь)
+        """
         try:
             self.setup_driver()
             full_url = f"https://scores24.live{match_url}" if not match_url.startswith('http') else match_url
-            self.driver.get(full_url)
+            self.open_page(full_url)
             time.sleep(3)
             
             match_data = {
@@ -2,7 +2,7 @@
 FotMob.com парсер для рейтингов команд и xG данных
 Высокий рейтинг: 8/10 для футбольных рейтингов и аналитики
 """
-import requests
+from utils.http_transport import get_global_transport
 import time
 import re
 import json
@@ -15,16 +15,11 @@ class FotMobScraper:
     Парсер для FotMob.com - рейтинги команд и xG аналитика
     """
     
-    def __init__(self, logger):
+    def __init__(self, logger, transport=None):
         self.logger = logger
         
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Connection': 'keep-alive'
-        })
+        # HTTP сессия поверх общего транспорта
+        self.session = (transport or get_global_transport(logger)).session('fotmob', 'json_en')
     
     def get_team_ratings(self, team_name: str) -> Dict[str, Any]:
         """
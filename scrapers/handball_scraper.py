@@ -5,9 +5,11 @@ from typing import List, Dict, Any, Tuple
 import re
 import time
 from selenium.webdriver.common.by import By
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, exclusive_driver
+from scrapers.match_detail_collector import MatchDetailCollector
 from scrapers.sofascore_simple_quality import SofaScoreSimpleQuality
 from config import HANDBALL_FILTER
+from utils.score_parser import parse_score
 import math
 
 class HandballScraper(BaseScraper):
@@ -18,6 +20,8 @@ class HandballScraper(BaseScraper):
     def __init__(self, logger):
         super().__init__(logger)
         self.sofascore_scraper = SofaScoreSimpleQuality(logger)
+        # Детали матча за одну загрузку страницы через общий пул браузеров
+        self.detail_collector = MatchDetailCollector(logger)
     
     def get_live_matches(self, url: str) -> List[Dict[str, Any]]:
         """
@@ -113,14 +117,8 @@ class HandballScraper(BaseScraper):
         """
         Получение разности голов
         """
-        try:
-            parts = re.split(r'[:-]', score)
-            if len(parts) == 2:
-                goals1, goals2 = int(parts[0]), int(parts[1])
-                return abs(goals1 - goals2)
-        except:
-            pass
-        return 0
+        parsed = parse_score(score)
+        return parsed.margin if parsed else 0
     
     def _is_suitable_for_totals(self, match_time: str) -> bool:
         """
@@ -146,12 +144,11 @@ class HandballScraper(BaseScraper):
         
         try:
             # Парсим счет
-            parts = re.split(r'[:-]', score)
-            if len(parts) != 2:
+            parsed = parse_score(score)
+            if not parsed:
                 return {}
             
-            goals1, goals2 = int(parts[0]), int(parts[1])
-            total_goals = goals1 + goals2
+            total_goals = parsed.total
             
             # Парсим время
             played_minutes = self._extract_played_minutes(match_time)
@@ -225,13 +222,26 @@ class HandballScraper(BaseScraper):
     def collect_match_data(self, match_url: str) -> Dict[str, Any]:
         """
         Сбор подробных данных по гандбольному матчу
+        Данные вкладок берутся из API и встроенного состояния страницы за одну загрузку;
+        обход вкладок кликами остается запасным путем, если страница их не отдала
         """
         self.logger.info(f"Сбор подробных данных гандбольного матча: {match_url}")
         
+        match_data = self.detail_collector.collect(match_url, 'handball')
+        if match_data.get('detail_sections'):
+            return match_data
+        
+        return self._collect_match_data_by_tabs(match_url)
+    
+    @exclusive_driver
+    def _collect_match_data_by_tabs(self, match_url: str) -> Dict[str, Any]:
+        """
+        Сбор подробных данных кликами по вкладкам (запасной путь)
+        """
         try:
             self.setup_driver()
             full_url = f"https://scores24.live{match_url}" if not match_url.startswith('http') else match_url
-            self.driver.get(full_url)
+            self.open_page(full_url)
             time.sleep(3)
             
             match_data = {
@@ -2,8 +2,7 @@
 HTML-only парсер для обхода JavaScript защиты
 Фокус на извлечении из чистого HTML без выполнения JS
 """
-import requests
-import time
+from utils.http_transport import get_global_transport
 import re
 from typing import List, Dict, Any
 from bs4 import BeautifulSoup
@@ -14,11 +13,11 @@ class HTMLOnlyScraper:
     Парсер работающий только с HTML (без JavaScript)
     """
     
-    def __init__(self, logger):
+    def __init__(self, logger, transport=None):
         self.logger = logger
         
-        # Сессия с ротацией заголовков
-        self.session = requests.Session()
+        # Сессия с ротацией заголовков (соединения - из общего транспорта)
+        self.session = (transport or get_global_transport(logger)).session('html_only', 'html_en')
         self.headers_pool = [
             {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -84,8 +83,6 @@ class HTMLOnlyScraper:
                                 matches.extend(html_matches)
                                 break
                         
-                        time.sleep(1)  # Задержка между запросами
-                        
                     except Exception as e:
                         self.logger.warning(f"Ошибка с {url}: {e}")
                         continue
@@ -3,12 +3,17 @@
 Комбинирует MarathonBet (коэффициенты) + SofaScore (реальные счета)
 """
 
-import requests
 import re
 import logging
 from typing import List, Dict, Any, Optional
 from bs4 import BeautifulSoup
-from scrapers.smart_team_matcher import SmartTeamMatcher
+from scrapers.live_score_feed import LiveScoreFeed
+from utils.score_parser import parse_score
+from utils.http_transport import get_global_transport
+from utils.bounded_cache import BoundedCache
+from utils.cycle_deadline import current_deadline
+from utils.hedged_requests import HedgeAttempt, HedgedFetcher
+from utils.latency_histogram import host_key
 
 
 class HybridScoreProvider:
@@ -21,8 +26,9 @@ class HybridScoreProvider:
     - Результат: полные данные для фильтрации неничейного счета
     """
     
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, transport=None, live_score_feed=None):
         self.logger = logger
+        transport = transport or get_global_transport(logger)
         
         # Источники счетов по приоритету
         self.score_sources = [
@@ -43,52 +49,72 @@ class HybridScoreProvider:
             }
         ]
         
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'ru-RU,ru;q=0.8,en-US;q=0.5,en;q=0.3'
-        }
+        # Сессия поверх общего транспорта (keep-alive вместо нового TCP+TLS на каждый запрос)
+        self.session = transport.session('hybrid_scores', 'html_ru')
         
-        # Кэш счетов для избежания повторных запросов
-        self._scores_cache = {}
+        # Кэш счетов для избежания повторных запросов (ограничен по размеру и времени жизни)
+        self._scores_cache = BoundedCache('hybrid_scores', max_entries=2000, ttl=600)
+        
+        # Общая лента live-счетов по видам спорта (одна загрузка на вид спорта за цикл)
+        self.live_score_feed = live_score_feed or LiveScoreFeed(logger, transport)
         
         # Умное сопоставление команд
-        self.smart_matcher = SmartTeamMatcher(logger)
+        self.smart_matcher = self.live_score_feed.matcher
+        
+        # Хеджирование источников: следующий запускается, если текущий не ответил за свой p90
+        # (задержки хостов записывает транспорт в общий трекер)
+        self.hedged_fetcher = HedgedFetcher(logger)
         
     def get_live_scores_from_best_source(self) -> Dict[str, str]:
         """
         Получает все live счета из лучшего доступного источника
         
+        Источники запрашиваются с хеджированием: первый корректный ответ побеждает,
+        остальные запросы отменяются
+        
         Returns:
             Dict[str, str]: Словарь {команды: счет}
         """
         
-        for source in self.score_sources:
-            try:
-                self.logger.info(f"Пробуем получить счета из {source['name']}")
-                
-                response = requests.get(source['url'], headers=self.headers, timeout=10)
-                
-                if response.status_code == 200:
-                    html_content = response.text
-                    scores = self._extract_scores_from_html(html_content, source['patterns'])
-                    
-                    if scores:
-                        self.logger.info(f"✅ {source['name']}: найдено {len(scores)} счетов")
-                        self._scores_cache = scores
-                        return scores
-                    else:
-                        self.logger.warning(f"❌ {source['name']}: счета не найдены")
-                else:
-                    self.logger.warning(f"❌ {source['name']}: HTTP {response.status_code}")
-                    
-            except Exception as e:
-                self.logger.error(f"❌ {source['name']}: ошибка {e}")
-                continue
+        attempts = [
+            HedgeAttempt(source['name'], host_key(source['url']),
+                         lambda source=source: self._fetch_source_scores(source))
+            for source in self.score_sources
+        ]
+        
+        remaining = current_deadline().remaining()
+        timeout = 30.0 if remaining is None else min(30.0, remaining)
+        result = self.hedged_fetcher.fetch(attempts, validate=bool, timeout=timeout)
+        
+        if result.ok:
+            scores = result.value
+            hedged = f", хеджей {result.hedges}" if result.hedges else ''
+            self.logger.info(f"✅ {result.winner}: найдено {len(scores)} счетов за {result.elapsed:.2f}с{hedged}")
+            self._scores_cache.clear()
+            self._scores_cache.update(scores)
+            return scores
         
         self.logger.error("❌ Ни один источник счетов не работает")
         return {}
     
+    def _fetch_source_scores(self, source: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Счета одного источника (пустой словарь - источник не дал результата)
+        """
+        
+        self.logger.info(f"Пробуем получить счета из {source['name']}")
+        
+        response = self.session.get(source['url'], timeout=10)
+        
+        if response.status_code != 200:
+            self.logger.warning(f"❌ {source['name']}: HTTP {response.status_code}")
+            return {}
+        
+        scores = self._extract_scores_from_html(response.text, source['patterns'])
+        if not scores:
+            self.logger.warning(f"❌ {source['name']}: счета не найдены")
+        return scores
+    
     def _extract_scores_from_html(self, html_content: str, patterns: List[str]) -> Dict[str, str]:
         """
         Извлекает счета из HTML используя паттерны
@@ -123,7 +149,8 @@ class HybridScoreProvider:
             
         return scores_dict
     
-    def enrich_marathonbet_matches_with_real_scores(self, marathonbet_matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def enrich_marathonbet_matches_with_real_scores(self, marathonbet_matches: List[Dict[str, Any]],
+                                                   sport: str = 'football') -> List[Dict[str, Any]]:
         """
         БЕЗОПАСНЫЙ МЕТОД: Консервативный подход к обогащению матчей
         
@@ -131,6 +158,7 @@ class HybridScoreProvider:
         
         Args:
             marathonbet_matches: Матчи от MarathonBet с коэффициентами но LIVE счетами
+            sport: вид спорта (счета берутся из ленты этого вида)
             
         Returns:
             List[Dict[str, Any]]: Только матчи с проверенными реальными счетами
@@ -140,7 +168,7 @@ class HybridScoreProvider:
         
         # Сначала пытаемся умное сопоставление
         try:
-            sofascore_matches = self.smart_matcher.get_sofascore_matches_with_teams()
+            sofascore_matches = self.live_score_feed.get_matches(sport)
             
             if sofascore_matches:
                 self.logger.info(f"✅ SofaScore: получено {len(sofascore_matches)} матчей")
@@ -172,18 +200,14 @@ class HybridScoreProvider:
         
         real_score_matches = []
         for match in marathonbet_matches:
-            score = match.get('score', 'LIVE')
+            score = parse_score(match.get('score', 'LIVE'))
             
-            # Принимаем только матчи с реальными (не LIVE) счетами
-            if score != 'LIVE' and ':' in score and score != '0:0':
-                try:
-                    home, away = map(int, score.split(':'))
-                    if 0 <= home <= 10 and 0 <= away <= 10:  # Разумные счета
-                        match['score_source'] = 'marathonbet_verified'
-                        match['quality_level'] = 'high'
-                        real_score_matches.append(match)
-                except ValueError:
-                    continue
+            # Принимаем только матчи с реальными (не LIVE и не 0:0) счетами
+            if score and not score.is_goalless:
+                if score.home <= 10 and score.away <= 10:  # Разумные счета
+                    match['score_source'] = 'marathonbet_verified'
+                    match['quality_level'] = 'high'
+                    real_score_matches.append(match)
         
         self.logger.info(f"✅ Консервативный режим: {len(real_score_matches)} проверенных матчей")
         
@@ -223,7 +247,8 @@ class HybridScoreProvider:
                 'draw_scores': draw_count,
                 'non_draw_percentage': (non_draw_count / cached_scores * 100) if cached_scores > 0 else 0,
                 'cache_status': 'active',
-                'best_source': self.score_sources[0]['name'] if self.score_sources else 'unknown'
+                'best_source': self.score_sources[0]['name'] if self.score_sources else 'unknown',
+                'hedging': self.hedged_fetcher.get_stats()
             }
         else:
             return {
@@ -232,7 +257,8 @@ class HybridScoreProvider:
                 'draw_scores': 0,
                 'non_draw_percentage': 0,
                 'cache_status': 'empty',
-                'best_source': 'none'
+                'best_source': 'none',
+                'hedging': self.hedged_fetcher.get_stats()
             }
 
 
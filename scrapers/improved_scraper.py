@@ -1,7 +1,7 @@
 """
 Улучшенный скрапер с альтернативными методами
 """
-import requests
+from utils.http_transport import USER_AGENTS, get_global_transport
 import time
 import re
 import json
@@ -19,13 +19,12 @@ class ImprovedScraper:
     Улучшенный скрапер с несколькими методами получения данных
     """
     
-    def __init__(self, logger):
+    def __init__(self, logger, transport=None):
         self.logger = logger
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.7339.80 Safari/537.36',
+        # HTTP сессия поверх общего транспорта
+        self.session = (transport or get_global_transport(logger)).session('improved', 'html_ru', {
+            'User-Agent': USER_AGENTS['chrome_linux'],
             'Accept': 'application/json, text/html, */*',
-            'Accept-Language': 'ru-RU,ru;q=0.9,en;q=0.8',
             'Cache-Control': 'no-cache'
         })
     
@@ -8,6 +8,8 @@ from typing import Dict, List, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from utils.league_classifier import CompiledLeagueClassifier
+
 class LeaguePriority(Enum):
     """Приоритеты лиг"""
     TOP = 1        # Топ-лиги (РПЛ, АПЛ, Ла Лига, etc)
@@ -33,6 +35,7 @@ class LeaguePrioritizer:
     
     def __init__(self):
         self.league_patterns = self._initialize_league_patterns()
+        self.classifier = self._build_classifier()
         self.priority_limits = {
             LeaguePriority.TOP: 25,       # До 25 матчей из топ-лиг
             LeaguePriority.EUROPEAN: 15,  # До 15 из европейских
@@ -150,6 +153,19 @@ class LeaguePrioritizer:
         
         return patterns
     
+    def _build_classifier(self) -> CompiledLeagueClassifier:
+        """Один классификатор по всем ключевым словам в порядке приоритетов"""
+        rules = []
+        for priority in [LeaguePriority.TOP, LeaguePriority.EUROPEAN, 
+                        LeaguePriority.MAJOR, LeaguePriority.REGIONAL, 
+                        LeaguePriority.MINOR]:
+            for league_info in self.league_patterns.get(priority, []):
+                keywords = [keyword.lower() for keyword in league_info.keywords]
+                rules.append(((priority, league_info.name), keywords))
+        
+        return CompiledLeagueClassifier(rules, default=(LeaguePriority.MINOR, "Неизвестная лига"),
+                                        flags=0, literal=True)
+    
     def determine_league_priority(self, match_info: Dict[str, Any]) -> Tuple[LeaguePriority, str]:
         """
         Определяет приоритет матча на основе информации о лиге
@@ -161,24 +177,18 @@ class LeaguePrioritizer:
             Tuple[LeaguePriority, str]: Приоритет и название лиги
         """
         league_text = str(match_info.get('league', '')).lower()
-        team1 = str(match_info.get('team1', '')).lower()
-        team2 = str(match_info.get('team2', '')).lower()
         
-        # Объединяем весь текст для анализа
-        full_text = f"{league_text} {team1} {team2}".lower()
+        # Проверяем по приоритетам (от высокого к низкому) одним проходом. Кэш - по строке
+        # лиги: она повторяется у многих матчей и между опросами, пары команд - нет
+        result = self.classifier.classify(league_text)
+        if result != self.classifier.default:
+            return result
         
-        # Проверяем по приоритетам (от высокого к низкому)
-        for priority in [LeaguePriority.TOP, LeaguePriority.EUROPEAN, 
-                        LeaguePriority.MAJOR, LeaguePriority.REGIONAL, 
-                        LeaguePriority.MINOR]:
-            
-            for league_info in self.league_patterns.get(priority, []):
-                for keyword in league_info.keywords:
-                    if keyword.lower() in full_text:
-                        return priority, league_info.name
-        
-        # Если не найдено - минимальный приоритет
-        return LeaguePriority.MINOR, "Неизвестная лига"
+        # Лига не распознана - ищем ключевые слова в названиях команд (без кэша);
+        # если не найдено - минимальный приоритет
+        team1 = str(match_info.get('team1', '')).lower()
+        team2 = str(match_info.get('team2', '')).lower()
+        return self.classifier.classify_uncached(f"{league_text} {team1} {team2}")
     
     def should_include_match(self, match_info: Dict[str, Any], 
                            priority_counts: Dict[LeaguePriority, int]) -> Tuple[bool, str]:
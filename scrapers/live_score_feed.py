@@ -0,0 +1,217 @@
+"""
+Лента live-счетов по видам спорта в пределах цикла
+Страница счетов каждого вида спорта загружается один раз за цикл (параллельно для всех
+видов), полные записи live-матчей SofaScore (url, лига, id) - при первом поиске.
+Записи индексируются по нормализованной паре команд с сохранением порядка хозяев и
+гостей - гибридный провайдер, пайплайн статистики и обогатитель MarathonBet читают
+из одной ленты
+"""
+
+import time
+import threading
+import logging
+from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from scrapers.smart_team_matcher import SmartTeamMatcher
+
+# Виды данных ленты: счета страницы livescore и полные записи матчей SofaScore
+SCORES = 'scores'
+RECORDS = 'records'
+
+# Страницы live-счетов SofaScore по видам спорта
+LIVESCORE_URLS = {
+    'football': 'https://www.sofascore.com/football/livescore',
+    'tennis': 'https://www.sofascore.com/tennis/livescore',
+    'table_tennis': 'https://www.sofascore.com/table-tennis/livescore',
+    'handball': 'https://www.sofascore.com/handball/livescore',
+}
+
+
+@dataclass
+class FeedSnapshot:
+    """Данные одного вида спорта за один цикл"""
+    sport: str
+    cycle_id: int
+    kind: str = SCORES
+    matches: List[Dict[str, Any]] = field(default_factory=list)
+    # Пара команд без учета порядка -> (запись, нормализованное имя ее первой команды)
+    index: Dict[Tuple[str, str], Tuple[Dict[str, Any], str]] = field(default_factory=dict)
+    fetched_at: float = field(default_factory=time.time)
+
+
+class LiveScoreFeed:
+    """
+    Общая лента live-счетов: одна загрузка на вид спорта за цикл
+    """
+
+    def __init__(self, logger: logging.Logger, transport=None, max_age: float = 120.0, max_workers: int = 4,
+                 records_source: Optional[Callable[[str], List[Dict[str, Any]]]] = None):
+        """
+        Args:
+            records_source: полные записи live-матчей SofaScore по виду спорта; по ним
+                ищет find() (без источника - по счетам страницы livescore)
+        """
+        self.logger = logger
+        self.matcher = SmartTeamMatcher(logger, transport)
+        self.records_source = records_source
+        self.max_age = max_age  # Защита от устаревания, если циклы не отмечаются
+
+        self._cycle_id = 0
+        self._snapshots: Dict[Tuple[str, str], FeedSnapshot] = {}
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='livescore')
+
+        self.stats = {
+            'fetches': 0,
+            'failed_fetches': 0,
+            'reads': 0,
+            'index_hits': 0,
+            'reversed_hits': 0,
+            'scan_hits': 0
+        }
+
+    # ---- цикл ----
+
+    def begin_cycle(self, sports: Optional[Iterable[str]] = None) -> int:
+        """
+        Начало нового цикла: прошлые снимки устаревают, загрузка счетов
+        указанных видов спорта запускается параллельно в фоне
+        """
+        with self._lock:
+            self._cycle_id += 1
+            cycle_id = self._cycle_id
+
+        for sport in sports or ():
+            self._schedule(sport)
+
+        return cycle_id
+
+    def _is_current(self, snapshot: Optional[FeedSnapshot]) -> bool:
+        return (snapshot is not None and snapshot.cycle_id == self._cycle_id
+                and time.time() - snapshot.fetched_at < self.max_age)
+
+    def _schedule(self, sport: str, kind: str = SCORES) -> Optional[Future]:
+        """Запуск загрузки (не более одной одновременной на вид спорта и вид данных)"""
+        if sport not in LIVESCORE_URLS:
+            return None
+
+        key = (kind, sport)
+        with self._lock:
+            if self._is_current(self._snapshots.get(key)):
+                return None
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self._fetch, sport, kind, self._cycle_id)
+                self._inflight[key] = future
+            return future
+
+    def _fetch(self, sport: str, kind: str, cycle_id: int) -> FeedSnapshot:
+        started = time.perf_counter()
+        snapshot = FeedSnapshot(sport=sport, cycle_id=cycle_id, kind=kind)
+
+        try:
+            if kind == RECORDS:
+                matches = self.records_source(sport) or []
+            else:
+                matches = self.matcher.get_sofascore_matches_with_teams(sport)
+
+            normalize = self.matcher._normalize_team_name
+            for match in matches:
+                match.setdefault('sport', sport)
+                team1, team2 = self._teams(match)
+                snapshot.index.setdefault(self.pair_key(team1, team2), (match, normalize(team1)))
+            snapshot.matches = matches
+            self.stats['fetches'] += 1
+
+            self.logger.info(f"📡 Лента {kind} {sport}: {len(matches)} матчей за {time.perf_counter() - started:.2f}с")
+        except Exception as e:
+            self.stats['failed_fetches'] += 1
+            self.logger.warning(f"Лента {kind} {sport} ошибка: {e}")
+
+        with self._lock:
+            self._snapshots[(kind, sport)] = snapshot
+            self._inflight.pop((kind, sport), None)
+
+        return snapshot
+
+    @staticmethod
+    def _teams(match: Dict[str, Any]) -> Tuple[str, str]:
+        """Участники записи (в теннисных записях SofaScore - player1/player2)"""
+        return (match.get('team1') or match.get('player1') or '',
+                match.get('team2') or match.get('player2') or '')
+
+    # ---- чтение ----
+
+    def pair_key(self, team1: str, team2: str) -> Tuple[str, str]:
+        """Ключ индекса: нормализованная пара команд без учета порядка"""
+        normalize = self.matcher._normalize_team_name
+        return tuple(sorted((normalize(team1), normalize(team2))))
+
+    def _current_snapshot(self, sport: str, kind: str) -> Optional[FeedSnapshot]:
+        """Снимок текущего цикла (загрузка только при первом обращении)"""
+        snapshot = self._snapshots.get((kind, sport))
+        if not self._is_current(snapshot):
+            future = self._schedule(sport, kind)
+            if future is not None:
+                snapshot = future.result()
+            else:
+                snapshot = self._snapshots.get((kind, sport))
+        return snapshot
+
+    def get_matches(self, sport: str) -> List[Dict[str, Any]]:
+        """Счета вида спорта текущего цикла со страницы livescore"""
+        self.stats['reads'] += 1
+        snapshot = self._current_snapshot(sport, SCORES)
+        return snapshot.matches if snapshot else []
+
+    def get_records(self, sport: str) -> List[Dict[str, Any]]:
+        """Полные записи live-матчей SofaScore текущего цикла (без источника записей - счета)"""
+        if self.records_source is None:
+            return self.get_matches(sport)
+        self.stats['reads'] += 1
+        snapshot = self._current_snapshot(sport, RECORDS)
+        return snapshot.matches if snapshot else []
+
+    def find(self, team1: str, team2: str, sport: str,
+             predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Поиск полной записи матча: сначала O(1) по индексу пары, затем (если задан
+        predicate) нечеткий проход по уже загруженным записям без сетевых запросов
+
+        Запись индекса с обратным порядком команд (team1 записи - это team2 запроса)
+        не возвращается: счет и статистика в ней читались бы в обратную сторону.
+        Такие матчи находит только predicate, который сам решает, допустим ли обратный порядок
+        """
+        matches = self.get_records(sport)
+        snapshot = self._snapshots.get((RECORDS if self.records_source is not None else SCORES, sport))
+
+        if snapshot is not None:
+            entry = snapshot.index.get(self.pair_key(team1, team2))
+            if entry is not None:
+                match, first_team = entry
+                if first_team == self.matcher._normalize_team_name(team1):
+                    self.stats['index_hits'] += 1
+                    return match
+                self.stats['reversed_hits'] += 1
+
+        if predicate is not None:
+            for match in matches:
+                if predicate(match):
+                    self.stats['scan_hits'] += 1
+                    return match
+
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'cycle_id': self._cycle_id,
+            'sports': {f"{kind}:{sport}": len(snapshot.matches)
+                       for (kind, sport), snapshot in self._snapshots.items()}
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
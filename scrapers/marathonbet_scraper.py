@@ -3,7 +3,6 @@ MarathonBet парсер для live спортивных данных с коэ
 УЛУЧШЕННАЯ ВЕРСИЯ: поддержка футбола, тенниса, настольного тенниса, гандбола
 Высокий потенциал: 157 матчей, 418 коэффициентов
 """
-import requests
 import time
 import re
 from typing import List, Dict, Any
@@ -14,24 +13,48 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 from datetime import datetime
+from utils.match_batch import create_match_batch
+from utils.score_parser import parse_score
+from utils.conditional_http import create_conditional_session
+from utils.html_fragments import IncrementalPageExtractor
+from utils.rate_limiter import get_global_rate_limiter
+from utils.session_state import get_global_session_state
+
+# Стратегии извлечения в порядке полного разбора: дедупликация оставляет первый найденный
+# матч, поэтому инкрементальный разбор упорядочивает матчи так же
+EXTRACTION_SOURCES = ('marathonbet_json', 'marathonbet_enhanced', 'marathonbet_structural', 'marathonbet_pattern')
 
 class MarathonBetScraper:
     """
     Парсер для MarathonBet.ru - букмекерские данные с коэффициентами
     """
     
-    def __init__(self, logger):
+    def __init__(self, logger, transport=None):
         self.logger = logger
         
-        # HTTP сессия
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ru-RU,ru;q=0.9,en;q=0.8',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'no-cache'
-        })
+        # HTTP сессия поверх общего транспорта (условные запросы + кэш разобранных страниц)
+        self.session = create_conditional_session('marathonbet', 'html_ru', {'Cache-Control': 'no-cache'},
+                                                  transport=transport)
+        
+        # Куки и User-Agent, полученные браузером, переиспользуются HTTP сессией
+        self.session_state = get_global_session_state(logger)
+        self.session_state.apply('marathonbet', self.session)
+        
+        # Сервис парсинга в пуле процессов (устанавливается агрегатором)
+        self.parse_service = None
+        
+        # Инкрементальный разбор: между опросами заново разбираются только изменившиеся события
+        self.incremental_parsing = True
+        self.fragment_extractor = IncrementalPageExtractor()
+        
+        # Каждый N-й инкрементальный разбор страницы сверяется с полным
+        self.full_parse_interval = 10
+        self._incremental_polls: Dict[str, int] = {}
+        self.incremental_stats = {'verified': 0, 'mismatches': 0}
+        
+        # Приоритизатор лиг создается один раз: скомпилированные правила и кэш классификации
+        # переживают опросы
+        self.league_prioritizer = None
         
         # Chrome настройки для обхода CAPTCHA
         self.chrome_options = Options()
@@ -122,9 +145,11 @@ class MarathonBetScraper:
         Приоритизация матчей БЕЗ жестких лимитов - качество данных важнее скорости
         """
         try:
-            from .league_prioritizer import LeaguePrioritizer
+            if self.league_prioritizer is None:
+                from .league_prioritizer import LeaguePrioritizer
+                self.league_prioritizer = LeaguePrioritizer()
             
-            prioritizer = LeaguePrioritizer()
+            prioritizer = self.league_prioritizer
             
             # УВЕЛИЧЕННЫЕ ЛИМИТЫ для максимального покрытия (45-минутный цикл позволяет)
             max_matches_by_sport = {
@@ -167,14 +192,18 @@ class MarathonBetScraper:
         ОПТИМИЗИРОВАННОЕ получение матчей с конкретного URL
         """
         try:
-            # БЫСТРЫЙ HTTP с сокращенным таймаутом
-            response = self.session.get(url, timeout=8)
+            # БЫСТРЫЙ HTTP с сокращенным таймаутом (неизменная страница не разбирается повторно)
+            matches, response = self.session.get_parsed(
+                url, lambda r: self._parse_enhanced_response(r, url, sport), variant=sport,
+                validate=lambda r: 'captcha' not in r.text.lower(), timeout=8
+            )
             
-            if response.status_code == 200 and 'captcha' not in response.text.lower():
-                matches = self._extract_enhanced_matches_from_html(response.text, url, sport)
-                if matches and len(matches) >= 10:  # Достаточно данных
-                    self.logger.info(f"MarathonBet HTTP успех: {len(matches)} матчей за быстрый запрос")
-                    return matches
+            if self.session_state.is_rejected(response):
+                self.session_state.reject('marathonbet', self.session)
+            
+            if matches and len(matches) >= 10:  # Достаточно данных
+                self.logger.info(f"MarathonBet HTTP успех: {len(matches)} матчей за быстрый запрос")
+                return matches
             
             # Если HTTP не дал достаточно данных, используем браузер
             return self._get_enhanced_via_browser_url(url, sport)
@@ -183,6 +212,95 @@ class MarathonBetScraper:
             self.logger.warning(f"MarathonBet enhanced {url} ошибка: {e}")
             return []
     
+    def _parse_enhanced_response(self, response, url: str, sport: str) -> List[Dict[str, Any]]:
+        """
+        Разбор HTTP ответа (в пуле процессов, если он есть)
+        """
+        if self.incremental_parsing:
+            matches = self._extract_incremental(response, url, sport)
+            if matches is not None:
+                return matches
+        
+        return self._parse_full_response(response, url, sport)
+    
+    def _parse_full_response(self, response, url: str, sport: str) -> List[Dict[str, Any]]:
+        """
+        Полный разбор страницы
+        """
+        if self.parse_service:
+            return self.parse_service.parse('marathonbet', response.content, url, sport,
+                                            encoding=response.encoding or 'utf-8')
+        return self._extract_enhanced_matches_from_html(response.text, url, sport)
+    
+    def _extract_incremental(self, response, source_url: str, sport: str) -> List[Dict[str, Any]]:
+        """
+        Инкрементальное извлечение по фрагментам data-event-id (None - нужен полный разбор)
+        
+        Фрагменты и остаток страницы разбираются всеми стратегиями полного разбора;
+        изменившиеся части при наличии пула разбираются в нем параллельно
+        """
+        page_key = f"{source_url}|{sport}"
+        parse_part = lambda part: self._extract_all_strategies(part, source_url, sport)
+        parse_batch = None
+        if self.parse_service:
+            parse_batch = lambda parts: self.parse_service.parse_many('marathonbet_fragment', parts,
+                                                                      source_url, sport)
+        
+        try:
+            matches = self.fragment_extractor.extract(page_key, response.text, parse_part, parse_part,
+                                                      parse_batch=parse_batch)
+            if matches is None:
+                return None
+            
+            matches.sort(key=self._strategy_rank)
+            matches = self._deduplicate_and_enhance_matches(matches)
+            
+        except Exception as e:
+            self.logger.warning(f"MarathonBet инкрементальное извлечение ошибка: {e}")
+            return None
+        
+        polls = self._incremental_polls.get(page_key, 0) + 1
+        self._incremental_polls[page_key] = polls
+        if self.full_parse_interval and polls % self.full_parse_interval == 0:
+            return self._verify_incremental(page_key, matches, response, source_url, sport)
+        
+        return matches
+    
+    def _verify_incremental(self, page_key: str, matches: List[Dict[str, Any]], response,
+                            source_url: str, sport: str) -> List[Dict[str, Any]]:
+        """
+        Сверка инкрементального результата с полным разбором той же страницы
+        
+        При расхождении состояние фрагментов страницы сбрасывается и возвращается полный результат
+        """
+        full_matches = self._parse_full_response(response, source_url, sport)
+        if not full_matches and matches:
+            # Пустой полный разбор (таймаут пула) сверке не подлежит
+            return matches
+        
+        self.incremental_stats['verified'] += 1
+        if self._match_signatures(full_matches) == self._match_signatures(matches):
+            return matches
+        
+        self.incremental_stats['mismatches'] += 1
+        self.logger.warning(f"MarathonBet {source_url}: инкрементальный разбор расходится с полным "
+                            f"({len(matches)} против {len(full_matches)} матчей), состояние фрагментов сброшено")
+        self.fragment_extractor.reset(page_key)
+        return full_matches
+    
+    @staticmethod
+    def _strategy_rank(match: Dict[str, Any]) -> int:
+        source = match.get('source')
+        return EXTRACTION_SOURCES.index(source) if source in EXTRACTION_SOURCES else len(EXTRACTION_SOURCES)
+    
+    @staticmethod
+    def _match_signatures(matches: List[Dict[str, Any]]) -> List[tuple]:
+        """Содержимое матчей без меток времени, независимо от порядка"""
+        return sorted(
+            tuple(sorted((key, str(value)) for key, value in match.items() if key != 'timestamp'))
+            for match in matches
+        )
+    
     def _get_enhanced_via_browser_url(self, url: str, sport: str) -> List[Dict[str, Any]]:
         """
         УЛУЧШЕННЫЙ браузерный метод для конкретного URL
@@ -195,6 +313,7 @@ class MarathonBetScraper:
             # Убираем признаки автоматизации
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
+            get_global_rate_limiter(self.logger).acquire(url)
             driver.get(url)
             
             # ОПТИМИЗИРОВАННОЕ ожидание загрузки
@@ -205,6 +324,8 @@ class MarathonBetScraper:
             # ОПТИМИЗИРОВАННОЕ ожидание для AJAX загрузки
             time.sleep(3)
             
+            self.session_state.capture('marathonbet', 'marathonbet.ru', driver, self.session)
+            
             page_source = driver.page_source
             matches = self._extract_enhanced_matches_from_html(page_source, url, sport)
             
@@ -221,22 +342,8 @@ class MarathonBetScraper:
         """
         УЛУЧШЕННОЕ извлечение матчей из HTML с лучшим алгоритмом коэффициентов
         """
-        matches = []
-        
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 1. УЛУЧШЕННЫЙ поиск через JSON данные
-            matches.extend(self._extract_from_json_data(html_content, sport))
-            
-            # 2. УЛУЧШЕННЫЙ поиск через data-атрибуты
-            matches.extend(self._extract_from_data_attributes(soup, sport))
-            
-            # 3. УЛУЧШЕННЫЙ поиск через структурные селекторы
-            matches.extend(self._extract_from_structural_selectors(soup, sport))
-            
-            # 4. Классический поиск по паттернам (как резерв)
-            matches.extend(self._extract_by_patterns(html_content, source_url, sport))
+            matches = self._extract_all_strategies(html_content, source_url, sport)
             
             # Убираем дубли и обогащаем данные
             unique_matches = self._deduplicate_and_enhance_matches(matches)
@@ -247,6 +354,26 @@ class MarathonBetScraper:
             self.logger.warning(f"MarathonBet enhanced извлечение ошибка: {e}")
             return []
     
+    def _extract_all_strategies(self, html_content: str, source_url: str, sport: str) -> List[Dict[str, Any]]:
+        """
+        Матчи всех стратегий извлечения до дедупликации (страница, фрагмент события или остаток страницы)
+        """
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        # 1. УЛУЧШЕННЫЙ поиск через JSON данные
+        matches = self._extract_from_json_data(html_content, sport)
+        
+        # 2. УЛУЧШЕННЫЙ поиск через data-атрибуты
+        matches.extend(self._extract_from_data_attributes(soup, sport))
+        
+        # 3. УЛУЧШЕННЫЙ поиск через структурные селекторы
+        matches.extend(self._extract_from_structural_selectors(soup, sport))
+        
+        # 4. Классический поиск по паттернам (как резерв)
+        matches.extend(self._extract_by_patterns(html_content, source_url, sport))
+        
+        return matches
+    
     def _extract_from_json_data(self, html_content: str, sport: str) -> List[Dict[str, Any]]:
         """
         НОВЫЙ: Извлечение из JSON данных в <script> тегах
@@ -780,6 +907,7 @@ class MarathonBetScraper:
             # Убираем признаки автоматизации
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
+            get_global_rate_limiter(self.logger).acquire(url)
             driver.get(url)
             
             # ОПТИМИЗИРОВАННОЕ ожидание загрузки
@@ -790,6 +918,8 @@ class MarathonBetScraper:
             # Дополнительное ожидание для AJAX загрузки
             time.sleep(10)
             
+            self.session_state.capture('marathonbet', 'marathonbet.ru', driver, self.session)
+            
             page_source = driver.page_source
             matches = self._extract_matches_from_html(page_source, url)
             
@@ -1352,6 +1482,21 @@ class MarathonBetScraper:
         """
         filtered_matches = []
         
+        # Векторизованный путь: счета разобраны один раз в колонки пакета
+        batch = create_match_batch(matches)
+        if batch is not None:
+            for i, leader, difference in batch.non_draw_rows():
+                match = matches[i]
+                match['is_non_draw'] = True
+                match['leading_team'] = leader
+                match['score_difference'] = difference
+                match['sport_type'] = sport
+                match['philosophy_compliant'] = True
+                filtered_matches.append(match)
+            
+            self.logger.info(f"MarathonBet {sport} фильтрация: {len(filtered_matches)} неничейных из {len(matches)} всего")
+            return filtered_matches
+        
         for match in matches:
             score = match.get('score', 'LIVE')
             
@@ -1410,58 +1555,34 @@ class MarathonBetScraper:
     
     def _analyze_football_score(self, score: str) -> tuple[bool, dict]:
         """Анализ футбольного счета: 1:0, 2:1, etc"""
-        if ':' in score:
-            home, away = map(int, score.split(':'))
-            if home != away:
-                return True, {
-                    'leader': 'home' if home > away else 'away',
-                    'difference': abs(home - away),
-                    'home_score': home,
-                    'away_score': away
-                }
+        parsed = parse_score(score)
+        if parsed and not parsed.is_draw:
+            return True, {
+                'leader': parsed.leader,
+                'difference': parsed.margin,
+                'home_score': parsed.home,
+                'away_score': parsed.away
+            }
         return False, {}
     
     def _analyze_tennis_score(self, score: str) -> tuple[bool, dict]:
         """Анализ теннисного счета: 2:1, 1:0 или 2:1 (6:4)"""
-        # Извлекаем счет по сетам (первая часть)
-        sets_score = score.split('(')[0].strip()  # 2:1 из "2:1 (6:4)"
-        
-        if ':' in sets_score:
-            home_sets, away_sets = map(int, sets_score.split(':'))
-            if home_sets != away_sets:
-                return True, {
-                    'leader': 'home' if home_sets > away_sets else 'away',
-                    'difference': abs(home_sets - away_sets),
-                    'home_sets': home_sets,
-                    'away_sets': away_sets
-                }
+        # Счет по сетам - основная пара ("2:1" из "2:1 (6:4)")
+        parsed = parse_score(score)
+        if parsed and not parsed.is_draw:
+            return True, {
+                'leader': parsed.leader,
+                'difference': parsed.margin,
+                'home_sets': parsed.home,
+                'away_sets': parsed.away
+            }
         return False, {}
     
     def _analyze_table_tennis_score(self, score: str) -> tuple[bool, dict]:
         """Анализ счета настольного тенниса: 2:0, 1:2 или 2:0 (11:8)"""
         # Аналогично теннису - анализируем сеты
-        sets_score = score.split('(')[0].strip()
-        
-        if ':' in sets_score:
-            home_sets, away_sets = map(int, sets_score.split(':'))
-            if home_sets != away_sets:
-                return True, {
-                    'leader': 'home' if home_sets > away_sets else 'away',
-                    'difference': abs(home_sets - away_sets),
-                    'home_sets': home_sets,
-                    'away_sets': away_sets
-                }
-        return False, {}
+        return self._analyze_tennis_score(score)
     
     def _analyze_handball_score(self, score: str) -> tuple[bool, dict]:
         """Анализ гандбольного счета: 15:12, 8:10, etc"""
-        if ':' in score:
-            home, away = map(int, score.split(':'))
-            if home != away:
-                return True, {
-                    'leader': 'home' if home > away else 'away',
-                    'difference': abs(home - away),
-                    'home_score': home,
-                    'away_score': away
-                }
-        return False, {}
\ No newline at end of file
+        return self._analyze_football_score(score)
\ No newline at end of file
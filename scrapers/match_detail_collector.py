@@ -0,0 +1,146 @@
+"""
+Сбор детальных данных матча Scores24 за одну загрузку страницы
+Вкладки страницы матча (прогноз, тренды, H2H, коэффициенты, таблица, результаты)
+берут данные из API и встроенного состояния страницы. Вместо кликов по вкладкам с
+паузами страница загружается один раз в режиме захвата: перехватываются ответы
+эндпоинтов разделов этого события, встроенное состояние читается из window.
+Разделы сопоставляются и приводятся к прежнему формату в match_detail_sections.
+Браузеры берутся из общего пула, поэтому несколько матчей собираются одновременно
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from selenium.webdriver.common.by import By
+
+from scrapers.match_detail_sections import (
+    build_sections, endpoint_patterns, event_key, find_event_node
+)
+from utils.browser_capture import CAPTURE_PROFILES, capture_page_selenium
+from utils.browser_pool import BrowserPool, get_global_browser_pool
+
+# Основная информация - из DOM загруженной страницы (поле -> селектор)
+MAIN_INFO_SELECTORS = {
+    'football': {'score': "[data-testid='match-score']", 'time': "[data-testid='match-time']",
+                 'league': "[data-testid='league-name']"},
+    'tennis': {'sets_score': "[data-testid='sets-score']", 'current_set': "[data-testid='current-set']",
+               'tournament': "[data-testid='tournament-name']"},
+    'handball': {'score': "[data-testid='match-score']", 'time': "[data-testid='match-time']",
+                 'league': "[data-testid='league-name']"},
+}
+
+PARTICIPANT_SELECTORS = {
+    'football': ("[data-testid='team-name']", 'team'),
+    'tennis': ("[data-testid='player-name']", 'player'),
+    'handball': ("[data-testid='team-name']", 'team'),
+}
+
+# Встроенное состояние страницы (Next.js / Nuxt / Apollo)
+EMBEDDED_STATE_SCRIPT = """
+try {
+    var state = window.__NEXT_DATA__ || window.__NUXT__ || window.__APOLLO_STATE__ || window.__INITIAL_STATE__;
+    return state ? JSON.stringify(state) : null;
+} catch (e) { return null; }
+"""
+
+class MatchDetailCollector:
+    """
+    Детальные данные матчей Scores24 через пул браузеров и режим захвата
+    """
+
+    def __init__(self, logger: logging.Logger, pool: Optional[BrowserPool] = None,
+                 base_url: str = 'https://scores24.live', acquire_timeout: float = 60.0):
+        """
+        Args:
+            pool: пул браузеров (по умолчанию - общий пул процесса)
+            acquire_timeout: ожидание свободного браузера, с
+        """
+        self.logger = logger
+        self.pool = pool or get_global_browser_pool(logger)
+        self.base_url = base_url
+        self.acquire_timeout = acquire_timeout
+        self.profile = CAPTURE_PROFILES['scores24']
+
+    def full_url(self, match_url: str) -> str:
+        return match_url if match_url.startswith('http') else f"{self.base_url}{match_url}"
+
+    def collect(self, match_url: str, sport: str) -> Dict[str, Any]:
+        """
+        Детальные данные одного матча
+
+        Returns:
+            Dict: основная информация и разделы вида спорта; в 'detail_sections' -
+            разделы, найденные на странице (пустой список - данных вкладок нет)
+        """
+        match_data = {'url': match_url, 'sport': sport, 'detail_sections': []}
+        event = event_key(match_url)
+
+        # Ждем ответов эндпоинтов разделов именно этого события
+        patterns = endpoint_patterns(sport, event)
+        profile = replace(self.profile, capture_patterns=self.profile.capture_patterns + patterns,
+                          expected_patterns=patterns)
+
+        def embedded_ready() -> bool:
+            # Все разделы уже во встроенном состоянии (SSR) - ответов API можно не ждать
+            embedded = self._read_embedded_state(driver)
+            node = find_event_node(embedded, event) if embedded is not None else None
+            return node is not None and len(build_sections([], node, match_url, sport)[1]) == len(patterns)
+
+        try:
+            with self.pool.driver(timeout=self.acquire_timeout) as driver:
+                capture = capture_page_selenium(driver, self.full_url(match_url), profile, self.logger,
+                                                ready=embedded_ready)
+                embedded = self._read_embedded_state(driver)
+                match_data.update(self._collect_main_info(driver, sport))
+        except Exception as e:
+            self.logger.warning(f"Ошибка загрузки страницы матча {match_url}: {e}")
+            match_data['error'] = str(e)
+            return match_data
+
+        sections, found = build_sections(capture.payloads, embedded, match_url, sport)
+        match_data.update(sections)
+        match_data['detail_sections'] = found
+
+        self.logger.info(f"Детали {sport} матча {match_url}: разделов {len(match_data['detail_sections'])}, "
+                         f"загрузка {capture.elapsed:.1f}с")
+        return match_data
+
+    def collect_many(self, items: Sequence[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Детальные данные нескольких матчей одновременно (не больше размера пула)
+
+        Args:
+            items: пары (url матча, вид спорта)
+
+        Returns:
+            List[Dict]: результаты в порядке items
+        """
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.pool.size, len(items)),
+                                thread_name_prefix='match-details') as executor:
+            return list(executor.map(lambda item: self.collect(*item), items))
+
+    def _read_embedded_state(self, driver) -> Optional[Any]:
+        try:
+            raw = driver.execute_script(EMBEDDED_STATE_SCRIPT)
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            self.logger.debug(f"Встроенное состояние страницы недоступно: {e}")
+            return None
+
+    def _collect_main_info(self, driver, sport: str) -> Dict[str, Any]:
+        """Основная информация из DOM (без ожиданий - страница уже загружена)"""
+        data = {}
+        selector, prefix = PARTICIPANT_SELECTORS.get(sport, PARTICIPANT_SELECTORS['football'])
+        participants = driver.find_elements(By.CSS_SELECTOR, selector)
+        if len(participants) >= 2:
+            data[f'{prefix}1'] = participants[0].text.strip()
+            data[f'{prefix}2'] = participants[1].text.strip()
+
+        for field_name, field_selector in MAIN_INFO_SELECTORS.get(sport, {}).items():
+            elements = driver.find_elements(By.CSS_SELECTOR, field_selector)
+            data[field_name] = elements[0].text.strip() if elements else ''
+        return data
@@ -0,0 +1,420 @@
+"""
+Разделы детальных данных матча Scores24 из перехваченных ответов страницы
+Ответ API относится к разделу, только если его URL указывает на эндпоинт раздела и
+на событие текущего матча (slug страницы матча); во встроенном состоянии страницы
+разделы ищутся только внутри узла этого события. Найденные данные приводятся к
+формату прежних методов _collect_* скраперов (обход вкладок)
+"""
+
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import unquote, urlparse
+
+# Разделы деталей по видам спорта (как в прежних обходах вкладок)
+SPORT_SECTIONS = {
+    'football': ('statistics', 'prediction', 'trends', 'h2h', 'odds', 'table', 'results'),
+    'tennis': ('statistics', 'h2h', 'odds', 'rankings', 'results'),
+    'handball': ('odds', 'results', 'table'),
+}
+
+# Эндпоинты разделов: шаблон ищется в URL ответа без slug события
+# (slug страниц Scores24 сам содержит слова вроде "prediction")
+SECTION_ENDPOINTS = {
+    'statistics': r'statistics|[/=_-]stats\b',
+    'prediction': r'predictions?|forecast',
+    'trends': r'trends|facts',
+    'h2h': r'h2h|head-?to-?head|face-?to-?face',
+    'odds': r'odds',
+    'table': r'standings|tournament-?table|[/=_-]table\b',
+    'rankings': r'rankings?',
+    'results': r'last-?matches|recent-?matches|results|[/=_-]form\b',
+}
+
+# Ключи раздела во встроенном состоянии и в обертках ответов (в нижнем регистре)
+SECTION_KEYS = {
+    'statistics': ('statistics', 'stats', 'matchstats'),
+    'prediction': ('prediction', 'predictions', 'forecast'),
+    'trends': ('trends', 'facts'),
+    'h2h': ('h2h', 'headtohead', 'facetoface'),
+    'odds': ('odds', 'bookmakerodds', 'markets'),
+    'table': ('table', 'standings', 'tournamenttable'),
+    'rankings': ('rankings', 'ranking'),
+    'results': ('results', 'lastmatches', 'recentmatches', 'form'),
+}
+
+# Значения раздела, если данных нет (как в прежних методах _collect_*)
+SECTION_DEFAULTS = {
+    'prediction': 'Недоступно',
+    'h2h': [],
+}
+
+# Поля узла события во встроенном состоянии, по которым узнается матч
+EVENT_ID_FIELDS = ('slug', 'url', 'href', 'id', 'matchslug', 'matchid')
+
+# Глубина обхода JSON
+MAX_SEARCH_DEPTH = 8
+
+
+def event_key(match_url: str) -> str:
+    """Идентификатор события - последний сегмент пути страницы матча (slug)"""
+    path = urlparse(match_url).path.rstrip('/')
+    return unquote(path.rsplit('/', 1)[-1]).lower()
+
+
+def participant_prefix(sport: str) -> str:
+    return 'player' if sport == 'tennis' else 'team'
+
+
+def endpoint_patterns(sport: str, event: str) -> Tuple[str, ...]:
+    """
+    Шаблоны URL ответов с разделами события (ожидаемые данные режима захвата)
+    """
+    # Слово раздела должно стоять вне slug: до него или после него
+    escaped = re.escape(event)
+    return tuple(
+        rf'(?i)(?:{SECTION_ENDPOINTS[section]}).*{escaped}|{escaped}.*?(?:{SECTION_ENDPOINTS[section]})'
+        for section in SPORT_SECTIONS.get(sport, ())
+    )
+
+
+def section_for_url(url: str, event: str, sport: str) -> Optional[str]:
+    """Раздел, к которому относится ответ API (None - ответ не про это событие или не про раздел)"""
+    text = unquote(url).lower()
+    if not event or event not in text:
+        return None
+    text = text.replace(event, '')
+    for section in SPORT_SECTIONS.get(sport, ()):
+        if re.search(SECTION_ENDPOINTS[section], text):
+            return section
+    return None
+
+
+def _walk(document: Any, max_depth: int = MAX_SEARCH_DEPTH) -> Iterable[Tuple[Any, int]]:
+    pending = deque([(document, 0)])
+    while pending:
+        node, depth = pending.popleft()
+        yield node, depth
+        if depth >= max_depth:
+            continue
+        children = node.values() if isinstance(node, dict) else node if isinstance(node, list) else ()
+        pending.extend((child, depth + 1) for child in children if isinstance(child, (dict, list)))
+
+
+def _find_key(document: Any, keys: Sequence[str]) -> Optional[Any]:
+    """Первое непустое значение под одним из ключей (обход в ширину, без учета регистра)"""
+    for node, _ in _walk(document):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if isinstance(key, str) and key.lower() in keys and value not in (None, '', [], {}):
+                    return value
+    return None
+
+
+def find_event_node(document: Any, event: str) -> Optional[Dict[str, Any]]:
+    """Узел события во встроенном состоянии страницы"""
+    for node, _ in _walk(document):
+        if not isinstance(node, dict):
+            continue
+        for key, value in node.items():
+            if (isinstance(key, str) and key.lower() in EVENT_ID_FIELDS and isinstance(value, str)
+                    and event_key(value) == event):
+                return node
+    return None
+
+
+def _unwrap(payload: Any, section: str) -> Any:
+    """Данные раздела из ответа его эндпоинта (обертки data/result и ключ раздела)"""
+    while isinstance(payload, dict) and len(payload) == 1 and next(iter(payload)) in ('data', 'result', 'response'):
+        payload = next(iter(payload.values()))
+    inner = _find_key(payload, SECTION_KEYS[section]) if isinstance(payload, dict) else None
+    return inner if inner is not None else payload
+
+
+def assign_sections(payloads: Iterable[Dict[str, Any]], embedded: Optional[Any],
+                    match_url: str, sport: str) -> Dict[str, Any]:
+    """
+    Сырые данные разделов события: ответы API эндпоинтов разделов, затем узел
+    события во встроенном состоянии
+
+    Args:
+        payloads: перехваченные ответы {'url', 'data'}
+        embedded: встроенное состояние страницы
+    """
+    event = event_key(match_url)
+    raw: Dict[str, Any] = {}
+
+    for payload in payloads:
+        section = section_for_url(payload.get('url', ''), event, sport)
+        if section and section not in raw:
+            raw[section] = _unwrap(payload.get('data'), section)
+
+    node = find_event_node(embedded, event) if embedded is not None else None
+    if node is not None:
+        for section in SPORT_SECTIONS.get(sport, ()):
+            if section not in raw:
+                value = _find_key(node, SECTION_KEYS[section])
+                if value is not None:
+                    raw[section] = value
+    return raw
+
+
+# ---- Приведение к формату прежних методов _collect_* ----
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, dict):
+        return _label(value, ('name', 'shortname', 'title', 'text', 'value', 'current', 'display'))
+    return str(value).strip()
+
+
+def _label(item: Dict[str, Any], keys: Sequence[str]) -> str:
+    lowered = {key.lower(): value for key, value in item.items() if isinstance(key, str)}
+    for key in keys:
+        value = lowered.get(key)
+        if value not in (None, '', [], {}):
+            return _text(value)
+    return ''
+
+
+def _pair(item: Any) -> Tuple[Any, Any]:
+    """Значения двух участников: [a, b], {'home','away'}, {'team1','team2'}, {'player1','player2'}"""
+    if isinstance(item, (list, tuple)) and len(item) >= 2:
+        return item[0], item[1]
+    if isinstance(item, dict):
+        lowered = {key.lower(): value for key, value in item.items() if isinstance(key, str)}
+        for first, second in (('home', 'away'), ('team1', 'team2'), ('player1', 'player2'),
+                              ('homevalue', 'awayvalue'), ('first', 'second')):
+            if first in lowered or second in lowered:
+                return lowered.get(first), lowered.get(second)
+    return None, None
+
+
+def _score(item: Dict[str, Any]) -> str:
+    score = _label(item, ('score', 'result_score', 'fullscore'))
+    if score:
+        return score
+    home, away = _pair({key.lower().replace('score', ''): value for key, value in item.items()
+                        if isinstance(key, str) and key.lower() in ('homescore', 'awayscore')})
+    if home is None or away is None:
+        return ''
+    return f"{_text(home)}:{_text(away)}"
+
+
+def _items(raw: Any, nested: Sequence[str] = ('items', 'rows', 'statisticsitems', 'list')) -> List[Any]:
+    """Элементы списка раздела с раскрытием групп"""
+    if isinstance(raw, dict):
+        inner = _find_key(raw, nested)
+        raw = inner if isinstance(inner, list) else [raw]
+    if not isinstance(raw, list):
+        return []
+    flat = []
+    for item in raw:
+        group = _find_key(item, nested) if isinstance(item, dict) else None
+        if isinstance(group, list):
+            flat.extend(group)
+        else:
+            flat.append(item)
+    return flat
+
+
+def normalize_statistics(raw: Any, sport: str) -> Dict[str, Any]:
+    prefix = participant_prefix(sport)
+    stats = {}
+    if isinstance(raw, dict) and not _find_key(raw, ('items', 'rows', 'statisticsitems', 'list')):
+        entries = [{'name': name, **({'home': value[0], 'away': value[1]} if isinstance(value, list) and len(value) >= 2
+                                     else value if isinstance(value, dict) else {})}
+                   for name, value in raw.items()]
+    else:
+        entries = _items(raw)
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        name = _label(entry, ('name', 'title', 'type', 'key'))
+        first, second = _pair(entry)
+        if name and (first is not None or second is not None):
+            stats[name] = {f'{prefix}1': _text(first), f'{prefix}2': _text(second)}
+    return stats
+
+
+def normalize_prediction(raw: Any, sport: str) -> str:
+    if isinstance(raw, list):
+        raw = raw[0] if raw else ''
+    if isinstance(raw, dict):
+        return _label(raw, ('text', 'title', 'prediction', 'value', 'name'))
+    return _text(raw)
+
+
+def normalize_trends(raw: Any, sport: str) -> Dict[str, str]:
+    trends = {}
+    if isinstance(raw, dict) and not _find_key(raw, ('items', 'list')):
+        return {str(name): _text(value) for name, value in raw.items()}
+    for item in _items(raw):
+        if isinstance(item, dict):
+            name = _label(item, ('title', 'name', 'text'))
+            if name:
+                trends[name] = _label(item, ('value', 'percent', 'probability', 'count'))
+        elif item:
+            trends[_text(item)] = ''
+    return trends
+
+
+def normalize_h2h(raw: Any, sport: str) -> List[Dict[str, str]]:
+    matches = []
+    for item in _items(raw, ('items', 'events', 'matches', 'list')):
+        if not isinstance(item, dict):
+            continue
+        match_info = {'date': _label(item, ('date', 'startdate', 'starttime', 'datetime')), 'score': _score(item)}
+        if sport == 'tennis':
+            match_info['tournament'] = _label(item, ('tournament', 'league', 'competition'))
+            match_info['surface'] = _label(item, ('surface', 'groundtype'))
+        else:
+            match_info['league'] = _label(item, ('league', 'tournament', 'competition'))
+        matches.append(match_info)
+    return matches
+
+
+def _odds_values(value: Any) -> List[str]:
+    if isinstance(value, dict):
+        inner = _find_key(value, ('outcomes', 'odds', 'values', 'choices'))
+        if isinstance(inner, list):
+            value = inner
+        else:
+            return [_text(item) for item in value.values() if not isinstance(item, (dict, list))]
+    if isinstance(value, list):
+        return [_label(item, ('value', 'odd', 'odds', 'coefficient', 'price', 'fractionalvalue'))
+                if isinstance(item, dict) else _text(item) for item in value]
+    return [_text(value)]
+
+
+def normalize_odds(raw: Any, sport: str) -> Dict[str, List[str]]:
+    odds = {}
+    if isinstance(raw, dict) and not _find_key(raw, ('markets', 'items', 'list')):
+        if all(not isinstance(value, (dict, list)) for value in raw.values()):
+            # Плоский ответ {'1': 1.5, 'X': 3.4, '2': 6.0} - один рынок исхода матча
+            return {'1X2': [_text(value) for value in raw.values()]} if raw else {}
+        return {str(market): _odds_values(value) for market, value in raw.items()}
+    for item in _items(raw, ('markets', 'items', 'list')):
+        if isinstance(item, dict):
+            market = _label(item, ('marketname', 'market', 'name', 'title'))
+            values = _odds_values(item)
+            if market and values:
+                odds[market] = values
+    return odds
+
+
+def normalize_table(raw: Any, sport: str) -> Dict[str, Dict[str, str]]:
+    table = {}
+    for row in _items(raw, ('rows', 'items', 'standings', 'list')):
+        if not isinstance(row, dict):
+            continue
+        team_name = _label(row, ('team', 'name', 'participant', 'teamname'))
+        if team_name:
+            table[team_name] = {'position': _label(row, ('position', 'rank', 'place')),
+                                'points': _label(row, ('points', 'pts'))}
+    return table
+
+
+def normalize_rankings(raw: Any, sport: str) -> Dict[str, str]:
+    first, second = _pair(raw)
+    rankings = {}
+    for key, value in (('player1', first), ('player2', second)):
+        if isinstance(value, dict):
+            value = _label(value, ('ranking', 'rank', 'position', 'value'))
+        if value not in (None, ''):
+            rankings[key] = _text(value)
+    return rankings
+
+
+RESULT_CODES = {'w': 'W', 'win': 'W', 'd': 'D', 'draw': 'D', 'l': 'L', 'loss': 'L', 'lose': 'L', 'defeat': 'L'}
+
+
+def _side_results(matches: Any, sport: str) -> Dict[str, Any]:
+    """Результаты участника и их сводка (формулы прежних _collect_team_results/_collect_player_results)"""
+    results = []
+    for item in _items(matches, ('events', 'matches', 'items', 'list')):
+        if not isinstance(item, dict):
+            continue
+        entry = {'result': RESULT_CODES.get(_label(item, ('result', 'outcome', 'status')).lower(), ''),
+                 'score': _score(item), 'date': _label(item, ('date', 'startdate', 'starttime'))}
+        if sport == 'tennis':
+            entry['tournament'] = _label(item, ('tournament', 'league', 'competition'))
+        elif sport == 'handball':
+            entry['opponent'] = _label(item, ('opponent', 'rival'))
+        results.append(entry)
+
+    wins = sum(1 for entry in results if entry['result'] == 'W')
+    draws = sum(1 for entry in results if entry['result'] == 'D')
+    losses = sum(1 for entry in results if entry['result'] == 'L')
+    total_matches = len(results)
+    win_percentage = (wins / total_matches * 100) if total_matches > 0 else 0
+
+    if sport == 'tennis':
+        sets_won = sets_lost = 0
+        for entry in results:
+            for won, lost in re.findall(r'(\d+)-(\d+)', entry['score']):
+                sets_won += int(won)
+                sets_lost += int(lost)
+        statistics = {'wins': wins, 'losses': losses, 'win_percentage': round(win_percentage, 1),
+                      'sets_won': sets_won, 'sets_lost': sets_lost}
+    elif sport == 'handball':
+        scored = conceded = 0
+        for entry in results:
+            goals = re.findall(r'(\d+)', entry['score'])
+            if len(goals) >= 2:
+                scored += int(goals[0])
+                conceded += int(goals[1])
+        avg_scored = scored / total_matches if total_matches > 0 else 0
+        avg_conceded = conceded / total_matches if total_matches > 0 else 0
+        statistics = {'wins': wins, 'draws': draws, 'losses': losses, 'win_percentage': round(win_percentage, 1),
+                      'avg_goals_scored': round(avg_scored, 1), 'avg_goals_conceded': round(avg_conceded, 1),
+                      'avg_total_goals': round(avg_scored + avg_conceded, 1)}
+    else:
+        statistics = {'wins': wins, 'draws': draws, 'losses': losses, 'win_percentage': round(win_percentage, 1)}
+
+    return {'matches': results, 'statistics': statistics}
+
+
+def normalize_results(raw: Any, sport: str) -> Dict[str, Any]:
+    prefix = participant_prefix(sport)
+    first, second = _pair(raw)
+    results = {}
+    for index, side in ((1, first), (2, second)):
+        if side:
+            side_results = _side_results(side, sport)
+            if side_results['matches']:
+                results[f'{prefix}{index}'] = side_results
+    return results
+
+
+NORMALIZERS = {
+    'statistics': normalize_statistics,
+    'prediction': normalize_prediction,
+    'trends': normalize_trends,
+    'h2h': normalize_h2h,
+    'odds': normalize_odds,
+    'table': normalize_table,
+    'rankings': normalize_rankings,
+    'results': normalize_results,
+}
+
+
+def build_sections(payloads: Iterable[Dict[str, Any]], embedded: Optional[Any],
+                   match_url: str, sport: str) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Разделы матча в формате обхода вкладок
+
+    Returns:
+        (разделы, найденные разделы): ненайденные разделы получают значения по умолчанию
+    """
+    raw = assign_sections(payloads, embedded, match_url, sport)
+    sections, found = {}, []
+    for section in SPORT_SECTIONS.get(sport, ()):
+        value = NORMALIZERS[section](raw[section], sport) if section in raw else None
+        if value:
+            sections[section] = value
+            found.append(section)
+        else:
+            sections[section] = SECTION_DEFAULTS.get(section, {})
+    return sections, found
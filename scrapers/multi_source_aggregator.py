@@ -10,48 +10,52 @@ from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 
-from scrapers.sofascore_simple_quality import SofaScoreSimpleQuality
-from scrapers.flashscore_scraper import FlashScoreScraper
-from scrapers.scores24_scraper import Scores24Scraper
-from scrapers.marathonbet_scraper import MarathonBetScraper
-from scrapers.team_stats_collector import TeamStatsCollector
-from scrapers.understat_scraper import UnderstatScraper
-from scrapers.fotmob_scraper import FotMobScraper
-from scrapers.parallel_aggregator import SafeParallelAggregator
-from scrapers.hybrid_score_provider import HybridScoreProvider
+from scrapers.source_registry import SourceRegistry, get_global_source_registry
+from utils.parse_pool import create_parsing_service
+from utils.match_record import as_matches
+from utils.match_batch import create_match_batch
+from utils.conditional_http import get_page_cache_report
+from utils.bounded_cache import BoundedCache, get_cache_report
+from utils.cycle_deadline import current_deadline
+from utils.http_transport import get_global_transport
+
+# Адреса источников для прогрева соединений
+SOURCE_BASE_URLS = {
+    'marathonbet': 'https://www.marathonbet.ru/',
+    'sofascore': 'https://www.sofascore.com/',
+    'flashscore': 'https://www.flashscore.com/',
+    'scores24': 'https://scores24.live/'
+}
 
 class MultiSourceAggregator:
     """
     Агрегатор данных из множественных источников спортивных данных
     """
     
-    def __init__(self, logger):
+    def __init__(self, logger, registry: Optional[SourceRegistry] = None):
         self.logger = logger
         
-        # Инициализируем эффективные + новые перспективные скраперы
-        self.scrapers = {
-            'sofascore': SofaScoreSimpleQuality(logger),
-            'flashscore': FlashScoreScraper(logger),
-            'scores24': Scores24Scraper(logger),
-            'marathonbet': MarathonBetScraper(logger)
-        }
+        # Реестр источников: модули импортируются и создаются при первом обращении
+        self.registry = registry or get_global_source_registry(logger)
         
-        # Специализированные сборщики статистики
-        self.stats_collectors = {
-            'team_stats': TeamStatsCollector(logger),
-            'understat': UnderstatScraper(logger),
-            'fotmob': FotMobScraper(logger)
-        }
+        # Эффективные + новые перспективные скраперы (ленивые)
+        self.scrapers = self.registry.view('match')
+        
+        # Специализированные сборщики статистики (ленивые)
+        self.stats_collectors = self.registry.view('stats')
         
-        # Безопасный параллельный агрегатор
-        self.parallel_aggregator = SafeParallelAggregator(self.scrapers, logger)
+        # Общий HTTP транспорт (пулы соединений, HTTP/2, DNS кэш) для всех источников
+        self.transport = get_global_transport(logger)
         
-        # Гибридный провайдер счетов для получения реальных live счетов
-        self.hybrid_score_provider = HybridScoreProvider(logger)
+        # Парсинг HTML в пуле процессов (CPU-нагрузка уходит из потоков загрузки)
+        self.parse_service = create_parsing_service(logger)
+        self.registry.add_create_hook(self._attach_parse_service)
         
-        # Комплексный пайплайн статистики для MarathonBet
-        from utils.comprehensive_stats_pipeline import create_comprehensive_stats_pipeline
-        self.stats_pipeline = create_comprehensive_stats_pipeline(self, logger)
+        # Тяжелые компоненты создаются при первом обращении
+        self._parallel_aggregator = None
+        self._hybrid_score_provider = None
+        self._stats_pipeline = None
+        self._live_score_feed = None
         
         # Режим работы (можно переключать)
         self.use_parallel_mode = True
@@ -82,8 +86,48 @@ class MultiSourceAggregator:
         }
         
         # Кэш для избежания дублированных запросов
-        self.cache = {}
         self.cache_ttl = 30  # 30 секунд для live данных
+        self.cache = BoundedCache('aggregator', max_entries=64, ttl=self.cache_ttl)
+    
+    def _attach_parse_service(self, name: str, source: Any):
+        """Подключение пула парсинга к только что созданному скраперу"""
+        if hasattr(source, 'parse_service'):
+            source.parse_service = self.parse_service
+    
+    @property
+    def parallel_aggregator(self):
+        """Безопасный параллельный агрегатор"""
+        if self._parallel_aggregator is None:
+            from scrapers.parallel_aggregator import SafeParallelAggregator
+            self._parallel_aggregator = SafeParallelAggregator(self.scrapers, self.logger)
+        return self._parallel_aggregator
+    
+    @property
+    def hybrid_score_provider(self):
+        """Гибридный провайдер счетов для получения реальных live счетов"""
+        if self._hybrid_score_provider is None:
+            from scrapers.hybrid_score_provider import HybridScoreProvider
+            self._hybrid_score_provider = HybridScoreProvider(self.logger, self.transport, self.live_score_feed)
+        return self._hybrid_score_provider
+    
+    @property
+    def live_score_feed(self):
+        """Общая лента live-счетов и записей SofaScore по видам спорта (одна загрузка на вид спорта за цикл)"""
+        if self._live_score_feed is None:
+            from scrapers.live_score_feed import LiveScoreFeed
+            self._live_score_feed = LiveScoreFeed(
+                self.logger, self.transport,
+                records_source=lambda sport: self.scrapers['sofascore'].get_live_matches(sport)
+            )
+        return self._live_score_feed
+    
+    @property
+    def stats_pipeline(self):
+        """Комплексный пайплайн статистики для MarathonBet"""
+        if self._stats_pipeline is None:
+            from utils.comprehensive_stats_pipeline import create_comprehensive_stats_pipeline
+            self._stats_pipeline = create_comprehensive_stats_pipeline(self, self.logger)
+        return self._stats_pipeline
     
     def get_aggregated_matches(self, sport: str, data_type: str = 'basic_info') -> List[Dict[str, Any]]:
         """
@@ -94,9 +138,10 @@ class MultiSourceAggregator:
             
             # Проверяем кэш
             cache_key = f"{sport}_{data_type}"
-            if self._is_cache_valid(cache_key):
+            cached_matches = self.cache.get(cache_key)
+            if cached_matches is not None:
                 self.logger.info(f"Агрегатор: используем кэш для {cache_key}")
-                return self.cache[cache_key]['data']
+                return cached_matches
             
             # Получаем данные из всех источников параллельно
             all_matches = self._fetch_from_all_sources(sport, data_type)
@@ -121,6 +166,15 @@ class MultiSourceAggregator:
         all_matches = {}
         source_list = self.source_priorities.get(data_type, ['sofascore', 'livescore', 'flashscore'])
         
+        # Берем только активные источники, поддерживающие этот вид спорта
+        # (остальные даже не импортируются)
+        source_list = [
+            source_name for source_name in source_list
+            if source_name in self.scrapers
+            and self.source_activation.get(source_name, True)
+            and sport in self.registry.spec(source_name).sports
+        ]
+        
         # Проверяем доступность источников
         available_sources = []
         for source_name in source_list:
@@ -370,20 +424,13 @@ class MultiSourceAggregator:
         """
         Проверка валидности кэша
         """
-        if cache_key not in self.cache:
-            return False
-        
-        cached_time = self.cache[cache_key]['timestamp']
-        return (datetime.now() - cached_time).seconds < self.cache_ttl
+        return cache_key in self.cache
     
     def _cache_data(self, cache_key: str, data: List[Dict[str, Any]]):
         """
         Кэширование данных
         """
-        self.cache[cache_key] = {
-            'data': data,
-            'timestamp': datetime.now()
-        }
+        self.cache.set(cache_key, data, ttl=self.cache_ttl)
     
     def get_quick_score_updates(self, sport: str) -> Dict[str, Any]:
         """
@@ -641,10 +688,21 @@ class MultiSourceAggregator:
         enriched_matches = []
         stats = {'total': len(marathonbet_matches), 'claude_ready': 0}
         
+        # Аналитика коэффициентов считается сразу для всего пакета (если есть numpy)
+        batch = create_match_batch(marathonbet_matches)
+        if batch is not None:
+            recommendation = batch.recommendation_codes()
+            value = batch.value_codes()
+            risk = batch.risk_codes()
+            probabilities = batch.implied_probabilities()
+        
         for i, match in enumerate(marathonbet_matches, 1):
             try:
                 # Создаем обогащенную копию с аналитикой
-                enriched = self._create_enriched_match_for_claude(match, sport)
+                odds_analysis = None
+                if batch is not None:
+                    odds_analysis = batch.odds_analysis(i - 1, recommendation, value, risk, probabilities)
+                enriched = self._create_enriched_match_for_claude(match, sport, odds_analysis)
                 enriched_matches.append(enriched)
                 
                 if enriched.get('claude_ai_ready'):
@@ -666,7 +724,8 @@ class MultiSourceAggregator:
         
         return enriched_matches
     
-    def _create_enriched_match_for_claude(self, match: Dict[str, Any], sport: str) -> Dict[str, Any]:
+    def _create_enriched_match_for_claude(self, match: Dict[str, Any], sport: str,
+                                          odds_analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Создание обогащенного матча для Claude AI
         """
@@ -674,7 +733,9 @@ class MultiSourceAggregator:
         
         # Аналитика на основе коэффициентов MarathonBet
         odds = match.get('odds', {})
-        if odds:
+        if odds_analysis is not None:
+            enriched['claude_odds_analysis'] = odds_analysis
+        elif odds:
             enriched['claude_odds_analysis'] = {
                 'betting_recommendation': self._get_betting_recommendation(odds),
                 'value_assessment': self._assess_odds_value(odds),
@@ -795,15 +856,15 @@ class MultiSourceAggregator:
         active_scrapers = {}
         active_stats = {}
         
-        # Фильтруем активные основные источники
-        for source_name, scraper in self.scrapers.items():
+        # Фильтруем активные основные источники (неактивные не загружаются)
+        for source_name in self.scrapers:
             if self.source_activation.get(source_name, False):
-                active_scrapers[source_name] = scraper
+                active_scrapers[source_name] = self.scrapers[source_name]
         
         # Фильтруем активные статистические источники
-        for source_name, collector in self.stats_collectors.items():
+        for source_name in self.stats_collectors:
             if self.stats_activation.get(source_name, False):
-                active_stats[source_name] = collector
+                active_stats[source_name] = self.stats_collectors[source_name]
         
         self.logger.info(f"Активные источники: {list(active_scrapers.keys())}")
         self.logger.info(f"Активные статистические: {list(active_stats.keys())}")
@@ -827,14 +888,26 @@ class MultiSourceAggregator:
         
         # Собираем только из MarathonBet
         if self.source_activation.get('marathonbet', False):
+            # Ленты счетов всех видов спорта грузятся параллельно, пока идет сбор MarathonBet
+            self.live_score_feed.begin_cycle(sports)
+            
             marathonbet_scraper = self.scrapers['marathonbet']
             
+            deadline = current_deadline()
             for sport in sports:
+                if deadline.expired():
+                    # Дедлайн цикла: в анализ уходят уже собранные виды спорта
+                    self.logger.warning(f"⏰ Дедлайн цикла: сбор MarathonBet остановлен перед {sport}")
+                    break
+                
                 try:
-                    sport_matches = marathonbet_scraper.get_live_matches_with_odds(sport, use_prioritization=False)
+                    # Словари скрапера -> компактные записи Match (дешевые копии дальше по пайплайну)
+                    sport_matches = as_matches(
+                        marathonbet_scraper.get_live_matches_with_odds(sport, use_prioritization=False)
+                    )
                     
                     # ГИБРИДНОЕ ОБОГАЩЕНИЕ: MarathonBet + реальные счета из SofaScore
-                    enriched_matches = self.hybrid_score_provider.enrich_marathonbet_matches_with_real_scores(sport_matches)
+                    enriched_matches = self.hybrid_score_provider.enrich_marathonbet_matches_with_real_scores(sport_matches, sport)
                     
                     # КРИТИЧЕСКАЯ ФИЛЬТРАЦИЯ: только неничейные матчи для конкретного спорта
                     non_draw_matches = marathonbet_scraper.filter_non_draw_matches(enriched_matches, sport)
@@ -903,5 +976,38 @@ class MultiSourceAggregator:
             'deactivated_sources': [name for name, active in self.source_activation.items() if not active],
             'deactivated_stats': [name for name, active in self.stats_activation.items() if not active],
             'total_active': len(active_sources) + len(active_stats),
-            'total_deactivated': len([a for a in self.source_activation.values() if not a]) + len([a for a in self.stats_activation.values() if not a])
-        }
\ No newline at end of file
+            'total_deactivated': len([a for a in self.source_activation.values() if not a]) + len([a for a in self.stats_activation.values() if not a]),
+            'loaded_sources': self.registry.get_import_report()['loaded'],
+            'page_cache': get_page_cache_report(),
+            'caches': get_cache_report(),
+            'transport': self.transport.get_stats()
+        }
+    
+    def prewarm_connections(self):
+        """
+        Прогрев соединений с активными источниками и пула парсинга перед циклом
+        """
+        try:
+            urls = [SOURCE_BASE_URLS[name] for name, active in self.source_activation.items()
+                    if active and name in SOURCE_BASE_URLS]
+            self.transport.prewarm(urls)
+        except Exception as e:
+            self.logger.warning(f"Ошибка прогрева соединений: {e}")
+        
+        # Воркеры парсинга выполняют initializer до первой страницы цикла
+        self.parse_service.warm_up()
+    
+    def close(self):
+        """
+        Освобождение ресурсов агрегатора (пул процессов парсинга)
+        """
+        try:
+            self.parse_service.shutdown()
+        except Exception as e:
+            self.logger.warning(f"Ошибка остановки сервиса парсинга: {e}")
+        
+        if self._live_score_feed is not None:
+            self._live_score_feed.close()
+        
+        # Общий HTTP транспорт не закрываем: им пользуются и другие компоненты,
+        # он закрывается при завершении процесса
@@ -11,6 +11,8 @@ import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from scrapers.conflict_resolver import DataConflictResolver
+from utils.latency_histogram import TimeoutPolicy, get_global_latency_tracker
+from utils.rate_limiter import get_global_rate_limiter
 
 class SafeParallelAggregator:
     """
@@ -22,7 +24,10 @@ class SafeParallelAggregator:
         self.logger = logger
         self.conflict_resolver = DataConflictResolver(logger)
         
-        # Настройки безопасности
+        # Настройки безопасности: стартовые таймауты источников, после накопления
+        # статистики таймаут выводится из p99 времени ответа источника
+        self.latency = get_global_latency_tracker()
+        self.source_timeout_policy = TimeoutPolicy(min_timeout=5.0, max_timeout=60.0, min_samples=10)
         self.source_timeouts = {
             'sofascore': 10,      # Быстрый источник
             'flashscore': 20,     # Средний источник  
@@ -30,13 +35,8 @@ class SafeParallelAggregator:
             'marathonbet': 35     # Медленный источник
         }
         
-        # Ограничения запросов к доменам
-        self.domain_limits = {
-            'sofascore.com': 1,
-            'flashscore.com': 2,
-            'scores24.live': 1,
-            'marathonbet.ru': 1
-        }
+        # Ограничения запросов к доменам: общий ограничитель, через который ходят все скраперы
+        self.rate_limiter = get_global_rate_limiter(logger)
         
         # Статистика работы
         self.stats = {
@@ -95,26 +95,34 @@ class SafeParallelAggregator:
         try:
             self.logger.info(f"Параллельный сбор {sport}")
             
-            # Создаем задачи для каждого источника
+            # Создаем задачи для каждого источника: они стартуют сразу, время ответа
+            # считается от создания задачи до ее завершения, а не от начала ожидания
             tasks = {}
+            started = {}
+            finished = {}
             
             for source_name, scraper in self.scrapers.items():
                 if hasattr(scraper, 'get_live_matches'):
-                    task = self._safe_source_request(source_name, scraper, sport)
+                    started[source_name] = time.perf_counter()
+                    task = asyncio.ensure_future(self._safe_source_request(source_name, scraper, sport))
+                    task.add_done_callback(lambda _, name=source_name: finished.setdefault(name, time.perf_counter()))
                     tasks[source_name] = task
             
-            # Запускаем все задачи параллельно
+            # Ждем все задачи; таймаут источника отсчитывается от старта его задачи
             results = {}
             
             for source_name, task in tasks.items():
+                timeout = self.get_source_timeout(source_name)
+                remaining = max(0.0, started[source_name] + timeout - time.perf_counter())
                 try:
-                    timeout = self.source_timeouts.get(source_name, 30)
-                    result = await asyncio.wait_for(task, timeout=timeout)
+                    result = await asyncio.wait_for(task, timeout=remaining)
                     results[source_name] = result
+                    self.latency.record(f"source:{source_name}", finished[source_name] - started[source_name])
                     self.stats['successful_requests'] += 1
                     
                 except asyncio.TimeoutError:
                     self.logger.warning(f"{source_name} превысил таймаут {timeout} сек")
+                    self.latency.record(f"source:{source_name}", timeout, error=True, timed_out=True)
                     results[source_name] = []
                     self.stats['failed_requests'] += 1
                     
@@ -132,6 +140,13 @@ class SafeParallelAggregator:
             self.logger.error(f"Ошибка параллельного сбора {sport}: {e}")
             return []
     
+    def get_source_timeout(self, source_name: str) -> float:
+        """
+        Таймаут источника: p99 x 1.5 наблюдаемого времени ответа, до накопления статистики - стартовый
+        """
+        return self.latency.timeout(f"source:{source_name}", default=self.source_timeouts.get(source_name, 30),
+                                    policy=self.source_timeout_policy)
+    
     async def _safe_source_request(self, source_name: str, scraper: Any, sport: str) -> List[Dict[str, Any]]:
         """
         Безопасный запрос к источнику
@@ -193,22 +208,24 @@ class SafeParallelAggregator:
             # Разрешаем конфликты для каждой группы
             final_matches = []
             
-            for team_pair, match_list in match_groups.items():
-                if len(match_list) == 1:
-                    # Нет конфликта
-                    final_matches.append(match_list[0])
-                else:
-                    # Есть конфликт - разрешаем
-                    self.logger.info(f"Разрешение конфликта для {team_pair}: {len(match_list)} версий")
-                    resolved_match = self.conflict_resolver.resolve_match_conflicts(match_list)
-                    
-                    if resolved_match:
-                        # Валидируем разрешенные данные
-                        validated_match = self.conflict_resolver.validate_resolved_data(resolved_match)
-                        final_matches.append(validated_match)
-                        self.stats['conflicts_resolved'] += 1
+            changed_groups = 0
             
-            self.logger.info(f"Объединение завершено: {len(final_matches)} финальных матчей")
+            for team_pair, match_list in match_groups.items():
+                # Инкрементально: неизмененные группы берутся из таблицы состояний
+                resolved_match, changed = self.conflict_resolver.resolve_group((sport, team_pair), match_list)
+                
+                if resolved_match:
+                    final_matches.append(resolved_match)
+                    if changed:
+                        changed_groups += 1
+                        if len(match_list) > 1:
+                            self.logger.debug(f"Разрешен конфликт для {team_pair}: {len(match_list)} версий")
+                            self.stats['conflicts_resolved'] += 1
+            
+            self.conflict_resolver.prune_states()
+            
+            self.logger.info(f"Объединение завершено: {len(final_matches)} финальных матчей "
+                             f"(изменилось {changed_groups}/{len(match_groups)} групп)")
             return final_matches
             
         except Exception as e:
@@ -271,8 +288,9 @@ class SafeParallelAggregator:
         """
         return {
             'statistics': self.stats,
-            'source_timeouts': self.source_timeouts,
-            'domain_limits': self.domain_limits,
+            'source_timeouts': {name: self.get_source_timeout(name) for name in self.source_timeouts},
+            'source_latency': self.latency.get_stats('source:'),
+            'domain_limits': self.rate_limiter.get_stats(),
             'conflict_resolution_stats': self.conflict_resolver.get_conflict_resolution_stats()
         }
     
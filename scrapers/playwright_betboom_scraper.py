@@ -8,6 +8,7 @@ import re
 from typing import List, Dict, Any
 from playwright.async_api import async_playwright
 from datetime import datetime
+from utils.browser_capture import CAPTURE_PROFILES, capture_page_async
 
 class PlaywrightBetBoomScraper:
     """
@@ -53,16 +54,16 @@ class PlaywrightBetBoomScraper:
                     Object.defineProperty(navigator, 'languages', {get: () => ['ru-RU', 'ru', 'en-US', 'en']});
                 """)
                 
-                # Переходим на страницу
-                await page.goto('https://betboom.ru/sport/football?type=live')
+                # Переходим на страницу в режиме захвата: без картинок/шрифтов/рекламы,
+                # дальше - как только пришли live данные (вместо фиксированных 10 секунд)
+                capture = await capture_page_async(page, 'https://betboom.ru/sport/football?type=live',
+                                                   CAPTURE_PROFILES['betboom'], self.logger)
                 
                 self.logger.info("Playwright: страница загружена")
                 
-                # Ждем загрузки контента
-                await page.wait_for_timeout(10000)  # 10 секунд
-                
-                # Имитируем действия пользователя
-                await self._simulate_user_actions(page)
+                # Данные не пришли за таймаут - имитируем действия пользователя, как раньше
+                if not capture.complete:
+                    await self._simulate_user_actions(page)
                 
                 # Извлекаем данные
                 matches = await self._extract_football_matches(page)
@@ -524,8 +525,8 @@ class PlaywrightBetBoomScraper:
                 )
                 page = await context.new_page()
                 
-                await page.goto('https://betboom.ru/sport/tennis?type=live')
-                await page.wait_for_timeout(10000)
+                await capture_page_async(page, 'https://betboom.ru/sport/tennis?type=live',
+                                         CAPTURE_PROFILES['betboom'], self.logger)
                 
                 page_text = await page.inner_text('body')
                 tennis_matches = self._parse_tennis_structure(page_text)
@@ -2,10 +2,9 @@
 Playwright скрапер для scores24.live
 """
 from playwright.sync_api import sync_playwright
-import time
 import re
-import json
 from typing import List, Dict, Any
+from utils.browser_capture import capture_page_sync, profile_for
 
 class PlaywrightScraper:
     """
@@ -32,49 +31,26 @@ class PlaywrightScraper:
                 
                 page = context.new_page()
                 
-                # Перехватываем API запросы
-                api_responses = []
-                
-                def handle_response(response):
-                    if ('api' in response.url or 'dapi' in response.url) and response.status == 200:
-                        try:
-                            content_type = response.headers.get('content-type', '')
-                            if 'json' in content_type:
-                                api_responses.append({
-                                    'url': response.url,
-                                    'data': response.json()
-                                })
-                        except:
-                            pass
-                
-                page.on('response', handle_response)
-                
-                # Загружаем страницу и ждем загрузки
+                # Режим захвата: без картинок/шрифтов/рекламы, JSON ответы API перехватываются,
+                # загрузка завершается, как только пришли ожидаемые данные
                 self.logger.info("Загружаем страницу с Playwright...")
-                page.goto(url, wait_until='networkidle', timeout=30000)
-                
-                # Дополнительное ожидание для динамического контента
-                time.sleep(8)
-                
-                # Прокручиваем страницу
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(2)
-                page.evaluate("window.scrollTo(0, 0)")
-                time.sleep(2)
+                capture = capture_page_sync(page, url, profile_for(url), self.logger)
                 
                 matches = []
                 
                 # Метод 1: Анализ API ответов
-                if api_responses:
-                    self.logger.info(f"Перехвачено {len(api_responses)} API ответов")
-                    for api_resp in api_responses:
-                        api_matches = self._parse_api_data(api_resp['data'], sport)
+                if capture.payloads:
+                    self.logger.info(f"Перехвачено {len(capture.payloads)} API ответов")
+                    for api_data in capture.data():
+                        api_matches = self._parse_api_data(api_data, sport)
                         if api_matches:
                             matches.extend(api_matches)
                             self.logger.info(f"API найдено {len(api_matches)} матчей")
                 
-                # Метод 2: Современные селекторы
+                # Метод 2: Современные селекторы (после прокрутки для ленивой подгрузки)
                 if not matches:
+                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    page.wait_for_timeout(1000)
                     matches = self._extract_with_selectors(page, sport)
                 
                 # Метод 3: JavaScript состояние
@@ -2,7 +2,6 @@
 Scores24.live парсер для футбольных live данных
 Высокий потенциал: 3,333 временных меток, 2,836 счетов, 1,210 упоминаний футбола
 """
-import requests
 import time
 import re
 from typing import List, Dict, Any
@@ -13,24 +12,45 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 from datetime import datetime
+from utils.conditional_http import create_conditional_session
+from utils.rate_limiter import get_global_rate_limiter
+from utils.session_state import get_global_session_state
+from utils.html_fragments import EVENT_ID_PATTERNS, IncrementalPageExtractor
+
+# Фрагменты событий Scores24: data-атрибуты и строки-ссылки на страницу матча
+SCORES24_FRAGMENT_PATTERNS = EVENT_ID_PATTERNS + (
+    re.compile(r'<(?P<tag>a)\b[^>]*?\bhref\s*=\s*["\'](?P<id>/[a-z]{2}/soccer/m-[^"\']+)["\'][^>]*>'),
+)
+
+# Источники стратегии по структуре в порядке полного разбора
+STRUCTURE_SOURCES = ('scores24_table', 'scores24_list')
 
 class Scores24Scraper:
     """
     Парсер для Scores24.live - очень перспективный источник футбольных данных
     """
     
-    def __init__(self, logger):
+    def __init__(self, logger, transport=None):
         self.logger = logger
         
-        # HTTP сессия
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ru-RU,ru;q=0.9,en;q=0.8',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'no-cache'
-        })
+        # HTTP сессия поверх общего транспорта (условные запросы + кэш разобранных страниц)
+        self.session = create_conditional_session('scores24', 'html_ru', {'Cache-Control': 'no-cache'},
+                                                  transport=transport)
+        
+        # Куки и User-Agent, полученные браузером, переиспользуются HTTP сессией
+        self.session_state = get_global_session_state(logger)
+        self.session_state.apply('scores24', self.session)
+        
+        # Сервис парсинга в пуле процессов (устанавливается агрегатором)
+        self.parse_service = None
+        
+        # Инкрементальный разбор: между опросами заново разбираются только изменившиеся строки матчей
+        self.incremental_parsing = True
+        self.fragment_extractor = IncrementalPageExtractor(SCORES24_FRAGMENT_PATTERNS)
+        # Каждый N-й опрос страницы сверяется с полным разбором (0 - без сверки)
+        self.full_parse_interval = 10
+        self._incremental_polls: Dict[str, int] = {}
+        self.incremental_stats = {'verified': 0, 'mismatches': 0}
         
         # Chrome настройки для обхода CAPTCHA
         self.chrome_options = Options()
@@ -73,23 +93,48 @@ class Scores24Scraper:
         """
         try:
             url = 'https://scores24.live/ru/soccer?matchesFilter=live'
-            response = self.session.get(url, timeout=15)
-            
-            if response.status_code != 200:
-                return []
+            matches, response = self.session.get_parsed(
+                url, self._parse_http_response, validate=self._is_not_captcha, timeout=15
+            )
             
-            # Проверяем на CAPTCHA
-            if 'captcha' in response.text.lower():
-                self.logger.warning("Scores24 HTTP: обнаружена CAPTCHA")
-                return []
+            if self.session_state.is_rejected(response):
+                self.session_state.reject('scores24', self.session)
             
-            matches = self._extract_matches_from_html(response.text)
-            return matches
+            return matches or []
             
         except Exception as e:
             self.logger.warning(f"Scores24 HTTP ошибка: {e}")
             return []
     
+    def _is_not_captcha(self, response) -> bool:
+        """
+        Проверка ответа на CAPTCHA
+        """
+        if 'captcha' in response.text.lower():
+            self.logger.warning("Scores24 HTTP: обнаружена CAPTCHA")
+            return False
+        return True
+    
+    def _parse_http_response(self, response) -> List[Dict[str, Any]]:
+        """
+        Разбор HTTP ответа (в пуле процессов, если он есть)
+        """
+        if self.incremental_parsing:
+            matches = self._extract_incremental(response, str(response.url))
+            if matches is not None:
+                return matches
+        
+        return self._parse_full_response(response)
+    
+    def _parse_full_response(self, response) -> List[Dict[str, Any]]:
+        """
+        Полный разбор страницы
+        """
+        if self.parse_service:
+            return self.parse_service.parse('scores24', response.content,
+                                            encoding=response.encoding or 'utf-8')
+        return self._extract_matches_from_html(response.text)
+    
     def _get_via_browser(self) -> List[Dict[str, Any]]:
         """
         Браузерный метод для обхода CAPTCHA
@@ -103,6 +148,7 @@ class Scores24Scraper:
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             url = 'https://scores24.live/ru/soccer?matchesFilter=live'
+            get_global_rate_limiter(self.logger).acquire(url)
             driver.get(url)
             
             # Ждем загрузки страницы
@@ -122,6 +168,8 @@ class Scores24Scraper:
             except:
                 pass
             
+            self.session_state.capture('scores24', 'scores24.live', driver, self.session)
+            
             page_source = driver.page_source
             matches = self._extract_matches_from_html(page_source)
             
@@ -138,18 +186,9 @@ class Scores24Scraper:
         """
         Извлечение матчей из HTML контента
         """
-        matches = []
-        
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Множественные стратегии поиска матчей
-            matches.extend(self._extract_by_selectors(soup))
-            matches.extend(self._extract_by_patterns(html_content))
-            matches.extend(self._extract_by_structure(soup))
-            
-            # Убираем дубли
-            unique_matches = self._deduplicate_matches(matches)
+            # Множественные стратегии поиска матчей, затем убираем дубли
+            unique_matches = self._deduplicate_matches(self._extract_all_strategies(html_content))
             
             self.logger.info(f"Scores24: извлечено {len(unique_matches)} уникальных матчей")
             return unique_matches
@@ -158,6 +197,91 @@ class Scores24Scraper:
             self.logger.warning(f"Scores24 извлечение ошибка: {e}")
             return []
     
+    def _extract_all_strategies(self, html_content: str) -> List[Dict[str, Any]]:
+        """
+        Матчи всех стратегий извлечения до дедупликации (страница, строка матча или остаток страницы)
+        """
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        matches = self._extract_by_selectors(soup)
+        matches.extend(self._extract_by_patterns(html_content))
+        matches.extend(self._extract_by_structure(soup))
+        
+        return matches
+    
+    def _extract_incremental(self, response, page_key: str) -> List[Dict[str, Any]]:
+        """
+        Инкрементальное извлечение по строкам матчей (None - нужен полный разбор)
+        
+        Строки и остаток страницы разбираются всеми стратегиями полного разбора и
+        упорядочиваются по стратегиям, как в полном разборе, до дедупликации;
+        изменившиеся части при наличии пула разбираются в нем параллельно
+        """
+        parse_batch = None
+        if self.parse_service:
+            parse_batch = lambda parts: self.parse_service.parse_many('scores24_fragment', parts)
+        
+        try:
+            matches = self.fragment_extractor.extract(
+                page_key, response.text, self._extract_all_strategies, self._extract_all_strategies,
+                parse_batch=parse_batch
+            )
+            if matches is None:
+                return None
+            
+            matches.sort(key=self._strategy_rank)
+            matches = self._deduplicate_matches(matches)
+            
+        except Exception as e:
+            self.logger.warning(f"Scores24 инкрементальное извлечение ошибка: {e}")
+            return None
+        
+        polls = self._incremental_polls.get(page_key, 0) + 1
+        self._incremental_polls[page_key] = polls
+        if self.full_parse_interval and polls % self.full_parse_interval == 0:
+            return self._verify_incremental(page_key, matches, response)
+        
+        return matches
+    
+    def _verify_incremental(self, page_key: str, matches: List[Dict[str, Any]], response) -> List[Dict[str, Any]]:
+        """
+        Сверка инкрементального результата с полным разбором той же страницы
+        
+        При расхождении состояние строк страницы сбрасывается и возвращается полный результат
+        """
+        full_matches = self._parse_full_response(response)
+        if not full_matches and matches:
+            # Пустой полный разбор (таймаут пула) сверке не подлежит
+            return matches
+        
+        self.incremental_stats['verified'] += 1
+        if self._match_signatures(full_matches) == self._match_signatures(matches):
+            return matches
+        
+        self.incremental_stats['mismatches'] += 1
+        self.logger.warning(f"Scores24 {page_key}: инкрементальный разбор расходится с полным "
+                            f"({len(matches)} против {len(full_matches)} матчей), состояние строк сброшено")
+        self.fragment_extractor.reset(page_key)
+        return full_matches
+    
+    @staticmethod
+    def _strategy_rank(match: Dict[str, Any]) -> tuple:
+        """Порядок стратегий полного разбора: селекторы, паттерны по номеру, таблицы, списки"""
+        source = match.get('source', '')
+        if source.startswith('scores24_pattern_'):
+            return (1, int(source.rsplit('_', 1)[1]))
+        if source in STRUCTURE_SOURCES:
+            return (2, STRUCTURE_SOURCES.index(source))
+        return (0, 0)
+    
+    @staticmethod
+    def _match_signatures(matches: List[Dict[str, Any]]) -> List[tuple]:
+        """Содержимое матчей без меток времени, независимо от порядка"""
+        return sorted(
+            tuple(sorted((key, str(value)) for key, value in match.items() if key != 'timestamp'))
+            for match in matches
+        )
+    
     def _extract_by_selectors(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         """
         Извлечение по CSS селекторам
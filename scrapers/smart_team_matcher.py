@@ -7,9 +7,11 @@ import re
 import logging
 from typing import List, Dict, Any, Optional, Tuple
 from difflib import SequenceMatcher
-import requests
 from bs4 import BeautifulSoup
 
+from utils.http_transport import get_global_transport
+from utils.bounded_cache import BoundedCache
+
 
 class SmartTeamMatcher:
     """
@@ -25,29 +27,29 @@ class SmartTeamMatcher:
     - Присваиваем правильные счета правильным командам
     """
     
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, transport=None):
         self.logger = logger
         
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'ru-RU,ru;q=0.8,en-US;q=0.5,en;q=0.3'
-        }
+        # Сессия поверх общего транспорта
+        self.session = (transport or get_global_transport(logger)).session('smart_matcher', 'html_ru')
         
-        # Кэш для сопоставлений
-        self._team_matches_cache = {}
+        # Кэш для сопоставлений: пары названий повторяются от цикла к циклу
+        self._team_matches_cache = BoundedCache('team_matches', max_entries=20000, ttl=3600)
         
-    def get_sofascore_matches_with_teams(self) -> List[Dict[str, Any]]:
+    def get_sofascore_matches_with_teams(self, sport: str = 'football') -> List[Dict[str, Any]]:
         """
         Получает матчи из SofaScore с названиями команд И счетами
         
+        Args:
+            sport: вид спорта (страница live-счетов этого вида)
+        
         Returns:
             List[Dict]: [{'team1': 'Команда А', 'team2': 'Команда Б', 'score': '1:0'}, ...]
         """
         
         try:
-            url = 'https://www.sofascore.com/football/livescore'
-            response = requests.get(url, headers=self.headers, timeout=10)
+            url = f"https://www.sofascore.com/{sport.replace('_', '-')}/livescore"
+            response = self.session.get(url, timeout=10)
             
             if response.status_code != 200:
                 self.logger.error(f"SofaScore HTTP {response.status_code}")
@@ -67,7 +69,7 @@ class SmartTeamMatcher:
             # Дедуплицируем
             unique_matches = self._deduplicate_sofascore_matches(matches)
             
-            self.logger.info(f"SofaScore: извлечено {len(unique_matches)} матчей с командами и счетами")
+            self.logger.info(f"SofaScore {sport}: извлечено {len(unique_matches)} матчей с командами и счетами")
             return unique_matches
             
         except Exception as e:
@@ -222,6 +224,11 @@ class SmartTeamMatcher:
             float: 0.0-1.0, где 1.0 = идеальное совпадение
         """
         
+        cache_key = (mb_team1, mb_team2, ss_team1, ss_team2)
+        cached = self._team_matches_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Нормализуем названия
         mb_team1_norm = self._normalize_team_name(mb_team1)
         mb_team2_norm = self._normalize_team_name(mb_team2)
@@ -235,7 +242,9 @@ class SmartTeamMatcher:
         reverse_sim = (self._string_similarity(mb_team1_norm, ss_team2_norm) + 
                       self._string_similarity(mb_team2_norm, ss_team1_norm)) / 2
         
-        return max(direct_sim, reverse_sim)
+        similarity = max(direct_sim, reverse_sim)
+        self._team_matches_cache[cache_key] = similarity
+        return similarity
     
     def _normalize_team_name(self, name: str) -> str:
         """Нормализует название команды для сравнения"""
@@ -0,0 +1,538 @@
+"""
+Клиент JSON API SofaScore
+Данные матча читаются из структурированного JSON (эндпоинты api/v1/event/... или
+встроенный в страницу блоб Next.js __NEXT_DATA__) вместо регулярных выражений по
+отрендеренному HTML: несколько килобайт JSON на матч вместо сотен килобайт страницы.
+Функции разбора чистые (принимают уже декодированный JSON) и проверяются на
+записанных ответах API без сети
+"""
+
+import re
+import json
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.http_transport import HttpTransport, get_global_transport
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+API_BASE_URL = 'https://api.sofascore.com/api/v1'
+SITE_BASE_URL = 'https://www.sofascore.com'
+
+# /football/match/chile-brazil/YUbseVb#id:14169219
+_EVENT_ID_RE = re.compile(r'#id:(\d+)')
+_NEXT_DATA_OPEN = '<script id="__NEXT_DATA__"'
+
+# Коды статуса SofaScore -> отображение времени
+_STATUS_TIME = {
+    31: 'HT',   # Перерыв
+    100: 'FT',  # Завершен
+    110: 'FT',  # После дополнительного времени
+    120: 'FT',  # После серии пенальти
+}
+
+# Статистика из API -> ключи базовой статистики (как в HTML пути)
+_BASIC_STAT_NAMES = {
+    'Ball possession': 'possession',
+    'Expected goals': 'xG',
+    'Total shots': 'shots',
+}
+
+# Вид спорта в URL -> вид спорта в системе
+_URL_SPORTS = {
+    'tennis': 'tennis',
+    'handball': 'handball',
+    'table-tennis': 'table_tennis',
+    'basketball': 'basketball',
+    'football': 'football',
+}
+
+
+def loads(data: Any) -> Any:
+    """Декодирование JSON (orjson, если установлен)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+# ---- типизированные результаты ----
+
+@dataclass
+class EventInfo:
+    """Событие (матч) SofaScore"""
+    event_id: int
+    home_team: str
+    away_team: str
+    home_score: Optional[int] = None
+    away_score: Optional[int] = None
+    status_code: int = 0
+    status_type: str = ''
+    status_description: str = ''
+    minute: Optional[int] = None
+    tournament: str = ''
+    category: str = ''
+    custom_id: str = ''
+    start_timestamp: int = 0
+    sport: str = ''
+
+    @property
+    def score(self) -> str:
+        if self.home_score is None or self.away_score is None:
+            return '0:0'
+        return f"{self.home_score}:{self.away_score}"
+
+    @property
+    def time(self) -> str:
+        if self.status_code in _STATUS_TIME:
+            return _STATUS_TIME[self.status_code]
+        if self.status_type == 'finished':
+            return 'FT'
+        if self.minute is not None:
+            return f"{self.minute}'"
+        return "1'"
+
+
+@dataclass
+class StatItem:
+    """Показатель статистики матча"""
+    name: str
+    home: str
+    away: str
+    home_value: Any = None
+    away_value: Any = None
+    group: str = ''
+
+
+@dataclass
+class H2HMatch:
+    """Прошлая личная встреча"""
+    start_timestamp: int
+    home_team: str
+    away_team: str
+    home_score: Optional[int]
+    away_score: Optional[int]
+    tournament: str = ''
+
+
+@dataclass
+class MatchDetails:
+    """Все данные матча из API"""
+    event: EventInfo
+    statistics: List[StatItem] = field(default_factory=list)
+    h2h: List[H2HMatch] = field(default_factory=list)
+    home_form: List[str] = field(default_factory=list)
+    away_form: List[str] = field(default_factory=list)
+    standings: Dict[str, Tuple[str, str]] = field(default_factory=dict)  # 'position' / 'points' -> (хозяева, гости)
+    odds: Dict[str, float] = field(default_factory=dict)  # '1' / 'X' / '2' -> десятичный коэффициент
+
+    def to_detailed_data(self) -> Dict[str, Any]:
+        """Словарь в формате SofaScoreSimpleQuality.get_detailed_match_data"""
+        event = self.event
+        data: Dict[str, Any] = {
+            'score': event.score,
+            'time': event.time,
+            'league': event.tournament or 'SofaScore Live',
+            'sport': event.sport,
+            'match_id': str(event.event_id),
+            'data_format': 'json'
+        }
+
+        if self.statistics:
+            data['detailed_statistics'] = {
+                item.name: {
+                    'team1': str(item.home_value if item.home_value is not None else item.home),
+                    'team2': str(item.away_value if item.away_value is not None else item.away)
+                }
+                for item in self.statistics
+            }
+            basic = {
+                _BASIC_STAT_NAMES[item.name]: {'team1': item.home, 'team2': item.away}
+                for item in self.statistics if item.name in _BASIC_STAT_NAMES
+            }
+            if basic:
+                data['statistics'] = basic
+
+        if self.h2h:
+            data['h2h'] = [
+                {
+                    'date': match.start_timestamp,
+                    'home_team': match.home_team,
+                    'away_team': match.away_team,
+                    'score': f"{match.home_score if match.home_score is not None else ''}-"
+                             f"{match.away_score if match.away_score is not None else ''}",
+                    'tournament': match.tournament
+                }
+                for match in self.h2h
+            ]
+
+        if self.home_form and self.away_form:
+            data['team_form'] = {
+                'team1_form': ''.join(self.home_form),
+                'team2_form': ''.join(self.away_form)
+            }
+
+        if len(self.odds) >= 2:
+            data['odds'] = {'1X2': {key: str(value) for key, value in self.odds.items()}}
+
+        tournament_info: Dict[str, Any] = {}
+        if event.tournament:
+            tournament_info.update({'tournament': event.tournament, 'category': event.category})
+        # Позиции и очки в таблице - в тех же ключах, что и в HTML пути
+        if 'position' in self.standings:
+            home, away = self.standings['position']
+            tournament_info['table_positions'] = {'team1_position': home, 'team2_position': away}
+        if 'points' in self.standings:
+            home, away = self.standings['points']
+            tournament_info['tournament_points'] = {'team1_points': home, 'team2_points': away}
+        if tournament_info:
+            data['tournament_info'] = tournament_info
+
+        return data
+
+
+# ---- разбор JSON ----
+
+def _team_name(team: Any) -> str:
+    if not isinstance(team, dict):
+        return ''
+    return team.get('name') or team.get('shortName') or ''
+
+
+def _score_value(score: Any) -> Optional[int]:
+    if isinstance(score, dict):
+        score = score.get('current', score.get('display'))
+    return score if isinstance(score, int) else None
+
+
+def _current_minute(event: Dict[str, Any], now: float) -> Optional[int]:
+    """Минута матча по началу текущего периода (так ее считает сайт)"""
+    period = event.get('time') or {}
+    started = period.get('currentPeriodStartTimestamp')
+    if not started:
+        return None
+    initial = period.get('initial', 0) or 0
+    minute = int((now - started + initial) // 60) + 1
+    limit = period.get('max')
+    if limit:
+        extra = period.get('extra', 0) or 0
+        minute = min(minute, (limit + extra) // 60)
+    return max(minute, 1)
+
+
+def parse_event(payload: Dict[str, Any], now: Optional[float] = None) -> Optional[EventInfo]:
+    """
+    Разбор ответа /event/{id} (или объекта события из __NEXT_DATA__)
+
+    Args:
+        payload: {'event': {...}} или сам объект события
+        now: текущее время для расчета минуты (по умолчанию time.time())
+    """
+    event = payload.get('event', payload) if isinstance(payload, dict) else None
+    if not isinstance(event, dict) or 'id' not in event:
+        return None
+
+    home, away = _team_name(event.get('homeTeam')), _team_name(event.get('awayTeam'))
+    if not home or not away:
+        return None
+
+    status = event.get('status') or {}
+    tournament = event.get('tournament') or {}
+    unique = tournament.get('uniqueTournament') or {}
+    sport = ((tournament.get('category') or {}).get('sport') or {}).get('slug', '')
+
+    info = EventInfo(
+        event_id=int(event['id']),
+        home_team=home,
+        away_team=away,
+        home_score=_score_value(event.get('homeScore')),
+        away_score=_score_value(event.get('awayScore')),
+        status_code=status.get('code', 0) or 0,
+        status_type=status.get('type', '') or '',
+        status_description=status.get('description', '') or '',
+        tournament=unique.get('name') or tournament.get('name', ''),
+        category=(tournament.get('category') or {}).get('name', ''),
+        custom_id=event.get('customId', '') or '',
+        start_timestamp=event.get('startTimestamp', 0) or 0,
+        sport=_URL_SPORTS.get(sport, sport)
+    )
+
+    if info.status_type == 'inprogress' and info.status_code not in _STATUS_TIME:
+        info.minute = _current_minute(event, time.time() if now is None else now)
+
+    return info
+
+
+def parse_statistics(payload: Dict[str, Any], period: str = 'ALL') -> List[StatItem]:
+    """Разбор ответа /event/{id}/statistics (только указанный период)"""
+    items: List[StatItem] = []
+    for block in payload.get('statistics') or []:
+        if not isinstance(block, dict) or block.get('period', 'ALL') != period:
+            continue
+        for group in block.get('groups') or []:
+            for item in group.get('statisticsItems') or []:
+                name = item.get('name')
+                if not name:
+                    continue
+                items.append(StatItem(
+                    name=name,
+                    home=str(item.get('home', '')),
+                    away=str(item.get('away', '')),
+                    home_value=item.get('homeValue'),
+                    away_value=item.get('awayValue'),
+                    group=group.get('groupName', '')
+                ))
+    return items
+
+
+def parse_h2h_events(payload: Dict[str, Any], limit: int = 5) -> List[H2HMatch]:
+    """Разбор ответа /event/{customId}/h2h/events (последние встречи первыми)"""
+    events = [event for event in payload.get('events') or [] if isinstance(event, dict)]
+    events.sort(key=lambda event: event.get('startTimestamp', 0), reverse=True)
+
+    matches = []
+    for event in events[:limit]:
+        tournament = event.get('tournament') or {}
+        matches.append(H2HMatch(
+            start_timestamp=event.get('startTimestamp', 0),
+            home_team=_team_name(event.get('homeTeam')),
+            away_team=_team_name(event.get('awayTeam')),
+            home_score=_score_value(event.get('homeScore')),
+            away_score=_score_value(event.get('awayScore')),
+            tournament=(tournament.get('uniqueTournament') or {}).get('name') or tournament.get('name', '')
+        ))
+    return matches
+
+
+def parse_pregame_form(payload: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Разбор ответа /event/{id}/pregame-form: формы хозяев и гостей"""
+    home = (payload.get('homeTeam') or {}).get('form') or []
+    away = (payload.get('awayTeam') or {}).get('form') or []
+    return [str(result) for result in home], [str(result) for result in away]
+
+
+def parse_pregame_standings(payload: Dict[str, Any]) -> Dict[str, Tuple[str, str]]:
+    """Разбор ответа /event/{id}/pregame-form: позиции и очки команд в таблице"""
+    home, away = payload.get('homeTeam') or {}, payload.get('awayTeam') or {}
+    standings = {}
+    if home.get('position') is not None and away.get('position') is not None:
+        standings['position'] = (str(home['position']), str(away['position']))
+    if payload.get('label') == 'Pts' and home.get('value') is not None and away.get('value') is not None:
+        standings['points'] = (str(home['value']), str(away['value']))
+    return standings
+
+
+def _fraction_to_decimal(value: str) -> Optional[float]:
+    try:
+        numerator, denominator = value.split('/')
+        return round(1 + int(numerator) / int(denominator), 2)
+    except (AttributeError, ValueError, ZeroDivisionError):
+        return None
+
+
+def parse_featured_odds(payload: Dict[str, Any]) -> Dict[str, float]:
+    """Разбор ответа /event/{id}/odds/1/featured: основной рынок 1X2"""
+    market = ((payload.get('featured') or {}).get('default')) or {}
+    odds = {}
+    for choice in market.get('choices') or []:
+        name = choice.get('name')
+        if name in ('1', 'X', '2'):
+            value = choice.get('decimalValue') or _fraction_to_decimal(choice.get('fractionalValue'))
+            if value:
+                odds[name] = float(value)
+    return odds
+
+
+def extract_next_data(html: str) -> Optional[Dict[str, Any]]:
+    """JSON блоб __NEXT_DATA__ со страницы (поиск подстроки, без разбора DOM)"""
+    start = html.find(_NEXT_DATA_OPEN)
+    if start < 0:
+        return None
+    start = html.find('>', start) + 1
+    end = html.find('</script>', start)
+    if start <= 0 or end < 0:
+        return None
+    try:
+        return loads(html[start:end])
+    except ValueError:
+        return None
+
+
+def find_event_in_next_data(data: Any, max_depth: int = 8) -> Optional[Dict[str, Any]]:
+    """Объект события внутри __NEXT_DATA__ (структура pageProps отличается по страницам)"""
+    stack = [(data, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, dict):
+            event = node.get('event')
+            if isinstance(event, dict) and 'homeTeam' in event and 'awayTeam' in event and 'id' in event:
+                return event
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        if depth < max_depth:
+            stack.extend((child, depth + 1) for child in children if isinstance(child, (dict, list)))
+    return None
+
+
+def event_id_from_url(match_url: str) -> Optional[int]:
+    """ID события из URL матча (#id:14169219)"""
+    found = _EVENT_ID_RE.search(match_url or '')
+    return int(found.group(1)) if found else None
+
+
+def sport_from_url(match_url: str, default: str = 'football') -> str:
+    """Вид спорта из URL матча (/table-tennis/match/...)"""
+    segment = (match_url or '').split('://')[-1].split('/match/')[0].rstrip('/').rsplit('/', 1)[-1]
+    return _URL_SPORTS.get(segment, default)
+
+
+# ---- клиент ----
+
+class SofaScoreApiClient:
+    """
+    Клиент JSON API SofaScore поверх общего транспорта
+    """
+
+    def __init__(self, logger: logging.Logger, transport: Optional[HttpTransport] = None):
+        self.logger = logger
+        transport = transport or get_global_transport(logger)
+        self.session = transport.session('sofascore_api', 'json_en', {
+            'Origin': SITE_BASE_URL,
+            'Referer': SITE_BASE_URL + '/'
+        })
+        # Страница нужна только если в URL нет ID события
+        self.page_session = transport.session('sofascore', 'html_en')
+
+        self.stats = {
+            'matches': 0,
+            'failed': 0,
+            'requests': 0,
+            'bytes': 0,
+            'decode_time': 0.0,
+            'cpu_time': 0.0
+        }
+
+    def _get_json(self, path: str, timeout: float = 8) -> Optional[Dict[str, Any]]:
+        """GET эндпоинта API: None при ошибке или отсутствии данных (404)"""
+        try:
+            response = self.session.get(f"{API_BASE_URL}{path}", timeout=timeout)
+        except Exception as e:
+            self.logger.debug(f"SofaScore API {path}: {e}")
+            return None
+
+        self.stats['requests'] += 1
+        if response.status_code != 200:
+            return None
+
+        content = response.content
+        self.stats['bytes'] += len(content)
+        started = time.perf_counter()
+        try:
+            data = loads(content)
+        except ValueError:
+            return None
+        finally:
+            self.stats['decode_time'] += time.perf_counter() - started
+
+        return data if isinstance(data, dict) else None
+
+    def resolve_event(self, match_url: str) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+        """
+        ID события по URL матча
+
+        Returns:
+            (ID события, объект события из __NEXT_DATA__ если пришлось загрузить страницу)
+        """
+        event_id = event_id_from_url(match_url)
+        if event_id is not None:
+            return event_id, None
+
+        url = match_url if match_url.startswith('http') else f"{SITE_BASE_URL}{match_url}"
+        try:
+            response = self.page_session.get(url, timeout=10)
+            if response.status_code != 200:
+                return None, None
+            event = find_event_in_next_data(extract_next_data(response.text))
+        except Exception as e:
+            self.logger.debug(f"SofaScore __NEXT_DATA__ {match_url}: {e}")
+            return None, None
+
+        if event is None:
+            return None, None
+        return int(event['id']), event
+
+    def get_match_details(self, match_url: str, sport: Optional[str] = None,
+                          with_h2h: bool = True, with_form: bool = True,
+                          with_odds: bool = True) -> Optional[MatchDetails]:
+        """
+        Данные матча из JSON API
+
+        Returns:
+            MatchDetails или None (вызывающий код переходит к HTML пути)
+        """
+        cpu_started = time.thread_time()
+        try:
+            event_id, embedded = self.resolve_event(match_url)
+            if event_id is None:
+                return None
+
+            payload = self._get_json(f"/event/{event_id}") or embedded
+            event = parse_event(payload) if payload else None
+            if event is None:
+                self.stats['failed'] += 1
+                return None
+            event.sport = sport or event.sport or sport_from_url(match_url)
+
+            details = MatchDetails(event=event)
+
+            # Статистики нет у не начавшихся матчей (404) - это не ошибка
+            statistics = self._get_json(f"/event/{event_id}/statistics")
+            if statistics:
+                details.statistics = parse_statistics(statistics)
+
+            if with_h2h and event.custom_id:
+                h2h = self._get_json(f"/event/{event.custom_id}/h2h/events")
+                if h2h:
+                    details.h2h = parse_h2h_events(h2h)
+
+            if with_form:
+                form = self._get_json(f"/event/{event_id}/pregame-form")
+                if form:
+                    details.home_form, details.away_form = parse_pregame_form(form)
+                    details.standings = parse_pregame_standings(form)
+
+            if with_odds:
+                odds = self._get_json(f"/event/{event_id}/odds/1/featured")
+                if odds:
+                    details.odds = parse_featured_odds(odds)
+
+            self.stats['matches'] += 1
+            return details
+
+        except Exception as e:
+            self.stats['failed'] += 1
+            self.logger.warning(f"SofaScore API ошибка {match_url}: {e}")
+            return None
+
+        finally:
+            # Процессорное время потока: запросы, декодирование и разбор (ожидание сети не входит)
+            self.stats['cpu_time'] += time.thread_time() - cpu_started
+
+    def get_stats(self) -> Dict[str, Any]:
+        matches = self.stats['matches']
+        return {
+            **self.stats,
+            'decode_time': round(self.stats['decode_time'], 4),
+            'cpu_time': round(self.stats['cpu_time'], 4),
+            'bytes_per_match': int(self.stats['bytes'] / matches) if matches else 0,
+            'cpu_ms_per_match': round(self.stats['cpu_time'] * 1000 / matches, 2) if matches else 0.0
+        }
@@ -3,7 +3,6 @@
 На основе анализа реальных данных с сайта
 """
 import requests
-import time
 import re
 import json
 from typing import List, Dict, Any
@@ -12,6 +11,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from utils.browser_capture import CAPTURE_PROFILES, capture_page_selenium, enable_performance_log
 
 class SofaScoreLiveImproved:
     """
@@ -30,6 +30,8 @@ class SofaScoreLiveImproved:
         self.chrome_options.add_argument('--disable-gpu')
         self.chrome_options.add_argument('--window-size=1920,1080')
         self.chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        # Журнал performance для перехвата JSON ответов API страницы
+        enable_performance_log(self.chrome_options)
     
     def get_current_live_matches(self, sport: str = 'football') -> List[Dict[str, Any]]:
         """
@@ -41,8 +43,8 @@ class SofaScoreLiveImproved:
             self.driver = webdriver.Chrome(options=self.chrome_options)
             
             # Переходим на главную страницу SofaScore
-            self.driver.get('https://www.sofascore.com/')
-            time.sleep(8)  # Ждем полной загрузки
+            capture_page_selenium(self.driver, 'https://www.sofascore.com/', CAPTURE_PROFILES['sofascore'],
+                                  self.logger, timeout=8)  # Ждем live данных, не дольше 8 секунд
             
             # Ищем live матчи на главной странице
             matches = self._extract_live_matches_from_main_page()
@@ -50,8 +52,8 @@ class SofaScoreLiveImproved:
             if not matches:
                 # Если на главной странице не нашли, переходим на страницу спорта
                 sport_url = f'https://www.sofascore.com/{sport}/live'
-                self.driver.get(sport_url)
-                time.sleep(8)
+                capture_page_selenium(self.driver, sport_url, CAPTURE_PROFILES['sofascore'],
+                                      self.logger, timeout=8)
                 
                 matches = self._extract_live_matches_from_sport_page(sport)
             
@@ -1,7 +1,7 @@
 """
 Рабочий скрапер SofaScore.com
 """
-import requests
+from utils.http_transport import USER_AGENTS, get_global_transport
 from bs4 import BeautifulSoup
 import re
 import json
@@ -12,13 +12,11 @@ class SofaScoreScraperV2:
     Рабочий скрапер SofaScore для извлечения максимума live данных
     """
     
-    def __init__(self, logger):
+    def __init__(self, logger, transport=None):
         self.logger = logger
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.7339.80 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
+        # HTTP сессия поверх общего транспорта
+        self.session = (transport or get_global_transport(logger)).session('sofascore_v2', 'html_en', {
+            'User-Agent': USER_AGENTS['chrome_linux'],
             'Cache-Control': 'no-cache'
         })
     
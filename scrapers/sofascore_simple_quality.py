@@ -1,24 +1,26 @@
 """
 Простой качественный скрапер SofaScore
 """
-import requests
 from bs4 import BeautifulSoup
 import re
 from typing import List, Dict, Any
+from utils.conditional_http import create_conditional_session
+from scrapers.sofascore_api import SofaScoreApiClient, sport_from_url
 
 class SofaScoreSimpleQuality:
     """
     Простой но качественный скрапер SofaScore
     """
     
-    def __init__(self, logger):
+    def __init__(self, logger, transport=None):
         self.logger = logger
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9'
-        })
+        # HTTP сессия поверх общего транспорта (условные запросы + кэш разобранных страниц)
+        self.session = create_conditional_session('sofascore', 'html_en', transport=transport)
+        # Детальные данные матча из JSON API (HTML путь остается запасным)
+        self.api_client = SofaScoreApiClient(logger, transport)
+        
+        # Сервис парсинга в пуле процессов (устанавливается агрегатором)
+        self.parse_service = None
     
     def get_live_matches(self, sport: str) -> List[Dict[str, Any]]:
         """
@@ -40,39 +42,21 @@ class SofaScoreSimpleQuality:
             return []
         
         try:
-            # ИСПРАВЛЕНИЕ: Добавляем заголовки для получения свежих данных (не кэш)
-            fresh_headers = self.session.headers.copy()
-            fresh_headers.update({
-                'Cache-Control': 'no-cache, no-store, must-revalidate',
-                'Pragma': 'no-cache', 
-                'Expires': '0',
-                'If-None-Match': '',
-                'If-Modified-Since': ''
-            })
+            # Свежие данные у промежуточных кэшей, но с ревалидацией по ETag/Last-Modified:
+            # неизменившаяся страница не разбирается повторно
+            fresh_headers = {
+                'Cache-Control': 'no-cache',
+                'Pragma': 'no-cache'
+            }
             
-            response = self.session.get(url, headers=fresh_headers, timeout=15)
+            unique_matches, response = self.session.get_parsed(
+                url, lambda r: self._parse_live_page(r, sport), variant=sport,
+                headers=fresh_headers, timeout=15
+            )
             
-            if response.status_code != 200:
+            if unique_matches is None:
                 return []
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Извлекаем ссылки на матчи
-            match_links = soup.find_all('a', href=re.compile(r'/match/'))
-            
-            matches = []
-            
-            for link in match_links:
-                try:
-                    match_data = self._parse_match_link(link, sport)
-                    if match_data:
-                        matches.append(match_data)
-                except Exception:
-                    continue
-            
-            # Убираем дубликаты
-            unique_matches = self._remove_duplicates(matches, sport)
-            
             self.logger.info(f"SofaScore {sport}: {len(unique_matches)} качественных матчей")
             return unique_matches
             
@@ -80,13 +64,51 @@ class SofaScoreSimpleQuality:
             self.logger.error(f"SofaScore {sport} ошибка: {e}")
             return []
     
+    def _parse_live_page(self, response, sport: str) -> List[Dict[str, Any]]:
+        """
+        Разбор страницы live матчей для вида спорта
+        """
+        # Извлекаем ссылки на матчи (разбор HTML - в пуле процессов, если он есть)
+        if self.parse_service:
+            match_links = self.parse_service.parse('sofascore_links', response.content,
+                                                   encoding=response.encoding or 'utf-8')
+        else:
+            match_links = self._extract_match_links_from_html(response.text)
+        
+        matches = []
+        
+        for href, text in match_links:
+            try:
+                match_data = self._parse_match_link_data(href, text, sport)
+                if match_data:
+                    matches.append(match_data)
+            except Exception:
+                continue
+        
+        # Убираем дубликаты
+        return self._remove_duplicates(matches, sport)
+    
+    def _extract_match_links_from_html(self, html_content: str) -> List[tuple]:
+        """
+        Извлечение ссылок на матчи в виде пар (href, text)
+        """
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        return [
+            (link.get('href', ''), link.get_text(strip=True))
+            for link in soup.find_all('a', href=re.compile(r'/match/'))
+        ]
+    
     def _parse_match_link(self, link, sport: str) -> Dict[str, Any]:
         """
         Парсинг ссылки на матч
         """
-        href = link.get('href', '')
-        text = link.get_text(strip=True)
-        
+        return self._parse_match_link_data(link.get('href', ''), link.get_text(strip=True), sport)
+    
+    def _parse_match_link_data(self, href: str, text: str, sport: str) -> Dict[str, Any]:
+        """
+        Парсинг данных ссылки на матч
+        """
         if not href or not text:
             return None
         
@@ -481,14 +503,25 @@ class SofaScoreSimpleQuality:
         """
         if team2 is None:
             # Передан URL матча
-            full_url = f"https://www.sofascore.com{team1_or_url}"
+            match_url = team1_or_url
         else:
             # Переданы названия команд - ищем матч
             match_url = self._find_match_url(team1_or_url, team2, sport)
             if not match_url:
                 self.logger.warning(f"SofaScore: матч {team1_or_url} vs {team2} не найден")
                 return {}
-            full_url = f"https://www.sofascore.com{match_url}"
+        full_url = f"https://www.sofascore.com{match_url}"
+        
+        # Определяем вид спорта из URL если не передан
+        if sport == 'football':
+            sport = sport_from_url(match_url, sport)
+        
+        # Сначала JSON API: несколько килобайт JSON вместо двух загрузок страницы
+        details = self.api_client.get_match_details(match_url, sport)
+        if details is not None:
+            return details.to_detailed_data()
+        
+        self.logger.debug(f"SofaScore API недоступен для {match_url}, разбор HTML")
         
         try:
             response = self.session.get(full_url, timeout=15)
@@ -499,17 +532,6 @@ class SofaScoreSimpleQuality:
             page_text = response.text
             detailed_data = {}
             
-            # Определяем вид спорта из URL если не передан
-            if sport == 'football' and match_url:
-                if '/tennis/' in match_url:
-                    sport = 'tennis'
-                elif '/handball/' in match_url:
-                    sport = 'handball'
-                elif '/table-tennis/' in match_url:
-                    sport = 'table_tennis'
-                elif '/basketball/' in match_url:
-                    sport = 'basketball'
-            
             # Базовые данные матча
             basic_data = self._get_basic_match_data(match_url)
             detailed_data.update(basic_data)
@@ -0,0 +1,275 @@
+"""
+Реестр источников данных с ленивой загрузкой
+Модули источников импортируются и создаются только при первом обращении,
+поэтому неактивные источники (selenium, playwright, лишние requests.Session) не стоят ничего
+"""
+
+import os
+import time
+import importlib
+import threading
+import logging
+from dataclasses import dataclass, field
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """Описание источника: где лежит класс и что он умеет"""
+    name: str
+    module: str
+    class_name: str
+    kind: str = 'match'  # match | stats | sport | analyzer
+    sports: Tuple[str, ...] = ()
+    data_types: Tuple[str, ...] = ()
+    transport: str = 'http'  # http | selenium | playwright | api
+
+
+@dataclass
+class LoadRecord:
+    """Стоимость загрузки источника"""
+    name: str
+    import_seconds: float = 0.0
+    init_seconds: float = 0.0
+    rss_delta_kb: int = 0
+    loaded_at: float = field(default_factory=time.time)
+
+
+ALL_SPORTS = ('football', 'tennis', 'table_tennis', 'handball')
+
+# Встроенные источники системы
+DEFAULT_SOURCES = (
+    # Основные источники матчей
+    SourceSpec('sofascore', 'scrapers.sofascore_simple_quality', 'SofaScoreSimpleQuality', 'match',
+               ALL_SPORTS, ('live_scores', 'detailed_stats', 'player_ratings', 'basic_info', 'betting_odds'), 'http'),
+    SourceSpec('flashscore', 'scrapers.flashscore_scraper', 'FlashScoreScraper', 'match',
+               ALL_SPORTS, ('live_scores', 'detailed_stats', 'basic_info'), 'selenium'),
+    SourceSpec('scores24', 'scrapers.scores24_scraper', 'Scores24Scraper', 'match',
+               ('football',), ('live_scores', 'basic_info'), 'selenium'),
+    SourceSpec('marathonbet', 'scrapers.marathonbet_scraper', 'MarathonBetScraper', 'match',
+               ALL_SPORTS, ('live_scores', 'basic_info', 'betting_odds'), 'selenium'),
+
+    # Сборщики статистики
+    SourceSpec('team_stats', 'scrapers.team_stats_collector', 'TeamStatsCollector', 'stats',
+               ('football',), ('team_stats',), 'http'),
+    SourceSpec('understat', 'scrapers.understat_scraper', 'UnderstatScraper', 'stats',
+               ('football',), ('xg', 'player_stats'), 'http'),
+    SourceSpec('fotmob', 'scrapers.fotmob_scraper', 'FotMobScraper', 'stats',
+               ('football',), ('match_analytics', 'player_ratings'), 'api'),
+
+    # Браузерные скраперы по видам спорта (основной цикл)
+    SourceSpec('football', 'scrapers.football_scraper', 'FootballScraper', 'sport',
+               ('football',), ('basic_info', 'detailed_stats'), 'selenium'),
+    SourceSpec('tennis', 'scrapers.tennis_scraper', 'TennisScraper', 'sport',
+               ('tennis',), ('basic_info', 'detailed_stats'), 'selenium'),
+    SourceSpec('table_tennis', 'scrapers.table_tennis_scraper', 'TableTennisScraper', 'sport',
+               ('table_tennis',), ('basic_info', 'detailed_stats'), 'selenium'),
+    SourceSpec('handball', 'scrapers.handball_scraper', 'HandballScraper', 'sport',
+               ('handball',), ('basic_info', 'detailed_stats'), 'selenium'),
+
+    # Анализаторы Claude AI
+    SourceSpec('claude_v1', 'ai_analyzer.claude_analyzer', 'ClaudeAnalyzer', 'analyzer', (), ('analysis',), 'api'),
+    SourceSpec('claude_v2', 'ai_analyzer.claude_analyzer_v2', 'ClaudeAnalyzerV2', 'analyzer', (), ('analysis',), 'api'),
+)
+
+
+def _current_rss_kb() -> int:
+    """Текущий RSS процесса в KB (не пиковый: иначе прирост после пика не виден)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss // 1024
+    return 0
+
+
+class SourceRegistry:
+    """
+    Реестр источников с метаданными возможностей и ленивым созданием
+    """
+
+    def __init__(self, logger: logging.Logger, specs: Tuple[SourceSpec, ...] = DEFAULT_SOURCES):
+        self.logger = logger
+        self._specs: Dict[str, SourceSpec] = {}
+        self._instances: Dict[str, Any] = {}
+        self._load_records: Dict[str, LoadRecord] = {}
+        self._on_create: List[Callable[[str, Any], None]] = []
+        self._lock = threading.RLock()
+        self._started_at = time.perf_counter()
+        self._start_rss_kb = _current_rss_kb()
+
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: SourceSpec):
+        """Регистрация источника (без импорта модуля)"""
+        self._specs[spec.name] = spec
+
+    def add_create_hook(self, hook: Callable[[str, Any], None]):
+        """Хук, вызываемый для каждого вновь созданного источника"""
+        self._on_create.append(hook)
+        for name, instance in list(self._instances.items()):
+            hook(name, instance)
+
+    def spec(self, name: str) -> SourceSpec:
+        return self._specs[name]
+
+    def names(self, kind: Optional[str] = None, sport: Optional[str] = None,
+              data_type: Optional[str] = None) -> List[str]:
+        """Имена источников, подходящих под фильтр возможностей"""
+        return [
+            spec.name for spec in self._specs.values()
+            if (kind is None or spec.kind == kind)
+            and (sport is None or sport in spec.sports)
+            and (data_type is None or data_type in spec.data_types)
+        ]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def get(self, name: str) -> Any:
+        """
+        Получение экземпляра источника (импорт и создание при первом обращении)
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+
+            spec = self._specs[name]
+            rss_before = _current_rss_kb()
+
+            started = time.perf_counter()
+            module = importlib.import_module(spec.module)
+            imported = time.perf_counter()
+            instance = getattr(module, spec.class_name)(self.logger)
+            created = time.perf_counter()
+
+            self._load_records[name] = LoadRecord(
+                name=name,
+                import_seconds=imported - started,
+                init_seconds=created - imported,
+                rss_delta_kb=_current_rss_kb() - rss_before
+            )
+            self._instances[name] = instance
+
+            self.logger.info(
+                f"📦 Источник {name} загружен: импорт {imported - started:.2f}с, "
+                f"создание {created - imported:.2f}с ({spec.transport})"
+            )
+
+            for hook in self._on_create:
+                try:
+                    hook(name, instance)
+                except Exception as e:
+                    self.logger.warning(f"Хук создания источника {name}: {e}")
+
+            return instance
+
+    def override(self, name: str, instance: Any):
+        """Подмена экземпляра источника (стенды, бенчмарки); хуки создания не вызываются"""
+        with self._lock:
+            self._instances[name] = instance
+
+    def loaded_items(self, kind: Optional[str] = None) -> List[Tuple[str, Any]]:
+        """Только уже созданные источники (без побочной загрузки)"""
+        return [
+            (name, instance) for name, instance in list(self._instances.items())
+            if kind is None or self._specs[name].kind == kind
+        ]
+
+    def view(self, kind: str) -> 'LazySourceMap':
+        """Словарь-представление источников одного типа"""
+        return LazySourceMap(self, kind)
+
+    def get_import_report(self) -> Dict[str, Any]:
+        """
+        Отчет о бюджете загрузки: что реально импортировано и во что это обошлось
+        """
+        records = sorted(self._load_records.values(),
+                         key=lambda r: r.import_seconds + r.init_seconds, reverse=True)
+        return {
+            'registered': len(self._specs),
+            'loaded': [r.name for r in records],
+            'not_loaded': [name for name in self._specs if name not in self._instances],
+            'total_import_seconds': round(sum(r.import_seconds for r in records), 3),
+            'total_init_seconds': round(sum(r.init_seconds for r in records), 3),
+            'uptime_seconds': round(time.perf_counter() - self._started_at, 3),
+            'rss_growth_kb': _current_rss_kb() - self._start_rss_kb,
+            'sources': {
+                r.name: {
+                    'import_seconds': round(r.import_seconds, 3),
+                    'init_seconds': round(r.init_seconds, 3),
+                    'rss_delta_kb': r.rss_delta_kb,
+                    'transport': self._specs[r.name].transport
+                }
+                for r in records
+            }
+        }
+
+    def log_import_report(self):
+        """Вывод отчета о бюджете загрузки в лог"""
+        report = self.get_import_report()
+        self.logger.info(
+            f"📦 Источники: загружено {len(report['loaded'])}/{report['registered']}, "
+            f"импорт {report['total_import_seconds']}с, создание {report['total_init_seconds']}с, "
+            f"RSS +{report['rss_growth_kb']}KB"
+        )
+        for name, info in report['sources'].items():
+            self.logger.info(
+                f"   {name}: импорт {info['import_seconds']}с, создание {info['init_seconds']}с, "
+                f"RSS +{info['rss_delta_kb']}KB ({info['transport']})"
+            )
+        if report['not_loaded']:
+            self.logger.info(f"   не загружены: {', '.join(report['not_loaded'])}")
+
+
+class LazySourceMap(Mapping):
+    """
+    Словарь источников одного типа: ключи известны сразу,
+    экземпляр создается при первом обращении по ключу
+    """
+
+    def __init__(self, registry: SourceRegistry, kind: str):
+        self._registry = registry
+        self._kind = kind
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self:
+            raise KeyError(name)
+        return self._registry.get(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._registry._specs and self._registry._specs[name].kind == self._kind
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._registry.names(kind=self._kind))
+
+    def __len__(self) -> int:
+        return len(self._registry.names(kind=self._kind))
+
+    def loaded_items(self) -> List[Tuple[str, Any]]:
+        """Уже созданные источники этого типа"""
+        return self._registry.loaded_items(self._kind)
+
+
+# Глобальный реестр источников
+_global_registry: Optional[SourceRegistry] = None
+
+def get_global_source_registry(logger: logging.Logger) -> SourceRegistry:
+    """Получение глобального реестра источников"""
+    global _global_registry
+    if _global_registry is None:
+        _global_registry = SourceRegistry(logger)
+    return _global_registry
@@ -0,0 +1,387 @@
+"""
+Генератор синтетической нагрузки на основе DemoDataProvider
+Воспроизводимые (seed) наборы из сотен и тысяч live-матчей по видам спорта с
+реалистичными распределениями счета, минуты и коэффициентов, плюс парные списки
+"со стороны SofaScore" с зашумленными названиями команд (кириллица/латиница,
+префиксы FC/ФК, сокращения) и известными правильными связями - для бенчмарков
+сопоставления, слияния, фильтрации и отбора на объемах 1k-50k матчей
+"""
+
+import math
+import random
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from scrapers.demo_data_provider import DemoDataProvider
+
+# Объем вечернего пика (матчей одновременно)
+PEAK_EVENING_COUNTS = {
+    'football': 400,
+    'tennis': 250,
+    'table_tennis': 200,
+    'handball': 60,
+}
+
+_TRANSLIT = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e', 'ж': 'zh', 'з': 'z',
+    'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh',
+    'щ': 'shch', 'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+}
+
+_CLUB_WORDS = [
+    'Динамо', 'Спартак', 'Локомотив', 'Торпедо', 'Шахтер', 'Металлург', 'Крылья', 'Звезда',
+    'Урал', 'Факел', 'Энергия', 'Химик', 'Авангард', 'Сокол', 'Атлетико', 'Реал', 'Спортинг',
+    'Депортиво', 'Олимпик', 'Расинг', 'Стандард', 'Униан', 'Интер', 'Викинг', 'Арсенал',
+]
+
+_CITIES = [
+    'Москва', 'Казань', 'Ростов', 'Самара', 'Пермь', 'Омск', 'Тула', 'Брянск', 'Курск', 'Липецк',
+    'Тамбов', 'Орел', 'Воронеж', 'Саратов', 'Томск', 'Иркутск', 'Минск', 'Гомель', 'Львов', 'Рига',
+    'Мадрид', 'Лиссабон', 'Порту', 'Лион', 'Марсель', 'Генуя', 'Турин', 'Мюнхен', 'Гамбург', 'Бремен',
+    'Брюгге', 'Гент', 'Осло', 'Берген', 'Мальмё', 'Гётеборг', 'Краков', 'Варшава', 'Прага', 'Брно',
+]
+
+_RESERVE_TAGS = ['', '', '', '', ' II', ' U21', ' U19', ' (Ж)']
+
+_FIRST_NAMES = [
+    'Андрей', 'Даниил', 'Карен', 'Роман', 'Алексей', 'Павел', 'Илья', 'Максим', 'Никита', 'Артем',
+    'Анна', 'Мария', 'Дарья', 'Екатерина', 'Вероника', 'Людмила', 'Полина', 'Елена', 'Ольга', 'Ирина',
+]
+
+_SURNAMES = [
+    'Рублев', 'Медведев', 'Хачанов', 'Сафиуллин', 'Котов', 'Карацев', 'Ивашка', 'Шевченко', 'Бублик',
+    'Гасанов', 'Кудерметова', 'Александрова', 'Касаткина', 'Самсонова', 'Павлюченкова', 'Калинская',
+    'Блинкова', 'Андреева', 'Шнайдер', 'Звонарева', 'Гришин', 'Соколов', 'Лебедев', 'Новиков', 'Морозов',
+    'Волков', 'Зайцев', 'Орлов', 'Киселев', 'Макаров',
+]
+
+_TENNIS_TOURNAMENTS = ['ATP Challenger', 'ITF M25', 'ITF W35', 'WTA 250', 'ATP 250', 'UTR Pro Tour']
+_TABLE_TENNIS_TOURNAMENTS = ['Лига Про', 'TT Cup', 'Setka Cup', 'WTT Feeder', 'Czech Liga Pro']
+_HANDBALL_LEAGUES = ['Суперлига', 'EHF Champions League', 'Bundesliga', 'Liga ASOBAL', 'Starligue']
+
+
+def transliterate(text: str) -> str:
+    """Латинская запись кириллического названия (как у англоязычных источников)"""
+    result = []
+    for char in text:
+        lower = char.lower()
+        if lower in _TRANSLIT:
+            latin = _TRANSLIT[lower]
+            result.append(latin.capitalize() if char.isupper() and latin else latin)
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+@dataclass
+class SyntheticDataset:
+    """Парный набор: матчи MarathonBet, матчи SofaScore и правильные связи"""
+    sport: str
+    seed: int
+    marathonbet: List[Dict[str, Any]] = field(default_factory=list)
+    sofascore: List[Dict[str, Any]] = field(default_factory=list)
+    links: Dict[int, int] = field(default_factory=dict)  # индекс MarathonBet -> индекс SofaScore
+
+    def evaluate(self, predicted: Dict[int, int]) -> Dict[str, float]:
+        """Точность и полнота сопоставления относительно известных связей"""
+        correct = sum(1 for mb_index, ss_index in predicted.items() if self.links.get(mb_index) == ss_index)
+        precision = correct / len(predicted) if predicted else 0.0
+        recall = correct / len(self.links) if self.links else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return {
+            'predicted': len(predicted),
+            'correct': correct,
+            'precision': round(precision, 4),
+            'recall': round(recall, 4),
+            'f1': round(f1, 4)
+        }
+
+
+class SyntheticLoadGenerator(DemoDataProvider):
+    """
+    Воспроизводимый генератор больших наборов live-матчей
+    """
+
+    def __init__(self, seed: int = 42, noise: float = 0.6):
+        """
+        Args:
+            seed: зерно генератора (одинаковое зерно - одинаковые наборы)
+            noise: вероятность каждого искажения названия на стороне SofaScore
+        """
+        super().__init__()
+        self.seed = seed
+        self.noise = noise
+        self.rng = random.Random(seed)
+        self._serial = 0  # Сквозной номер: match_id уникален в пределах генератора
+
+        # Пулы названий: демо-команды + сгенерированные
+        self.football_pool = self._build_team_pool([team for pair in self.football_teams for team in pair[:2]])
+        self.handball_pool = self._build_team_pool([team for pair in self.handball_teams for team in pair[:2]])
+        self.player_pool = [player for pair in self.tennis_players for player in pair[:2]] + [
+            f"{first} {last}" for first in _FIRST_NAMES for last in _SURNAMES
+        ]
+
+    def _build_team_pool(self, base: List[str]) -> List[str]:
+        teams = list(base)
+        for club in _CLUB_WORDS:
+            for city in _CITIES:
+                teams.append(f"{club} {city}")
+        for tag in _RESERVE_TAGS[4:]:
+            teams.extend(f"{club} {city}{tag}" for club in _CLUB_WORDS[:8] for city in _CITIES[:20])
+        return teams
+
+    # ---- матчи ----
+
+    def generate_matches(self, sport: str, count: int) -> List[Dict[str, Any]]:
+        """Матчи одного вида спорта в формате MarathonBet"""
+        generators = {
+            'football': self._football_match,
+            'tennis': self._tennis_match,
+            'table_tennis': self._table_tennis_match,
+            'handball': self._handball_match,
+        }
+        generator = generators.get(sport)
+        if generator is None:
+            return []
+
+        pool = self.player_pool if sport in ('tennis', 'table_tennis') else (
+            self.football_pool if sport == 'football' else self.handball_pool)
+        pairs = self._unique_pairs(pool, count)
+        timestamp = datetime.now().isoformat()
+
+        matches = []
+        for team1, team2 in pairs:
+            self._serial += 1
+            index = self._serial
+            match = generator(team1, team2)
+            match.update({
+                'source': 'marathonbet',
+                'sport': sport,
+                'team1': team1,
+                'team2': team2,
+                'url': f"/synthetic/{sport}/{self.seed}/{index}",
+                'match_id': f"syn_{sport}_{self.seed}_{index}",
+                'timestamp': timestamp
+            })
+            matches.append(match)
+        return matches
+
+    def generate_cycle(self, counts: Optional[Dict[str, int]] = None, scale: float = 1.0) -> List[Dict[str, Any]]:
+        """Все виды спорта одного цикла (по умолчанию - объем вечернего пика)"""
+        counts = counts or PEAK_EVENING_COUNTS
+        matches = []
+        for sport, count in counts.items():
+            matches.extend(self.generate_matches(sport, max(1, int(count * scale))))
+        return matches
+
+    def _unique_pairs(self, pool: List[str], count: int) -> List[Tuple[str, str]]:
+        """Пары без повторов (при нехватке пула добавляются номера команд)"""
+        pairs, seen = [], set()
+        attempts = 0
+        while len(pairs) < count:
+            team1, team2 = self.rng.sample(pool, 2)
+            attempts += 1
+            if attempts > count * 20:
+                suffix = f" {attempts % 97 + 2}"
+                team1, team2 = team1 + suffix, team2 + suffix
+            if (team1, team2) in seen:
+                continue
+            seen.add((team1, team2))
+            pairs.append((team1, team2))
+        return pairs
+
+    def _poisson(self, rate: float) -> int:
+        # Алгоритм Кнута (rate небольшой)
+        limit, k, p = math.exp(-rate), 0, 1.0
+        while True:
+            p *= self.rng.random()
+            if p <= limit:
+                return k
+            k += 1
+
+    def _odds(self, probabilities: Dict[str, float], margin: float = 0.06) -> Dict[str, float]:
+        return {key: round(min(51.0, max(1.01, 1 / (max(p, 1e-6) * (1 + margin)))), 2) for key, p in probabilities.items()}
+
+    def _football_match(self, team1: str, team2: str) -> Dict[str, Any]:
+        minute = self.rng.randint(1, 90)
+        goals1 = self._poisson(1.45 * minute / 90)
+        goals2 = self._poisson(1.15 * minute / 90)
+
+        if minute == 45 and self.rng.random() < 0.5:
+            time_text = 'HT'
+        elif minute in (45, 90) and self.rng.random() < 0.5:
+            time_text = f"{minute}+{self.rng.randint(1, 5)}'"
+        else:
+            time_text = f"{minute}'"
+
+        # Вероятности исходов: сила команд + текущая разница с учетом оставшегося времени
+        remaining = 1 - minute / 90
+        lead = goals1 - goals2
+        strength = self.rng.gauss(0.2, 0.6)
+        x = strength * remaining + lead * (1.2 + 2.5 * (1 - remaining))
+        p_draw = 0.27 * remaining + (0.55 * (1 - remaining) if lead == 0 else 0.04 * remaining)
+        p_home = (1 - p_draw) / (1 + math.exp(-x))
+
+        return {
+            'score': f"{goals1}:{goals2}",
+            'time': time_text,
+            'league': self.rng.choice(self.football_teams)[2],
+            'odds': self._odds({'П1': p_home, 'X': p_draw, 'П2': 1 - p_draw - p_home})
+        }
+
+    def _tennis_match(self, team1: str, team2: str) -> Dict[str, Any]:
+        sets = [(6, self.rng.randint(0, 4)) if self.rng.random() < 0.5 else (self.rng.randint(0, 4), 6)
+                for _ in range(self.rng.choice([0, 1, 1, 2]))]
+        sets1 = sum(1 for a, b in sets if a > b)
+        sets2 = len(sets) - sets1
+        games = (self.rng.randint(0, 6), self.rng.randint(0, 6))
+        detail = ', '.join(f"{a}:{b}" for a, b in sets + [games])
+
+        x = self.rng.gauss(0, 0.8) + (sets1 - sets2) * 1.3 + (games[0] - games[1]) * 0.15
+        p1 = 1 / (1 + math.exp(-x))
+
+        return {
+            'score': f"{sets1}:{sets2} ({detail})",
+            'time': f"{len(sets) + 1}-й сет",
+            'league': self.rng.choice(_TENNIS_TOURNAMENTS),
+            'odds': self._odds({'П1': p1, 'П2': 1 - p1})
+        }
+
+    def _table_tennis_match(self, team1: str, team2: str) -> Dict[str, Any]:
+        sets1 = self.rng.randint(0, 2)
+        sets2 = self.rng.randint(0, 2)
+        points = (self.rng.randint(0, 11), self.rng.randint(0, 11))
+
+        x = self.rng.gauss(0, 0.6) + (sets1 - sets2) * 0.9 + (points[0] - points[1]) * 0.08
+        p1 = 1 / (1 + math.exp(-x))
+
+        return {
+            'score': f"{sets1}:{sets2} ({points[0]}:{points[1]})",
+            'time': f"{sets1 + sets2 + 1}-й сет",
+            'league': self.rng.choice(_TABLE_TENNIS_TOURNAMENTS),
+            'odds': self._odds({'П1': p1, 'П2': 1 - p1})
+        }
+
+    def _handball_match(self, team1: str, team2: str) -> Dict[str, Any]:
+        minute = self.rng.randint(1, 60)
+        goals1 = max(0, int(self.rng.gauss(0.5 * minute, 0.12 * minute + 1)))
+        goals2 = max(0, int(self.rng.gauss(0.47 * minute, 0.12 * minute + 1)))
+
+        remaining = 1 - minute / 60
+        x = (goals1 - goals2) * (0.25 + 0.6 * (1 - remaining)) + self.rng.gauss(0, 0.4) * remaining
+        p_draw = 0.08 * remaining + 0.02
+        p_home = (1 - p_draw) / (1 + math.exp(-x))
+
+        return {
+            'score': f"{goals1}:{goals2}",
+            'time': f"{minute}'",
+            'league': self.rng.choice(_HANDBALL_LEAGUES),
+            'odds': self._odds({'П1': p_home, 'X': p_draw, 'П2': 1 - p_draw - p_home})
+        }
+
+    # ---- зашумленные названия ----
+
+    def team_variant(self, name: str, sport: str = 'football') -> str:
+        """Название команды/игрока так, как его мог бы написать другой источник"""
+        rng = self.rng
+        if sport in ('tennis', 'table_tennis'):
+            return self._player_variant(name)
+
+        latin = rng.random() < 0.7
+        words = name.split()
+
+        if rng.random() < self.noise * 0.4 and len(words) > 1 and len(words[0]) > 4:
+            words[0] = words[0][:3] + '.'  # Сокращение: "Дин. Казань"
+        if rng.random() < self.noise * 0.2:
+            words = [word.replace('II', '2').replace('(Ж)', 'W') for word in words]
+
+        variant = ' '.join(words)
+        if latin:
+            variant = transliterate(variant)
+
+        if rng.random() < self.noise * 0.5:
+            prefix = 'FC' if latin else 'ФК'
+            variant = f"{prefix} {variant}" if rng.random() < 0.6 else f"{variant} {prefix}"
+        if rng.random() < self.noise * 0.15:
+            variant = variant.replace(' ', '-', 1)
+        if rng.random() < self.noise * 0.1:
+            variant = variant.upper()
+        if rng.random() < self.noise * 0.1:
+            variant = variant.replace(' ', '  ', 1)
+
+        return variant
+
+    def _player_variant(self, name: str) -> str:
+        rng = self.rng
+        parts = name.split()
+        if len(parts) < 2:
+            return transliterate(name) if rng.random() < 0.7 else name
+
+        first, last = parts[0], ' '.join(parts[1:])
+        latin = rng.random() < 0.7
+        if latin:
+            first, last = transliterate(first), transliterate(last)
+
+        roll = rng.random()
+        if roll < self.noise * 0.4:
+            return f"{last} {first[0]}."
+        if roll < self.noise * 0.7:
+            return f"{first[0]}. {last}"
+        if roll < self.noise * 0.8:
+            return f"{last} {first}"
+        return f"{first} {last}"
+
+    # ---- парные наборы ----
+
+    def generate_paired(self, sport: str, count: int, coverage: float = 0.85,
+                        decoy_rate: float = 0.1, swap_rate: float = 0.05) -> SyntheticDataset:
+        """
+        Матчи MarathonBet и соответствующий список SofaScore
+
+        Args:
+            coverage: доля матчей MarathonBet, которые есть на SofaScore
+            decoy_rate: доля лишних матчей SofaScore (нет у MarathonBet)
+            swap_rate: доля матчей с переставленными командами на SofaScore
+        """
+        dataset = SyntheticDataset(sport=sport, seed=self.seed)
+        dataset.marathonbet = self.generate_matches(sport, count)
+
+        sofascore: List[Tuple[Dict[str, Any], Optional[int]]] = []
+        for index, match in enumerate(dataset.marathonbet):
+            if self.rng.random() >= coverage:
+                continue
+            sofascore.append((self._sofascore_side(match, sport, swapped=self.rng.random() < swap_rate), index))
+
+        for decoy in self.generate_matches(sport, max(0, int(count * decoy_rate))):
+            sofascore.append((self._sofascore_side(decoy, sport, swapped=False), None))
+
+        self.rng.shuffle(sofascore)
+        for ss_index, (match, mb_index) in enumerate(sofascore):
+            dataset.sofascore.append(match)
+            if mb_index is not None:
+                dataset.links[mb_index] = ss_index
+
+        return dataset
+
+    def _sofascore_side(self, match: Dict[str, Any], sport: str, swapped: bool) -> Dict[str, Any]:
+        team1 = self.team_variant(match['team1'], sport)
+        team2 = self.team_variant(match['team2'], sport)
+        score = match['score'].split(' ')[0]
+        if swapped:
+            team1, team2 = team2, team1
+            home, away = score.split(':')
+            score = f"{away}:{home}"
+        return {
+            'team1': team1,
+            'team2': team2,
+            'score': score,
+            'source': 'sofascore',
+            'sport': sport
+        }
+
+
+def create_synthetic_generator(seed: int = 42, noise: float = 0.6) -> SyntheticLoadGenerator:
+    """Создание генератора синтетической нагрузки"""
+    return SyntheticLoadGenerator(seed, noise)
@@ -5,7 +5,7 @@ from typing import List, Dict, Any
 import re
 import time
 from selenium.webdriver.common.by import By
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, exclusive_driver
 from scrapers.sofascore_simple_quality import SofaScoreSimpleQuality
 from config import TABLE_TENNIS_FILTER
 
@@ -127,6 +127,7 @@ class TableTennisScraper(BaseScraper):
             pass
         return False
     
+    @exclusive_driver
     def collect_match_data(self, match_url: str) -> Dict[str, Any]:
         """
         Сбор подробных данных по матчу настольного тенниса
@@ -136,7 +137,7 @@ class TableTennisScraper(BaseScraper):
         try:
             self.setup_driver()
             full_url = f"https://scores24.live{match_url}" if not match_url.startswith('http') else match_url
-            self.driver.get(full_url)
+            self.open_page(full_url)
             time.sleep(3)
             
             match_data = {
@@ -8,6 +8,8 @@ from typing import Dict, List, Tuple, Optional, Set
 from dataclasses import dataclass
 import difflib
 
+from utils.bounded_cache import BoundedCache
+
 @dataclass
 class TeamMapping:
     """Информация о сопоставлении команды"""
@@ -23,9 +25,11 @@ class TeamNameMapper:
     MarathonBet - основной источник названий
     """
     
-    def __init__(self):
-        self.team_mappings: Dict[str, TeamMapping] = {}
-        self.reverse_mappings: Dict[str, str] = {}  # альтернативное -> основное
+    def __init__(self, max_teams: int = 20000, mapping_ttl: float = 7 * 24 * 3600):
+        # Сопоставления пополняются из каждого цикла MarathonBet: ограничены по числу и
+        # времени жизни, команды из текущих матчей обновляются при повторном изучении
+        self.team_mappings: BoundedCache = BoundedCache('team_mappings', max_entries=max_teams, ttl=mapping_ttl)
+        self.reverse_mappings: BoundedCache = BoundedCache('team_reverse_mappings', max_entries=max_teams * 2, ttl=mapping_ttl)  # альтернативное -> основное
         self.common_abbreviations = self._initialize_abbreviations()
         self.name_normalizers = self._initialize_normalizers()
         
@@ -2,7 +2,7 @@
 Специализированный сборщик статистики по командам и игрокам
 Объединяет данные из множественных источников для полной картины
 """
-import requests
+from utils.http_transport import get_global_transport
 import time
 import re
 from typing import List, Dict, Any, Optional
@@ -15,17 +15,11 @@ class TeamStatsCollector:
     Сборщик статистики команд и игроков из множественных источников
     """
     
-    def __init__(self, logger):
+    def __init__(self, logger, transport=None):
         self.logger = logger
         
-        # HTTP сессия
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'ru-RU,ru;q=0.9,en;q=0.8',
-            'Connection': 'keep-alive'
-        })
+        # HTTP сессия поверх общего транспорта
+        self.session = (transport or get_global_transport(logger)).session('team_stats', 'html_ru')
     
     def get_team_statistics(self, team1: str, team2: str, sport: str = 'football') -> Dict[str, Any]:
         """
@@ -5,9 +5,11 @@ from typing import List, Dict, Any
 import re
 import time
 from selenium.webdriver.common.by import By
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, exclusive_driver
+from scrapers.match_detail_collector import MatchDetailCollector
 from scrapers.sofascore_simple_quality import SofaScoreSimpleQuality
 from config import TENNIS_FILTER, TOP_LEAGUES
+from utils.score_parser import parse_score
 
 class TennisScraper(BaseScraper):
     """
@@ -17,6 +19,8 @@ class TennisScraper(BaseScraper):
     def __init__(self, logger):
         super().__init__(logger)
         self.sofascore_scraper = SofaScoreSimpleQuality(logger)
+        # Детали матча за одну загрузку страницы через общий пул браузеров
+        self.detail_collector = MatchDetailCollector(logger)
     
     def get_live_matches(self, url: str) -> List[Dict[str, Any]]:
         """
@@ -113,41 +117,26 @@ class TennisScraper(BaseScraper):
         """
         Проверка, выиграл ли ведущий первый сет
         """
-        try:
-            # Парсим счет по сетам (например, "1-0", "2-1")
-            parts = re.split(r'[-:]', sets_score)
-            if len(parts) == 2:
-                set1, set2 = int(parts[0]), int(parts[1])
-                return set1 > set2  # Первый игрок ведет по сетам
-        except:
-            pass
-        return False
+        # Счет по сетам (например, "1-0", "2-1"): первый игрок ведет по сетам
+        parsed = parse_score(sets_score)
+        return bool(parsed and parsed.leader == 'home')
     
     def _has_significant_game_lead(self, current_set: str) -> bool:
         """
         Проверка на значительное преимущество в геймах текущего сета
         """
-        try:
-            # Парсим счет в текущем сете (например, "6-2", "5-1")
-            parts = re.split(r'[-:]', current_set)
-            if len(parts) == 2:
-                games1, games2 = int(parts[0]), int(parts[1])
-                return abs(games1 - games2) >= TENNIS_FILTER['min_games_lead']
-        except:
-            pass
+        # Счет в текущем сете (например, "6-2", "5-1")
+        parsed = parse_score(current_set)
+        if parsed:
+            return parsed.margin >= TENNIS_FILTER['min_games_lead']
         return False
     
     def _is_even_sets(self, sets_score: str) -> bool:
         """
         Проверка на ничейный счет по сетам
         """
-        try:
-            parts = re.split(r'[-:]', sets_score)
-            if len(parts) == 2:
-                return parts[0] == parts[1]
-        except:
-            pass
-        return False
+        parsed = parse_score(sets_score)
+        return bool(parsed and parsed.is_draw)
     
     def _get_tournament_priority(self, tournament: str) -> int:
         """
@@ -161,13 +150,26 @@ class TennisScraper(BaseScraper):
     def collect_match_data(self, match_url: str) -> Dict[str, Any]:
         """
         Сбор подробных данных по теннисному матчу
+        Данные вкладок берутся из API и встроенного состояния страницы за одну загрузку;
+        обход вкладок кликами остается запасным путем, если страница их не отдала
         """
         self.logger.info(f"Сбор подробных данных теннисного матча: {match_url}")
         
+        match_data = self.detail_collector.collect(match_url, 'tennis')
+        if match_data.get('detail_sections'):
+            return match_data
+        
+        return self._collect_match_data_by_tabs(match_url)
+    
+    @exclusive_driver
+    def _collect_match_data_by_tabs(self, match_url: str) -> Dict[str, Any]:
+        """
+        Сбор подробных данных кликами по вкладкам (запасной путь)
+        """
         try:
             self.setup_driver()
             full_url = f"https://scores24.live{match_url}" if not match_url.startswith('http') else match_url
-            self.driver.get(full_url)
+            self.open_page(full_url)
             time.sleep(3)
             
             match_data = {
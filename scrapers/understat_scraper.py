@@ -2,7 +2,7 @@
 Understat.com парсер для xG статистики и детальной аналитики
 Высокий рейтинг: 9/10 для футбольной аналитики
 """
-import requests
+from utils.http_transport import get_global_transport
 import time
 import re
 import json
@@ -15,16 +15,11 @@ class UnderstatScraper:
     Парсер для Understat.com - специализированная футбольная аналитика
     """
     
-    def __init__(self, logger):
+    def __init__(self, logger, transport=None):
         self.logger = logger
         
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Connection': 'keep-alive'
-        })
+        # HTTP сессия поверх общего транспорта
+        self.session = (transport or get_global_transport(logger)).session('understat', 'html_en')
     
     def get_team_xg_stats(self, team_name: str) -> Dict[str, Any]:
         """
@@ -4,7 +4,7 @@ WebSocket скрапер для scores24.live
 import asyncio
 import websockets
 import json
-import requests
+from utils.http_transport import get_global_transport
 import re
 from typing import List, Dict, Any
 import time
@@ -14,8 +14,9 @@ class WebSocketScraper:
     Скрапер через WebSocket соединения
     """
     
-    def __init__(self, logger):
+    def __init__(self, logger, transport=None):
         self.logger = logger
+        self.transport = transport or get_global_transport(logger)
     
     def get_live_matches(self, base_url: str, sport: str) -> List[Dict[str, Any]]:
         """
@@ -120,16 +121,14 @@ class WebSocketScraper:
             f'https://scores24.live/feed/{sport}/live'
         ]
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
-            'Accept': 'application/json, */*',
+        session = self.transport.session('scores24_api', 'json_en', {
             'Referer': base_url,
             'X-Requested-With': 'XMLHttpRequest'
-        }
+        })
         
         for endpoint in api_endpoints:
             try:
-                response = requests.get(endpoint, headers=headers, timeout=8)
+                response = session.get(endpoint, timeout=8)
                 
                 if response.status_code == 200:
                     try:
@@ -152,15 +151,9 @@ class WebSocketScraper:
         """
         Эмуляция браузерных запросов
         """
-        session = requests.Session()
-        
-        # Устанавливаем браузерные заголовки
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.7339.80 Safari/537.36',
+        # Браузерные заголовки, соединения - из общего транспорта
+        session = self.transport.session('scores24_browser', 'html_ru', {
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ru-RU,ru;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         })
         
@@ -0,0 +1,121 @@
+"""
+Очередь отправки сообщений в Telegram
+Цикл анализа ставит публикацию в очередь и не ждет Telegram API; отправку выполняет
+один фоновый поток в порядке постановки. При остановке демона очередь дочищается.
+Результат доставки (отправлено или нет) пишет в журнал сама очередь - цикл знает
+только, что публикация принята
+"""
+
+import queue
+import time
+import threading
+import logging
+from typing import Any, Callable, Dict, Optional
+
+_STOP = object()
+
+
+class TelegramOutbox:
+    """
+    Очередь публикаций с одним потоком отправки
+    """
+
+    def __init__(self, logger: logging.Logger, max_pending: int = 50):
+        self.logger = logger
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.stats = {
+            'queued': 0,
+            'sent': 0,
+            'failed': 0,
+            'dropped': 0
+        }
+
+    def submit(self, send_func: Callable[..., Any], *args, **kwargs) -> bool:
+        """
+        Постановка отправки в очередь
+
+        Returns:
+            bool: True если публикация принята
+        """
+        if self._closed:
+            self.logger.warning("Очередь Telegram закрыта, публикация отброшена")
+            self.stats['dropped'] += 1
+            return False
+
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((send_func, args, kwargs))
+        except queue.Full:
+            self.logger.warning(f"Очередь Telegram переполнена ({self._queue.maxsize}), публикация отброшена")
+            self.stats['dropped'] += 1
+            return False
+
+        self.stats['queued'] += 1
+        return True
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='telegram-outbox', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                send_func, args, kwargs = job
+                name = getattr(send_func, '__qualname__', repr(send_func))
+                if send_func(*args, **kwargs):
+                    self.stats['sent'] += 1
+                    self.logger.info(f"📨 Публикация из очереди Telegram доставлена ({name})")
+                else:
+                    self.stats['failed'] += 1
+                    self.logger.error(f"Публикация из очереди Telegram не доставлена ({name})")
+            except Exception as e:
+                self.stats['failed'] += 1
+                self.logger.error(f"Ошибка отправки из очереди Telegram: {e}")
+            finally:
+                self._queue.task_done()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """
+        Ожидание отправки всех поставленных публикаций
+
+        Returns:
+            bool: True если очередь опустела до таймаута
+        """
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 30.0) -> bool:
+        """Дочистка очереди и остановка потока отправки"""
+        self._closed = True
+        drained = self.drain(timeout)
+        if not drained:
+            self.logger.warning(f"Очередь Telegram не дочищена: осталось {self.pending} публикаций")
+
+        if self._thread is not None and drained:
+            self._queue.put(_STOP)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+        return drained
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'pending': self.pending}
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Тест Accept-Encoding условной сессии: объявляются только кодировки, которые
+распаковывает клиент общего транспорта, и каждая объявленная кодировка
+действительно распаковывается (локальный сервер сжимает ответ запрошенным способом)
+"""
+import sys
+import gzip
+import zlib
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append('.')
+
+from utils.conditional_http import ConditionalSession
+from utils.http_transport import HttpTransport
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BODY = ('<html><body>' + 'Спартак - Зенит 1:0 34\' ' * 200 + '</body></html>').encode('utf-8')
+
+COMPRESSORS = {
+    'gzip': gzip.compress,
+    'deflate': zlib.compress,
+    'br': brotli.compress if brotli else None,
+    'zstd': zstandard.ZstdCompressor().compress if zstandard else None,
+}
+
+
+class CompressingHandler(BaseHTTPRequestHandler):
+    """Отдает BODY, сжатый кодировкой из пути запроса (/gzip, /zstd, ...)"""
+
+    def do_GET(self):
+        encoding = self.path.strip('/')
+        body = COMPRESSORS[encoding](BODY)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def advertised(session) -> list:
+    return [encoding.strip() for encoding in session.headers['Accept-Encoding'].split(',')]
+
+
+def test_zstd_advertised_with_zstandard():
+    """С zstandard и клиентом httpx zstd объявляется в Accept-Encoding"""
+    transport = HttpTransport(logging.getLogger('test'))
+    try:
+        encodings = advertised(ConditionalSession(transport, 'test'))
+        assert encodings == transport.content_encodings()
+        assert {'gzip', 'deflate'} <= set(encodings)
+        if zstandard is not None and transport.backend == 'httpx':
+            assert 'zstd' in encodings, encodings
+    finally:
+        transport.close()
+
+
+def test_advertised_encodings_decode():
+    """Каждая объявленная кодировка распаковывается транспортом"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CompressingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    transport = HttpTransport(logging.getLogger('test'))
+    try:
+        session = ConditionalSession(transport, 'test')
+        for encoding in advertised(session):
+            response = session.get(f'http://127.0.0.1:{server.server_port}/{encoding}', timeout=5)
+            assert response.status_code == 200, encoding
+            assert response.content == BODY, encoding
+    finally:
+        transport.close()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'✅ {name}')
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Тест инкрементального разбора MarathonBet: на странице live футбола результат по
+фрагментам событий совпадает с полным разбором - в первом опросе, после изменения
+одного события и при периодической сверке
+Фикстура fixtures/marathonbet/live_football_page.html: строки событий data-event-id,
+JSON в <script> страницы и внутри события, матч вне фрагментов (промо-блок)
+"""
+import sys
+import logging
+from types import SimpleNamespace
+sys.path.append('.')
+
+from scrapers.marathonbet_scraper import MarathonBetScraper
+
+URL = 'https://www.marathonbet.ru/su/live/26418'
+
+
+def load_page() -> str:
+    with open('fixtures/marathonbet/live_football_page.html', encoding='utf-8') as f:
+        return f.read()
+
+
+def make_response(html: str):
+    return SimpleNamespace(text=html, content=html.encode('utf-8'), encoding='utf-8')
+
+
+def make_scraper() -> MarathonBetScraper:
+    scraper = MarathonBetScraper(logging.getLogger('test'))
+    scraper.full_parse_interval = 0
+    return scraper
+
+
+def teams(matches):
+    return {(match['team1'], match['team2']) for match in matches}
+
+
+def test_incremental_equals_full():
+    """Первый опрос: фрагменты и остаток разбираются всеми стратегиями полного разбора"""
+    scraper = make_scraper()
+    html = load_page()
+
+    full = scraper._extract_enhanced_matches_from_html(html, URL, 'football')
+    incremental = scraper._extract_incremental(make_response(html), URL, 'football')
+
+    assert incremental is not None
+    assert scraper._match_signatures(incremental) == scraper._match_signatures(full)
+    # Матч вне фрагментов и JSON внутри фрагмента не теряются
+    assert ('Ротор', 'Торпедо') in teams(incremental)
+    assert ('Ростов', 'Ахмат') in teams(incremental)
+    assert any(match['source'] == 'marathonbet_json' and match['team1'] == 'Краснодар'
+               for match in incremental)
+
+
+def test_changed_event_equals_full():
+    """Следующий опрос: изменилось одно событие - переразбирается только его фрагмент"""
+    scraper = make_scraper()
+    html = load_page()
+    scraper._extract_incremental(make_response(html), URL, 'football')
+
+    changed = html.replace('<td class="score">1:0</td><td class="time">34\'</td>',
+                           '<td class="score">2:0</td><td class="time">41\'</td>')
+    assert changed != html
+
+    reparsed_before = scraper.fragment_extractor.stats['fragments_reparsed']
+    incremental = scraper._extract_incremental(make_response(changed), URL, 'football')
+    full = scraper._extract_enhanced_matches_from_html(changed, URL, 'football')
+
+    assert scraper.fragment_extractor.stats['fragments_reparsed'] - reparsed_before == 1
+    assert scraper._match_signatures(incremental) == scraper._match_signatures(full)
+
+
+def test_periodic_full_parse_check():
+    """Сверка с полным разбором: совпадение не сбрасывает состояние, расхождение - сбрасывает"""
+    scraper = make_scraper()
+    scraper.full_parse_interval = 1
+    html = load_page()
+
+    scraper._extract_incremental(make_response(html), URL, 'football')
+    assert scraper.incremental_stats == {'verified': 1, 'mismatches': 0}
+
+    # Испорченное сохраненное состояние фрагмента обнаруживается сверкой
+    state = scraper.fragment_extractor._pages[f'{URL}|football']
+    event_id = next(iter(state.fragments))
+    state.fragments[event_id] = (state.fragments[event_id][0], [])
+
+    result = scraper._extract_incremental(make_response(html), URL, 'football')
+    full = scraper._extract_enhanced_matches_from_html(html, URL, 'football')
+    assert scraper.incremental_stats['mismatches'] == 1
+    assert scraper._match_signatures(result) == scraper._match_signatures(full)
+    assert f'{URL}|football' not in scraper.fragment_extractor._pages
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'✅ {name}')
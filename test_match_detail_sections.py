@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Тест сбора деталей матча Scores24 за одну загрузку на записанных ответах страницы
+Фикстуры fixtures/scores24/*_match_capture.json: перехваченные ответы API (в том числе
+чужого события и посторонних эндпоинтов) и встроенное состояние страницы
+"""
+import sys
+import json
+import glob
+import logging
+sys.path.append('.')
+
+from scrapers.match_detail_sections import build_sections, endpoint_patterns, event_key, section_for_url
+from utils.browser_capture import CaptureProfile, capture_page_selenium
+
+
+def load_fixtures():
+    for path in sorted(glob.glob('fixtures/scores24/*_match_capture.json')):
+        with open(path, encoding='utf-8') as f:
+            yield path, json.load(f)
+
+
+def test_sections_match_fixtures():
+    """Разделы из ответов своего события в формате прежнего обхода вкладок"""
+    for path, fixture in load_fixtures():
+        sections, found = build_sections(fixture['payloads'], fixture['embedded'],
+                                         fixture['match_url'], fixture['sport'])
+        assert found == fixture['expected_sections'], path
+        assert sections == fixture['expected'], path
+
+
+def test_foreign_event_is_ignored():
+    """Ответы другого события и посторонних эндпоинтов не попадают в разделы"""
+    _, fixture = next(load_fixtures())
+    event = event_key(fixture['match_url'])
+    foreign = [payload for payload in fixture['payloads'] if event not in payload['url']]
+    sections, found = build_sections(foreign, None, fixture['match_url'], fixture['sport'])
+    assert found == []
+    assert sections['h2h'] == [] and sections['prediction'] == 'Недоступно'
+
+
+def test_endpoint_patterns():
+    """Ожидаемые ответы - эндпоинты разделов события, а не любой /api/ и не сам slug"""
+    import re
+    event = 'm-14-09-2025-arsenal-nottingham-forest-prediction'
+    patterns = [re.compile(pattern) for pattern in endpoint_patterns('football', event)]
+    own = f'https://scores24.live/api/v1/matches/{event}/odds'
+    assert any(pattern.search(own) for pattern in patterns)
+    assert not any(pattern.search(f'https://scores24.live/ru/soccer/{event}') for pattern in patterns)
+    assert not any(pattern.search('https://scores24.live/api/v1/matches/m-13-09-2025-chelsea-fulham-prediction/odds')
+                   for pattern in patterns)
+    assert section_for_url(f'https://scores24.live/api/v1/page/{event}', event, 'football') is None
+
+
+class RecordedDriver:
+    """Драйвер с журналом performance: хвост прошлой страницы и ответы нового перехода"""
+
+    def __init__(self, stale, events):
+        self.logs = [stale, events]
+        self.bodies = {}
+
+    def execute_cdp_cmd(self, command, params):
+        if command == 'Network.getResponseBody':
+            return {'body': json.dumps(self.bodies[params['requestId']])}
+        return {}
+
+    def get(self, url):
+        pass
+
+    def get_log(self, kind):
+        return self.logs.pop(0) if self.logs else []
+
+
+def _entry(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+def _response(request_id, loader_id, url):
+    return [
+        _entry('Network.responseReceived', requestId=request_id, loaderId=loader_id,
+               response={'url': url, 'status': 200, 'mimeType': 'application/json'}),
+        _entry('Network.loadingFinished', requestId=request_id),
+    ]
+
+
+def test_capture_ignores_previous_page():
+    """Переиспользуемый драйвер: ответы прошлой страницы не считаются данными новой"""
+    old_url = 'https://scores24.live/api/v1/matches/m-old/odds'
+    new_url = 'https://scores24.live/api/v1/matches/m-new/odds'
+    stale = _response('1', 'L-old', old_url)
+    events = (_response('2', 'L-old', old_url)
+              + [_entry('Network.requestWillBeSent', requestId='L-new', loaderId='L-new', type='Document')]
+              + _response('3', 'L-new', new_url))
+    driver = RecordedDriver(stale, events)
+    driver.bodies = {'1': {'odds': 'old'}, '2': {'odds': 'old'}, '3': {'odds': 'new'}}
+
+    profile = CaptureProfile('test', (r'/api/',), (r'm-new/odds',), timeout=2.0, settle=0)
+    result = capture_page_selenium(driver, 'https://scores24.live/ru/soccer/m-new', profile,
+                                   logging.getLogger('test'))
+    assert result.complete
+    assert result.data() == [{'odds': 'new'}]
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'✅ {name}')
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Тест инкрементального разбора Scores24: на странице live футбола результат по строкам
+матчей совпадает с полным разбором - в первом опросе, после изменения одной строки
+и при периодической сверке
+Фикстура fixtures/scores24/live_soccer_page.html: строки-ссылки на матчи, строки
+data-event-id/data-match-id (таблица, список, текст только для паттернов) и матч вне
+строк (бегущая строка)
+"""
+import sys
+import logging
+from types import SimpleNamespace
+sys.path.append('.')
+
+from scrapers.scores24_scraper import Scores24Scraper
+
+URL = 'https://scores24.live/ru/soccer?matchesFilter=live'
+
+
+def load_page() -> str:
+    with open('fixtures/scores24/live_soccer_page.html', encoding='utf-8') as f:
+        return f.read()
+
+
+def make_response(html: str):
+    return SimpleNamespace(text=html, content=html.encode('utf-8'), encoding='utf-8', url=URL)
+
+
+def make_scraper() -> Scores24Scraper:
+    scraper = Scores24Scraper(logging.getLogger('test'))
+    scraper.full_parse_interval = 0
+    return scraper
+
+
+def teams(matches):
+    return {(match['team1'], match['team2']) for match in matches}
+
+
+def test_incremental_equals_full():
+    """Первый опрос: строки и остаток разбираются всеми стратегиями полного разбора"""
+    scraper = make_scraper()
+    html = load_page()
+
+    full = scraper._extract_matches_from_html(html)
+    incremental = scraper._extract_incremental(make_response(html), URL)
+
+    assert incremental is not None
+    assert scraper._match_signatures(incremental) == scraper._match_signatures(full)
+    # Матч вне строк и строка, которую находят только паттерны, не теряются
+    assert ('Ротор', 'Торпедо') in teams(incremental)
+    assert any(match['source'] == 'scores24_pattern_1' and match['team1'] == 'Ростов'
+               for match in incremental)
+    assert len(incremental) == 7
+
+
+def test_changed_row_equals_full():
+    """Следующий опрос: изменилась одна строка - переразбирается только она"""
+    scraper = make_scraper()
+    html = load_page()
+    scraper._extract_incremental(make_response(html), URL)
+
+    changed = html.replace("Ростов 2:0 Ахмат 80'", "Ростов 3:0 Ахмат 84'")
+    assert changed != html
+
+    reparsed_before = scraper.fragment_extractor.stats['fragments_reparsed']
+    incremental = scraper._extract_incremental(make_response(changed), URL)
+    full = scraper._extract_matches_from_html(changed)
+
+    assert scraper.fragment_extractor.stats['fragments_reparsed'] - reparsed_before == 1
+    assert scraper._match_signatures(incremental) == scraper._match_signatures(full)
+
+
+def test_periodic_full_parse_check():
+    """Сверка с полным разбором: совпадение не сбрасывает состояние, расхождение - сбрасывает"""
+    scraper = make_scraper()
+    scraper.full_parse_interval = 1
+    html = load_page()
+
+    scraper._extract_incremental(make_response(html), URL)
+    assert scraper.incremental_stats == {'verified': 1, 'mismatches': 0}
+
+    # Испорченное сохраненное состояние строки обнаруживается сверкой
+    state = scraper.fragment_extractor._pages[URL]
+    event_id = next(iter(state.fragments))
+    state.fragments[event_id] = (state.fragments[event_id][0], [])
+
+    result = scraper._extract_incremental(make_response(html), URL)
+    full = scraper._extract_matches_from_html(html)
+    assert scraper.incremental_stats['mismatches'] == 1
+    assert scraper._match_signatures(result) == scraper._match_signatures(full)
+    assert URL not in scraper.fragment_extractor._pages
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'✅ {name}')
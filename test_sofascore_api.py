@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Тест JSON API SofaScore на записанных ответах
+Фикстуры fixtures/sofascore/: ответы эндпоинтов event, statistics, h2h, pregame-form
+и odds одного матча (football_event_api.json) и страница того же матча
+(football_match_page.html) для сравнения с HTML путем SofaScoreSimpleQuality
+"""
+import re
+import sys
+import json
+import time
+import logging
+from types import SimpleNamespace
+sys.path.append('.')
+
+from scrapers.sofascore_api import (
+    API_BASE_URL, SITE_BASE_URL, MatchDetails, SofaScoreApiClient, event_id_from_url,
+    parse_event, parse_featured_odds, parse_h2h_events, parse_pregame_form,
+    parse_pregame_standings, parse_statistics
+)
+from utils.http_transport import SourceSession
+
+# Ключи, которые есть только в одном из путей
+JSON_ONLY_KEYS = {'match_id', 'data_format'}
+HTML_ONLY_KEYS = {'team_statistics'}  # средние показатели команд - вне эндпоинтов матча
+
+
+class RecordedTransport:
+    """Транспорт с записанными ответами вместо сети (адрес без #фрагмента -> тело)"""
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.requests = []
+        self.bytes = 0
+
+    def session(self, source, profile='html_en', headers=None):
+        return SourceSession(self, source, headers)
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.requests.append(url)
+        body = self.bodies.get(url.split('#')[0])
+        if body is None:
+            return SimpleNamespace(status_code=404, content=b'', text='', encoding='utf-8', headers={}, url=url)
+        self.bytes += len(body)
+        return SimpleNamespace(status_code=200, content=body, text=body.decode('utf-8'),
+                               encoding='utf-8', headers={}, url=url)
+
+
+def load_fixture():
+    with open('fixtures/sofascore/football_event_api.json', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_page() -> bytes:
+    with open('fixtures/sofascore/football_match_page.html', 'rb') as f:
+        return f.read()
+
+
+def api_bodies(fixture):
+    return {f"{API_BASE_URL}{path}": json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            for path, payload in fixture['responses'].items()}
+
+
+def page_bodies(fixture):
+    return {f"{SITE_BASE_URL}{fixture['match_url']}".split('#')[0]: load_page()}
+
+
+def test_parse_recorded_payloads():
+    """Разбор каждого записанного ответа и итоговый словарь в формате детальных данных"""
+    fixture = load_fixture()
+    responses = fixture['responses']
+    event_id = event_id_from_url(fixture['match_url'])
+
+    event = parse_event(responses[f'/event/{event_id}'])
+    assert (event.event_id, event.home_team, event.away_team) == (event_id, 'Zenit', 'Spartak Moscow')
+    assert (event.score, event.time, event.sport) == ('1:0', 'HT', 'football')
+
+    statistics = parse_statistics(responses[f'/event/{event_id}/statistics'])
+    assert len(statistics) == 6  # только период ALL
+    h2h = parse_h2h_events(responses[f'/event/{event.custom_id}/h2h/events'])
+    assert len(h2h) == 5 and h2h[0].start_timestamp == max(match.start_timestamp for match in h2h)
+
+    form_payload = responses[f'/event/{event_id}/pregame-form']
+    home_form, away_form = parse_pregame_form(form_payload)
+    odds = parse_featured_odds(responses[f'/event/{event_id}/odds/1/featured'])
+    assert odds == {'1': 1.7, 'X': 4.0, '2': 5.75}
+
+    details = MatchDetails(event=event, statistics=statistics, h2h=h2h, home_form=home_form,
+                           away_form=away_form, standings=parse_pregame_standings(form_payload), odds=odds)
+    assert details.to_detailed_data() == fixture['expected']
+
+
+def test_client_on_recorded_responses():
+    """Клиент: пять запросов к API на матч, результат совпадает с разбором ответов"""
+    fixture = load_fixture()
+    transport = RecordedTransport(api_bodies(fixture))
+    client = SofaScoreApiClient(logging.getLogger('test'), transport)
+
+    details = client.get_match_details(fixture['match_url'], 'football')
+    assert details is not None
+    assert details.to_detailed_data() == fixture['expected']
+
+    stats = client.get_stats()
+    assert stats['requests'] == 5 and stats['matches'] == 1
+    assert stats['bytes_per_match'] == transport.bytes
+
+
+def test_event_id_from_next_data():
+    """URL без #id: ID события берется из __NEXT_DATA__ страницы"""
+    fixture = load_fixture()
+    bodies = {**api_bodies(fixture), **page_bodies(fixture)}
+    client = SofaScoreApiClient(logging.getLogger('test'), RecordedTransport(bodies))
+
+    event_id, embedded = client.resolve_event(fixture['match_url'].split('#')[0])
+    assert event_id == event_id_from_url(fixture['match_url'])
+    assert embedded['homeTeam']['name'] == 'Zenit'
+
+
+def html_path_data(fixture):
+    """Детальные данные HTML путем: API недоступен (404), страница из фикстуры"""
+    from scrapers.sofascore_simple_quality import SofaScoreSimpleQuality
+
+    transport = RecordedTransport(page_bodies(fixture))
+    scraper = SofaScoreSimpleQuality(logging.getLogger('test'), transport)
+    started = time.thread_time()
+    data = scraper.get_detailed_match_data(fixture['match_url'])
+    return data, transport.bytes, time.thread_time() - started
+
+
+def test_json_keys_match_html_path():
+    """Ключи и форма значений JSON пути совпадают с HTML путем"""
+    fixture = load_fixture()
+    json_data = fixture['expected']
+    html_data, _, _ = html_path_data(fixture)
+    assert html_data, 'HTML путь ничего не извлек из страницы'
+
+    assert set(json_data) - JSON_ONLY_KEYS <= set(html_data), set(json_data) - set(html_data)
+    assert set(html_data) - set(json_data) <= HTML_ONLY_KEYS, set(html_data) - set(json_data)
+
+    # Значения счета и лиги HTML путь находит регулярными выражениями по всей странице
+    # (и ошибается), поэтому сравнивается формат, а не значение
+    for key in ('score', 'time', 'league', 'sport'):
+        assert isinstance(json_data[key], str) and isinstance(html_data[key], str), key
+    assert re.fullmatch(r'\d+:\d+', json_data['score']) and re.fullmatch(r'\d+:\d+', html_data['score'])
+    assert json_data['time'] == html_data['time']
+
+    for key in ('statistics', 'detailed_statistics'):
+        for value in list(json_data[key].values()) + list(html_data[key].values()):
+            assert set(value) == {'team1', 'team2'}, key
+    assert set(json_data['statistics']) == set(html_data['statistics'])
+
+    assert [set(match) for match in json_data['h2h']] == [set(match) for match in html_data['h2h']]
+    assert [match['score'] for match in json_data['h2h']] == [match['score'] for match in html_data['h2h']]
+    assert json_data['team_form'] == html_data['team_form']
+    assert {key: float(value) for key, value in json_data['odds']['1X2'].items()} == \
+           {key: float(value) for key, value in html_data['odds']['1X2'].items()}
+    for key, value in html_data['tournament_info'].items():
+        assert json_data['tournament_info'][key] == value, key
+
+
+def test_bytes_and_cpu_per_match():
+    """Замер: байты и процессорное время на матч - JSON API против HTML пути"""
+    fixture = load_fixture()
+    transport = RecordedTransport(api_bodies(fixture))
+    client = SofaScoreApiClient(logging.getLogger('test'), transport)
+
+    rounds = 20
+    html_bytes = html_cpu = 0.0
+    for _ in range(rounds):
+        assert client.get_match_details(fixture['match_url'], 'football') is not None
+        _, page_bytes, page_cpu = html_path_data(fixture)
+        html_bytes += page_bytes
+        html_cpu += page_cpu
+
+    stats = client.get_stats()
+    assert stats['matches'] == rounds
+    assert stats['bytes_per_match'] == sum(len(body) for body in api_bodies(fixture).values())
+    assert stats['cpu_ms_per_match'] > 0
+
+    print(f"   JSON API: {stats['bytes_per_match']} байт, {stats['cpu_ms_per_match']} мс CPU на матч; "
+          f"HTML путь: {int(html_bytes / rounds)} байт, {html_cpu * 1000 / rounds:.2f} мс CPU на матч")
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'✅ {name}')
@@ -12,6 +12,9 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import logging
 
+from utils.latency_histogram import LatencyTracker, get_global_latency_tracker, host_key
+from utils.rate_limiter import DomainRateLimiter, get_global_rate_limiter
+
 try:
     from asyncio_throttle import Throttle
 except ImportError:
@@ -31,12 +34,14 @@ class RequestStats:
     total_time: float = 0.0
     average_response_time: float = 0.0
     last_request_time: Optional[datetime] = None
+    hosts: set = field(default_factory=set)  # Хосты запросов (гистограммы - в LatencyTracker)
 
 @dataclass
 class ClientConfig:
     """Конфигурация HTTP клиента"""
     # Основные настройки
-    timeout: int = 30
+    timeout: int = 30  # Таймаут до накопления статистики хоста
+    adaptive_timeouts: bool = True  # Далее таймаут выводится из p99 задержек хоста
     max_connections: int = 100
     max_connections_per_host: int = 10
     
@@ -66,13 +71,20 @@ class AsyncHTTPClient:
     Продвинутый асинхронный HTTP клиент
     """
     
-    def __init__(self, config: Optional[ClientConfig] = None, logger: Optional[logging.Logger] = None):
+    def __init__(self, config: Optional[ClientConfig] = None, logger: Optional[logging.Logger] = None,
+                 latency: Optional[LatencyTracker] = None, rate_limiter: Optional[DomainRateLimiter] = None):
         self.config = config or ClientConfig()
         self.logger = logger or logging.getLogger(__name__)
         
         # Статистика
         self.stats = RequestStats()
         
+        # Гистограммы задержек по хостам (общие с HTTP транспортом)
+        self.latency = latency or get_global_latency_tracker()
+        
+        # Общий ограничитель частоты по доменам (один для всех скраперов и процессов)
+        self.rate_limiter = rate_limiter or get_global_rate_limiter(self.logger)
+        
         # Сессия aiohttp
         self.session: Optional[aiohttp.ClientSession] = None
         
@@ -168,6 +180,7 @@ class AsyncHTTPClient:
         if self.throttle:
             async with self.throttle:
                 pass
+        await self.rate_limiter.acquire_async(url)
         
         # Подготавливаем заголовки
         headers = kwargs.get('headers', {})
@@ -180,12 +193,21 @@ class AsyncHTTPClient:
             if proxy:
                 kwargs['proxy'] = proxy
         
+        # Адаптивный таймаут: p99 хоста x 1.5 (пока данных мало - из конфигурации)
+        host = host_key(url)
+        self.stats.hosts.add(host)
+        timeout_seconds = None
+        if 'timeout' not in kwargs and self.config.adaptive_timeouts:
+            timeout_seconds = self.latency.timeout(host, default=self.config.timeout)
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout_seconds)
+        
         # Выполняем запрос
         start_time = time.time()
         
         try:
             response = await self.session.request(method, url, **kwargs)
             execution_time = time.time() - start_time
+            self.latency.record(host, execution_time, error=response.status >= 400)
             
             # Обновляем статистику
             self.stats.total_requests += 1
@@ -206,6 +228,9 @@ class AsyncHTTPClient:
             
         except Exception as e:
             execution_time = time.time() - start_time
+            timed_out = isinstance(e, asyncio.TimeoutError)
+            self.latency.record(host, timeout_seconds if timed_out and timeout_seconds else execution_time,
+                                error=True, timed_out=timed_out)
             self.stats.total_requests += 1
             self.stats.failed_requests += 1
             self.stats.total_time += execution_time
@@ -311,7 +336,8 @@ class AsyncHTTPClient:
             "success_rate": round(success_rate, 2),
             "average_response_time": round(self.stats.average_response_time, 3),
             "total_time": round(self.stats.total_time, 2),
-            "last_request_time": self.stats.last_request_time.isoformat() if self.stats.last_request_time else None
+            "last_request_time": self.stats.last_request_time.isoformat() if self.stats.last_request_time else None,
+            "hosts": {host: stats for host, stats in self.latency.get_stats().items() if host in self.stats.hosts}
         }
     
     def reset_stats(self):
@@ -81,6 +81,9 @@ class AsyncSourceAdapter:
         if self.cache_manager:
             await self.cache_manager.close()
         
+        if self.captcha_bypass:
+            self.captcha_bypass.close()
+        
         self.logger.info(f"AsyncSourceAdapter для {self.source_name} закрыт")
     
     async def get_matches_async(self, sport: str = 'football', **kwargs) -> List[Dict[str, Any]]:
@@ -277,6 +280,7 @@ class AsyncSourceAdapter:
             "average_time": round(self.stats.average_time, 3),
             "total_time": round(self.stats.total_time, 2),
             "captcha_bypass_enabled": self.captcha_bypass_enabled,
+            "captcha_bypass_domains": self.captcha_bypass.get_domain_statistics() if self.captcha_bypass else {},
             "caching_enabled": self.caching_enabled
         }
     
@@ -0,0 +1,325 @@
+"""
+Ограниченный кэш в памяти процесса
+TTL + LRU вытеснение, учет приблизительного размера записей и общий бюджет памяти
+для всех кэшей демона: при превышении бюджета вытесняются самые старые записи
+самого большого кэша, поэтому RSS не растет при многодневной работе
+"""
+
+import sys
+import time
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+# Общий бюджет памяти всех кэшей по умолчанию
+DEFAULT_MEMORY_BUDGET = 128 * 1024 * 1024
+
+_MISSING = object()
+
+
+def estimate_size(obj: Any, max_depth: int = 4) -> int:
+    """
+    Приблизительный размер объекта в байтах (контейнеры, dataclass и __slots__
+    обходятся рекурсивно до max_depth, общие объекты считаются один раз)
+    """
+    seen = set()
+    total = 0
+    stack = [(obj, 0)]
+
+    while stack:
+        item, depth = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+
+        try:
+            total += sys.getsizeof(item)
+        except TypeError:
+            continue
+
+        if depth >= max_depth or isinstance(item, (str, bytes, int, float, bool)):
+            continue
+
+        if isinstance(item, dict):
+            for key, value in item.items():
+                stack.append((key, depth + 1))
+                stack.append((value, depth + 1))
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend((child, depth + 1) for child in item)
+        else:
+            attrs = getattr(item, '__dict__', None)
+            if attrs is not None:
+                stack.append((attrs, depth + 1))
+            for slot in getattr(type(item), '__slots__', ()):
+                value = getattr(item, slot, None)
+                if value is not None:
+                    stack.append((value, depth + 1))
+
+    return total
+
+
+class _Entry:
+    __slots__ = ('value', 'size', 'expires_at')
+
+    def __init__(self, value: Any, size: int, expires_at: Optional[float]):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+
+
+class BoundedCache(MutableMapping):
+    """
+    Кэш с TTL, LRU вытеснением и учетом размера
+
+    Поддерживает протокол словаря (get, [], in, len, items), поэтому заменяет
+    обычные словари-кэши без изменения вызывающего кода. Устаревшая запись
+    ведет себя как отсутствующая.
+    """
+
+    def __init__(self, name: str, max_entries: int = 1024, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None, sizeof: Callable[[Any], int] = estimate_size):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+
+        self._data: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.bytes = 0
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'expired': 0,
+            'evicted': 0,
+            'budget_evicted': 0
+        }
+
+        _budget.register(self)
+
+    # ---- протокол словаря ----
+
+    # Кэш сравнивается по идентичности (нужно для учета в общем бюджете)
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.set(key, value)
+
+    def __delitem__(self, key: Hashable):
+        with self._lock:
+            entry = self._data.pop(key)
+            self._account(-entry.size)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+            if self._is_expired(entry, time.monotonic()):
+                self._drop(key, entry)
+                self.stats['expired'] += 1
+                return False
+            return True
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter([key for key, _ in self._live_items()])
+
+    def __len__(self) -> int:
+        # Устаревшие записи не считаются (как и в in/get) - удаляются перед подсчетом
+        with self._lock:
+            self.purge_expired()
+            return len(self._data)
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Снимок живых записей (без изменения порядка LRU)"""
+        return [(key, entry.value) for key, entry in self._live_items()]
+
+    def values(self) -> List[Any]:
+        return [entry.value for _, entry in self._live_items()]
+
+    def keys(self) -> List[Hashable]:
+        return [key for key, _ in self._live_items()]
+
+    # ---- операции ----
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return default
+            if self._is_expired(entry, time.monotonic()):
+                self._drop(key, entry)
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return default
+            self._data.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Запись значения (ttl переопределяет TTL кэша для этой записи)"""
+        ttl = self.ttl if ttl is None else ttl
+        size = self.sizeof(value) + sys.getsizeof(key)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self._account(-previous.size)
+            self._data[key] = _Entry(value, size, expires_at)
+            self._account(size)
+            self.stats['sets'] += 1
+            self._evict_over_limits()
+
+        _budget.enforce()
+
+    def clear(self):
+        with self._lock:
+            self._account(-self.bytes)
+            self._data.clear()
+
+    def purge_expired(self) -> int:
+        """Удаление всех устаревших записей"""
+        now = time.monotonic()
+        removed = 0
+        with self._lock:
+            for key, entry in list(self._data.items()):
+                if self._is_expired(entry, now):
+                    self._drop(key, entry)
+                    removed += 1
+            self.stats['expired'] += removed
+        return removed
+
+    def evict_bytes(self, target: int) -> int:
+        """Вытеснение самых старых записей на target байт (для общего бюджета)"""
+        freed = 0
+        with self._lock:
+            while self._data and freed < target:
+                key, entry = self._data.popitem(last=False)
+                self._account(-entry.size)
+                freed += entry.size
+                self.stats['budget_evicted'] += 1
+        return freed
+
+    # ---- внутреннее ----
+
+    def _is_expired(self, entry: _Entry, now: float) -> bool:
+        return entry.expires_at is not None and entry.expires_at <= now
+
+    def _drop(self, key: Hashable, entry: _Entry):
+        del self._data[key]
+        self._account(-entry.size)
+
+    def _account(self, delta: int):
+        self.bytes += delta
+        _budget.account(delta)
+
+    def _evict_over_limits(self):
+        while len(self._data) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes
+                                                      and len(self._data) > 1):
+            key, entry = self._data.popitem(last=False)
+            self._account(-entry.size)
+            self.stats['evicted'] += 1
+
+    def _live_items(self) -> List[Tuple[Hashable, _Entry]]:
+        now = time.monotonic()
+        with self._lock:
+            return [(key, entry) for key, entry in self._data.items() if not self._is_expired(entry, now)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._data),
+            'max_entries': self.max_entries,
+            'bytes': self.bytes,
+            'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else 0.0
+        }
+
+
+class MemoryBudget:
+    """
+    Общий бюджет памяти всех BoundedCache процесса
+    """
+
+    def __init__(self, limit_bytes: int = DEFAULT_MEMORY_BUDGET):
+        self.limit_bytes = limit_bytes
+        self.total_bytes = 0
+        self.enforcements = 0
+        self._caches: 'weakref.WeakSet[BoundedCache]' = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def register(self, cache: BoundedCache):
+        with self._lock:
+            self._caches.add(cache)
+
+    def account(self, delta: int):
+        with self._lock:
+            self.total_bytes += delta
+
+    def enforce(self):
+        """Возврат в бюджет: сначала устаревшие записи, затем LRU самого большого кэша"""
+        if self.total_bytes <= self.limit_bytes:
+            return
+
+        self.enforcements += 1
+        caches = list(self._caches)
+        for cache in caches:
+            cache.purge_expired()
+
+        while self.total_bytes > self.limit_bytes:
+            largest = max(caches, key=lambda cache: cache.bytes, default=None)
+            if largest is None or not largest.bytes:
+                break
+            # Вытесняем с запасом 10%, чтобы не срабатывать на каждой записи
+            overflow = self.total_bytes - int(self.limit_bytes * 0.9)
+            if not largest.evict_bytes(min(overflow, largest.bytes)):
+                break
+
+    def get_report(self) -> Dict[str, Any]:
+        report: Dict[str, Dict[str, Any]] = {}
+        for cache in sorted(self._caches, key=lambda cache: cache.name):
+            stats = cache.get_stats()
+            current = report.get(cache.name)
+            if current is None:
+                report[cache.name] = stats
+                continue
+            # Несколько экземпляров одного кэша (например, у каждого скрапера) суммируются
+            for key, value in stats.items():
+                if key != 'hit_rate':
+                    current[key] += value
+            lookups = current['hits'] + current['misses']
+            current['hit_rate'] = round(current['hits'] / lookups, 3) if lookups else 0.0
+
+        return {
+            'budget_bytes': self.limit_bytes,
+            'total_bytes': self.total_bytes,
+            'enforcements': self.enforcements,
+            'caches': report
+        }
+
+
+_budget = MemoryBudget()
+
+
+def set_memory_budget(limit_bytes: int):
+    """Установка общего бюджета памяти кэшей"""
+    _budget.limit_bytes = limit_bytes
+    _budget.enforce()
+
+
+def get_cache_report() -> Dict[str, Any]:
+    """Размеры всех кэшей процесса (для статуса системы и метрик)"""
+    return _budget.get_report()
@@ -0,0 +1,302 @@
+"""
+Режим захвата для браузерных скраперов
+Вместо полной загрузки страницы с фиксированными паузами:
+- неважные ресурсы (картинки, шрифты, медиа, реклама и аналитика) блокируются
+- JSON ответы XHR/fetch, которые делает страница, перехватываются по шаблонам источника
+- загрузка завершается, как только пришли ожидаемые данные
+
+Для Playwright используется route + событие response, для Selenium (Chrome) -
+CDP: Network.setBlockedURLs и журнал performance с Network.getResponseBody
+"""
+
+import re
+import json
+import time
+import base64
+import fnmatch
+import logging
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.rate_limiter import domain_for, get_global_rate_limiter
+
+# Типы ресурсов, которые не нужны для извлечения данных
+BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+
+# Реклама и аналитика (шаблоны URL в стиле Network.setBlockedURLs)
+BLOCKED_URL_GLOBS = (
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*mc.yandex.ru*', '*facebook.net*', '*hotjar.com*', '*adservice.google.*', '*criteo.*', '*scorecardresearch.com*',
+)
+
+# Статические ресурсы по расширению (для CDP, где блокировка по типу недоступна)
+BLOCKED_EXTENSION_GLOBS = (
+    '*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico*',
+    '*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.mp4*', '*.webm*',
+)
+
+
+@dataclass(frozen=True)
+class CaptureProfile:
+    """Что перехватывать и чего ждать на страницах источника"""
+    name: str
+    capture_patterns: Tuple[str, ...]  # URL JSON ответов, которые сохраняются
+    expected_patterns: Tuple[str, ...]  # каждый должен прийти хотя бы раз для раннего завершения
+    block_resource_types: Tuple[str, ...] = BLOCKED_RESOURCE_TYPES
+    block_url_globs: Tuple[str, ...] = BLOCKED_URL_GLOBS
+    timeout: float = 15.0  # не дольше прежней фиксированной паузы
+    settle: float = 0.5  # после ожидаемых данных - на отрисовку DOM
+
+
+CAPTURE_PROFILES: Dict[str, CaptureProfile] = {
+    'sofascore': CaptureProfile('sofascore', (r'/api/v1/',), (r'/api/v1/sport/[\w-]+/events/live',)),
+    'scores24': CaptureProfile('scores24', (r'/api/', r'dapi'), (r'/api/|dapi',), timeout=12.0),
+    'betboom': CaptureProfile('betboom', (r'/api/',), (r'/api/.*(live|event)',), timeout=10.0),
+}
+
+_DOMAIN_PROFILES = {
+    'sofascore.com': 'sofascore',
+    'scores24.live': 'scores24',
+    'betboom.ru': 'betboom',
+}
+
+# Для неизвестных источников: любой JSON API, ранний выход по первому ответу
+GENERIC_PROFILE = CaptureProfile('generic', (r'/api/',), (r'/api/',))
+
+
+def profile_for(url: str) -> CaptureProfile:
+    """Профиль захвата по домену страницы"""
+    return CAPTURE_PROFILES.get(_DOMAIN_PROFILES.get(domain_for(url), ''), GENERIC_PROFILE)
+
+
+@dataclass
+class CaptureResult:
+    """Результат загрузки страницы в режиме захвата"""
+    payloads: List[Dict[str, Any]] = field(default_factory=list)  # {'url', 'data'}
+    complete: bool = False  # все ожидаемые данные пришли до таймаута
+    elapsed: float = 0.0
+    blocked: int = 0
+
+    def data(self, pattern: Optional[str] = None) -> List[Any]:
+        """Перехваченные данные (все или с URL под шаблон)"""
+        return [item['data'] for item in self.payloads if pattern is None or re.search(pattern, item['url'])]
+
+
+class _Collector:
+    """Общая логика захвата для Playwright и Selenium"""
+
+    def __init__(self, profile: CaptureProfile):
+        self.profile = profile
+        self.capture = [re.compile(pattern) for pattern in profile.capture_patterns]
+        self.missing = {pattern: re.compile(pattern) for pattern in profile.expected_patterns}
+        self.result = CaptureResult()
+        self.started = time.perf_counter()
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        blocked = (resource_type in self.profile.block_resource_types
+                   or any(fnmatch.fnmatch(url, glob) for glob in self.profile.block_url_globs))
+        if blocked:
+            self.result.blocked += 1
+        return blocked
+
+    def wants(self, url: str, status: int, content_type: str) -> bool:
+        return status == 200 and 'json' in (content_type or '') and any(p.search(url) for p in self.capture)
+
+    def add(self, url: str, data: Any):
+        self.result.payloads.append({'url': url, 'data': data})
+        for pattern, regex in list(self.missing.items()):
+            if regex.search(url):
+                del self.missing[pattern]
+
+    @property
+    def complete(self) -> bool:
+        return not self.missing
+
+    def finish(self, logger: Optional[logging.Logger]) -> CaptureResult:
+        self.result.complete = self.complete
+        self.result.elapsed = time.perf_counter() - self.started
+        if logger:
+            status = 'данные получены' if self.result.complete else 'таймаут ожидания данных'
+            logger.info(f"⚡ Захват {self.profile.name}: {len(self.result.payloads)} JSON ответов за "
+                        f"{self.result.elapsed:.1f}с, заблокировано {self.result.blocked} ресурсов ({status})")
+        return self.result
+
+
+# ---- Playwright ----
+
+def capture_page_sync(page, url: str, profile: Optional[CaptureProfile] = None,
+                      logger: Optional[logging.Logger] = None) -> CaptureResult:
+    """Загрузка страницы в режиме захвата (playwright.sync_api)"""
+    collector = _Collector(profile or profile_for(url))
+
+    def handle_route(route):
+        request = route.request
+        if collector.should_block(request.resource_type, request.url):
+            route.abort()
+        else:
+            route.continue_()
+
+    def handle_response(response):
+        if collector.wants(response.url, response.status, response.headers.get('content-type', '')):
+            try:
+                collector.add(response.url, response.json())
+            except Exception:
+                pass
+
+    page.route('**/*', handle_route)
+    page.on('response', handle_response)
+
+    get_global_rate_limiter(logger).acquire(url)
+    page.goto(url, wait_until='domcontentloaded', timeout=collector.profile.timeout * 1000)
+
+    deadline = time.perf_counter() + collector.profile.timeout
+    while not collector.complete and time.perf_counter() < deadline:
+        page.wait_for_timeout(100)
+    if collector.complete and collector.profile.settle:
+        page.wait_for_timeout(collector.profile.settle * 1000)
+
+    return collector.finish(logger)
+
+
+async def capture_page_async(page, url: str, profile: Optional[CaptureProfile] = None,
+                             logger: Optional[logging.Logger] = None) -> CaptureResult:
+    """Загрузка страницы в режиме захвата (playwright.async_api)"""
+    collector = _Collector(profile or profile_for(url))
+
+    async def handle_route(route):
+        request = route.request
+        if collector.should_block(request.resource_type, request.url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def handle_response(response):
+        if collector.wants(response.url, response.status, response.headers.get('content-type', '')):
+            try:
+                collector.add(response.url, await response.json())
+            except Exception:
+                pass
+
+    await page.route('**/*', handle_route)
+    page.on('response', handle_response)
+
+    await get_global_rate_limiter(logger).acquire_async(url)
+    await page.goto(url, wait_until='domcontentloaded', timeout=collector.profile.timeout * 1000)
+
+    deadline = time.perf_counter() + collector.profile.timeout
+    while not collector.complete and time.perf_counter() < deadline:
+        await page.wait_for_timeout(100)
+    if collector.complete and collector.profile.settle:
+        await page.wait_for_timeout(collector.profile.settle * 1000)
+
+    return collector.finish(logger)
+
+
+# ---- Selenium (Chrome DevTools Protocol) ----
+
+def enable_performance_log(options):
+    """Журнал performance в ChromeOptions (нужен для перехвата ответов через CDP)"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+def capture_page_selenium(driver, url: str, profile: Optional[CaptureProfile] = None,
+                          logger: Optional[logging.Logger] = None,
+                          timeout: Optional[float] = None,
+                          ready: Optional[Callable[[], bool]] = None) -> CaptureResult:
+    """
+    Загрузка страницы в режиме захвата через Selenium Chrome
+    (блокировка по шаблонам URL; без журнала performance - только блокировка и ожидание)
+    Учитываются только ответы текущего перехода (по loaderId), поэтому драйвер можно
+    переиспользовать между страницами
+
+    Args:
+        timeout: верхняя граница ожидания вместо таймаута профиля
+        ready: дополнительная проверка готовности страницы (раз в секунду), например
+            данные уже есть во встроенном состоянии и ответов API ждать не нужно
+    """
+    profile = profile or profile_for(url)
+    if timeout is not None:
+        profile = replace(profile, timeout=timeout)
+    collector = _Collector(profile)
+
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs',
+                               {'urls': list(collector.profile.block_url_globs + BLOCKED_EXTENSION_GLOBS)})
+    except Exception as e:
+        if logger:
+            logger.debug(f"CDP блокировка недоступна: {e}")
+
+    # Журнал performance общий для всех загрузок драйвера (драйверы переиспользуются пулом):
+    # события предыдущей страницы вычитываются до перехода
+    try:
+        driver.get_log('performance')
+    except Exception:
+        pass
+
+    get_global_rate_limiter(logger).acquire(url)
+    driver.get(url)
+
+    # loaderId текущего перехода: ответы с другим loaderId относятся к прошлой странице
+    loader_id: Optional[str] = None
+    pending: Dict[str, str] = {}
+    deadline = time.perf_counter() + collector.profile.timeout
+    next_ready_check = time.perf_counter() + 1.0
+    while not collector.complete and time.perf_counter() < deadline:
+        if ready is not None and time.perf_counter() >= next_ready_check:
+            next_ready_check = time.perf_counter() + 1.0
+            try:
+                if ready():
+                    collector.missing.clear()
+                    break
+            except Exception:
+                pass
+
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            # Журнал не включен: остается фиксированное ожидание в пределах таймаута профиля
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+            break
+
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method, params = message.get('method'), message.get('params', {})
+
+            if method == 'Network.requestWillBeSent':
+                # Документ перехода: requestId совпадает с loaderId
+                if (loader_id is None and params.get('type') == 'Document'
+                        and params.get('requestId') == params.get('loaderId')):
+                    loader_id = params['loaderId']
+                continue
+            if loader_id is None:
+                continue
+
+            if method == 'Network.responseReceived':
+                if params.get('loaderId') != loader_id:
+                    continue
+                response = params.get('response', {})
+                if collector.wants(response.get('url', ''), response.get('status', 0), response.get('mimeType', '')):
+                    pending[params['requestId']] = response['url']
+            elif method == 'Network.loadingFinished' and params.get('requestId') in pending:
+                request_url = pending.pop(params['requestId'])
+                try:
+                    body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+                    text = base64.b64decode(body['body']).decode('utf-8') if body.get('base64Encoded') else body['body']
+                    collector.add(request_url, json.loads(text))
+                except Exception:
+                    continue
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                collector.result.blocked += 1
+
+        if not collector.complete:
+            time.sleep(0.1)
+
+    if collector.complete and collector.profile.settle:
+        time.sleep(collector.profile.settle)
+
+    return collector.finish(logger)
@@ -0,0 +1,163 @@
+"""
+Общий пул браузеров Selenium
+Вместо запуска и закрытия Chrome на каждый матч драйверы создаются лениво, не
+больше заданного числа, и переиспользуются между задачами. Драйверы пула
+запускаются с журналом performance, поэтому в них работает режим захвата
+(utils.browser_capture)
+"""
+
+import queue
+import atexit
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+except ImportError:
+    webdriver = None
+
+from config import SELENIUM_OPTIONS, CHROMEDRIVER_PATH
+from utils.browser_capture import enable_performance_log
+
+
+def create_chrome_driver():
+    """Chrome с общими настройками проекта и журналом performance"""
+    if webdriver is None:
+        raise RuntimeError("selenium не установлен")
+    chrome_options = Options()
+    for option in SELENIUM_OPTIONS:
+        chrome_options.add_argument(option)
+    enable_performance_log(chrome_options)
+    return webdriver.Chrome(service=Service(CHROMEDRIVER_PATH), options=chrome_options)
+
+
+class BrowserPool:
+    """
+    Ограниченный пул переиспользуемых драйверов
+    """
+
+    def __init__(self, logger: logging.Logger, size: int = 3,
+                 factory: Optional[Callable[[], Any]] = None, max_uses: int = 50):
+        """
+        Args:
+            size: максимальное число одновременно открытых браузеров
+            factory: создание драйвера (по умолчанию - Chrome с настройками проекта)
+            max_uses: после стольких задач драйвер перезапускается (утечки памяти Chrome)
+        """
+        self.logger = logger
+        self.size = max(1, size)
+        self.factory = factory or create_chrome_driver
+        self.max_uses = max_uses
+
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._uses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.stats = {'created': 0, 'reused': 0, 'discarded': 0, 'waits': 0}
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """
+        Драйвер из пула на время задачи
+
+        Ошибка внутри блока считается поломкой браузера: драйвер закрывается, а не
+        возвращается в пул
+
+        Raises:
+            TimeoutError: за timeout секунд не освободился ни один браузер
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats['waits'] += 1
+            if not self._slots.acquire(timeout=timeout):
+                raise TimeoutError("нет свободного браузера в пуле")
+
+        driver = None
+        healthy = False
+        try:
+            driver = self._take()
+            yield driver
+            healthy = True
+        finally:
+            if driver is not None:
+                self._give_back(driver, healthy)
+            self._slots.release()
+
+    def _take(self):
+        try:
+            driver = self._idle.get_nowait()
+            with self._lock:
+                self.stats['reused'] += 1
+            return driver
+        except queue.Empty:
+            pass
+
+        driver = self.factory()
+        with self._lock:
+            self.stats['created'] += 1
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _give_back(self, driver, healthy: bool):
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+            keep = healthy and not self._closed and uses < self.max_uses
+
+        if keep:
+            self._idle.put(driver)
+        else:
+            self._discard(driver)
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self.stats['discarded'] += 1
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.debug(f"Ошибка закрытия браузера пула: {e}")
+
+    def close(self):
+        """Закрытие простаивающих браузеров (занятые закрываются при возврате)"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, 'size': self.size, 'open': len(self._uses), 'idle': self._idle.qsize()}
+
+
+# Глобальный пул браузеров
+_global_pool: Optional[BrowserPool] = None
+_global_lock = threading.Lock()
+
+def get_global_browser_pool(logger: Optional[logging.Logger] = None, size: int = 3) -> BrowserPool:
+    """Получение общего пула браузеров процесса (закрывается close_global_browser_pool)"""
+    global _global_pool
+    if _global_pool is None:
+        with _global_lock:
+            if _global_pool is None:
+                _global_pool = BrowserPool(logger or logging.getLogger(__name__), size=size)
+                atexit.register(close_global_browser_pool)
+    return _global_pool
+
+
+def close_global_browser_pool():
+    """Закрытие общего пула браузеров (при остановке анализатора и завершении процесса)"""
+    global _global_pool
+    with _global_lock:
+        pool, _global_pool = _global_pool, None
+    if pool is not None:
+        pool.close()
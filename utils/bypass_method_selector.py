@@ -0,0 +1,166 @@
+"""
+Адаптивный выбор методов обхода защиты по доменам
+Методы упорядочиваются по ожидаемому времени до успеха: суммарное время попыток
+метода на домене, деленное на число успехов (при последовательном переборе такой
+порядок минимизирует ожидаемое время). Успешность и время сглажены априорными
+значениями, поэтому метод, который на домене стабильно не срабатывает, уходит в
+конец очереди после нескольких неудач. Исследование epsilon-greedy: с малой
+вероятностью первым пробуется случайный другой метод, чтобы замечать изменения
+защиты домена.
+
+Статистика затухает (новые наблюдения весят больше) и сохраняется в JSON между
+перезапусками
+"""
+
+import os
+import json
+import time
+import random
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from config import BYPASS_STATS_FILE
+from utils.rate_limiter import domain_for
+
+
+class BypassMethodSelector:
+    """
+    Порядок методов обхода для домена по накопленной статистике (epsilon-greedy бандит)
+    """
+
+    def __init__(self, logger: logging.Logger, path: Optional[str] = BYPASS_STATS_FILE,
+                 prior_times: Optional[Dict[str, float]] = None, epsilon: float = 0.1,
+                 decay: float = 0.98, save_interval: float = 30.0):
+        """
+        Args:
+            path: файл статистики (None - без сохранения)
+            prior_times: ожидаемое время попытки метода до появления наблюдений
+            epsilon: вероятность поставить первым случайный другой метод
+            decay: затухание старых наблюдений при каждой новой попытке метода
+            save_interval: минимальный интервал между записями файла, с
+        """
+        self.logger = logger
+        self.path = path
+        self.prior_times = prior_times or {}
+        self.epsilon = epsilon
+        self._random = random.Random()
+        self.decay = decay
+        self.save_interval = save_interval
+
+        # домен -> метод -> {'attempts', 'successes', 'total_time'}
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = 0.0
+
+        self._load()
+
+    def order(self, url: str, methods: Sequence[str]) -> List[str]:
+        """
+        Методы в порядке попыток для домена URL
+        (без статистики по домену - порядок вызывающего кода)
+        """
+        domain = domain_for(url)
+        with self._lock:
+            stats = self._stats.get(domain)
+            if not stats:
+                return list(methods)
+            scored = [(self._expected_time(stats.get(method), method), index, method)
+                      for index, method in enumerate(methods)]
+        ordered = [method for _, _, method in sorted(scored)]
+
+        if len(ordered) > 1 and self._random.random() < self.epsilon:
+            explored = ordered.pop(self._random.randrange(1, len(ordered)))
+            ordered.insert(0, explored)
+        return ordered
+
+    def _expected_time(self, entry: Optional[Dict[str, float]], method: str) -> float:
+        """Ожидаемое время до успеха: сглаженное среднее время попытки / сглаженная успешность"""
+        prior = self.prior_times.get(method, 10.0)
+        attempts = entry['attempts'] if entry else 0.0
+        successes = entry['successes'] if entry else 0.0
+        total_time = entry['total_time'] if entry else 0.0
+        mean_time = (total_time + prior) / (attempts + 1)
+        success_rate = (successes + 1) / (attempts + 2)
+        return mean_time / success_rate
+
+    def record(self, url: str, method: str, success: bool, elapsed: float):
+        """Результат попытки метода на домене URL"""
+        domain = domain_for(url)
+        with self._lock:
+            entry = self._stats.setdefault(domain, {}).setdefault(
+                method, {'attempts': 0.0, 'successes': 0.0, 'total_time': 0.0})
+            for key in entry:
+                entry[key] *= self.decay
+            entry['attempts'] += 1
+            entry['successes'] += 1 if success else 0
+            entry['total_time'] += elapsed
+            self._dirty = True
+
+        if time.monotonic() - self._saved_at >= self.save_interval:
+            self.save()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._stats = {
+                domain: {method: {key: float(entry.get(key, 0.0)) for key in ('attempts', 'successes', 'total_time')}
+                         for method, entry in methods.items()}
+                for domain, methods in data.get('domains', {}).items()
+            }
+            self.logger.info(f"Статистика методов обхода загружена: {len(self._stats)} доменов")
+        except Exception as e:
+            self.logger.warning(f"Не удалось загрузить статистику методов обхода {self.path}: {e}")
+            self._stats = {}
+
+    def save(self) -> bool:
+        """Запись статистики в файл (атомарно через временный файл)"""
+        if not self.path:
+            return False
+        with self._lock:
+            if not self._dirty:
+                return True
+            data = {'updated_at': time.time(), 'domains': self._stats}
+            payload = json.dumps(data, ensure_ascii=False, indent=2)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Не удалось сохранить статистику методов обхода {self.path}: {e}")
+            return False
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Метрики по доменам: успешность, среднее время попытки и ожидаемое время до успеха"""
+        with self._lock:
+            snapshot = {domain: {method: dict(entry) for method, entry in methods.items()}
+                        for domain, methods in self._stats.items()}
+
+        metrics = {}
+        for domain, methods in snapshot.items():
+            metrics[domain] = {
+                method: {
+                    'attempts': round(entry['attempts'], 2),
+                    'success_rate': round(entry['successes'] / entry['attempts'], 3) if entry['attempts'] else 0.0,
+                    'mean_time': round(entry['total_time'] / entry['attempts'], 3) if entry['attempts'] else 0.0,
+                    'time_to_success': round(entry['total_time'] / entry['successes'], 3) if entry['successes'] else None,
+                    'expected_time': round(self._expected_time(entry, method), 3)
+                }
+                for method, entry in methods.items()
+            }
+        return metrics
+
+    def log_report(self):
+        for domain, methods in self.get_metrics().items():
+            ranked = sorted(methods.items(), key=lambda item: item[1]['expected_time'])
+            summary = ', '.join(f"{method} {info['success_rate']:.0%}/{info['mean_time']:.1f}с" for method, info in ranked)
+            self.logger.info(f"🛡️ Обход {domain}: {summary}")
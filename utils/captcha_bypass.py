@@ -4,13 +4,19 @@ CAPTCHA Bypass Manager - Продвинутый обход защиты сайт
 """
 
 import asyncio
+import atexit
 import random
 import time
+import weakref
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 from enum import Enum
 import logging
 
+from utils.latency_histogram import TimeoutPolicy, get_global_latency_tracker
+from utils.rate_limiter import get_global_rate_limiter
+from utils.bypass_method_selector import BypassMethodSelector
+
 # Импорты для разных методов обхода
 try:
     import undetected_chromedriver as uc
@@ -68,6 +74,7 @@ class CaptchaBypassManager:
     
     def __init__(self, logger: logging.Logger):
         self.logger = logger
+        _managers.add(self)
         self.user_agent_rotator = self._init_user_agent_rotator()
         self.proxy_list = self._load_proxy_list()
         
@@ -83,6 +90,23 @@ class CaptchaBypassManager:
         # Статистика успешности методов
         self.method_stats = {method: {"attempts": 0, "successes": 0} 
                            for method in BypassMethod}
+        
+        # Время выполнения методов: таймаут из p99 вместо стартовых значений method_settings
+        self.latency = get_global_latency_tracker()
+        self.timeout_policy = TimeoutPolicy(min_timeout=5.0, max_timeout=60.0, min_samples=10)
+        
+        # Частота обращений к домену задает общий ограничитель (вместо пауз между методами)
+        self.rate_limiter = get_global_rate_limiter(logger)
+        
+        # Порядок методов по домену: ожидаемое время до успеха (статистика сохраняется между запусками)
+        self.method_selector = BypassMethodSelector(
+            logger, prior_times={method.value: settings["timeout"] / 2 for method, settings in self.method_settings.items()}
+        )
+    
+    def _method_timeout(self, method: BypassMethod) -> float:
+        """Таймаут метода обхода по наблюдаемому времени выполнения"""
+        return self.latency.timeout(f"bypass:{method.value}", default=self.method_settings[method]["timeout"],
+                                    policy=self.timeout_policy)
     
     def _init_user_agent_rotator(self):
         """Инициализация ротатора User-Agent"""
@@ -116,6 +140,10 @@ class CaptchaBypassManager:
                                          preferred_methods: Optional[List[BypassMethod]] = None) -> BypassResult:
         """
         Попытка обхода с использованием нескольких методов
+        
+        Порядок методов выбирается по статистике домена: сначала метод с наименьшим
+        ожидаемым временем до успеха (preferred_methods задает набор и порядок для
+        доменов без статистики)
         """
         if preferred_methods is None:
             # Методы в порядке предпочтения (от быстрого к медленному)
@@ -127,16 +155,22 @@ class CaptchaBypassManager:
                 BypassMethod.SELENIUM_WIRE
             ]
         
-        self.logger.info(f"Начинаем обход для {url} с {len(preferred_methods)} методами")
+        methods = [BypassMethod(value) for value in
+                   self.method_selector.order(url, [method.value for method in preferred_methods])]
         
-        for method in preferred_methods:
+        self.logger.info(f"Начинаем обход для {url} с {len(methods)} методами: "
+                         f"{', '.join(method.value for method in methods)}")
+        
+        for method in methods:
             self.logger.info(f"Пробуем метод: {method.value}")
+            started = time.time()
             
             try:
                 result = await self._try_bypass_method(url, method)
                 
                 # Обновляем статистику
                 self.method_stats[method]["attempts"] += 1
+                self.method_selector.record(url, method.value, result.success, result.execution_time)
                 if result.success:
                     self.method_stats[method]["successes"] += 1
                     self.logger.info(f"✅ Успешный обход методом {method.value} за {result.execution_time:.2f}с")
@@ -147,9 +181,7 @@ class CaptchaBypassManager:
             except Exception as e:
                 self.logger.error(f"❌ Ошибка метода {method.value}: {e}")
                 self.method_stats[method]["attempts"] += 1
-                
-                # Пауза перед следующим методом
-                await asyncio.sleep(random.uniform(1, 3))
+                self.method_selector.record(url, method.value, False, time.time() - started)
         
         return BypassResult(
             success=False,
@@ -159,6 +191,7 @@ class CaptchaBypassManager:
     
     async def _try_bypass_method(self, url: str, method: BypassMethod) -> BypassResult:
         """Попытка обхода конкретным методом"""
+        await self.rate_limiter.acquire_async(url)
         start_time = time.time()
         
         try:
@@ -176,6 +209,7 @@ class CaptchaBypassManager:
                 raise ValueError(f"Неподдерживаемый метод: {method}")
             
             execution_time = time.time() - start_time
+            self.latency.record(f"bypass:{method.value}", execution_time)
             
             # Проверяем на наличие CAPTCHA в контенте
             if self._detect_captcha(content):
@@ -195,6 +229,10 @@ class CaptchaBypassManager:
             
         except Exception as e:
             execution_time = time.time() - start_time
+            timed_out = isinstance(e, asyncio.TimeoutError)
+            self.latency.record(f"bypass:{method.value}",
+                                self._method_timeout(method) if timed_out else execution_time,
+                                error=True, timed_out=timed_out)
             return BypassResult(
                 success=False,
                 method=method,
@@ -215,7 +253,7 @@ class CaptchaBypassManager:
             'Upgrade-Insecure-Requests': '1',
         }
         
-        timeout = aiohttp.ClientTimeout(total=self.method_settings[BypassMethod.HTTP_SIMPLE]["timeout"])
+        timeout = aiohttp.ClientTimeout(total=self._method_timeout(BypassMethod.HTTP_SIMPLE))
         
         async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
             async with session.get(url) as response:
@@ -381,11 +419,35 @@ class CaptchaBypassManager:
             }
         return stats
     
+    def get_domain_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Статистика методов по доменам (основа выбора порядка методов)"""
+        return self.method_selector.get_metrics()
+    
+    def close(self):
+        """Сохранение статистики методов по доменам"""
+        self.method_selector.save()
+    
     async def smart_delay(self, min_delay: float = 1.0, max_delay: float = 3.0):
         """Умная задержка между запросами"""
         delay = random.uniform(min_delay, max_delay)
         await asyncio.sleep(delay)
 
+# Созданные менеджеры: статистика методов сохраняется не чаще раза в save_interval,
+# поэтому при остановке все менеджеры закрываются (close_captcha_bypass_managers)
+_managers: 'weakref.WeakSet[CaptchaBypassManager]' = weakref.WeakSet()
+
+
+def close_captcha_bypass_managers():
+    """Сохранение статистики всех менеджеров (при остановке анализатора и завершении процесса)"""
+    for manager in list(_managers):
+        try:
+            manager.close()
+        except Exception as e:
+            manager.logger.warning(f"Ошибка закрытия менеджера обхода CAPTCHA: {e}")
+
+
+atexit.register(close_captcha_bypass_managers)
+
 # Фабрика для создания менеджера
 def create_captcha_bypass_manager(logger: logging.Logger) -> CaptchaBypassManager:
     """Создание настроенного менеджера обхода CAPTCHA"""
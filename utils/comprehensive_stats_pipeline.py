@@ -248,22 +248,24 @@ class ComprehensiveStatsPipeline:
             return None
     
     async def _get_sofascore_basic_stats(self, team1: str, team2: str, sport: str) -> Optional[Dict[str, Any]]:
-        """Получение базовой статистики из SofaScore"""
+        """Получение базовой статистики из SofaScore (записи live-матчей общей ленты цикла)"""
         try:
-            matches = self.aggregator.scrapers['sofascore'].get_live_matches(sport)
-            
-            # Ищем наш матч среди live матчей SofaScore
-            for sofascore_match in matches:
+            def same_match(sofascore_match: Dict[str, Any]) -> bool:
                 sf_team1 = sofascore_match.get('team1', '').lower()
                 sf_team2 = sofascore_match.get('team2', '').lower()
-                
-                if (self._teams_match(team1, sf_team1) and self._teams_match(team2, sf_team2)) or \
-                   (self._teams_match(team1, sf_team2) and self._teams_match(team2, sf_team1)):
-                    return {
-                        'sofascore_match_found': True,
-                        'sofascore_data': sofascore_match,
-                        'match_confidence': 0.8
-                    }
+                return (self._teams_match(team1, sf_team1) and self._teams_match(team2, sf_team2)) or \
+                       (self._teams_match(team1, sf_team2) and self._teams_match(team2, sf_team1))
+            
+            # Ищем наш матч в индексе ленты, затем нечетко среди уже загруженных матчей
+            sofascore_match = self.aggregator.live_score_feed.find(team1, team2, sport, same_match)
+            if sofascore_match:
+                return {
+                    'sofascore_match_found': True,
+                    'sofascore_data': sofascore_match,
+                    # Команды в записи SofaScore в обратном порядке: счет читается от team2
+                    'teams_reversed': not self._teams_match(team1, sofascore_match.get('team1', '').lower()),
+                    'match_confidence': 0.8
+                }
             
             return None
             
@@ -0,0 +1,184 @@
+"""
+HTTP сессия с условными запросами и кэшем разобранных страниц
+ETag/Last-Modified отправляются повторно (If-None-Match/If-Modified-Since), тело
+хэшируется - при 304 или побайтно одинаковом теле возвращается прошлый результат
+разбора без BeautifulSoup. Сжатие brotli/zstd включается, если их распаковывает
+клиент транспорта
+"""
+
+import time
+import hashlib
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.http_transport import HttpTransport, SourceSession, get_global_transport, profile_headers
+
+
+def accept_encoding(transport: HttpTransport) -> str:
+    """Accept-Encoding только с теми кодировками, которые распакует клиент транспорта"""
+    content_encodings = getattr(transport, 'content_encodings', None)
+    return ', '.join(content_encodings() if content_encodings else ['gzip', 'deflate'])
+
+
+@dataclass
+class PageEntry:
+    """Последняя версия страницы и результаты ее разбора"""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None
+    body_size: int = 0
+    results: Dict[str, Any] = field(default_factory=dict)  # вариант разбора -> результат
+    fetched_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class PageCacheStats:
+    """Статистика повторного использования страниц одного источника"""
+    requests: int = 0
+    not_modified: int = 0   # 304
+    unchanged: int = 0      # 200 с тем же телом
+    parsed: int = 0
+    bytes_saved: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        if not self.requests:
+            return 0.0
+        return (self.not_modified + self.unchanged) / self.requests
+
+
+def _copy_result(result: Any) -> Any:
+    """Поверхностная копия результата: вызывающий код дополняет матчи на месте"""
+    if isinstance(result, list):
+        return [item.copy() if hasattr(item, 'copy') else item for item in result]
+    return result
+
+
+class ConditionalSession(SourceSession):
+    """
+    Сессия источника с ревалидацией страниц и кэшем разобранных результатов
+
+    Обычный get() работает как раньше; get_parsed() делает условный запрос
+    и вызывает parse(response) только если содержимое страницы изменилось.
+    """
+
+    def __init__(self, transport: HttpTransport, source: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(transport, source, headers)
+        self.headers['Accept-Encoding'] = accept_encoding(transport)
+
+        self._pages: Dict[str, PageEntry] = {}
+        self._lock = threading.Lock()
+        self.cache_stats = PageCacheStats()
+
+        _sessions.add(self)
+
+    def get_parsed(self, url: str, parse: Callable[[Any], Any], variant: str = '',
+                   validate: Optional[Callable[[Any], bool]] = None,
+                   **kwargs) -> Tuple[Optional[Any], Any]:
+        """
+        Условный GET с повторным использованием прошлого разбора
+
+        Args:
+            url: адрес страницы
+            parse: разбор ответа (вызывается только для нового содержимого)
+            variant: ключ варианта разбора (например, вид спорта для одной страницы)
+            validate: проверка ответа перед разбором (CAPTCHA и т.д.)
+
+        Returns:
+            Tuple: (результат разбора или None, ответ)
+        """
+        entry = self._pages.get(url)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None and variant in entry.results:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        response = self.get(url, headers=headers, **kwargs)
+        self.cache_stats.requests += 1
+
+        if response.status_code == 304 and entry is not None and variant in entry.results:
+            self.cache_stats.not_modified += 1
+            self.cache_stats.bytes_saved += entry.body_size
+            return _copy_result(entry.results[variant]), response
+
+        if response.status_code != 200:
+            return None, response
+
+        body_hash = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+
+        with self._lock:
+            entry = self._pages.get(url)
+            if entry is None or entry.body_hash != body_hash:
+                entry = PageEntry(body_hash=body_hash, body_size=len(response.content))
+                self._pages[url] = entry
+            entry.etag = response.headers.get('ETag')
+            entry.last_modified = response.headers.get('Last-Modified')
+            entry.fetched_at = time.time()
+
+            if variant in entry.results:
+                self.cache_stats.unchanged += 1
+                return _copy_result(entry.results[variant]), response
+
+        if validate is not None and not validate(response):
+            return None, response
+
+        result = parse(response)
+        self.cache_stats.parsed += 1
+
+        with self._lock:
+            if entry.body_hash == body_hash:
+                entry.results[variant] = result
+
+        return _copy_result(result), response
+
+    def forget(self, url: Optional[str] = None):
+        """Сброс сохраненных страниц (всех или одной)"""
+        with self._lock:
+            if url is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(url, None)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        stats = self.cache_stats
+        return {
+            'requests': stats.requests,
+            'not_modified': stats.not_modified,
+            'unchanged': stats.unchanged,
+            'parsed': stats.parsed,
+            'hit_rate': round(stats.hit_rate, 3),
+            'bytes_saved': stats.bytes_saved,
+            'pages': len(self._pages)
+        }
+
+
+# Все созданные сессии (для отчета по источникам)
+_sessions: 'weakref.WeakSet[ConditionalSession]' = weakref.WeakSet()
+
+
+def create_conditional_session(source: str, profile: str = 'html_en', headers: Optional[Dict[str, str]] = None,
+                               transport: Optional[HttpTransport] = None) -> ConditionalSession:
+    """Создание сессии источника поверх общего транспорта с профилем заголовков"""
+    return ConditionalSession(transport or get_global_transport(), source,
+                              profile_headers(profile, **(headers or {})))
+
+
+def get_page_cache_report() -> Dict[str, Dict[str, Any]]:
+    """Доля повторно использованных страниц по источникам"""
+    report: Dict[str, Dict[str, Any]] = {}
+    for session in list(_sessions):
+        stats = session.get_cache_stats()
+        current = report.get(session.source)
+        if current is None:
+            report[session.source] = stats
+            continue
+        for key in ('requests', 'not_modified', 'unchanged', 'parsed', 'bytes_saved', 'pages'):
+            current[key] += stats[key]
+        hits = current['not_modified'] + current['unchanged']
+        current['hit_rate'] = round(hits / current['requests'], 3) if current['requests'] else 0.0
+    return report
@@ -0,0 +1,475 @@
+"""
+Бенчмарк циклов анализа
+run.py --bench выполняет run_smart_cycle и run_analysis_cycle несколько раз на локальных
+подменах: источники матчей и лента счетов отдают синтетические данные с задержкой как у
+HTTP, Claude отвечает фиктивным клиентом с настраиваемой задержкой, Telegram - пустой
+приемник (сообщения форматируются, но не отправляются). Фильтры, сопоставление, отбор
+и построение промптов выполняются настоящим кодом.
+
+Отчет: p50/p95/max по этапам, пик аллокаций (tracemalloc), пиковый RSS, матчей в секунду
+и сравнение с сохраненной базой (регрессии помечаются)
+"""
+
+import json
+import time
+import resource
+import logging
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from scrapers.synthetic_load_generator import PEAK_EVENING_COUNTS, create_synthetic_generator
+from utils.cycle_stages import add_stage_listener, remove_stage_listener
+from utils.smart_scheduler import ActivityPeriod
+
+# Источники, у которых подменяется только сеть, а остальные методы (фильтры) настоящие
+DELEGATED_SOURCES = ('marathonbet',)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль с линейной интерполяцией (q от 0 до 100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        'p50': round(percentile(values, 50), 4),
+        'p95': round(percentile(values, 95), 4),
+        'max': round(max(values), 4) if values else 0.0,
+        'samples': len(values)
+    }
+
+
+class FakeClaudeClient:
+    """Фиктивный клиент Anthropic: задержка вместо API, ответ фиксированной формы"""
+
+    def __init__(self, latency: float = 1.0):
+        self.latency = latency
+        self.messages = self
+        self.calls = 0
+
+    def create(self, model: str = '', max_tokens: int = 0, temperature: float = 0.0,
+               messages: Optional[List[Dict[str, Any]]] = None, **kwargs) -> SimpleNamespace:
+        self.calls += 1
+        time.sleep(self.latency)
+        prompt = ''.join(message.get('content', '') for message in messages or [])
+        text = "🎯 БЕНЧМАРК: фиктивный анализ\n\n1. П1 @ 1.85 - уверенность 75%\n2. П2 @ 2.10 - уверенность 70%"
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=text)],
+            usage=SimpleNamespace(input_tokens=len(prompt) // 4, output_tokens=len(text) // 4)
+        )
+
+
+class NullTelegramSink:
+    """Пустой приемник Telegram: сообщение принимается и отбрасывается"""
+
+    def __init__(self):
+        self.messages = 0
+        self.characters = 0
+
+    def send(self, text: str, *args, **kwargs) -> bool:
+        self.messages += 1
+        self.characters += len(text or '')
+        return True
+
+
+class BenchFixtures:
+    """
+    Синтетические данные одного цикла: матчи MarathonBet и список SofaScore по видам спорта
+    """
+
+    def __init__(self, seed: int = 42, scale: float = 1.0, latency: float = 0.05):
+        self.generator = create_synthetic_generator(seed)
+        self.scale = scale
+        self.latency = latency
+        self.marathonbet: Dict[str, List[Dict[str, Any]]] = {}
+        self.sofascore: Dict[str, List[Dict[str, Any]]] = {}
+        self.requests = 0
+
+    def refresh(self):
+        """Новые матчи для следующего цикла (детерминированно от seed)"""
+        for sport, count in PEAK_EVENING_COUNTS.items():
+            dataset = self.generator.generate_paired(sport, max(1, int(count * self.scale)))
+            self.marathonbet[sport] = dataset.marathonbet
+            self.sofascore[sport] = [
+                {**match, 'url': f"/synthetic/sofascore/{sport}/{index}#id:{index}", 'time': "LIVE"}
+                for index, match in enumerate(dataset.sofascore)
+            ]
+
+    @property
+    def total_matches(self) -> int:
+        return sum(len(matches) for matches in self.marathonbet.values())
+
+    def _request(self):
+        self.requests += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def source_matches(self, source: str, sport: str) -> List[Dict[str, Any]]:
+        """Ответ источника матчей (копии: пайплайн изменяет словари)"""
+        self._request()
+        matches = self.sofascore if source == 'sofascore' else self.marathonbet if source == 'marathonbet' else {}
+        return [dict(match) for match in matches.get(sport, [])]
+
+    def feed_matches(self, sport: str = 'football') -> List[Dict[str, Any]]:
+        """Ответ страницы live-счетов SofaScore"""
+        self._request()
+        return [dict(match) for match in self.sofascore.get(sport, [])]
+
+    def match_details(self, match_url: str) -> Dict[str, Any]:
+        """Детальные данные матча"""
+        self._request()
+        return {
+            'url': match_url,
+            'statistics': {'Владение мячом': '55% - 45%', 'Удары': '9 - 6', 'Удары в створ': '4 - 2'},
+            'data_format': 'fixture'
+        }
+
+
+class FixtureSource:
+    """
+    Источник матчей на синтетических данных; остальные методы берутся у настоящего
+    источника (если он передан)
+    """
+
+    def __init__(self, name: str, fixtures: BenchFixtures, delegate: Any = None):
+        self.name = name
+        self.fixtures = fixtures
+        self.delegate = delegate
+
+    def get_live_matches(self, sport: str = 'football') -> List[Dict[str, Any]]:
+        return self.fixtures.source_matches(self.name, sport)
+
+    def get_live_matches_with_odds(self, sport: str = 'football', use_prioritization: bool = True) -> List[Dict[str, Any]]:
+        return self.fixtures.source_matches(self.name, sport)
+
+    def get_detailed_match_data(self, match_url: str) -> Dict[str, Any]:
+        return self.fixtures.match_details(match_url)
+
+    def verify_connection(self) -> bool:
+        return True
+
+    def close_driver(self):
+        pass
+
+    def __getattr__(self, attr: str) -> Any:
+        delegate = self.__dict__.get('delegate')
+        if delegate is None:
+            raise AttributeError(attr)
+        return getattr(delegate, attr)
+
+
+class CycleBenchmark:
+    """
+    Многократный прогон циклов анализа на локальных подменах
+    """
+
+    CYCLES = ('smart', 'legacy')
+
+    def __init__(self, analyzer, logger: logging.Logger, seed: int = 42, scale: float = 1.0,
+                 http_latency: float = 0.05, claude_latency: float = 1.0, trace_memory: bool = True):
+        """
+        Args:
+            analyzer: SportsAnalyzer (подмены устанавливаются в его компоненты)
+            scale: множитель объема вечернего пика (PEAK_EVENING_COUNTS)
+            http_latency: задержка ответа подмененного источника
+            claude_latency: задержка ответа фиктивного Claude
+            trace_memory: учитывать пик аллокаций через tracemalloc
+        """
+        self.analyzer = analyzer
+        self.logger = logger
+        self.seed = seed
+        self.scale = scale
+        self.http_latency = http_latency
+        self.claude_latency = claude_latency
+        self.trace_memory = trace_memory
+
+        self.fixtures = BenchFixtures(seed, scale, http_latency)
+        self.claude_client = FakeClaudeClient(claude_latency)
+        self.telegram_sink = NullTelegramSink()
+        self._installed = False
+
+    # ---- подмены ----
+
+    def install(self):
+        """Подмена сети, Claude и Telegram в компонентах анализатора"""
+        if self._installed:
+            return
+
+        analyzer = self.analyzer
+        registry = analyzer.source_registry
+
+        for name in registry.names(kind='match'):
+            delegate = None
+            if name in DELEGATED_SOURCES:
+                try:
+                    delegate = registry.get(name)
+                except Exception as e:
+                    self.logger.warning(f"Бенчмарк: источник {name} без настоящих методов: {e}")
+            registry.override(name, FixtureSource(name, self.fixtures, delegate))
+
+        aggregator = analyzer.multi_source_aggregator
+        aggregator.live_score_feed.matcher.get_sofascore_matches_with_teams = self.fixtures.feed_matches
+        aggregator.prewarm_connections = lambda: None
+
+        for name in ('claude_v1', 'claude_v2'):
+            try:
+                registry.get(name).client = self.claude_client
+            except Exception as e:
+                self.logger.warning(f"Бенчмарк: анализатор {name} недоступен: {e}")
+
+        analyzer.telegram_reporter._send_message = self.telegram_sink.send
+        analyzer.claude_telegram_reporter._send_telegram_message = self.telegram_sink.send
+
+        # Расписание не зависит от времени запуска: всегда вечерний пик
+        scheduler = analyzer.smart_scheduler
+        peak_config = scheduler.schedule_config[ActivityPeriod.EVENING_PEAK]
+        scheduler.should_run_analysis = lambda *args, **kwargs: (True, 'бенчмарк')
+        scheduler.get_current_period = lambda *args, **kwargs: ActivityPeriod.EVENING_PEAK
+        scheduler.get_max_matches_for_period = lambda *args, **kwargs: peak_config.max_matches_per_message
+
+        self._installed = True
+
+    # ---- прогон ----
+
+    def run(self, cycles: int = 5, warmup: int = 1, modes: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Прогон циклов и отчет
+
+        Args:
+            cycles: число измеряемых циклов каждого вида
+            warmup: число первых циклов, которые не учитываются (импорты, прогрев кэшей)
+            modes: виды циклов ('smart', 'legacy')
+        """
+        self.install()
+
+        cycle_funcs: Dict[str, Callable[[], Any]] = {
+            'smart': self.analyzer.run_smart_cycle,
+            'legacy': self.analyzer.run_analysis_cycle,
+        }
+
+        started_tracemalloc = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracemalloc = True
+
+        report = {
+            'created_at': datetime.now().isoformat(),
+            'config': {
+                'seed': self.seed,
+                'scale': self.scale,
+                'cycles': cycles,
+                'warmup': warmup,
+                'http_latency': self.http_latency,
+                'claude_latency': self.claude_latency,
+                'matches_per_cycle': sum(max(1, int(count * self.scale)) for count in PEAK_EVENING_COUNTS.values())
+            },
+            'cycles': {}
+        }
+
+        try:
+            for mode in modes or self.CYCLES:
+                self.logger.info(f"⏱️ Бенчмарк {mode}: {warmup} прогревочных + {cycles} измеряемых циклов")
+                samples = [self._run_cycle(cycle_funcs[mode]) for _ in range(warmup + cycles)][warmup:]
+                report['cycles'][mode] = self._summarize_mode(samples)
+        finally:
+            if started_tracemalloc:
+                tracemalloc.stop()
+
+        report['peak_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        report['claude_calls'] = self.claude_client.calls
+        report['telegram_messages'] = self.telegram_sink.messages
+        report['fixture_requests'] = self.fixtures.requests
+        return report
+
+    def _run_cycle(self, cycle_func: Callable[[], Any]) -> Dict[str, Any]:
+        self.fixtures.refresh()
+        # Между настоящими циклами проходят минуты: кэш агрегатора к началу цикла устаревает
+        self.analyzer.multi_source_aggregator.cache.clear()
+
+        stages: Dict[str, float] = {}
+        current: List[Any] = [None, 0.0]
+
+        def listener(stage: Optional[str], now: float):
+            if current[0] is not None:
+                stages[current[0]] = stages.get(current[0], 0.0) + now - current[1]
+            current[0], current[1] = stage, now
+
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            base_memory = tracemalloc.get_traced_memory()[0]
+
+        add_stage_listener(listener)
+        started = time.perf_counter()
+        error = None
+        try:
+            cycle_func()
+        except Exception as e:
+            error = str(e)
+            self.logger.warning(f"Бенчмарк: ошибка цикла: {e}")
+        finally:
+            total = time.perf_counter() - started
+            remove_stage_listener(listener)
+
+        alloc_peak_mb = 0.0
+        if tracemalloc.is_tracing():
+            alloc_peak_mb = (tracemalloc.get_traced_memory()[1] - base_memory) / 1024 / 1024
+
+        return {
+            'total': total,
+            'stages': stages,
+            'alloc_peak_mb': alloc_peak_mb,
+            'matches': self.fixtures.total_matches,
+            'error': error
+        }
+
+    def _summarize_mode(self, all_samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # Упавший цикл обрывается на середине и занижает времена - в замеры не входит
+        samples = [sample for sample in all_samples if not sample['error']]
+        # Этапы в порядке выполнения
+        stage_names = list(dict.fromkeys(stage for sample in samples for stage in sample['stages']))
+        return {
+            'total': summarize([sample['total'] for sample in samples]),
+            'stages': {
+                stage: summarize([sample['stages'][stage] for sample in samples if stage in sample['stages']])
+                for stage in stage_names
+            },
+            'alloc_peak_mb': summarize([sample['alloc_peak_mb'] for sample in samples]),
+            'matches_per_second': round(percentile(
+                [sample['matches'] / sample['total'] for sample in samples if sample['total'] > 0], 50), 1),
+            'errors': len(all_samples) - len(samples)
+        }
+
+
+def bench_failures(report: Dict[str, Any]) -> List[str]:
+    """
+    Виды циклов с ошибками: времена считаются только по успешным циклам, поэтому
+    упавший цикл иначе выглядел бы быстрым (а без успешных - нулевым)
+    """
+    failures = []
+    for mode, result in report.get('cycles', {}).items():
+        succeeded = result['total']['samples']
+        if result['errors'] or not succeeded:
+            failures.append(f"{mode}: ошибок {result['errors']}, успешных циклов {succeeded}")
+    return failures
+
+
+# ---- база для сравнения ----
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.15,
+                          min_delta: float = 0.005) -> List[Dict[str, Any]]:
+    """
+    Регрессии относительно базы: p50/p95 этапа выросли больше чем на threshold
+    (и больше чем на min_delta секунд), пропускная способность упала больше чем на threshold,
+    ошибок в циклах стало больше
+    """
+    regressions = []
+    for mode, current in report.get('cycles', {}).items():
+        base = baseline.get('cycles', {}).get(mode)
+        if not base:
+            continue
+
+        before, after = base.get('errors', 0), current.get('errors', 0)
+        if after > before:
+            regressions.append({
+                'cycle': mode, 'stage': 'errors', 'metric': 'errors',
+                'baseline': before, 'current': after, 'change': None
+            })
+
+        timings = [('total', current['total'], base.get('total', {}))]
+        timings += [(stage, stats, base.get('stages', {}).get(stage, {})) for stage, stats in current['stages'].items()]
+
+        for stage, stats, base_stats in timings:
+            for metric in ('p50', 'p95'):
+                before, after = base_stats.get(metric), stats.get(metric)
+                if before is None or after is None:
+                    continue
+                if after > before * (1 + threshold) and after - before > min_delta:
+                    regressions.append({
+                        'cycle': mode, 'stage': stage, 'metric': metric,
+                        'baseline': before, 'current': after,
+                        'change': round((after - before) / before, 3) if before else None
+                    })
+
+        before, after = base.get('matches_per_second'), current.get('matches_per_second')
+        if before and after is not None and after < before * (1 - threshold):
+            regressions.append({
+                'cycle': mode, 'stage': 'throughput', 'metric': 'matches_per_second',
+                'baseline': before, 'current': after, 'change': round((after - before) / before, 3)
+            })
+
+    return regressions
+
+
+def load_baseline(path: str, logger: logging.Logger) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ошибка чтения базы бенчмарка {path}: {e}")
+        return None
+
+
+def save_report(report: Dict[str, Any], path: str, logger: logging.Logger) -> bool:
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return True
+    except Exception as e:
+        logger.warning(f"Ошибка записи отчета бенчмарка {path}: {e}")
+        return False
+
+
+def format_report(report: Dict[str, Any], regressions: Optional[List[Dict[str, Any]]] = None,
+                  failures: Optional[List[str]] = None) -> str:
+    """Отчет в текстовом виде для консоли"""
+    config = report['config']
+    lines = [
+        f"Бенчмарк: {config['cycles']} циклов (+{config['warmup']} прогрев), "
+        f"{config['matches_per_cycle']} матчей/цикл, seed {config['seed']}, "
+        f"HTTP {config['http_latency'] * 1000:.0f} мс, Claude {config['claude_latency']:.2f} с"
+    ]
+
+    for mode, result in report['cycles'].items():
+        lines.append('')
+        lines.append(f"[{mode}] матчей/с: {result['matches_per_second']}, "
+                     f"пик аллокаций p50 {result['alloc_peak_mb']['p50']:.1f} МБ, ошибок: {result['errors']}")
+        lines.append(f"  {'этап':<12} {'p50, с':>9} {'p95, с':>9} {'max, с':>9}")
+        for stage, stats in list(result['stages'].items()) + [('ВСЕГО', result['total'])]:
+            lines.append(f"  {stage:<12} {stats['p50']:>9.3f} {stats['p95']:>9.3f} {stats['max']:>9.3f}")
+
+    lines.append('')
+    lines.append(f"Пиковый RSS: {report['peak_rss_mb']} МБ, запросов к подменам: {report['fixture_requests']}, "
+                 f"вызовов Claude: {report['claude_calls']}, сообщений Telegram: {report['telegram_messages']}")
+
+    if failures:
+        lines.append('')
+        lines.append(f"❌ Циклы с ошибками: {len(failures)}")
+        lines.extend(f"  {failure}" for failure in failures)
+
+    if regressions is not None:
+        lines.append('')
+        if regressions:
+            lines.append(f"❌ Регрессии относительно базы: {len(regressions)}")
+            for item in regressions:
+                change = f" ({item['change']:+.0%})" if item['change'] is not None else ''
+                lines.append(f"  {item['cycle']}/{item['stage']} {item['metric']}: "
+                             f"{item['baseline']} -> {item['current']}{change}")
+        else:
+            lines.append("✅ Регрессий относительно базы нет")
+
+    return '\n'.join(lines)
+
+
+def create_cycle_benchmark(analyzer, logger: logging.Logger, **kwargs) -> CycleBenchmark:
+    """Создание бенчмарка циклов"""
+    return CycleBenchmark(analyzer, logger, **kwargs)
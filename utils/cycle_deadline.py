@@ -0,0 +1,68 @@
+"""
+Дедлайн цикла анализа
+Рантайм демона задает дедлайн перед запуском цикла; код цикла проверяет его между
+единицами работы (вид спорта, матч) и при истечении переходит к анализу и публикации
+того, что уже собрано. Вне демона дедлайн не ограничен
+"""
+
+import time
+import threading
+from typing import Optional
+
+
+class CycleDeadline:
+    """
+    Дедлайн одного цикла (мягкий: проверяется кодом цикла)
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + seconds if seconds else None
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Досрочное завершение (остановка демона или превышение жесткого дедлайна)"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def expired(self) -> bool:
+        if self._cancelled.is_set():
+            return True
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def remaining(self) -> Optional[float]:
+        """Оставшееся время в секундах (None - без ограничения)"""
+        if self._cancelled.is_set():
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+
+_UNLIMITED = CycleDeadline()
+_current: CycleDeadline = _UNLIMITED
+
+
+def start_deadline(seconds: Optional[float]) -> CycleDeadline:
+    """Новый дедлайн для начинающегося цикла"""
+    global _current
+    _current = CycleDeadline(seconds)
+    return _current
+
+
+def current_deadline() -> CycleDeadline:
+    """Дедлайн текущего цикла (без ограничения вне демона)"""
+    return _current
+
+
+def clear_deadline(deadline: Optional[CycleDeadline] = None):
+    """Снятие дедлайна после цикла (только если он все еще текущий)"""
+    global _current
+    if deadline is None or _current is deadline:
+        _current = _UNLIMITED
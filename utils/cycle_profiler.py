@@ -0,0 +1,308 @@
+"""
+Профилирование циклов анализа
+Выборочный (sampling) профилировщик: фоновый поток раз в несколько миллисекунд снимает
+стеки всех потоков процесса и относит их к текущему этапу цикла. Результат пишется
+в каталог с меткой времени:
+- stacks.collapsed и stage_<этап>.collapsed - свернутые стеки (flamegraph.pl, speedscope)
+- top_functions.txt - функции с наибольшим собственным временем
+- stages.json - длительность этапов по циклам
+- memory_cycle_<N>.txt - разница снимков tracemalloc между циклами
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import logging
+import threading
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.cycle_stages import add_stage_listener, current_stage, remove_stage_listener
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_UNSAFE_NAME_RE = re.compile(r'[^\w.-]+')
+
+
+def _frame_label(code) -> str:
+    """Имя кадра для свернутого стека: функция (файл:строка)"""
+    filename = code.co_filename
+    if filename.startswith(_PROJECT_ROOT):
+        filename = os.path.relpath(filename, _PROJECT_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Сэмплирующий профилировщик всех потоков процесса
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        self.interval = interval
+        self.max_depth = max_depth
+
+        # (этап, стек от корня к листу) -> число выборок
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+        self._labels: Dict[Any, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='cycle-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            stage = current_stage() or 'idle'
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                self.stacks[(stage, self._stack(frame))] += 1
+            self.samples += 1
+
+    def _stack(self, frame) -> Tuple[str, ...]:
+        labels = []
+        while frame is not None and len(labels) < self.max_depth:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = _frame_label(code)
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
+
+    def _is_idle(self, stack: Tuple[str, ...]) -> bool:
+        """Потоки, ожидающие работу (пулы, планировщик), не учитываются в топе"""
+        leaf = stack[-1] if stack else ''
+        return leaf.startswith(('wait (', '_worker (', 'select (', 'sleep (')) or leaf.startswith('_wait_for_tstate_lock')
+
+    def collapsed(self, stage: Optional[str] = None) -> List[str]:
+        """Строки свернутого формата: этап;кадр;...;кадр число"""
+        lines = []
+        for (sample_stage, stack), count in sorted(self.stacks.items()):
+            if (stage is not None and sample_stage != stage) or self._is_idle(stack):
+                continue
+            frames = ';'.join(frame.replace(';', ':') for frame in stack)
+            lines.append(f"{sample_stage};{frames} {count}")
+        return lines
+
+    def top_functions(self, limit: int = 30) -> List[Dict[str, Any]]:
+        """Функции по собственному времени (лист стека), с общим временем"""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for (_, stack), count in self.stacks.items():
+            if not stack or self._is_idle(stack):
+                continue
+            self_counts[stack[-1]] += count
+            for frame in set(stack):
+                total_counts[frame] += count
+
+        return [
+            {
+                'function': frame,
+                'self_samples': count,
+                'self_seconds': round(count * self.interval, 3),
+                'total_seconds': round(total_counts[frame] * self.interval, 3)
+            }
+            for frame, count in self_counts.most_common(limit)
+        ]
+
+    def stages(self) -> List[str]:
+        return sorted({stage for stage, _ in self.stacks})
+
+
+@dataclass
+class CycleTiming:
+    """Длительность этапов одного цикла"""
+    cycle: int
+    started_at: str
+    total_seconds: float = 0.0
+    stages: Dict[str, float] = field(default_factory=dict)
+
+
+class CycleProfiler:
+    """
+    Профилирование циклов: сэмплирование стеков, этапы и снимки памяти
+
+    run(cycle_func) выполняет цикл; с вероятностью sample_rate цикл профилируется
+    (1.0 для run.py --profile, 0.01 для постоянного выборочного режима в продакшене).
+    """
+
+    def __init__(self, logger: logging.Logger, output_root: str = 'profiles', sample_rate: float = 1.0,
+                 interval: float = 0.005, top_n: int = 30, trace_memory: bool = True):
+        self.logger = logger
+        self.output_root = output_root
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.top_n = top_n
+        self.trace_memory = trace_memory
+
+        self.cycles_run = 0
+        self.cycles_profiled = 0
+        self.output_dir: Optional[str] = None
+
+        self._profiler: Optional[SamplingProfiler] = None
+        self._timings: List[CycleTiming] = []
+        self._stage_started: Optional[Tuple[str, float]] = None
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._started_tracemalloc = False
+
+    # ---- выполнение цикла ----
+
+    def run(self, cycle_func: Callable[[], Any]) -> Any:
+        """Выполнение цикла (профилируется выборочно)"""
+        self.cycles_run += 1
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return cycle_func()
+
+        self.cycles_profiled += 1
+        timing = CycleTiming(cycle=self.cycles_run, started_at=datetime.now().isoformat())
+        self._timings.append(timing)
+
+        if self._profiler is None:
+            self._profiler = SamplingProfiler(self.interval)
+        if self.trace_memory:
+            self._begin_memory()
+
+        listener = lambda stage, now: self._on_stage(timing, stage, now)
+        add_stage_listener(listener)
+        self._profiler.start()
+        started = time.perf_counter()
+        try:
+            return cycle_func()
+        finally:
+            self._on_stage(timing, None, time.perf_counter())
+            timing.total_seconds = round(time.perf_counter() - started, 3)
+            self._profiler.stop()
+            remove_stage_listener(listener)
+
+            if self.trace_memory:
+                self._end_memory(timing.cycle)
+
+            # Выборочный режим: каждый профилированный цикл сохраняется сразу
+            if self.sample_rate < 1.0:
+                self.write_report()
+
+    def _on_stage(self, timing: CycleTiming, stage: Optional[str], now: float):
+        if self._stage_started is not None:
+            name, started = self._stage_started
+            timing.stages[name] = round(timing.stages.get(name, 0.0) + now - started, 3)
+        self._stage_started = (stage, now) if stage is not None else None
+
+    # ---- память ----
+
+    def _begin_memory(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            self._started_tracemalloc = True
+            self._last_snapshot = None
+        if self._last_snapshot is None:
+            self._last_snapshot = tracemalloc.take_snapshot()
+
+    def _end_memory(self, cycle: int):
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        previous = self._last_snapshot
+        self._last_snapshot = snapshot
+
+        if previous is not None:
+            diff = snapshot.compare_to(previous, 'lineno')
+            os.makedirs(self._ensure_output_dir(), exist_ok=True)
+            path = os.path.join(self.output_dir, f"memory_cycle_{cycle}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                current, peak = tracemalloc.get_traced_memory()
+                f.write(f"# Цикл {cycle}: текущая память {current / 1024 / 1024:.1f} МБ, пик {peak / 1024 / 1024:.1f} МБ\n")
+                for stat in diff[:self.top_n]:
+                    f.write(f"{stat}\n")
+
+        # Выборочный режим: между профилированными циклами память не отслеживается
+        if self.sample_rate < 1.0 and self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+            self._last_snapshot = None
+
+    # ---- отчет ----
+
+    def _ensure_output_dir(self) -> str:
+        if self.output_dir is None:
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.output_dir = os.path.join(self.output_root, stamp)
+        return self.output_dir
+
+    def write_report(self) -> Optional[str]:
+        """Запись результатов в каталог с меткой времени"""
+        if self._profiler is None:
+            return None
+
+        try:
+            output_dir = self._ensure_output_dir()
+            os.makedirs(output_dir, exist_ok=True)
+
+            with open(os.path.join(output_dir, 'stacks.collapsed'), 'w', encoding='utf-8') as f:
+                f.write('\n'.join(self._profiler.collapsed()) + '\n')
+
+            for stage in self._profiler.stages():
+                name = _UNSAFE_NAME_RE.sub('_', stage)
+                with open(os.path.join(output_dir, f"stage_{name}.collapsed"), 'w', encoding='utf-8') as f:
+                    f.write('\n'.join(self._profiler.collapsed(stage)) + '\n')
+
+            top = self._profiler.top_functions(self.top_n)
+            with open(os.path.join(output_dir, 'top_functions.txt'), 'w', encoding='utf-8') as f:
+                f.write(f"# Выборок: {self._profiler.samples}, интервал {self.interval * 1000:.1f} мс\n")
+                f.write(f"{'self, с':>9} {'всего, с':>9}  функция\n")
+                for item in top:
+                    f.write(f"{item['self_seconds']:>9.3f} {item['total_seconds']:>9.3f}  {item['function']}\n")
+
+            with open(os.path.join(output_dir, 'stages.json'), 'w', encoding='utf-8') as f:
+                json.dump([timing.__dict__ for timing in self._timings], f, ensure_ascii=False, indent=2)
+
+            self.logger.info(f"🔬 Профиль {self.cycles_profiled} циклов записан в {output_dir}")
+            for item in top[:5]:
+                self.logger.info(f"   {item['self_seconds']:.2f}с  {item['function']}")
+
+            return output_dir
+
+        except Exception as e:
+            self.logger.warning(f"Ошибка записи профиля: {e}")
+            return None
+
+        finally:
+            # Выборочный режим: каждый профилированный цикл в отдельном каталоге
+            if self.sample_rate < 1.0:
+                self._profiler = None
+                self._timings = []
+                self.output_dir = None
+
+    def close(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+
+def create_cycle_profiler(logger: logging.Logger, output_root: str = 'profiles', sample_rate: float = 1.0,
+                          **kwargs) -> CycleProfiler:
+    """Создание профилировщика циклов"""
+    return CycleProfiler(logger, output_root, sample_rate, **kwargs)
@@ -0,0 +1,50 @@
+"""
+Отметки этапов цикла анализа
+Цикл отмечает начало каждого этапа (сбор, детализация, анализ, отчет); подписчики
+(профилировщик, бенчмарк) получают отметки и сами решают, что с ними делать.
+Без подписчиков отметка ничего не стоит
+"""
+
+import time
+import threading
+from typing import Callable, List, Optional
+
+# Подписчик: (этап или None в конце цикла, время perf_counter)
+StageListener = Callable[[Optional[str], float], None]
+
+_listeners: List[StageListener] = []
+_lock = threading.Lock()
+_current_stage: Optional[str] = None
+
+
+def add_stage_listener(listener: StageListener):
+    with _lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def remove_stage_listener(listener: StageListener):
+    with _lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def mark_stage(stage: Optional[str]):
+    """Начало этапа цикла (None - цикл завершен)"""
+    global _current_stage
+    _current_stage = stage
+    if not _listeners:
+        return
+    now = time.perf_counter()
+    for listener in list(_listeners):
+        listener(stage, now)
+
+
+def end_cycle():
+    """Завершение цикла: последний этап закрывается"""
+    mark_stage(None)
+
+
+def current_stage() -> Optional[str]:
+    """Текущий этап цикла (общий для всех потоков цикла)"""
+    return _current_stage
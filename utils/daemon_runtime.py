@@ -0,0 +1,204 @@
+"""
+Рантайм демона на asyncio
+- точные таймеры: интервал берется из SmartScheduler.get_optimal_interval, следующий
+  запуск отсчитывается от начала предыдущего (без дрейфа опроса раз в минуту)
+- дедлайн цикла: по мягкому дедлайну цикл прекращает сбор и публикует собранное,
+  по жесткому цикл считается зависшим и отменяется
+- защита от наложения: новый цикл не стартует, пока выполняется предыдущий
+- плавная остановка по SIGTERM/SIGINT: текущий цикл сворачивается, очередь Telegram
+  дочищается, браузеры закрываются
+"""
+
+import signal
+import asyncio
+import logging
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from telegram_bot.outbox import TelegramOutbox
+from utils.cycle_deadline import CycleDeadline, clear_deadline, start_deadline
+
+
+class DaemonRuntime:
+    """
+    Основной цикл демона: расписание, дедлайны и остановка
+    """
+
+    def __init__(self, analyzer, logger: logging.Logger, cycle_func: Optional[Callable[[], Any]] = None,
+                 deadline_ratio: float = 0.8, min_deadline: float = 120.0, hard_grace: float = 60.0,
+                 shutdown_timeout: float = 60.0):
+        """
+        Args:
+            analyzer: SportsAnalyzer
+            cycle_func: функция цикла (по умолчанию analyzer.run_analysis_cycle)
+            deadline_ratio: мягкий дедлайн как доля интервала
+            min_deadline: минимальный мягкий дедлайн в секундах
+            hard_grace: запас после мягкого дедлайна до отмены цикла
+            shutdown_timeout: ожидание дочистки очереди Telegram при остановке
+        """
+        self.analyzer = analyzer
+        self.logger = logger
+        self.cycle_func = cycle_func or analyzer.run_analysis_cycle
+        self.deadline_ratio = deadline_ratio
+        self.min_deadline = min_deadline
+        self.hard_grace = hard_grace
+        self.shutdown_timeout = shutdown_timeout
+
+        # Публикации уходят через очередь, цикл не ждет Telegram API
+        self.outbox = TelegramOutbox(logger)
+        analyzer.telegram_outbox = self.outbox
+
+        # Один поток: циклы физически не могут выполняться одновременно
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cycle')
+        self._cycle_future: Optional[asyncio.Future] = None
+        self._deadline: Optional[CycleDeadline] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+        self.stats = {
+            'cycles': 0,
+            'failed_cycles': 0,
+            'soft_deadlines': 0,
+            'hard_deadlines': 0,
+            'overlaps_skipped': 0,
+            'missed_slots': 0
+        }
+
+    # ---- основной цикл ----
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._install_signal_handlers(loop)
+
+        self.logger.info("🕐 Рантайм демона запущен")
+        next_at = loop.time()  # Первый цикл сразу
+
+        try:
+            while not self._stop_event.is_set():
+                if not await self._sleep_until(next_at):
+                    break
+
+                interval = self._interval_seconds()
+                if interval <= 0:
+                    # Период отключен: проверяем снова на границе следующего периода
+                    wait = self._seconds_until_next_period()
+                    self.logger.info(f"Анализ отключен в текущем периоде, следующая проверка через {wait / 60:.0f} мин")
+                    next_at = loop.time() + wait
+                    continue
+
+                started = loop.time()
+                next_at = started + interval
+
+                if self._cycle_future is not None and not self._cycle_future.done():
+                    self.stats['overlaps_skipped'] += 1
+                    self.logger.warning("⏭️ Предыдущий цикл еще выполняется, запуск пропущен")
+                    continue
+
+                await self._run_cycle(interval)
+
+                # Цикл дольше интервала: пропущенные слоты не догоняются
+                while next_at <= loop.time():
+                    next_at += interval
+                    self.stats['missed_slots'] += 1
+
+                if not self._stop_event.is_set():
+                    self.logger.info(f"Следующий цикл через {(next_at - loop.time()) / 60:.1f} мин")
+        finally:
+            await self._shutdown()
+
+    async def _sleep_until(self, when: float) -> bool:
+        """Ожидание момента запуска; False если пришел сигнал остановки"""
+        delay = when - asyncio.get_running_loop().time()
+        if delay > 0:
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+        return not self._stop_event.is_set()
+
+    def _interval_seconds(self) -> float:
+        try:
+            return self.analyzer.smart_scheduler.get_optimal_interval() * 60
+        except Exception as e:
+            self.logger.warning(f"Ошибка расчета интервала: {e}")
+            return 0
+
+    def _seconds_until_next_period(self) -> float:
+        """Периоды расписания меняются на границах часов по Москве"""
+        now = datetime.now(self.analyzer.smart_scheduler.moscow_tz)
+        return max(1.0, 3600 - now.minute * 60 - now.second - now.microsecond / 1e6)
+
+    # ---- цикл ----
+
+    async def _run_cycle(self, interval: float):
+        loop = asyncio.get_running_loop()
+        soft = max(self.min_deadline, interval * self.deadline_ratio)
+
+        deadline = start_deadline(soft)
+        self._deadline = deadline
+        self._cycle_future = loop.run_in_executor(self._executor, self._cycle_body, deadline)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(self._cycle_future), timeout=soft + self.hard_grace)
+            self.stats['cycles'] += 1
+        except asyncio.TimeoutError:
+            # Поток нельзя прервать: дедлайн отменяется, цикл завершается на ближайшей проверке,
+            # до этого новые циклы не стартуют
+            deadline.cancel()
+            self.stats['hard_deadlines'] += 1
+            self.logger.error(f"⏰ Цикл превысил жесткий дедлайн {soft + self.hard_grace:.0f}с и отменен")
+        except Exception as e:
+            self.stats['failed_cycles'] += 1
+            self.logger.error(f"Ошибка цикла: {e}")
+
+        if deadline.expired() and not deadline.cancelled:
+            self.stats['soft_deadlines'] += 1
+
+    def _cycle_body(self, deadline: CycleDeadline):
+        try:
+            if hasattr(self.analyzer, 'run_profiled_cycle'):
+                return self.analyzer.run_profiled_cycle(self.cycle_func)
+            return self.cycle_func()
+        finally:
+            clear_deadline(deadline)
+
+    # ---- остановка ----
+
+    def _install_signal_handlers(self, loop: asyncio.AbstractEventLoop):
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.request_stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows или не главный поток
+
+    def request_stop(self):
+        """Остановка: новые циклы не запускаются, текущий сворачивается"""
+        if self._stop_event is None or self._stop_event.is_set():
+            return
+        self.logger.info("Получен сигнал остановки, завершаем текущий цикл...")
+        self._stop_event.set()
+        if self._deadline is not None:
+            self._deadline.cancel()
+
+    async def _shutdown(self):
+        loop = asyncio.get_running_loop()
+
+        if self._cycle_future is not None and not self._cycle_future.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(self._cycle_future), timeout=self.hard_grace)
+            except (asyncio.TimeoutError, Exception) as e:
+                self.logger.warning(f"Цикл не завершился при остановке: {e!r}")
+
+        # Дочистка очереди Telegram в отдельном потоке (не блокируя цикл событий)
+        drained = await loop.run_in_executor(None, self.outbox.close, self.shutdown_timeout)
+        self.logger.info(f"Очередь Telegram {'дочищена' if drained else 'не дочищена'}: {self.outbox.get_stats()}")
+
+        # Браузеры, пулы и транспорт
+        await loop.run_in_executor(None, self.analyzer.stop)
+        self._executor.shutdown(wait=False)
+
+        self.logger.info(f"Рантайм демона остановлен: {self.get_stats()}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'telegram': self.outbox.get_stats()}
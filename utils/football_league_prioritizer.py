@@ -3,11 +3,12 @@
 Исключает киберфутбол, понижает приоритет ACL и 5x5
 """
 
-import re
 import logging
 from typing import List, Dict, Any
 from enum import Enum
 
+from utils.league_classifier import CompiledLeagueClassifier
+
 
 class LeaguePriority(Enum):
     """Уровни приоритета лиг"""
@@ -76,6 +77,16 @@ class FootballLeaguePrioritizer:
             r'\b(лига чемпионов|champions league|uefa)\b',
             r'\b(отборочные|qualifier|playoff)\b'
         ]
+        
+        # Все группы паттернов в порядке проверки -> один скомпилированный классификатор
+        self.classifier = CompiledLeagueClassifier([
+            (LeaguePriority.EXCLUDED, self.excluded_patterns),
+            (LeaguePriority.VERY_LOW, self.very_low_priority_patterns),
+            (LeaguePriority.HIGHEST, self.highest_priority_patterns),
+            (LeaguePriority.HIGH, self.high_priority_patterns),
+            (LeaguePriority.LOW, self.low_priority_patterns),
+            (LeaguePriority.MEDIUM, self.medium_priority_patterns),
+        ], default=LeaguePriority.MEDIUM)
     
     def get_league_priority(self, league_name: str) -> LeaguePriority:
         """
@@ -91,46 +102,12 @@ class FootballLeaguePrioritizer:
         if not league_name:
             return LeaguePriority.MEDIUM
         
-        league_lower = league_name.lower()
-        
-        # ИСКЛЮЧАЕМ киберфутбол
-        for pattern in self.excluded_patterns:
-            if re.search(pattern, league_lower, re.IGNORECASE):
-                self.logger.info(f"❌ ИСКЛЮЧЕН киберфутбол: {league_name}")
-                return LeaguePriority.EXCLUDED
-        
-        # ОЧЕНЬ НИЗКИЙ приоритет (ACL, 5x5)
-        for pattern in self.very_low_priority_patterns:
-            if re.search(pattern, league_lower, re.IGNORECASE):
-                self.logger.debug(f"⬇️ Очень низкий приоритет: {league_name}")
-                return LeaguePriority.VERY_LOW
-        
-        # МАКСИМАЛЬНЫЙ приоритет
-        for pattern in self.highest_priority_patterns:
-            if re.search(pattern, league_lower, re.IGNORECASE):
-                self.logger.debug(f"⬆️ Максимальный приоритет: {league_name}")
-                return LeaguePriority.HIGHEST
-        
-        # ВЫСОКИЙ приоритет
-        for pattern in self.high_priority_patterns:
-            if re.search(pattern, league_lower, re.IGNORECASE):
-                self.logger.debug(f"⬆️ Высокий приоритет: {league_name}")
-                return LeaguePriority.HIGH
-        
-        # НИЗКИЙ приоритет (молодежь)
-        for pattern in self.low_priority_patterns:
-            if re.search(pattern, league_lower, re.IGNORECASE):
-                self.logger.debug(f"⬇️ Низкий приоритет: {league_name}")
-                return LeaguePriority.LOW
+        priority = self.classifier.classify(league_name.lower())
         
-        # СРЕДНИЙ приоритет (региональные)
-        for pattern in self.medium_priority_patterns:
-            if re.search(pattern, league_lower, re.IGNORECASE):
-                self.logger.debug(f"➡️ Средний приоритет: {league_name}")
-                return LeaguePriority.MEDIUM
+        if priority == LeaguePriority.EXCLUDED:
+            self.logger.debug(f"❌ ИСКЛЮЧЕН киберфутбол: {league_name}")
         
-        # По умолчанию средний приоритет
-        return LeaguePriority.MEDIUM
+        return priority
     
     def prioritize_football_matches(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
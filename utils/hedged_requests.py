@@ -0,0 +1,197 @@
+"""
+Хеджированные запросы к взаимозаменяемым источникам
+Запускается основной источник; если он не ответил за свой наблюдаемый p90, параллельно
+запускается следующий. Побеждает первый корректный результат, остальные отменяются
+(еще не начатые не запускаются, результаты уже идущих отбрасываются). Ошибка или
+некорректный ответ сразу запускают следующий источник без ожидания.
+
+Бюджет хеджирования ограничивает дополнительную нагрузку: хедж-запросов не больше
+заданной доли от всех вызовов (плюс небольшой запас на старт)
+"""
+
+import time
+import threading
+import logging
+from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.latency_histogram import LatencyTracker, get_global_latency_tracker
+
+
+@dataclass
+class HedgeAttempt:
+    """Один источник: ключ задержек (хост в LatencyTracker) и функция запроса"""
+    name: str
+    latency_key: str
+    fetch: Callable[[], Any]
+
+
+@dataclass
+class HedgeResult:
+    """Результат хеджированного вызова"""
+    value: Any = None
+    winner: Optional[str] = None
+    hedges: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.winner is not None
+
+
+class HedgeBudget:
+    """
+    Бюджет хедж-запросов: не больше ratio от числа вызовов плюс burst
+    """
+
+    def __init__(self, ratio: float = 0.2, burst: int = 3):
+        self.ratio = ratio
+        self.burst = burst
+        self.calls = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def on_call(self):
+        with self._lock:
+            self.calls += 1
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.hedges < self.burst + self.ratio * self.calls:
+                self.hedges += 1
+                return True
+            return False
+
+
+class HedgedFetcher:
+    """
+    Хеджированное получение данных из нескольких источников
+    """
+
+    def __init__(self, logger: logging.Logger, latency: Optional[LatencyTracker] = None,
+                 budget: Optional[HedgeBudget] = None, hedge_percentile: float = 90.0,
+                 default_delay: float = 2.0, min_delay: float = 0.05, min_samples: int = 10,
+                 max_workers: int = 4):
+        """
+        Args:
+            hedge_percentile: перцентиль задержки источника, после которого запускается хедж
+            default_delay: задержка хеджа, пока по источнику мало наблюдений
+            min_samples: наблюдений, после которых задержка берется из гистограммы
+        """
+        self.logger = logger
+        self.latency = latency or get_global_latency_tracker()
+        self.budget = budget or HedgeBudget()
+        self.hedge_percentile = hedge_percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedge')
+
+        self.stats = {
+            'calls': 0,
+            'hedges': 0,
+            'secondary_wins': 0,
+            'primary_wins': 0,
+            'fallbacks': 0,
+            'budget_denied': 0,
+            'failures': 0
+        }
+
+    def hedge_delay(self, latency_key: str) -> float:
+        """Сколько ждать источник, прежде чем запускать следующий"""
+        histogram = self.latency.histogram(latency_key)
+        if histogram.total < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, histogram.percentile(self.hedge_percentile))
+
+    def fetch(self, attempts: List[HedgeAttempt], validate: Callable[[Any], bool] = bool,
+              timeout: float = 30.0) -> HedgeResult:
+        """
+        Первый корректный результат среди источников (в порядке приоритета)
+
+        Args:
+            attempts: источники по приоритету
+            validate: проверка результата (некорректный результат = ошибка источника)
+            timeout: общее ограничение времени вызова
+        """
+        started = time.perf_counter()
+        deadline = started + timeout
+        result = HedgeResult()
+        self.stats['calls'] += 1
+        self.budget.on_call()
+
+        pending: Dict[Future, HedgeAttempt] = {}
+        queue = list(attempts)
+
+        def launch():
+            attempt = queue.pop(0)
+            pending[self._executor.submit(attempt.fetch)] = attempt
+            return attempt
+
+        if queue:
+            current = launch()
+        next_hedge_at = time.perf_counter() + self.hedge_delay(current.latency_key) if queue else None
+
+        try:
+            while pending:
+                now = time.perf_counter()
+                if now >= deadline:
+                    self.logger.warning(f"Хеджированный запрос: общий таймаут {timeout:.0f}с")
+                    break
+
+                wait_until = deadline if next_hedge_at is None else min(deadline, next_hedge_at)
+                done, _ = wait(list(pending), timeout=max(0.0, wait_until - now), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    attempt = pending.pop(future)
+                    try:
+                        value = future.result()
+                        valid = validate(value)
+                    except Exception as e:
+                        self.logger.warning(f"❌ {attempt.name}: ошибка {e}")
+                        valid = False
+
+                    if valid:
+                        result.value, result.winner = value, attempt.name
+                        return result
+
+                    # Ошибка источника: следующий запускается сразу, без ожидания хеджа
+                    if queue:
+                        self.stats['fallbacks'] += 1
+                        current = launch()
+                        next_hedge_at = time.perf_counter() + self.hedge_delay(current.latency_key) if queue else None
+
+                if done or next_hedge_at is None or time.perf_counter() < next_hedge_at:
+                    continue
+
+                # Источник не ответил за свой p90: хедж следующим источником
+                if self.budget.try_acquire():
+                    self.stats['hedges'] += 1
+                    result.hedges += 1
+                    current = launch()
+                    self.logger.info(f"🪝 Хедж: {current.name} запущен параллельно (ожидание превысило p{self.hedge_percentile:.0f})")
+                    next_hedge_at = time.perf_counter() + self.hedge_delay(current.latency_key) if queue else None
+                else:
+                    self.stats['budget_denied'] += 1
+                    next_hedge_at = None
+
+            self.stats['failures'] += 1
+            return result
+
+        finally:
+            for future in pending:
+                future.cancel()  # Еще не начатые не запускаются; идущие завершатся по своему таймауту
+            result.elapsed = time.perf_counter() - started
+            if result.ok:
+                key = 'primary_wins' if attempts and result.winner == attempts[0].name else 'secondary_wins'
+                self.stats[key] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'budget': {'calls': self.budget.calls, 'hedges': self.budget.hedges, 'ratio': self.budget.ratio}
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,223 @@
+"""
+Инкрементальный разбор live-страниц по фрагментам событий
+Страница делится на фрагменты по идентификатору события (data-event-id, строка матча),
+каждый фрагмент хэшируется - между опросами заново разбираются только изменившиеся
+фрагменты, матчи из неизменных берутся из прошлого опроса
+"""
+
+import re
+import hashlib
+import threading
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Pattern, Sequence, Tuple
+
+# Атрибуты идентификатора события по умолчанию
+EVENT_ID_PATTERNS = (
+    re.compile(r'<(?P<tag>[a-zA-Z][\w-]*)\b[^>]*?\b(?:data-event-id|data-match-id)\s*=\s*["\'](?P<id>[^"\']+)["\'][^>]*>'),
+)
+
+# Теги без закрывающей пары
+_VOID_TAGS = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                        'link', 'meta', 'source', 'track', 'wbr'})
+
+_tag_regex_cache: Dict[str, Pattern] = {}
+
+
+def _tag_regex(tag: str) -> Pattern:
+    regex = _tag_regex_cache.get(tag)
+    if regex is None:
+        regex = re.compile(rf'<(/?){re.escape(tag)}\b[^>]*?(/?)>', re.IGNORECASE)
+        _tag_regex_cache[tag] = regex
+    return regex
+
+
+def _find_element_end(html: str, tag: str, start: int) -> int:
+    """Позиция после закрывающего тега элемента (-1 если разметка не сбалансирована)"""
+    if tag.lower() in _VOID_TAGS:
+        return start
+    depth = 1
+    for found in _tag_regex(tag).finditer(html, start):
+        if found.group(1):
+            depth -= 1
+            if depth == 0:
+                return found.end()
+        elif not found.group(2):
+            depth += 1
+    return -1
+
+
+def split_fragments(html: str, patterns: Sequence[Pattern] = EVENT_ID_PATTERNS) -> Optional[Tuple[Dict[str, str], str]]:
+    """
+    Деление страницы на фрагменты событий без построения DOM
+
+    Returns:
+        (id -> html фрагмента, остаток страницы вне фрагментов) или None,
+        если разметка не сбалансирована
+    """
+    openings = []
+    for pattern in patterns:
+        for found in pattern.finditer(html):
+            openings.append((found.start(), found.end(), found.group('tag'), found.group('id')))
+    openings.sort()
+
+    fragments: Dict[str, List[str]] = {}
+    rest: List[str] = []
+    position = 0
+
+    for start, open_end, tag, event_id in openings:
+        if start < position:
+            continue  # Вложенный элемент уже входит во внешний фрагмент
+
+        end = _find_element_end(html, tag, open_end)
+        if end < 0:
+            return None
+
+        rest.append(html[position:start])
+        fragments.setdefault(event_id, []).append(html[start:end])
+        position = end
+
+    rest.append(html[position:])
+    return {key: '\n'.join(parts) for key, parts in fragments.items()}, ''.join(rest)
+
+
+@dataclass
+class _PageState:
+    fragments: Dict[str, Tuple[str, List[Any]]] = field(default_factory=dict)  # id -> (хэш, матчи)
+    rest: Tuple[Optional[str], List[Any]] = (None, [])
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+class IncrementalPageExtractor:
+    """
+    Разбор страницы с повторным использованием неизменных фрагментов
+    """
+
+    def __init__(self, patterns: Sequence[Pattern] = EVENT_ID_PATTERNS, min_fragments: int = 3):
+        self.patterns = tuple(patterns)
+        self.min_fragments = min_fragments
+        self._pages: Dict[str, _PageState] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'pages': 0,
+            'fallbacks': 0,
+            'fragments_total': 0,
+            'fragments_reparsed': 0,
+            'fragments_reused': 0
+        }
+
+    def extract(self, page_key: str, html: str,
+                parse_fragment: Callable[[str], List[Any]],
+                parse_rest: Optional[Callable[[str], List[Any]]] = None,
+                parse_batch: Optional[Callable[[List[str]], List[Optional[List[Any]]]]] = None) -> Optional[List[Any]]:
+        """
+        Матчи страницы: изменившиеся фрагменты разбираются parse_fragment,
+        остаток страницы (скрипты, заголовки) - parse_rest
+
+        Args:
+            parse_batch: разбор всех изменившихся частей одним вызовом (например,
+                параллельно в пуле процессов) вместо parse_fragment/parse_rest;
+                None в результате - часть не разобрана и будет разобрана в следующий раз
+
+        Returns:
+            Список матчей в порядке: остаток, затем фрагменты по порядку на странице;
+            None если страницу нельзя разделить (нужен полный разбор)
+        """
+        split = split_fragments(html, self.patterns)
+        if split is None or len(split[0]) < self.min_fragments:
+            self.stats['fallbacks'] += 1
+            return None
+
+        fragments, rest_html = split
+        with self._lock:
+            previous = self._pages.get(page_key) or _PageState()
+
+        # Части страницы: (id фрагмента или None для остатка, html)
+        parts: List[Tuple[Optional[str], str]] = []
+        if parse_rest is not None:
+            parts.append((None, rest_html))
+        parts.extend(fragments.items())
+
+        # Неизменные части берутся из прошлого опроса, остальные разбираются разом
+        entries = []
+        pending: List[Tuple[Optional[str], str]] = []
+        for key, part in parts:
+            part_hash = _digest(part)
+            cached = previous.rest if key is None else previous.fragments.get(key)
+            if cached is not None and cached[0] == part_hash:
+                entries.append((key, part_hash, cached[1]))
+            else:
+                entries.append((key, part_hash, None))
+                pending.append((key, part))
+
+        if parse_batch is not None:
+            parsed = list(parse_batch([part for _, part in pending]) or [])
+        else:
+            parsed = [(parse_rest if key is None else parse_fragment)(part) or [] for key, part in pending]
+        parsed_iter = iter(parsed + [None] * (len(pending) - len(parsed)))
+
+        state = _PageState()
+        matches: List[Any] = []
+        now = datetime.now().isoformat()
+
+        for key, part_hash, cached_matches in entries:
+            if cached_matches is not None:
+                part_matches = cached_matches
+                matches.extend(self._reuse(part_matches, now))
+                if key is not None:
+                    self.stats['fragments_reused'] += 1
+            else:
+                part_matches = next(parsed_iter)
+                if part_matches is None:
+                    part_hash, part_matches = None, []  # Не сохраняем: разберем при следующем опросе
+                matches.extend(self._copy(part_matches))
+                if key is not None:
+                    self.stats['fragments_reparsed'] += 1
+
+            if key is None:
+                state.rest = (part_hash, part_matches)
+            else:
+                state.fragments[key] = (part_hash, part_matches)
+
+        self.stats['pages'] += 1
+        self.stats['fragments_total'] += len(fragments)
+
+        # Исчезнувшие фрагменты (завершенные матчи) отбрасываются вместе со старым состоянием
+        with self._lock:
+            self._pages[page_key] = state
+
+        return matches
+
+    @staticmethod
+    def _copy(matches: List[Any]) -> List[Any]:
+        """Копии матчей: дедупликация и обогащение меняют словари на месте"""
+        return [match.copy() for match in matches]
+
+    @staticmethod
+    def _reuse(matches: List[Any], timestamp: str) -> List[Any]:
+        """Копии матчей прошлого опроса с обновленной меткой времени"""
+        reused = []
+        for match in matches:
+            match = match.copy()
+            if 'timestamp' in match:
+                match['timestamp'] = timestamp
+            reused.append(match)
+        return reused
+
+    def reset(self, page_key: Optional[str] = None):
+        """Сброс сохраненного состояния страниц"""
+        with self._lock:
+            if page_key is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(page_key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats['fragments_reparsed'] + self.stats['fragments_reused']
+        return {
+            **self.stats,
+            'reuse_rate': round(self.stats['fragments_reused'] / total, 3) if total else 0.0
+        }
@@ -0,0 +1,427 @@
+"""
+Общий HTTP транспорт для всех скраперов
+Один пул соединений на хост с keep-alive, HTTP/2 (httpx + h2) где хост его поддерживает,
+общий DNS кэш, прогрев соединений перед циклом и единые профили заголовков.
+Без httpx используется requests.Session с пулом HTTPAdapter
+"""
+
+import time
+import atexit
+import socket
+import threading
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    from httpx._decoders import SUPPORTED_DECODERS as HTTPX_DECODERS
+except ImportError:
+    HTTPX_DECODERS = None
+
+try:
+    from urllib3.util.request import ACCEPT_ENCODING as URLLIB3_ENCODINGS
+except ImportError:
+    URLLIB3_ENCODINGS = 'gzip,deflate'
+
+try:
+    import h2  # noqa: F401
+except ImportError:
+    h2 = None
+
+from utils.latency_histogram import LatencyTracker, get_global_latency_tracker
+from utils.rate_limiter import DomainRateLimiter, get_global_rate_limiter
+
+
+# ---- профили заголовков ----
+
+USER_AGENTS = {
+    'chrome_windows': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'chrome_linux': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+}
+
+_ACCEPT_HTML = 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
+_ACCEPT_JSON = 'application/json, text/plain, */*'
+
+HEADER_PROFILES: Dict[str, Dict[str, str]] = {
+    # Страницы русскоязычных источников (MarathonBet, Scores24)
+    'html_ru': {
+        'User-Agent': USER_AGENTS['chrome_windows'],
+        'Accept': _ACCEPT_HTML,
+        'Accept-Language': 'ru-RU,ru;q=0.9,en;q=0.8',
+    },
+    # Страницы англоязычных источников (SofaScore, FlashScore, Understat)
+    'html_en': {
+        'User-Agent': USER_AGENTS['chrome_windows'],
+        'Accept': _ACCEPT_HTML,
+        'Accept-Language': 'en-US,en;q=0.9',
+    },
+    # JSON API (FotMob, скрытые API)
+    'json_en': {
+        'User-Agent': USER_AGENTS['chrome_windows'],
+        'Accept': _ACCEPT_JSON,
+        'Accept-Language': 'en-US,en;q=0.9',
+    },
+}
+
+
+# Заголовки уровня соединения: keep-alive обеспечивает пул, в HTTP/2 они запрещены
+_CONNECTION_HEADERS = ('Connection', 'Keep-Alive', 'Transfer-Encoding', 'Upgrade')
+
+
+def profile_headers(profile: str, **overrides: str) -> Dict[str, str]:
+    """Заголовки профиля с точечными переопределениями"""
+    headers = dict(HEADER_PROFILES[profile])
+    headers.update(overrides)
+    return headers
+
+
+# ---- DNS кэш ----
+
+class DNSCache:
+    """
+    Кэш socket.getaddrinfo с TTL для запросов общего транспорта
+
+    Обертка getaddrinfo отвечает из кэша только внутри scope() - в потоке, который
+    сейчас выполняет запрос HttpTransport (httpx или urllib3). Остальной код процесса
+    (Selenium, aiohttp, Telegram) разрешает имена как обычно
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._cache: Dict[Tuple, Tuple[float, List]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._original = None
+        self.hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def scope(self):
+        """Кэш действует для разрешения имен в текущем потоке внутри блока"""
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+
+    def install(self):
+        if self._original is not None:
+            return
+        self._original = socket.getaddrinfo
+        socket.getaddrinfo = self._getaddrinfo
+
+    def uninstall(self):
+        if self._original is not None:
+            socket.getaddrinfo = self._original
+            self._original = None
+
+    def _getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        if not getattr(self._local, 'depth', 0):
+            return self._original(host, port, family, type, proto, flags)
+
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > now:
+            self.hits += 1
+            return list(cached[1])
+
+        result = self._original(host, port, family, type, proto, flags)
+        with self._lock:
+            self._cache[key] = (now + self.ttl, result)
+        self.misses += 1
+        return list(result)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_dns_cache = DNSCache()
+
+
+# ---- транспорт ----
+
+@dataclass
+class TransportConfig:
+    """Конфигурация общего транспорта"""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0
+    http2: bool = True
+    timeout: float = 15.0
+    dns_ttl: float = 300.0
+    prewarm_timeout: float = 5.0
+    adaptive_timeouts: bool = True  # Таймаут из p99 хоста вместо константы вызывающего кода
+    rate_limiting: bool = True  # Токен домена из общего ограничителя перед каждым запросом
+
+
+class HttpTransport:
+    """
+    Общий HTTP клиент: пулы соединений по хостам, HTTP/2, DNS кэш, прогрев
+    """
+
+    def __init__(self, logger: logging.Logger, config: Optional[TransportConfig] = None,
+                 latency: Optional[LatencyTracker] = None, rate_limiter: Optional[DomainRateLimiter] = None):
+        self.logger = logger
+        self.config = config or TransportConfig()
+        self.latency = latency or get_global_latency_tracker()
+        self.rate_limiter = rate_limiter or get_global_rate_limiter(logger)
+
+        _dns_cache.ttl = self.config.dns_ttl
+        _dns_cache.install()
+
+        if httpx is not None:
+            self.backend = 'httpx'
+            self.http2 = bool(self.config.http2 and h2 is not None)
+            self._client = httpx.Client(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_keepalive_connections,
+                    keepalive_expiry=self.config.keepalive_expiry
+                ),
+                timeout=self.config.timeout,
+                follow_redirects=True
+            )
+        else:
+            self.backend = 'requests'
+            self.http2 = False
+            self._client = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.config.max_keepalive_connections,
+                                  pool_maxsize=self.config.max_keepalive_connections)
+            self._client.mount('http://', adapter)
+            self._client.mount('https://', adapter)
+
+        # Хосты, к которым ходили источники (для прогрева перед следующим циклом)
+        self._origins: Dict[str, float] = {}
+        self._host_stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+        self.logger.info(f"HTTP транспорт: {self.backend}, HTTP/2 {'включен' if self.http2 else 'выключен'}")
+
+    def content_encodings(self) -> List[str]:
+        """
+        Кодировки сжатия, которые распаковывает клиент транспорта (для Accept-Encoding)
+
+        httpx и urllib3 подключают декодеры br/zstd по-разному (zstandard против
+        backports.zstd), поэтому список берется у активного клиента
+        """
+        if self.backend == 'httpx':
+            if HTTPX_DECODERS is None:
+                return ['gzip', 'deflate']
+            return [encoding for encoding in HTTPX_DECODERS if encoding != 'identity']
+        return [encoding.strip() for encoding in URLLIB3_ENCODINGS.split(',')]
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Запрос через общий пул (ответ совместим с requests.Response по
+        status_code, text, content, json(), headers, encoding, url)
+
+        Таймаут вызывающего кода используется, пока по хосту мало наблюдений;
+        дальше таймаут выводится из p99 задержек хоста
+        """
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+
+        if timeout is None:
+            timeout = self.config.timeout
+        if self.config.adaptive_timeouts and isinstance(timeout, (int, float)):
+            timeout = self.latency.timeout(origin, default=timeout)
+
+        if self.backend == 'httpx' and 'allow_redirects' in kwargs:
+            kwargs['follow_redirects'] = kwargs.pop('allow_redirects')
+
+        # Ожидание ограничителя не входит в задержку хоста
+        if self.config.rate_limiting:
+            self.rate_limiter.acquire(url)
+
+        started = time.perf_counter()
+
+        try:
+            with _dns_cache.scope():
+                response = self._client.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        except Exception as e:
+            timed_out = 'timeout' in type(e).__name__.lower()
+            elapsed = timeout if timed_out and isinstance(timeout, (int, float)) else time.perf_counter() - started
+            self._record(origin, elapsed, error=True, timed_out=timed_out)
+            raise
+
+        self._record(origin, time.perf_counter() - started)
+        return response
+
+    def get(self, url: str, **kwargs) -> Any:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Any:
+        return self.request('POST', url, **kwargs)
+
+    def _record(self, origin: str, elapsed: float, error: bool = False, timed_out: bool = False):
+        self.latency.record(origin, elapsed, error=error, timed_out=timed_out)
+        with self._lock:
+            self._origins[origin] = time.time()
+            stats = self._host_stats.setdefault(origin, {'requests': 0, 'errors': 0, 'total_time': 0.0})
+            stats['requests'] += 1
+            stats['total_time'] += elapsed
+            if error:
+                stats['errors'] += 1
+
+    def set_cookies(self, cookies: Iterable[Dict[str, Any]]):
+        """
+        Куки в общий jar клиента (формат Selenium: name, value, domain, path);
+        дальнейшие Set-Cookie сервера обновляют их как обычно
+        """
+        for cookie in cookies:
+            self._client.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+
+    def clear_cookies(self, domain: str) -> int:
+        """Удаление кук домена (и его поддоменов) из общего jar"""
+        jar = getattr(self._client.cookies, 'jar', self._client.cookies)
+        removed = 0
+        for cookie in list(jar):
+            cookie_domain = cookie.domain.lstrip('.')
+            if cookie_domain == domain or cookie_domain.endswith('.' + domain):
+                jar.clear(cookie.domain, cookie.path, cookie.name)
+                removed += 1
+        return removed
+
+    def session(self, source: str, profile: str = 'html_en',
+                headers: Optional[Dict[str, str]] = None) -> 'SourceSession':
+        """Сессия источника: свои заголовки, общие соединения"""
+        return SourceSession(self, source, profile_headers(profile, **(headers or {})))
+
+    def prewarm(self, urls: Optional[Iterable[str]] = None, max_workers: int = 8) -> Dict[str, bool]:
+        """
+        Прогрев соединений перед циклом: DNS, TCP и TLS устанавливаются заранее,
+        первый запрос цикла идет по уже открытому соединению
+
+        Args:
+            urls: дополнительные адреса для прогрева (к хостам прошлых циклов)
+        """
+        origins = set(self._origins)
+        for url in urls or ():
+            parts = urlsplit(url)
+            origins.add(f"{parts.scheme}://{parts.netloc}")
+        origins = sorted(origins)
+
+        if not origins:
+            return {}
+
+        def warm(origin: str) -> Tuple[str, bool]:
+            try:
+                with _dns_cache.scope():
+                    self._client.request('HEAD', origin + '/', timeout=self.config.prewarm_timeout)
+                return origin, True
+            except Exception as e:
+                self.logger.debug(f"Прогрев {origin} не удался: {e}")
+                return origin, False
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(origins))) as executor:
+            results = dict(executor.map(warm, origins))
+
+        self.logger.info(f"🔥 Прогрев соединений: {sum(results.values())}/{len(results)} хостов "
+                         f"за {time.perf_counter() - started:.2f}с")
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hosts = {
+                origin: {
+                    'requests': int(stats['requests']),
+                    'errors': int(stats['errors']),
+                    'avg_time': round(stats['total_time'] / stats['requests'], 3) if stats['requests'] else 0.0
+                }
+                for origin, stats in self._host_stats.items()
+            }
+        for origin, info in hosts.items():
+            latency = self.latency.histogram(origin).snapshot()
+            info.update({key: latency[key] for key in ('p50', 'p95', 'p99')})
+            info['timeout'] = self.latency.timeout(origin, default=self.config.timeout)
+        return {
+            'backend': self.backend,
+            'http2': self.http2,
+            'dns_cache': {'hits': _dns_cache.hits, 'misses': _dns_cache.misses},
+            'hosts': hosts,
+            'rate_limits': self.rate_limiter.get_stats()
+        }
+
+    def close(self):
+        try:
+            self._client.close()
+        except Exception as e:
+            self.logger.warning(f"Ошибка закрытия HTTP транспорта: {e}")
+
+
+class SourceSession:
+    """
+    Сессия одного источника поверх общего транспорта
+    Интерфейс как у requests.Session (headers, get, post), соединения общие
+    """
+
+    def __init__(self, transport: HttpTransport, source: str, headers: Optional[Dict[str, str]] = None):
+        self.transport = transport
+        self.source = source
+        self.headers = CaseInsensitiveDict(headers or {})
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> Any:
+        merged = CaseInsensitiveDict(self.headers)
+        if headers:
+            merged.update(headers)
+        for name in _CONNECTION_HEADERS:
+            merged.pop(name, None)
+        return self.transport.request(method, url, headers=dict(merged), **kwargs)
+
+    def get(self, url: str, **kwargs) -> Any:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Any:
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        """Соединения принадлежат общему транспорту - закрывать нечего"""
+
+
+# Глобальный транспорт
+_global_transport: Optional[HttpTransport] = None
+_global_lock = threading.Lock()
+
+def get_global_transport(logger: Optional[logging.Logger] = None) -> HttpTransport:
+    """
+    Получение общего HTTP транспорта процесса
+
+    Транспортом пользуются все компоненты, поэтому он закрывается только при
+    завершении процесса (close_global_transport)
+    """
+    global _global_transport
+    if _global_transport is None:
+        with _global_lock:
+            if _global_transport is None:
+                _global_transport = HttpTransport(logger or logging.getLogger(__name__))
+                atexit.register(close_global_transport)
+    return _global_transport
+
+
+def close_global_transport():
+    """Закрытие общего транспорта (при завершении процесса)"""
+    global _global_transport
+    with _global_lock:
+        transport, _global_transport = _global_transport, None
+    if transport is not None:
+        transport.close()
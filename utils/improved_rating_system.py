@@ -4,12 +4,13 @@
 """
 
 import re
-import time
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import logging
 
+from utils.bounded_cache import BoundedCache
+
 @dataclass
 class RatingSource:
     """Конфигурация источника рейтингов"""
@@ -73,8 +74,8 @@ class ImprovedRatingSystem:
         }
         
         # Кэш рейтингов (для избежания повторных запросов)
-        self._ratings_cache = {}
         self._cache_ttl = 3600  # 1 час
+        self._ratings_cache = BoundedCache('ratings', max_entries=5000, ttl=self._cache_ttl)
     
     def get_comprehensive_rating(self, team1: str, team2: str, sport: str = 'football') -> Dict[str, Any]:
         """
@@ -130,10 +131,9 @@ class ImprovedRatingSystem:
         """
         # Проверяем кэш
         cache_key = f"{team_name.lower()}:{sport}"
-        if cache_key in self._ratings_cache:
-            cached_data = self._ratings_cache[cache_key]
-            if time.time() - cached_data['timestamp'] < self._cache_ttl:
-                return cached_data['rating']
+        cached_rating = self._ratings_cache.get(cache_key)
+        if cached_rating is not None:
+            return cached_rating
         
         # Собираем рейтинги из всех источников
         source_ratings = self._collect_multi_source_ratings(team_name, sport)
@@ -159,10 +159,7 @@ class ImprovedRatingSystem:
         )
         
         # Кэшируем результат
-        self._ratings_cache[cache_key] = {
-            'rating': team_rating,
-            'timestamp': time.time()
-        }
+        self._ratings_cache[cache_key] = team_rating
         
         return team_rating
     
@@ -0,0 +1,226 @@
+"""
+Гистограммы задержек и адаптивные таймауты
+Задержки запросов накапливаются по хостам (и по источникам/методам обхода) в
+гистограммах с логарифмически-линейными корзинами как в HdrHistogram: относительная
+погрешность ~3% при постоянной памяти. Таймаут запроса выводится из наблюдаемого
+p99 (p99 x 1.5 в пределах ограничений): быстрые хосты отваливаются быстро, медленные
+но здоровые хосты больше не обрываются раньше времени.
+
+Пока данных мало, используется таймаут по умолчанию (константа вызывающего кода).
+Запрос, упавший по таймауту, записывается со значением таймаута, поэтому при
+замедлении хоста таймаут растет, а не закрепляет обрывы
+"""
+
+import time
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+# Точность корзин: 2^5 = 32 линейные подкорзины на каждую степень двойки
+_SUB_BUCKET_BITS = 5
+_EXACT_LIMIT = 1 << (_SUB_BUCKET_BITS + 1)
+
+
+def _bucket_lower(value_us: int) -> int:
+    """Нижняя граница корзины значения (в микросекундах)"""
+    if value_us < _EXACT_LIMIT:
+        return value_us
+    shift = value_us.bit_length() - (_SUB_BUCKET_BITS + 1)
+    return (value_us >> shift) << shift
+
+
+def _bucket_upper(lower_us: int) -> int:
+    """Верхняя граница корзины (наибольшее эквивалентное значение)"""
+    if lower_us < _EXACT_LIMIT:
+        return lower_us
+    shift = lower_us.bit_length() - (_SUB_BUCKET_BITS + 1)
+    return lower_us + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек с логарифмически-линейными корзинами
+    """
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.sum_seconds = 0.0
+        self.min_seconds: Optional[float] = None
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float):
+        value_us = max(1, int(seconds * 1_000_000))
+        lower = _bucket_lower(value_us)
+        self.counts[lower] = self.counts.get(lower, 0) + 1
+        self.total += 1
+        self.sum_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.min_seconds = seconds if self.min_seconds is None else min(self.min_seconds, seconds)
+
+    def merge(self, other: 'LatencyHistogram'):
+        for lower, count in other.counts.items():
+            self.counts[lower] = self.counts.get(lower, 0) + count
+        self.total += other.total
+        self.sum_seconds += other.sum_seconds
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+        if other.min_seconds is not None:
+            self.min_seconds = other.min_seconds if self.min_seconds is None else min(self.min_seconds, other.min_seconds)
+
+    def percentile(self, q: float) -> float:
+        """Значение перцентиля q (0-100) в секундах, с округлением вверх до границы корзины"""
+        if not self.total:
+            return 0.0
+        rank = max(1, int(round(q / 100 * self.total + 0.4999)))
+        seen = 0
+        for lower in sorted(self.counts):
+            seen += self.counts[lower]
+            if seen >= rank:
+                return min(_bucket_upper(lower) / 1_000_000, self.max_seconds)
+        return self.max_seconds
+
+    @property
+    def mean(self) -> float:
+        return self.sum_seconds / self.total if self.total else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.total,
+            'mean': round(self.mean, 4),
+            'p50': round(self.percentile(50), 4),
+            'p95': round(self.percentile(95), 4),
+            'p99': round(self.percentile(99), 4),
+            'max': round(self.max_seconds, 4)
+        }
+
+
+class WindowedHistogram:
+    """
+    Гистограмма скользящего окна: текущее и предыдущее окно, старые данные отбрасываются
+    (таймауты следуют за нынешним состоянием хоста, а не за историей с запуска)
+    """
+
+    def __init__(self, window: float = 600.0):
+        self.window = window
+        self._current = LatencyHistogram()
+        self._previous = LatencyHistogram()
+        self._started_at = time.monotonic()
+
+    def _rotate(self):
+        now = time.monotonic()
+        if now - self._started_at >= self.window:
+            # Больше двух окон без данных - предыдущее окно тоже устарело
+            self._previous = self._current if now - self._started_at < 2 * self.window else LatencyHistogram()
+            self._current = LatencyHistogram()
+            self._started_at = now
+
+    def record(self, seconds: float):
+        self._rotate()
+        self._current.record(seconds)
+
+    def merged(self) -> LatencyHistogram:
+        self._rotate()
+        histogram = LatencyHistogram()
+        histogram.merge(self._previous)
+        histogram.merge(self._current)
+        return histogram
+
+
+@dataclass
+class TimeoutPolicy:
+    """Правило вывода таймаута из наблюдаемых задержек"""
+    percentile: float = 99.0
+    multiplier: float = 1.5
+    min_timeout: float = 2.0
+    max_timeout: float = 45.0
+    min_samples: int = 20
+
+
+class LatencyTracker:
+    """
+    Задержки и адаптивные таймауты по ключам (хост, источник, метод обхода)
+    """
+
+    def __init__(self, policy: Optional[TimeoutPolicy] = None, window: float = 600.0):
+        self.policy = policy or TimeoutPolicy()
+        self.window = window
+        self._histograms: Dict[str, WindowedHistogram] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float, error: bool = False, timed_out: bool = False):
+        """
+        Запись задержки запроса
+
+        Args:
+            timed_out: запрос оборван по таймауту (seconds - значение таймаута)
+        """
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = WindowedHistogram(self.window)
+                self._stats[key] = {'requests': 0, 'errors': 0, 'timeouts': 0}
+            histogram.record(seconds)
+            stats = self._stats[key]
+            stats['requests'] += 1
+            if error:
+                stats['errors'] += 1
+            if timed_out:
+                stats['timeouts'] += 1
+
+    def histogram(self, key: str) -> LatencyHistogram:
+        with self._lock:
+            windowed = self._histograms.get(key)
+            return windowed.merged() if windowed is not None else LatencyHistogram()
+
+    def timeout(self, key: str, default: float, policy: Optional[TimeoutPolicy] = None) -> float:
+        """
+        Таймаут для следующего запроса: p99 x множитель в пределах ограничений,
+        default - пока наблюдений меньше min_samples
+        """
+        policy = policy or self.policy
+        histogram = self.histogram(key)
+        if histogram.total < policy.min_samples:
+            return default
+        observed = histogram.percentile(policy.percentile) * policy.multiplier
+        return round(min(policy.max_timeout, max(policy.min_timeout, observed)), 3)
+
+    def get_stats(self, prefix: str = '') -> Dict[str, Any]:
+        with self._lock:
+            keys = [key for key in self._histograms if key.startswith(prefix)]
+        report = {}
+        for key in sorted(keys):
+            report[key] = {
+                **self.histogram(key).snapshot(),
+                **self._stats[key],
+                'timeout': self.timeout(key, default=0.0)
+            }
+        return report
+
+    def log_report(self, logger: logging.Logger, prefix: str = ''):
+        for key, stats in self.get_stats(prefix).items():
+            timeout = f"{stats['timeout']:.1f}с" if stats['timeout'] else 'по умолчанию'
+            logger.info(f"⏱️ {key}: p50 {stats['p50']:.2f}с, p95 {stats['p95']:.2f}с, p99 {stats['p99']:.2f}с "
+                        f"({stats['count']} запросов, таймаутов {stats['timeouts']}), таймаут {timeout}")
+
+
+def host_key(url: str) -> str:
+    """Ключ хоста для URL (схема и адрес)"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+# Глобальный трекер задержек
+_global_tracker: Optional[LatencyTracker] = None
+_global_lock = threading.Lock()
+
+def get_global_latency_tracker() -> LatencyTracker:
+    """Получение общего трекера задержек процесса"""
+    global _global_tracker
+    if _global_tracker is None:
+        with _global_lock:
+            if _global_tracker is None:
+                _global_tracker = LatencyTracker()
+    return _global_tracker
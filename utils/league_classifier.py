@@ -0,0 +1,54 @@
+"""
+Скомпилированный классификатор лиг
+Все правила приоритизации собраны в одно регулярное выражение с именованными группами,
+результат для каждой строки кэшируется (одни и те же лиги повторяются в каждом опросе)
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Iterable, List, Sequence, Tuple
+
+
+class CompiledLeagueClassifier:
+    """
+    Классификатор "первое подходящее правило" за один проход regex
+
+    Правила передаются в порядке приоритета проверки: (метка, [паттерны]).
+    Альтернатива вида .*?(?P<rN>...) пробуется целиком по всей строке прежде
+    чем движок перейдет к следующему правилу, поэтому результат совпадает с
+    последовательной проверкой правил, но выполняется одним вызовом re.match.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[Any, Iterable[str]]], default: Any = None,
+                 flags: int = re.IGNORECASE, cache_size: int = 2048, literal: bool = False):
+        self.default = default
+        self._labels: List[Any] = []
+
+        alternatives = []
+        for label, patterns in rules:
+            patterns = [re.escape(p) if literal else p for p in patterns]
+            if not patterns:
+                continue
+            group_name = f"r{len(self._labels)}"
+            self._labels.append(label)
+            alternatives.append(f"(?s:.*?)(?P<{group_name}>{'|'.join(patterns)})")
+
+        self._regex = re.compile('|'.join(alternatives), flags) if alternatives else None
+        self.classify = lru_cache(maxsize=cache_size)(self.classify_uncached)
+
+    def classify_uncached(self, text: str) -> Any:
+        """Метка первого сработавшего правила (без кэша) - для строк, которые не повторяются"""
+        if self._regex is None or not text:
+            return self.default
+
+        found = self._regex.match(text)
+        if not found:
+            return self.default
+
+        return self._labels[int(found.lastgroup[1:])]
+
+    def cache_info(self):
+        return self.classify.cache_info()
+
+    def cache_clear(self):
+        self.classify.cache_clear()
@@ -173,31 +173,33 @@ class MarathonBetEnricher:
     
     def _find_in_sofascore_live(self, team1: str, team2: str, sport: str) -> Optional[Dict[str, Any]]:
         """
-        Поиск матча в live данных SofaScore
+        Поиск матча в live данных SofaScore (записи общей ленты цикла, тот же порядок команд)
         """
         try:
-            sofascore_matches = self.aggregator.scrapers['sofascore'].get_live_matches(sport)
+            team1_variants = [v.lower() for v in get_team_variants(team1)]
+            team2_variants = [v.lower() for v in get_team_variants(team2)]
             
-            team1_variants = get_team_variants(team1)
-            team2_variants = get_team_variants(team2)
-            
-            for sf_match in sofascore_matches:
+            def same_match(sf_match: Dict[str, Any]) -> bool:
                 sf_team1 = sf_match.get('team1', '').lower()
                 sf_team2 = sf_match.get('team2', '').lower()
                 
                 # Проверяем все варианты
-                for t1_var in team1_variants:
-                    for t2_var in team2_variants:
-                        if ((t1_var.lower() in sf_team1 or sf_team1 in t1_var.lower()) and
-                            (t2_var.lower() in sf_team2 or sf_team2 in t2_var.lower())):
-                            
-                            self.logger.info(f"✅ Найден в SofaScore live: {team1} vs {team2} → {sf_team1} vs {sf_team2}")
-                            return {
-                                'sofascore_match': sf_match,
-                                'matched_teams': {'sofascore_team1': sf_team1, 'sofascore_team2': sf_team2},
-                                'confidence': 0.8,
-                                'source': 'sofascore_live'
-                            }
+                return any((t1_var in sf_team1 or sf_team1 in t1_var) and
+                           (t2_var in sf_team2 or sf_team2 in t2_var)
+                           for t1_var in team1_variants for t2_var in team2_variants)
+            
+            sf_match = self.aggregator.live_score_feed.find(team1, team2, sport, same_match)
+            if sf_match:
+                sf_team1 = sf_match.get('team1', '').lower()
+                sf_team2 = sf_match.get('team2', '').lower()
+                
+                self.logger.info(f"✅ Найден в SofaScore live: {team1} vs {team2} → {sf_team1} vs {sf_team2}")
+                return {
+                    'sofascore_match': sf_match,
+                    'matched_teams': {'sofascore_team1': sf_team1, 'sofascore_team2': sf_team2},
+                    'confidence': 0.8,
+                    'source': 'sofascore_live'
+                }
             
             return None
             
@@ -0,0 +1,253 @@
+"""
+Колоночный пакет матчей (struct-of-arrays) для векторизованного отбора
+Счета, минуты, коэффициенты, коды спорта и приоритета разбираются один раз за опрос,
+дальше фильтрация неничейных, проверка коэффициентов, вероятности, риск и
+приоритет для Telegram считаются векторными выражениями NumPy
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from utils.match_record import Match
+from utils.score_parser import parse_score
+
+SPORT_CODES = {'football': 0, 'tennis': 1, 'table_tennis': 2, 'handball': 3}
+
+_MINUTE_RE = re.compile(r'(\d+)')
+
+# Метки, совпадающие с MultiSourceAggregator._get_betting_recommendation и др.
+RECOMMENDATION_LABELS = ('avoid_too_low_odds', 'consider_if_very_confident',
+                         'good_conservative_value', 'analyze_for_value_opportunities')
+RECOMMENDATION_EDGES = (1.15, 1.4, 2.0)
+RECOMMENDATION_POINTS = (2, 6, 10, 8)
+
+RISK_LABELS = ('very_low_risk', 'low_risk', 'medium_risk', 'high_risk')
+RISK_EDGES = (1.2, 1.6, 2.5)
+RISK_POINTS = (1, 5, 3, 0)
+
+VALUE_LABELS = ('very_close_match', 'moderate_difference', 'clear_favorite')
+VALUE_EDGES = (0.2, 0.8)
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(str(value).replace(',', '.'))
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class MatchBatch:
+    """
+    Пакет матчей одного опроса в виде колонок NumPy
+    """
+
+    def __init__(self, matches: Sequence[Any]):
+        if np is None:
+            raise ImportError("MatchBatch требует numpy")
+
+        self.matches = list(matches)
+        n = len(self.matches)
+
+        self.score_home = np.full(n, np.nan)
+        self.score_away = np.full(n, np.nan)
+        self.minute = np.full(n, np.nan)
+        self.odds_1 = np.full(n, np.nan)
+        self.odds_x = np.full(n, np.nan)
+        self.odds_2 = np.full(n, np.nan)
+        self.sport_code = np.full(n, -1, dtype=np.int8)
+        self.priority_code = np.zeros(n, dtype=np.int16)
+        self.has_odds = np.zeros(n, dtype=bool)
+        self.has_analysis = np.zeros(n, dtype=bool)
+
+        for i, match in enumerate(self.matches):
+            self._load_row(i, match)
+
+    @staticmethod
+    def available() -> bool:
+        """Доступен ли векторизованный путь (установлен numpy)"""
+        return np is not None
+
+    def __len__(self) -> int:
+        return len(self.matches)
+
+    def _load_row(self, i: int, match: Any):
+        """Разбор одного матча в колонки (единственный проход по строкам)"""
+        self.sport_code[i] = SPORT_CODES.get(str(match.get('sport', '')).lower(), -1)
+        priority = match.get('league_priority', 0)
+        self.priority_code[i] = priority if isinstance(priority, int) else 0
+        self.has_analysis[i] = bool(match.get('claude_odds_analysis'))
+
+        if isinstance(match, Match):
+            # Уже разобранные числовые поля
+            if match.score_home is not None:
+                self.score_home[i], self.score_away[i] = match.score_home, match.score_away
+            if match.minute is not None:
+                self.minute[i] = match.minute
+            if match.odds_1 is not None:
+                self.odds_1[i], self.odds_2[i] = match.odds_1, match.odds_2
+                if match.odds_x is not None:
+                    self.odds_x[i] = match.odds_x
+                self.has_odds[i] = True
+
+        if np.isnan(self.score_home[i]):
+            # Счет по сетам/голам: основная пара ("2:1 (6:4)" -> 2, 1)
+            parsed = parse_score(match.get('score', ''))
+            if parsed:
+                self.score_home[i], self.score_away[i] = parsed.home, parsed.away
+
+        if np.isnan(self.minute[i]):
+            parsed = _MINUTE_RE.match(str(match.get('time', '')))
+            if parsed:
+                self.minute[i] = int(parsed.group(1))
+
+        odds = match.get('odds') or {}
+        if odds and not self.has_odds[i]:
+            self.has_odds[i] = True
+            self.odds_1[i] = _to_float(odds.get('П1', 0))
+            self.odds_2[i] = _to_float(odds.get('П2', 0))
+            if 'X' in odds:
+                self.odds_x[i] = _to_float(odds['X'])
+
+    # ---- маски ----
+
+    def non_draw_mask(self):
+        """Матчи с реальным неничейным счетом"""
+        return ~np.isnan(self.score_home) & (self.score_home != self.score_away)
+
+    def non_draw_rows(self) -> List[tuple]:
+        """(индекс, лидер, разница) для неничейных матчей"""
+        mask = self.non_draw_mask()
+        indices = np.flatnonzero(mask)
+        leaders = np.where(self.score_home[indices] > self.score_away[indices], 'home', 'away')
+        differences = np.abs(self.score_home[indices] - self.score_away[indices]).astype(np.int64)
+        return list(zip(indices.tolist(), leaders.tolist(), differences.tolist()))
+
+    def odds_sanity_mask(self, max_odds: float = 50.0, min_favorite: float = 1.05):
+        """Реалистичные коэффициенты П1/П2 и не слишком очевидный фаворит"""
+        with np.errstate(invalid='ignore'):
+            return (self.has_odds
+                    & (self.odds_1 > 0) & (self.odds_2 > 0)
+                    & (self.odds_1 <= max_odds) & (self.odds_2 <= max_odds)
+                    & (np.fmin(self.odds_1, self.odds_2) >= min_favorite))
+
+    def sport_mask(self, sport: str):
+        return self.sport_code == SPORT_CODES.get(sport, -2)
+
+    # ---- производные колонки ----
+
+    def min_odds(self):
+        return np.fmin(self.odds_1, self.odds_2)
+
+    def score_difference(self):
+        return np.abs(self.score_home - self.score_away)
+
+    def implied_probabilities(self) -> Dict[str, Any]:
+        """Подразумеваемые вероятности (в %) и маржа букмекера"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            prob_1 = np.where(self.odds_1 > 0, 100.0 / self.odds_1, np.nan)
+            prob_2 = np.where(self.odds_2 > 0, 100.0 / self.odds_2, np.nan)
+            prob_x = np.where(self.odds_x > 0, 100.0 / self.odds_x, 0.0)
+        total = prob_1 + prob_2
+        return {
+            'team1': prob_1,
+            'team2': prob_2,
+            'draw': prob_x,
+            'total': total,
+            'margin': total + prob_x - 100.0
+        }
+
+    def recommendation_codes(self):
+        """Индексы RECOMMENDATION_LABELS (-1 если коэффициенты не разобраны)"""
+        min_odds = self.min_odds()
+        codes = np.digitize(min_odds, RECOMMENDATION_EDGES)
+        return np.where(np.isnan(min_odds), -1, codes)
+
+    def risk_codes(self):
+        """Индексы RISK_LABELS (-1 если коэффициенты не разобраны)"""
+        min_odds = self.min_odds()
+        codes = np.digitize(min_odds, RISK_EDGES)
+        return np.where(np.isnan(min_odds), -1, codes)
+
+    def value_codes(self):
+        """Индексы VALUE_LABELS (-1 если коэффициенты не разобраны)"""
+        diff = np.abs(self.odds_1 - self.odds_2)
+        codes = np.digitize(diff, VALUE_EDGES)
+        return np.where(np.isnan(diff), -1, codes)
+
+    def telegram_priority(self):
+        """
+        Приоритет для Telegram (векторная версия calculate_telegram_priority)
+        """
+        recommendation = self.recommendation_codes()
+        risk = self.risk_codes()
+
+        rec_points = np.where(recommendation >= 0, np.take(RECOMMENDATION_POINTS, recommendation.clip(0)), 0)
+        risk_points = np.where(risk >= 0, np.take(RISK_POINTS, risk.clip(0)), 0)
+        score = np.where(self.has_analysis, rec_points + risk_points, 0)
+
+        with np.errstate(invalid='ignore'):
+            avg_odds = (self.odds_1 + self.odds_2) / 2
+            balanced = (avg_odds >= 1.5) & (avg_odds <= 3.0)
+            close = np.abs(self.odds_1 - self.odds_2) < 0.5
+
+        score = score + np.where(self.has_odds & balanced, 3, 0) + np.where(self.has_odds & close, 2, 0)
+        return score.astype(np.int32)
+
+    # ---- отбор ----
+
+    def top_k(self, scores, k: int, mask=None) -> List[int]:
+        """
+        Индексы k лучших строк по убыванию scores (при равенстве - исходный порядок)
+        """
+        indices = np.arange(len(self.matches)) if mask is None else np.flatnonzero(mask)
+        if k <= 0 or len(indices) == 0:
+            return []
+
+        # Уникальный ключ: приоритет, затем исходная позиция (как у стабильной сортировки)
+        key = scores[indices].astype(np.int64) * (len(self.matches) + 1) - indices
+
+        if k < len(indices):
+            selected = np.argpartition(-key, k - 1)[:k]
+        else:
+            selected = np.arange(len(indices))
+
+        ordered = selected[np.argsort(-key[selected])]
+        return indices[ordered].tolist()
+
+    def take(self, indices: Sequence[int]) -> List[Any]:
+        return [self.matches[i] for i in indices]
+
+    def odds_analysis(self, i: int, recommendation, value, risk, probabilities) -> Optional[Dict[str, Any]]:
+        """
+        Словарь claude_odds_analysis для строки i из заранее посчитанных колонок
+        """
+        if not self.has_odds[i]:
+            return None
+
+        if probabilities['team1'][i] > 0 and probabilities['team2'][i] > 0:
+            probability_analysis = {
+                'team1_win_probability': round(float(probabilities['team1'][i]), 2),
+                'team2_win_probability': round(float(probabilities['team2'][i]), 2),
+                'total_probability': round(float(probabilities['total'][i]), 2)
+            }
+        else:
+            probability_analysis = {'calculation_failed': True}
+
+        return {
+            'betting_recommendation': RECOMMENDATION_LABELS[recommendation[i]] if recommendation[i] >= 0 else 'odds_analysis_needed',
+            'value_assessment': VALUE_LABELS[value[i]] if value[i] >= 0 else 'assessment_failed',
+            'risk_level': RISK_LABELS[risk[i]] if risk[i] >= 0 else 'risk_assessment_failed',
+            'probability_analysis': probability_analysis
+        }
+
+
+def create_match_batch(matches: Sequence[Any]) -> Optional[MatchBatch]:
+    """Создание пакета (None если numpy недоступен)"""
+    if np is None:
+        return None
+    return MatchBatch(matches)
@@ -0,0 +1,288 @@
+"""
+Компактная запись матча (__slots__)
+Заменяет свободные словари в горячем пути: интернированные строки команд/лиг,
+числовые счет, минута и коэффициенты, словарь собирается только по запросу (to_dict)
+"""
+
+import re
+import sys
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from utils.score_parser import parse_score
+
+# Минута вида 45' / 45
+_MINUTE_RE = re.compile(r"^\s*(\d{1,3})\s*'?\s*$")
+
+# Ключи коэффициентов MarathonBet -> слоты
+_ODDS_KEYS = ('П1', 'X', 'П2')
+
+# Строковые поля, которые интернируются (повторяются в сотнях матчей)
+_INTERNED_FIELDS = ('source', 'sport', 'team1', 'team2', 'league')
+# Строковые поля, которые храним как есть
+_PLAIN_FIELDS = ('url', 'match_id')
+# Порядок ключей при сборке словаря (совпадает с порядком у скраперов)
+_CORE_KEYS = ('source', 'sport', 'team1', 'team2', 'score', 'time', 'league',
+              'timestamp', 'url', 'match_id', 'odds')
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Match(MutableMapping):
+    """
+    Запись live-матча с фиксированным набором полей
+
+    Поддерживает протокол словаря (get, [], in, copy, items), поэтому
+    существующий код фильтрации и обогащения работает без изменений.
+    Все неизвестные ключи (claude_*, score_source и т.д.) лежат в extra.
+    """
+
+    __slots__ = (
+        'source', 'sport', 'team1', 'team2', 'league', 'url', 'match_id',
+        'score_home', 'score_away', 'score_text',
+        'minute', 'time_text',
+        'odds_1', 'odds_x', 'odds_2', 'odds_raw',
+        'timestamp', 'timestamp_text',
+        'extra'
+    )
+
+    def __init__(self, source: str = None, sport: str = None, team1: str = None, team2: str = None,
+                 league: str = None, url: str = None, match_id: str = None):
+        self.source = _intern(source)
+        self.sport = _intern(sport)
+        self.team1 = _intern(team1)
+        self.team2 = _intern(team2)
+        self.league = _intern(league)
+        self.url = url
+        self.match_id = match_id
+
+        self.score_home: Optional[int] = None
+        self.score_away: Optional[int] = None
+        self.score_text: Optional[str] = None
+        self.minute: Optional[int] = None
+        self.time_text: Optional[str] = None
+        self.odds_1: Optional[float] = None
+        self.odds_x: Optional[float] = None
+        self.odds_2: Optional[float] = None
+        self.odds_raw: Optional[Dict[str, Any]] = None
+        self.timestamp: Optional[float] = None
+        self.timestamp_text: Optional[str] = None
+        self.extra: Dict[str, Any] = {}
+
+    # ---- конструирование ----
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Match':
+        """Создание записи из словаря скрапера"""
+        match = cls.__new__(cls)
+        cls.__init__(match)
+        for key, value in data.items():
+            match[key] = value
+        return match
+
+    # ---- свойства ----
+
+    @property
+    def has_numeric_score(self) -> bool:
+        return self.score_home is not None
+
+    @property
+    def goal_difference(self) -> Optional[int]:
+        if self.score_home is None:
+            return None
+        return self.score_home - self.score_away
+
+    # ---- протокол словаря ----
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _INTERNED_FIELDS or key in _PLAIN_FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+
+        if key == 'score':
+            if self.score_home is not None:
+                return f"{self.score_home}:{self.score_away}"
+            if self.score_text is None:
+                raise KeyError(key)
+            return self.score_text
+
+        if key == 'time':
+            if self.time_text is not None:
+                return self.time_text
+            if self.minute is None:
+                raise KeyError(key)
+            return f"{self.minute}'"
+
+        if key == 'odds':
+            if self.odds_raw is not None:
+                return self.odds_raw
+            if self.odds_1 is None:
+                raise KeyError(key)
+            odds = {'П1': self.odds_1}
+            if self.odds_x is not None:
+                odds['X'] = self.odds_x
+            odds['П2'] = self.odds_2
+            return odds
+
+        if key == 'timestamp':
+            if self.timestamp_text is not None:
+                return self.timestamp_text
+            if self.timestamp is None:
+                raise KeyError(key)
+            return datetime.fromtimestamp(self.timestamp).isoformat()
+
+        return self.extra[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in _INTERNED_FIELDS:
+            setattr(self, key, _intern(value))
+
+        elif key in _PLAIN_FIELDS:
+            setattr(self, key, value)
+
+        elif key == 'score':
+            # Простые счета вида 1:0 храним как два числа, сложные (сеты) - как текст
+            parsed = parse_score(value)
+            if parsed and not parsed.detail and value == str(parsed):
+                self.score_home, self.score_away = parsed.home, parsed.away
+                self.score_text = None
+            else:
+                self.score_home = self.score_away = None
+                self.score_text = _intern(value)
+
+        elif key == 'time':
+            parsed = _MINUTE_RE.match(value) if isinstance(value, str) else None
+            if parsed and value.strip().endswith("'"):
+                self.minute = int(parsed.group(1))
+                self.time_text = None
+            else:
+                self.minute = None
+                self.time_text = _intern(value)
+                if parsed:
+                    self.minute = int(parsed.group(1))
+
+        elif key == 'odds':
+            self._set_odds(value)
+
+        elif key == 'timestamp':
+            self._set_timestamp(value)
+
+        else:
+            self.extra[key] = value
+
+    def _set_odds(self, odds: Any):
+        self.odds_1 = self.odds_x = self.odds_2 = None
+        self.odds_raw = None
+
+        if isinstance(odds, dict) and 'П1' in odds and 'П2' in odds and set(odds) <= set(_ODDS_KEYS):
+            p1, p2 = _to_float(odds['П1']), _to_float(odds['П2'])
+            x = _to_float(odds['X']) if 'X' in odds else None
+            if p1 is not None and p2 is not None and (x is not None or 'X' not in odds):
+                self.odds_1, self.odds_x, self.odds_2 = p1, x, p2
+                return
+
+        # Нестандартные коэффициенты храним как есть
+        self.odds_raw = odds
+
+    def _set_timestamp(self, value: Any):
+        self.timestamp = None
+        self.timestamp_text = None
+
+        if isinstance(value, (int, float)):
+            self.timestamp = float(value)
+            return
+
+        try:
+            parsed = datetime.fromisoformat(value)
+            if parsed.tzinfo is None and parsed.isoformat() == value:
+                self.timestamp = parsed.timestamp()
+                return
+        except (TypeError, ValueError):
+            pass
+
+        self.timestamp_text = value
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+
+        if key in _INTERNED_FIELDS or key in _PLAIN_FIELDS:
+            setattr(self, key, None)
+        elif key == 'score':
+            self.score_home = self.score_away = self.score_text = None
+        elif key == 'time':
+            self.minute = self.time_text = None
+        elif key == 'odds':
+            self.odds_1 = self.odds_x = self.odds_2 = self.odds_raw = None
+        elif key == 'timestamp':
+            self.timestamp = self.timestamp_text = None
+        else:
+            del self.extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __iter__(self) -> Iterator[str]:
+        for key in _CORE_KEYS:
+            if key in self:
+                yield key
+        yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for key in _CORE_KEYS if key in self) + len(self.extra)
+
+    def __repr__(self) -> str:
+        return f"Match({self.sport}: {self.team1} vs {self.team2} {self.get('score', '')})"
+
+    # ---- копирование и экспорт ----
+
+    def copy(self) -> 'Match':
+        """Дешевая копия: слоты + поверхностная копия extra"""
+        clone = Match.__new__(Match)
+        for slot in Match.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        clone.extra = dict(self.extra)
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сборка словаря для промпта Claude и Telegram"""
+        return {key: self[key] for key in self}
+
+
+def as_match(match: Any) -> Match:
+    """Адаптер миграции: словарь скрапера -> Match (Match возвращается как есть)"""
+    if isinstance(match, Match):
+        return match
+    return Match.from_dict(match)
+
+
+def as_matches(matches: Iterable[Any]) -> List[Match]:
+    """Адаптер миграции для списка матчей"""
+    return [as_match(match) for match in matches if match]
+
+
+def to_dicts(matches: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Обратное преобразование для кода, которому нужны настоящие словари"""
+    return [match.to_dict() if isinstance(match, Match) else match for match in matches]
@@ -0,0 +1,391 @@
+"""
+Сервис парсинга HTML в пуле процессов
+Выносит CPU-нагрузку (BeautifulSoup + регулярные выражения) из потоков загрузки,
+чтобы парсинг разных источников масштабировался по ядрам, а не упирался в GIL
+"""
+
+import os
+import time
+import logging
+import importlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+# Поля матча, которые передаются из воркера позиционно (компактный кортеж)
+MATCH_FIELDS = (
+    'source', 'sport', 'team1', 'team2', 'score', 'time', 'league',
+    'url', 'timestamp', 'match_id', 'status', 'odds'
+)
+
+# Цели парсинга: модуль, класс скрапера и чистый метод извлечения
+PARSE_TARGETS = {
+    'marathonbet': ('scrapers.marathonbet_scraper', 'MarathonBetScraper', '_extract_enhanced_matches_from_html'),
+    'marathonbet_fragment': ('scrapers.marathonbet_scraper', 'MarathonBetScraper', '_extract_all_strategies'),
+    'scores24': ('scrapers.scores24_scraper', 'Scores24Scraper', '_extract_matches_from_html'),
+    'scores24_fragment': ('scrapers.scores24_scraper', 'Scores24Scraper', '_extract_all_strategies'),
+    'sofascore_links': ('scrapers.sofascore_simple_quality', 'SofaScoreSimpleQuality', '_extract_match_links_from_html'),
+    'flashscore_feed': ('scrapers.flashscore_scraper', 'FlashScoreScraper', '_parse_flashscore_api_response'),
+}
+
+# Цели, которые возвращают не матчи, а готовые кортежи
+RAW_TUPLE_TARGETS = {'sofascore_links'}
+
+# Экземпляры парсеров внутри процесса-воркера (создаются один раз в initializer)
+_WORKER_PARSERS: Dict[str, Any] = {}
+
+
+@dataclass
+class ParsePoolConfig:
+    """Конфигурация пула парсинга"""
+    max_workers: int = max(1, (os.cpu_count() or 2) - 1)
+    shared_memory_threshold: int = 256 * 1024  # Страницы больше 256KB идут через shared memory
+    task_timeout: float = 30.0
+    targets: Tuple[str, ...] = tuple(PARSE_TARGETS.keys())
+
+
+def _init_worker(targets: Tuple[str, ...]):
+    """
+    Инициализация воркера: прогреваем bs4/lxml, модули скраперов и их паттерны
+    """
+    logger = logging.getLogger('ParseWorker')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    try:
+        import bs4  # noqa: F401
+        import lxml  # noqa: F401
+    except ImportError:
+        pass
+
+    for name in targets:
+        if name not in PARSE_TARGETS:
+            continue
+        module_name, class_name, _ = PARSE_TARGETS[name]
+        try:
+            module = importlib.import_module(module_name)
+            _WORKER_PARSERS[name] = getattr(module, class_name)(logger)
+        except Exception:
+            # Недоступную цель парсим в основном процессе
+            continue
+
+
+def _pack_match(match: Dict[str, Any]) -> tuple:
+    """
+    Упаковка словаря матча в компактный кортеж (mask, values, extras)
+    """
+    mask = 0
+    values = []
+    for index, field_name in enumerate(MATCH_FIELDS):
+        if field_name in match:
+            mask |= 1 << index
+            value = match[field_name]
+            if field_name == 'odds' and isinstance(value, dict):
+                value = tuple(value.items())
+            values.append(value)
+
+    extras = tuple((key, value) for key, value in match.items() if key not in MATCH_FIELDS)
+    return mask, tuple(values), extras
+
+
+def unpack_match(packed: tuple) -> Dict[str, Any]:
+    """
+    Распаковка компактного кортежа обратно в словарь матча
+    """
+    mask, values, extras = packed
+    match = {}
+    value_iter = iter(values)
+    for index, field_name in enumerate(MATCH_FIELDS):
+        if mask & (1 << index):
+            value = next(value_iter)
+            if field_name == 'odds' and isinstance(value, tuple):
+                value = dict(value)
+            match[field_name] = value
+
+    match.update(extras)
+    return match
+
+
+def _read_payload(payload: Any) -> bytes:
+    """
+    Чтение страницы: либо байты напрямую, либо (имя shared memory, размер)
+    """
+    if isinstance(payload, bytes):
+        return payload
+
+    shm_name, size = payload
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        return bytes(shm.buf[:size])
+    finally:
+        shm.close()
+
+
+def _parse_in_worker(target: str, payload: Any, encoding: str, args: tuple) -> List[tuple]:
+    """
+    Задача воркера: декодирование страницы, извлечение и упаковка результата
+    """
+    parser = _WORKER_PARSERS.get(target)
+    if parser is None:
+        _init_worker((target,))
+        parser = _WORKER_PARSERS[target]
+
+    html = _read_payload(payload).decode(encoding or 'utf-8', errors='replace')
+    method_name = PARSE_TARGETS[target][2]
+    result = getattr(parser, method_name)(html, *args) or []
+
+    if target in RAW_TUPLE_TARGETS:
+        return [tuple(item) for item in result]
+    return [_pack_match(match) for match in result if match]
+
+
+def _ping_worker() -> int:
+    """Пустая задача для прогрева воркеров"""
+    return os.getpid()
+
+
+class ParsingService:
+    """
+    Сервис парсинга страниц в пуле процессов
+
+    Потоки загрузки передают сюда сырые байты страницы и получают
+    готовый список матчей; сам разбор выполняется в отдельных процессах.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None, config: Optional[ParsePoolConfig] = None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.config = config or ParsePoolConfig()
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._local_parsers: Dict[str, Any] = {}
+        self._warmed = False
+
+        # Статистика
+        self.stats = {
+            'tasks': 0,
+            'shared_memory_tasks': 0,
+            'bytes_parsed': 0,
+            'local_fallbacks': 0,
+            'timeouts': 0,
+            'pool_restarts': 0,
+            'errors': 0
+        }
+
+    def start(self):
+        """Запуск пула процессов"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.config.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.config.targets,)
+                )
+                self.logger.info(f"ParsingService: запущен пул из {self.config.max_workers} процессов")
+        return self
+
+    def warm_up(self):
+        """
+        Прогрев: заставляем все воркеры выполнить initializer до первого цикла
+        (повторные вызовы ничего не делают, пока пул не перезапускался)
+        """
+        if self._warmed and self._executor is not None:
+            return
+        self.start()
+        try:
+            futures = [self._executor.submit(_ping_worker) for _ in range(self.config.max_workers)]
+            pids = {future.result(timeout=self.config.task_timeout) for future in futures}
+            self._warmed = True
+            self.logger.info(f"ParsingService: прогрето {len(pids)} воркеров")
+        except Exception as e:
+            self.logger.warning(f"ParsingService: ошибка прогрева: {e}")
+
+    def _reset_executor(self):
+        """Сломанный пул останавливается без ожидания; новый запустится при следующей задаче"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._warmed = False
+        if executor is not None:
+            self.stats['pool_restarts'] += 1
+            try:
+                executor.shutdown(wait=False, cancel_futures=True)
+            except Exception as e:
+                self.logger.debug(f"ParsingService: ошибка остановки пула: {e}")
+
+    def shutdown(self):
+        """Остановка пула процессов"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+                self._warmed = False
+                self.logger.info("ParsingService: пул процессов остановлен")
+
+    def parse(self, target: str, content: bytes, *args, encoding: str = 'utf-8') -> List[Any]:
+        """
+        Парсинг страницы в пуле процессов
+
+        Args:
+            target: Имя цели из PARSE_TARGETS
+            content: Сырые байты страницы (response.content)
+            *args: Дополнительные аргументы метода извлечения
+            encoding: Кодировка страницы
+
+        Returns:
+            Список матчей (или кортежей для RAW_TUPLE_TARGETS)
+        """
+        if target not in PARSE_TARGETS:
+            raise ValueError(f"Неизвестная цель парсинга: {target}")
+
+        if isinstance(content, str):
+            content = content.encode(encoding or 'utf-8')
+
+        self.stats['tasks'] += 1
+        self.stats['bytes_parsed'] += len(content)
+
+        shm = None
+        future = None
+        try:
+            self.start()
+
+            payload: Any = content
+            if len(content) >= self.config.shared_memory_threshold:
+                shm = shared_memory.SharedMemory(create=True, size=len(content))
+                shm.buf[:len(content)] = content
+                payload = (shm.name, len(content))
+                self.stats['shared_memory_tasks'] += 1
+
+            future = self._executor.submit(_parse_in_worker, target, payload, encoding, args)
+            packed = future.result(timeout=self.config.task_timeout)
+
+        except TimeoutError:
+            # TimeoutError - подкласс OSError: медленная страница не означает сломанный пул
+            if future is not None:
+                future.cancel()
+            self.logger.warning(f"ParsingService: {target} не разобран за {self.config.task_timeout}с")
+            self.stats['timeouts'] += 1
+            return []
+
+        except (BrokenProcessPool, RuntimeError) as e:
+            self.logger.warning(f"ParsingService: пул недоступен ({e}), парсим в текущем процессе")
+            self.stats['local_fallbacks'] += 1
+            self._reset_executor()
+            return self._parse_locally(target, content, encoding, args)
+
+        except OSError as e:
+            # Shared memory недоступна: пул исправен, страница разбирается здесь
+            self.logger.warning(f"ParsingService: ошибка передачи страницы ({e}), парсим в текущем процессе")
+            self.stats['local_fallbacks'] += 1
+            return self._parse_locally(target, content, encoding, args)
+
+        except Exception as e:
+            self.logger.warning(f"ParsingService: ошибка парсинга {target}: {e}")
+            self.stats['errors'] += 1
+            return []
+
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+        if target in RAW_TUPLE_TARGETS:
+            return packed
+        return [unpack_match(item) for item in packed]
+
+    def parse_many(self, target: str, contents: List[bytes], *args,
+                   encoding: str = 'utf-8') -> List[Optional[List[Any]]]:
+        """
+        Параллельный парсинг нескольких частей страницы (фрагменты событий)
+
+        Части небольшие, поэтому передаются байтами без shared memory
+
+        Returns:
+            Результаты в порядке contents; None - часть не разобрана (таймаут, ошибка)
+        """
+        if target not in PARSE_TARGETS:
+            raise ValueError(f"Неизвестная цель парсинга: {target}")
+
+        contents = [content.encode(encoding or 'utf-8') if isinstance(content, str) else content
+                    for content in contents]
+        if not contents:
+            return []
+
+        self.stats['tasks'] += len(contents)
+        self.stats['bytes_parsed'] += sum(len(content) for content in contents)
+
+        try:
+            self.start()
+            futures = [self._executor.submit(_parse_in_worker, target, content, encoding, args)
+                       for content in contents]
+        except (BrokenProcessPool, RuntimeError) as e:
+            self.logger.warning(f"ParsingService: пул недоступен ({e}), парсим в текущем процессе")
+            self.stats['local_fallbacks'] += 1
+            self._reset_executor()
+            return [self._parse_locally(target, content, encoding, args) for content in contents]
+
+        results: List[Optional[List[Any]]] = []
+        deadline = time.monotonic() + self.config.task_timeout
+        for future, content in zip(futures, contents):
+            try:
+                packed = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except TimeoutError:
+                future.cancel()
+                self.stats['timeouts'] += 1
+                results.append(None)
+                continue
+            except (BrokenProcessPool, RuntimeError) as e:
+                self.logger.warning(f"ParsingService: пул недоступен ({e}), парсим в текущем процессе")
+                self.stats['local_fallbacks'] += 1
+                self._reset_executor()
+                results.append(self._parse_locally(target, content, encoding, args))
+                continue
+            except Exception as e:
+                self.logger.warning(f"ParsingService: ошибка парсинга {target}: {e}")
+                self.stats['errors'] += 1
+                results.append(None)
+                continue
+
+            if target in RAW_TUPLE_TARGETS:
+                results.append(packed)
+            else:
+                results.append([unpack_match(item) for item in packed])
+
+        if None in results:
+            self.logger.warning(f"ParsingService: {target} - не разобрано {results.count(None)} из {len(results)} частей")
+        return results
+
+    def _parse_locally(self, target: str, content: bytes, encoding: str, args: tuple) -> List[Any]:
+        """Резервный парсинг в текущем процессе"""
+        try:
+            parser = self._local_parsers.get(target)
+            if parser is None:
+                module_name, class_name, _ = PARSE_TARGETS[target]
+                module = importlib.import_module(module_name)
+                parser = getattr(module, class_name)(self.logger)
+                self._local_parsers[target] = parser
+
+            html = content.decode(encoding or 'utf-8', errors='replace')
+            return getattr(parser, PARSE_TARGETS[target][2])(html, *args) or []
+
+        except Exception as e:
+            self.logger.warning(f"ParsingService: локальный парсинг {target} не удался: {e}")
+            self.stats['errors'] += 1
+            return []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получение статистики сервиса"""
+        return {
+            **self.stats,
+            'workers': self.config.max_workers,
+            'running': self._executor is not None
+        }
+
+
+# Фабричная функция
+def create_parsing_service(logger: Optional[logging.Logger] = None,
+                           config: Optional[ParsePoolConfig] = None) -> ParsingService:
+    """Создание настроенного сервиса парсинга"""
+    return ParsingService(logger, config)
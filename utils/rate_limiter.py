@@ -0,0 +1,286 @@
+"""
+Глобальный ограничитель запросов по доменам (token bucket)
+Все синхронные и асинхронные скраперы берут токен домена перед запросом: пока
+запас токенов есть, запросы идут без задержек, дальше - строго с разрешенной
+частотой вместо фиксированных пауз.
+
+Состояние ведер общее для процессов: по умолчанию в разделяемой памяти
+(/dev/shm, блокировка flock), по выбору - в Redis (атомарный Lua-скрипт).
+Без fcntl или при недоступном Redis используются ведра внутри процесса
+"""
+
+import os
+import time
+import mmap
+import struct
+import asyncio
+import tempfile
+import threading
+import logging
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+# Разрешенная частота по доменам: (запросов в секунду, запас токенов)
+DOMAIN_RATES: Dict[str, Tuple[float, int]] = {
+    'marathonbet.ru': (1.0, 2),
+    'sofascore.com': (3.0, 3),
+    'scores24.live': (1.0, 2),
+    'flashscore.com': (2.0, 4),
+}
+
+# Частота для доменов вне списка
+DEFAULT_RATE: Tuple[float, int] = (5.0, 10)
+
+
+def domain_for(url: str) -> str:
+    """Домен ограничения для URL или хоста (api.sofascore.com -> sofascore.com)"""
+    host = (urlsplit(url).hostname if '//' in url else url.split(':')[0]) or ''
+    host = host.lower().rstrip('.')
+    for domain in DOMAIN_RATES:
+        if host == domain or host.endswith('.' + domain):
+            return domain
+    labels = host.split('.')
+    return '.'.join(labels[-2:]) if len(labels) >= 2 else host
+
+
+def _take_token(tokens: float, updated: float, now: float, rate: float, burst: int) -> Tuple[float, float]:
+    """
+    Резервирование токена: новое число токенов и ожидание до разрешенного запроса
+    (токены уходят в минус - следующие запросы встают в очередь за текущим)
+    """
+    if updated <= 0:
+        tokens = float(burst)
+    else:
+        tokens = min(float(burst), tokens + max(0.0, now - updated) * rate)
+    tokens -= 1.0
+    return tokens, max(0.0, -tokens / rate)
+
+
+class LocalBucketBackend:
+    """Ведра внутри процесса"""
+
+    name = 'local'
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, domain: str, rate: float, burst: int) -> float:
+        with self._lock:
+            tokens, updated = self._buckets.get(domain, (0.0, 0.0))
+            now = time.time()
+            tokens, wait = _take_token(tokens, updated, now, rate, burst)
+            self._buckets[domain] = (tokens, now)
+            return wait
+
+
+class SharedMemoryBucketBackend:
+    """
+    Ведра в файле разделяемой памяти, общие для всех процессов хоста
+    Таблица фиксированного размера: имя домена, токены, время обновления
+    """
+
+    name = 'shared_memory'
+
+    _SLOT = struct.Struct('<48sdd')
+    _SLOTS = 64
+
+    def __init__(self, path: Optional[str] = None):
+        if fcntl is None:
+            raise RuntimeError("fcntl недоступен")
+        base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        self.path = path or os.path.join(base, 'sportstavka_rate_limits')
+
+        size = self._SLOT.size * self._SLOTS
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        # flock разделяет процессы, потоки одного процесса разделяет обычная блокировка
+        self._lock = threading.Lock()
+
+    def _slot(self, domain: str) -> int:
+        key = domain.encode('utf-8')[:48]
+        free = None
+        for index in range(self._SLOTS):
+            name, _, _ = self._SLOT.unpack_from(self._map, index * self._SLOT.size)
+            name = name.rstrip(b'\0')
+            if name == key:
+                return index
+            if not name and free is None:
+                free = index
+        if free is None:
+            raise RuntimeError("Таблица ограничителя заполнена")
+        self._SLOT.pack_into(self._map, free * self._SLOT.size, key, 0.0, 0.0)
+        return free
+
+    def reserve(self, domain: str, rate: float, burst: int) -> float:
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                offset = self._slot(domain) * self._SLOT.size
+                name, tokens, updated = self._SLOT.unpack_from(self._map, offset)
+                now = time.time()
+                tokens, wait = _take_token(tokens, updated, now, rate, burst)
+                self._SLOT.pack_into(self._map, offset, name, tokens, now)
+                return wait
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+
+class RedisBucketBackend:
+    """Ведра в Redis (совместимом сервере): резервирование одним Lua-скриптом"""
+
+    name = 'redis'
+
+    _SCRIPT = """
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local tokens, updated = tonumber(state[1]), tonumber(state[2])
+    if tokens == nil then tokens = burst; updated = now end
+    tokens = math.min(burst, tokens + math.max(0, now - updated) * rate) - 1
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1], 3600)
+    if tokens >= 0 then return '0' end
+    return tostring(-tokens / rate)
+    """
+
+    def __init__(self, url: str, key_prefix: str):
+        if redis is None:
+            raise RuntimeError("redis не установлен")
+        self.key_prefix = key_prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        self._client.ping()
+        self._script = self._client.register_script(self._SCRIPT)
+
+    def reserve(self, domain: str, rate: float, burst: int) -> float:
+        wait = self._script(keys=[f"{self.key_prefix}:{domain}"], args=[rate, burst, time.time()])
+        return float(wait)
+
+
+@dataclass
+class RateLimiterConfig:
+    """Конфигурация ограничителя"""
+    enabled: bool = True
+    backend: str = 'shared_memory'  # shared_memory, redis, local
+    redis_url: str = 'redis://localhost:6379/0'
+    key_prefix: str = 'sportstavka:ratelimit'
+    shm_path: Optional[str] = None
+    domain_rates: Dict[str, Tuple[float, int]] = field(default_factory=lambda: dict(DOMAIN_RATES))
+    default_rate: Tuple[float, int] = DEFAULT_RATE
+
+
+class DomainRateLimiter:
+    """
+    Ограничитель частоты запросов по доменам
+    """
+
+    def __init__(self, logger: logging.Logger, config: Optional[RateLimiterConfig] = None):
+        self.logger = logger
+        self.config = config or RateLimiterConfig()
+        self._local = LocalBucketBackend()
+        self.backend = self._create_backend()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+        self.logger.info(f"Ограничитель запросов: {self.backend.name}, доменов с лимитами {len(self.config.domain_rates)}")
+
+    def _create_backend(self):
+        try:
+            if self.config.backend == 'redis':
+                return RedisBucketBackend(self.config.redis_url, self.config.key_prefix)
+            if self.config.backend == 'shared_memory':
+                return SharedMemoryBucketBackend(self.config.shm_path)
+        except Exception as e:
+            self.logger.warning(f"Ограничитель {self.config.backend} недоступен ({e}), ведра внутри процесса")
+        return self._local
+
+    def rate_for(self, domain: str) -> Tuple[float, int]:
+        return self.config.domain_rates.get(domain, self.config.default_rate)
+
+    def reserve(self, url: str) -> float:
+        """Резервирование токена домена URL; возвращает необходимое ожидание в секундах"""
+        if not self.config.enabled:
+            return 0.0
+        domain = domain_for(url)
+        rate, burst = self.rate_for(domain)
+        try:
+            wait = self.backend.reserve(domain, rate, burst)
+        except Exception as e:
+            self.logger.warning(f"Ошибка ограничителя {self.backend.name}: {e}")
+            wait = self._local.reserve(domain, rate, burst)
+        self._record(domain, wait)
+        return wait
+
+    def acquire(self, url: str) -> float:
+        """Ожидание разрешения на запрос к домену URL (синхронно)"""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """Ожидание разрешения на запрос к домену URL (асинхронно)"""
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _record(self, domain: str, wait: float):
+        with self._lock:
+            stats = self._stats.setdefault(domain, {'requests': 0, 'delayed': 0, 'total_wait': 0.0, 'max_wait': 0.0})
+            stats['requests'] += 1
+            if wait > 0:
+                stats['delayed'] += 1
+                stats['total_wait'] += wait
+                stats['max_wait'] = max(stats['max_wait'], wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            domains = {
+                domain: {
+                    'rate': self.rate_for(domain)[0],
+                    'burst': self.rate_for(domain)[1],
+                    'requests': int(stats['requests']),
+                    'delayed': int(stats['delayed']),
+                    'total_wait': round(stats['total_wait'], 3),
+                    'max_wait': round(stats['max_wait'], 3)
+                }
+                for domain, stats in self._stats.items()
+            }
+        return {'backend': self.backend.name, 'enabled': self.config.enabled, 'domains': domains}
+
+
+def create_rate_limiter(logger: logging.Logger, backend: str = 'shared_memory', **kwargs) -> DomainRateLimiter:
+    """Создание ограничителя с выбранным хранилищем состояния"""
+    return DomainRateLimiter(logger, RateLimiterConfig(backend=backend, **kwargs))
+
+
+# Глобальный ограничитель
+_global_limiter: Optional[DomainRateLimiter] = None
+_global_lock = threading.Lock()
+
+def get_global_rate_limiter(logger: Optional[logging.Logger] = None) -> DomainRateLimiter:
+    """Получение общего ограничителя процесса"""
+    global _global_limiter
+    if _global_limiter is None:
+        with _global_lock:
+            if _global_limiter is None:
+                _global_limiter = DomainRateLimiter(logger or logging.getLogger(__name__))
+    return _global_limiter
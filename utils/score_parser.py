@@ -0,0 +1,101 @@
+"""
+Единый парсер счетов для всех видов спорта
+Футбол/гандбол: голы "2:1"; теннис: сеты + геймы "1:0 (6:4, 3:2)";
+настольный теннис: сеты + очки "2:1 (11:8)". Результат - неизменяемый Score,
+каждая уникальная строка разбирается один раз (кэш по исходной строке)
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Основная пара (голы или сеты) в начале строки
+_PRIMARY_RE = re.compile(r'^\s*(\d{1,3})\s*[:\-]\s*(\d{1,3})')
+# Дополнительные пары (геймы/очки/периоды) после основной
+_DETAIL_RE = re.compile(r'(\d{1,3})\s*[:\-]\s*(\d{1,3})')
+
+# Статусы без счета
+NO_SCORE_VALUES = frozenset({'', 'LIVE', 'FT', 'HT', '-', 'VS', 'V'})
+
+
+@dataclass(frozen=True)
+class Score:
+    """Разобранный счет матча"""
+    home: int
+    away: int
+    detail: Tuple[Tuple[int, int], ...] = ()  # Геймы/очки по сетам или периоды
+    raw: str = ''
+
+    @property
+    def is_draw(self) -> bool:
+        return self.home == self.away
+
+    @property
+    def leader(self) -> Optional[str]:
+        """'home', 'away' или None при ничьей"""
+        if self.home > self.away:
+            return 'home'
+        if self.away > self.home:
+            return 'away'
+        return None
+
+    @property
+    def margin(self) -> int:
+        return abs(self.home - self.away)
+
+    @property
+    def total(self) -> int:
+        return self.home + self.away
+
+    @property
+    def is_goalless(self) -> bool:
+        return self.home == 0 and self.away == 0
+
+    @property
+    def current_period(self) -> Optional[Tuple[int, int]]:
+        """Счет текущего сета/периода (последняя пара в скобках)"""
+        return self.detail[-1] if self.detail else None
+
+    def __str__(self) -> str:
+        return f"{self.home}:{self.away}"
+
+
+class ScoreParser:
+    """
+    Скомпилированный парсер счетов с кэшем по исходной строке
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    def _parse(self, raw: str) -> Optional[Score]:
+        """Разбор строки счета (None если счета нет)"""
+        if not isinstance(raw, str) or raw.strip().upper() in NO_SCORE_VALUES:
+            return None
+
+        primary = _PRIMARY_RE.match(raw)
+        if not primary:
+            return None
+
+        rest = raw[primary.end():]
+        detail = tuple((int(a), int(b)) for a, b in _DETAIL_RE.findall(rest))
+
+        return Score(int(primary.group(1)), int(primary.group(2)), detail, raw)
+
+    def cache_info(self):
+        return self.parse.cache_info()
+
+
+# Общий парсер для всей системы
+_default_parser = ScoreParser()
+
+
+def parse_score(raw: str) -> Optional[Score]:
+    """Разбор счета общим кэширующим парсером"""
+    return _default_parser.parse(raw)
+
+
+def get_score_parser() -> ScoreParser:
+    """Получение общего парсера счетов"""
+    return _default_parser
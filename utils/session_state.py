@@ -0,0 +1,208 @@
+"""
+Передача состояния браузера в HTTP сессию
+Когда источник вынуждает перейти на Selenium, куки, полученные браузером (в том
+числе cookie прохождения защиты), и его User-Agent переносятся в общий HTTP
+транспорт и сохраняются на диск вместе со сроком действия. Следующие опросы
+остаются на дешевом HTTP пути, пока сервер снова не отвергнет сессию (CAPTCHA,
+403/429/503) - тогда состояние сбрасывается и браузер получает новое
+"""
+
+import os
+import json
+import time
+import threading
+import logging
+from typing import Any, Dict, List, Optional
+
+from config import SESSION_STATE_FILE
+
+# Статусы, которыми источники отвергают сессию
+REJECT_STATUSES = (403, 429, 503)
+
+
+class SessionStateManager:
+    """
+    Куки и User-Agent браузера по источникам с сохранением между перезапусками
+    """
+
+    def __init__(self, logger: logging.Logger, path: Optional[str] = SESSION_STATE_FILE,
+                 session_cookie_ttl: float = 6 * 3600):
+        """
+        Args:
+            path: файл состояния (None - без сохранения)
+            session_cookie_ttl: время жизни кук без срока действия (сессионных), с
+        """
+        self.logger = logger
+        self.path = path
+        self.session_cookie_ttl = session_cookie_ttl
+
+        # источник -> {'domain', 'user_agent', 'cookies', 'captured_at'}
+        self._states: Dict[str, Dict[str, Any]] = {}
+        # источник -> User-Agent сессии до передачи состояния
+        self._default_agents: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {'captured': 0, 'applied': 0, 'rejected': 0}
+
+        self._load()
+
+    def _valid_cookies(self, state: Dict[str, Any], now: float) -> List[Dict[str, Any]]:
+        session_deadline = state.get('captured_at', 0) + self.session_cookie_ttl
+        return [
+            cookie for cookie in state.get('cookies', [])
+            if (cookie.get('expiry') or session_deadline) > now
+        ]
+
+    def capture(self, source: str, domain: str, driver, session=None) -> int:
+        """
+        Состояние браузера после загрузки страницы источника
+
+        Args:
+            domain: домен источника (куки других доменов не переносятся)
+            driver: Selenium WebDriver с загруженной страницей
+            session: HTTP сессия источника, в которую сразу передается состояние
+
+        Returns:
+            int: число перенесенных кук
+        """
+        try:
+            cookies = [
+                {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'expiry') if key in cookie}
+                for cookie in driver.get_cookies()
+                if cookie.get('domain', '').lstrip('.') == domain
+                or cookie.get('domain', '').lstrip('.').endswith('.' + domain)
+            ]
+            user_agent = driver.execute_script('return navigator.userAgent')
+        except Exception as e:
+            self.logger.warning(f"Не удалось получить состояние браузера {source}: {e}")
+            return 0
+
+        if not cookies:
+            return 0
+
+        with self._lock:
+            self._states[source] = {
+                'domain': domain,
+                'user_agent': user_agent,
+                'cookies': cookies,
+                'captured_at': time.time()
+            }
+            self.stats['captured'] += 1
+
+        self.logger.info(f"🍪 {source}: состояние браузера сохранено ({len(cookies)} кук)")
+        self._save()
+
+        if session is not None:
+            self.apply(source, session)
+        return len(cookies)
+
+    def apply(self, source: str, session) -> bool:
+        """
+        Передача сохраненного состояния в HTTP сессию источника
+        (куки - в общий jar транспорта, User-Agent - в заголовки сессии)
+        """
+        with self._lock:
+            state = self._states.get(source)
+            if state is None:
+                return False
+            cookies = self._valid_cookies(state, time.time())
+            if not cookies:
+                self._states.pop(source, None)
+                expired = True
+            else:
+                expired = False
+                if source not in self._default_agents:
+                    self._default_agents[source] = session.headers.get('User-Agent')
+                self.stats['applied'] += 1
+
+        if expired:
+            self.logger.info(f"🍪 {source}: сохраненные куки истекли")
+            self._save()
+            return False
+
+        session.transport.set_cookies(cookies)
+        if state.get('user_agent'):
+            session.headers['User-Agent'] = state['user_agent']
+        return True
+
+    def is_rejected(self, response) -> bool:
+        """Ответ, которым сервер отвергает сессию"""
+        if response.status_code in REJECT_STATUSES:
+            return True
+        return response.status_code == 200 and 'captcha' in response.text.lower()
+
+    def reject(self, source: str, session=None):
+        """
+        Сервер отверг сессию: состояние удаляется, сессия возвращается к исходному User-Agent
+        """
+        with self._lock:
+            state = self._states.pop(source, None)
+            default_agent = self._default_agents.pop(source, None)
+            if state is not None:
+                self.stats['rejected'] += 1
+
+        if state is None:
+            return
+
+        if session is not None:
+            session.transport.clear_cookies(state['domain'])
+            if default_agent:
+                session.headers['User-Agent'] = default_agent
+
+        self.logger.info(f"🍪 {source}: сессия отвергнута сервером, нужен браузер")
+        self._save()
+
+    def has_state(self, source: str) -> bool:
+        with self._lock:
+            state = self._states.get(source)
+            return state is not None and bool(self._valid_cookies(state, time.time()))
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            now = time.time()
+            self._states = {
+                source: state for source, state in data.get('sources', {}).items()
+                if self._valid_cookies(state, now)
+            }
+            if self._states:
+                self.logger.info(f"🍪 Загружено состояние браузера: {', '.join(sorted(self._states))}")
+        except Exception as e:
+            self.logger.warning(f"Не удалось загрузить состояние сессий {self.path}: {e}")
+            self._states = {}
+
+    def _save(self):
+        if not self.path:
+            return
+        with self._lock:
+            payload = json.dumps({'sources': self._states}, ensure_ascii=False, indent=2)
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.logger.warning(f"Не удалось сохранить состояние сессий {self.path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sources = {source: len(state.get('cookies', [])) for source, state in self._states.items()}
+        return {**self.stats, 'sources': sources}
+
+
+# Глобальный менеджер состояния
+_global_state: Optional[SessionStateManager] = None
+_global_lock = threading.Lock()
+
+def get_global_session_state(logger: Optional[logging.Logger] = None) -> SessionStateManager:
+    """Получение общего менеджера состояния сессий процесса"""
+    global _global_state
+    if _global_state is None:
+        with _global_lock:
+            if _global_state is None:
+                _global_state = SessionStateManager(logger or logging.getLogger(__name__))
+    return _global_state